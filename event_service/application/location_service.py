@@ -1,58 +1,59 @@
 from typing import List, Dict, Any
-import uuid
+from django.conf import settings
+from django.db.models import Q
 
-from domain.location import EventLocation, LocationSearch
+from domain import geohash
+from domain.location import EventLocation
+from infrastructure.services.location_index import LOCATION_FIELDS, LocationIndex, LocationIndexRegistry
 
 
 class LocationSearchService:
-    """Service for location-based event search."""
+    """Service for location-based event search.
+    
+    Candidates are narrowed in the database by the search circle's bounding
+    box and the geohash cells covering it, then measured with a vectorized
+    Haversine. With LOCATION_INDEX_IN_MEMORY set, queries are answered from
+    a per-process snapshot of all locations instead.
+    """
     
     def search_nearby(self, latitude: float, longitude: float, 
                      radius_km: float = 10.0) -> List[Dict[str, Any]]:
         """Search for events within radius of coordinates."""
-        locations = EventLocation.objects.all()
+        if radius_km < 0:
+            return []
+        if settings.LOCATION_INDEX_IN_MEMORY:
+            return LocationIndexRegistry.get().search(latitude, longitude, radius_km)
         
-        nearby = []
-        for loc in locations:
-            distance = loc.distance_to(latitude, longitude)
-            if distance <= radius_km:
-                nearby.append({
-                    'event_id': str(loc.event_id),
-                    'city': loc.city,
-                    'country': loc.country,
-                    'latitude': loc.latitude,
-                    'longitude': loc.longitude,
-                    'distance_km': round(distance, 2),
-                })
+        min_lat, max_lat, lon_ranges = geohash.bounding_box(latitude, longitude, radius_km)
+        in_box = Q()
+        for min_lon, max_lon in lon_ranges:
+            in_box |= Q(longitude__gte=min_lon, longitude__lte=max_lon)
+        # Rows without a geohash yet are still found through the bounding box
+        in_cells = Q(geohash='')
+        for prefix in geohash.cover(min_lat, max_lat, lon_ranges):
+            in_cells |= Q(geohash__startswith=prefix)
         
-        # Sort by distance
-        nearby.sort(key=lambda x: x['distance_km'])
-        return nearby
+        candidates = EventLocation.objects.filter(
+            in_box, in_cells, latitude__gte=min_lat, latitude__lte=max_lat
+        ).values_list(*LOCATION_FIELDS)
+        return LocationIndex(candidates).search(latitude, longitude, radius_km)
 
 
 class NearbyEventsService:
     """Service for finding nearby events."""
     
-    def execute(self, city: str, radius_km: float = 50.0) -> List[EventLocation]:
+    def execute(self, city: str, radius_km: float = 50.0) -> List[Dict[str, Any]]:
         """Find events near a city."""
-        # Get events in the city
-        city_events = EventLocation.objects.filter(city__iexact=city)
-        
-        if not city_events.exists():
+        # Use the city's first event as reference
+        reference = EventLocation.objects.filter(city__iexact=city).order_by('pk').values_list(
+            'latitude', 'longitude'
+        ).first()
+        if reference is None:
             return []
         
-        # Use first event's coordinates as reference
-        ref_location = city_events.first()
-        
         # Find all events within radius
         search_service = LocationSearchService()
-        nearby = search_service.search_nearby(
-            ref_location.latitude,
-            ref_location.longitude,
-            radius_km
-        )
-        
-        return nearby
+        return search_service.search_nearby(reference[0], reference[1], radius_km)
 
 
 class GeoFilterService:
@@ -1,8 +1,10 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional
 import uuid
 
-from domain.recommendation import UserPreference, RecommendationScore
+from domain.recommendation import UserPreference
 from domain.search_index import EventSearchIndex
+from infrastructure.services.recommendation_cache_service import RecommendationCacheService
+from infrastructure.services.recommendation_index import RecommendationIndexRegistry
 
 
 class UserPreferenceService:
@@ -29,7 +31,16 @@ class UserPreferenceService:
 
 
 class EventRecommendationService:
-    """Service for generating event recommendations."""
+    """Service for generating event recommendations.
+    
+    Scores come from the in-memory recommendation index, and each user's
+    top TOP_N are cached until their preferences or the catalog change.
+    """
+    
+    TOP_N = 50
+    
+    def __init__(self, cache_service: Optional[RecommendationCacheService] = None):
+        self.cache_service = cache_service or RecommendationCacheService()
     
     def generate_recommendations(self, user_id: uuid.UUID, limit: int = 10) -> List[Dict[str, Any]]:
         """Generate personalized event recommendations."""
@@ -40,62 +51,27 @@ class EventRecommendationService:
             # Return popular events for new users
             return self._get_popular_events(limit)
         
-        # Get published events
-        events = EventSearchIndex.objects.filter(is_published=True)
-        
-        recommendations = []
-        for event in events:
-            score = self._calculate_event_score(event, pref)
-            if score > 0:
-                recommendations.append({
-                    'event_id': str(event.event_id),
-                    'title': event.title,
-                    'category': event.category,
-                    'score': round(score, 2),
-                    'reason': self._generate_reason(event, pref),
-                })
+        if limit > self.TOP_N:
+            return RecommendationIndexRegistry.get().recommend(pref, limit)
         
-        # Sort by score and return top N
-        recommendations.sort(key=lambda x: x['score'], reverse=True)
+        version = RecommendationIndexRegistry.version()
+        recommendations = self.cache_service.get(user_id, version, pref.updated_at)
+        if recommendations is None:
+            index = RecommendationIndexRegistry.get()
+            recommendations = index.recommend(pref, self.TOP_N)
+            self.cache_service.set(user_id, index.version, pref.updated_at, recommendations)
         return recommendations[:limit]
     
-    def _calculate_event_score(self, event: EventSearchIndex, pref: UserPreference) -> float:
-        """Calculate recommendation score for an event."""
-        score = 0.0
-        
-        # Category match
-        if event.category in pref.preferred_categories:
-            score += 0.3
-        
-        # Tag match
-        matching_tags = set(event.tags) & set(pref.preferred_tags)
-        if matching_tags:
-            score += 0.25 * (len(matching_tags) / max(len(pref.preferred_tags), 1))
-        
-        # City match
-        if event.city in pref.preferred_cities:
-            score += 0.25
-        
-        # Popularity
-        score += min(event.view_count / 1000, 0.2)
-        
-        return score
-    
-    def _generate_reason(self, event: EventSearchIndex, pref: UserPreference) -> str:
-        """Generate explanation for recommendation."""
-        reasons = []
-        
-        if event.category in pref.preferred_categories:
-            reasons.append(f"Matches your interest in {event.category}")
-        
-        matching_tags = set(event.tags) & set(pref.preferred_tags)
-        if matching_tags:
-            reasons.append(f"Tagged with {', '.join(list(matching_tags)[:2])}")
-        
-        if event.city in pref.preferred_cities:
-            reasons.append(f"In your preferred city {event.city}")
-        
-        return '; '.join(reasons) if reasons else "Popular event"
+    def precompute(self, preferences: Iterable[UserPreference], timeout: int = 86400) -> int:
+        """Score and cache top recommendations for many users at once."""
+        index = RecommendationIndexRegistry.get()
+        entries = [
+            (pref.user_id, pref.updated_at, index.recommend(pref, self.TOP_N))
+            for pref in preferences
+        ]
+        if entries:
+            self.cache_service.set_many(index.version, entries, timeout=timeout)
+        return len(entries)
     
     def _get_popular_events(self, limit: int) -> List[Dict[str, Any]]:
         """Get popular events for users without preferences."""
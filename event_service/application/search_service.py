@@ -1,26 +1,83 @@
-from typing import Dict, Any, List
+from collections import defaultdict
+from typing import Dict, Any, List, Optional
+import base64
+import json
+import re
 import uuid
-from django.db.models import Q
-from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.db.models.functions import Cast, Ln
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
 
 from domain.search_index import EventSearchIndex
+from infrastructure.services.search_cache_service import SearchCacheService
+from infrastructure.services.view_counter_service import ViewCounterService
+
+
+SEARCH_CONFIG = 'english'
+
+
+def encode_cursor(score: float, index_id: uuid.UUID) -> str:
+    """Opaque keyset cursor for the row a page ended on."""
+    payload = json.dumps([score, str(index_id)]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        score, index_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return float(score), uuid.UUID(index_id)
+    except (ValueError, TypeError):
+        raise ValidationError('Invalid cursor')
 
 
 class EventSearchService:
-    """Service for searching events."""
+    """Service for searching events.
     
-    def execute(self, query: str, filters: Dict[str, Any] = None) -> List[EventSearchIndex]:
+    Text queries run against the weighted search_vector (kept current by
+    a database trigger) with prefix matching, and also match titles by
+    trigram word similarity so typos still find events. Matches are scored
+    by text relevance scaled by the stored search_rank; without a query,
+    events are ordered by search_rank. Pages are fetched with keyset
+    cursors on (score, id).
+    """
+    
+    DEFAULT_LIMIT = 50
+    MAX_LIMIT = 100
+    
+    def __init__(self, cache_service: Optional[SearchCacheService] = None):
+        self.cache_service = cache_service or SearchCacheService()
+    
+    def execute(self, query: str, filters: Dict[str, Any] = None,
+                limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None) -> List[EventSearchIndex]:
         """Search events with query and filters."""
-        results = EventSearchIndex.objects.filter(is_published=True)
+        return self.search(query, filters, limit, cursor)['results']
+    
+    def search_cached(self, query: str, filters: Dict[str, Any] = None,
+                      limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Like search(), with serialized results served through the search cache.
         
-        # Apply text search
-        if query:
-            search_query = SearchQuery(query)
-            results = results.filter(
-                Q(title__icontains=query) |
-                Q(description__icontains=query) |
-                Q(category__icontains=query)
-            )
+        Adds 'cached': whether the page came from the cache.
+        """
+        filters = filters or {}
+        
+        def compute() -> Dict[str, Any]:
+            page = self.search(query, filters, limit, cursor)
+            return {'results': self.cache_service.serialize(page['results']), 'next_cursor': page['next_cursor']}
+        
+        # Each page is cached under its own key
+        page, cached = self.cache_service.get_or_compute(
+            query, {**filters, 'cursor': cursor, 'limit': limit}, compute
+        )
+        return {**page, 'cached': cached}
+    
+    def search(self, query: str, filters: Dict[str, Any] = None,
+               limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """One page of results plus the cursor for the next page."""
+        limit = max(1, min(limit or self.DEFAULT_LIMIT, self.MAX_LIMIT))
+        results = EventSearchIndex.objects.filter(is_published=True)
         
         # Apply filters
         if filters:
@@ -31,15 +88,54 @@ class EventSearchService:
             if 'status' in filters:
                 results = results.filter(status=filters['status'])
         
-        # Order by rank
-        return results.order_by('-search_rank', '-created_at')[:50]
+        # Apply text search
+        query = (query or '').strip()
+        if query:
+            results = self._full_text(results, query)
+        else:
+            results = results.annotate(score=F('search_rank'))
+        
+        if cursor:
+            score, index_id = decode_cursor(cursor)
+            results = results.filter(Q(score__lt=score) | Q(score=score, id__lt=index_id))
+        
+        page = list(results.order_by('-score', '-id')[:limit + 1])
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = encode_cursor(page[-1].score, page[-1].id)
+        
+        return {'results': page, 'next_cursor': next_cursor}
+    
+    def _full_text(self, results, query: str):
+        similarity = TrigramWordSimilarity(query, 'title')
+        matches = Q(title__trigram_word_similar=query)
+        relevance = similarity
+        
+        terms = re.findall(r'\w+', query.lower())
+        if terms:
+            # Prefix-match every term: "tech conf" finds "technology conference"
+            ts_query = SearchQuery(' & '.join(f"{term}:*" for term in terms),
+                                   search_type='raw', config=SEARCH_CONFIG)
+            matches |= Q(search_vector=ts_query)
+            relevance = SearchRank(F('search_vector'), ts_query) + similarity
+        
+        boost = Value(1.0) + Ln(Value(1.0) + Cast('search_rank', FloatField()))
+        return results.filter(matches).annotate(score=relevance * boost)
 
 
 class SearchFilterService:
     """Service for getting available search filters."""
     
+    def __init__(self, cache_service: Optional[SearchCacheService] = None):
+        self.cache_service = cache_service or SearchCacheService()
+    
     def execute(self) -> Dict[str, List[str]]:
         """Get available filter options."""
+        filters, _ = self.cache_service.get_or_compute('', {}, self._compute, namespace='filters')
+        return filters
+    
+    def _compute(self) -> Dict[str, List[str]]:
         published_events = EventSearchIndex.objects.filter(is_published=True)
         
         categories = list(
@@ -62,24 +158,83 @@ class SearchFilterService:
 
 
 class SearchRankingService:
-    """Service for updating search rankings."""
+    """Service for updating search rankings.
+    
+    Page views are buffered in Redis and applied in bulk by
+    flush_view_counts(). Recent views also feed trending_score, which
+    decay_trending() halves every TRENDING_HALF_LIFE seconds.
+    """
+    
+    DECAY_INTERVAL = 600  # 10 minutes
+    TRENDING_HALF_LIFE = 86400  # 1 day
+    TRENDING_FLOOR = 0.01
+    
+    def __init__(self, view_counter: Optional[ViewCounterService] = None):
+        self.view_counter = view_counter or ViewCounterService()
     
     def execute(self, event_id: uuid.UUID) -> EventSearchIndex:
         """Update search ranking for an event."""
         try:
             index = EventSearchIndex.objects.get(event_id=event_id)
             index.update_rank()
-            index.save()
+            index.save(update_fields=['search_rank', 'updated_at'])
             return index
         except EventSearchIndex.DoesNotExist:
             return None
     
     def increment_view_count(self, event_id: uuid.UUID) -> None:
-        """Increment view count and update rank."""
+        """Record a page view. Counts and rank catch up on the next flush."""
+        self.view_counter.record(event_id)
+    
+    def flush_view_counts(self, batch_size: int = 1000) -> Dict[str, int]:
+        """Apply buffered views to view counts, trending scores and ranks.
+        
+        Events are grouped by how many views they got, and each group is
+        written with one UPDATE that adds to the counters and recomputes the
+        rank from the new values in the same statement.
+        """
+        counts = self.view_counter.drain()
+        if not counts:
+            return {'events': 0, 'views': 0}
+        
+        by_views = defaultdict(list)
+        for event_id, views in counts.items():
+            by_views[views].append(event_id)
+        
         try:
-            index = EventSearchIndex.objects.get(event_id=event_id)
-            index.view_count += 1
-            index.update_rank()
-            index.save()
-        except EventSearchIndex.DoesNotExist:
-            pass
+            with transaction.atomic():
+                for views, event_ids in by_views.items():
+                    view_count = F('view_count') + views
+                    trending_score = F('trending_score') + views
+                    for start in range(0, len(event_ids), batch_size):
+                        EventSearchIndex.objects.filter(event_id__in=event_ids[start:start + batch_size]).update(
+                            view_count=view_count,
+                            trending_score=trending_score,
+                            search_rank=EventSearchIndex.rank_expression(view_count, trending_score),
+                        )
+        except Exception:
+            self.view_counter.restore(counts)
+            raise
+        
+        return {'events': len(counts), 'views': sum(counts.values())}
+    
+    def decay_trending(self) -> int:
+        """Age every trending score by one DECAY_INTERVAL and re-rank those events.
+        
+        Meant to run every DECAY_INTERVAL seconds. Scores that fall below
+        TRENDING_FLOOR drop to zero, so only recently viewed events are
+        touched.
+        """
+        factor = 0.5 ** (self.DECAY_INTERVAL / self.TRENDING_HALF_LIFE)
+        
+        def decayed():
+            return Case(
+                When(trending_score__lt=self.TRENDING_FLOOR / factor, then=Value(0.0)),
+                default=F('trending_score') * factor,
+                output_field=FloatField(),
+            )
+        
+        return EventSearchIndex.objects.filter(trending_score__gt=0).update(
+            trending_score=decayed(),
+            search_rank=EventSearchIndex.rank_expression(trending_score=decayed()),
+        )
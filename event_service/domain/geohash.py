@@ -0,0 +1,89 @@
+from math import asin, cos, degrees, floor, pi, radians, sin
+from typing import List, Tuple
+
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# 9 characters is a cell of roughly 5m x 5m
+PRECISION = 9
+
+EARTH_RADIUS_KM = 6371
+
+# (min_lon, max_lon) pairs; two when a box crosses the antimeridian
+LonRanges = List[Tuple[float, float]]
+
+
+def encode(latitude: float, longitude: float, precision: int = PRECISION) -> str:
+    """Geohash of a point. Nearby points share long prefixes."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = bit_count = 0
+    even = True
+    while len(chars) < precision:
+        interval, value = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (interval[0] + interval[1]) / 2
+        if value >= mid:
+            bits = bits * 2 + 1
+            interval[0] = mid
+        else:
+            bits = bits * 2
+            interval[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = bit_count = 0
+    return ''.join(chars)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """(height, width) of a geohash cell in degrees."""
+    lat_bits = 5 * precision // 2
+    lon_bits = 5 * precision - lat_bits
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, LonRanges]:
+    """Smallest lat/lon box containing every point within `radius_km`."""
+    # Widened by a hair so points exactly on the circle survive rounding
+    angle = radius_km / EARTH_RADIUS_KM * (1 + 1e-9)
+    if angle >= pi / 2:
+        return -90.0, 90.0, [(-180.0, 180.0)]
+    
+    min_lat = latitude - degrees(angle)
+    max_lat = latitude + degrees(angle)
+    if min_lat <= -90 or max_lat >= 90:
+        # The circle covers a pole, so every longitude is in range
+        return max(min_lat, -90.0), min(max_lat, 90.0), [(-180.0, 180.0)]
+    
+    delta = degrees(asin(sin(angle) / cos(radians(latitude))))
+    min_lon = longitude - delta
+    max_lon = longitude + delta
+    if min_lon < -180:
+        return min_lat, max_lat, [(min_lon + 360, 180.0), (-180.0, max_lon)]
+    if max_lon > 180:
+        return min_lat, max_lat, [(min_lon, 180.0), (-180.0, max_lon - 360)]
+    return min_lat, max_lat, [(min_lon, max_lon)]
+
+
+def cover(min_lat: float, max_lat: float, lon_ranges: LonRanges, max_cells: int = 32) -> List[str]:
+    """Geohash prefixes of the finest cells that tile the box in at most `max_cells`."""
+    for precision in range(PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        rows = _steps(min_lat + 90, max_lat + 90, height, 180)
+        columns = [_steps(min_lon + 180, max_lon + 180, width, 360) for min_lon, max_lon in lon_ranges]
+        if len(rows) * sum(len(c) for c in columns) > max_cells:
+            continue
+        return sorted({
+            encode(-90 + (row + 0.5) * height, -180 + (column + 0.5) * width, precision)
+            for row in rows
+            for steps in columns
+            for column in steps
+        })
+    return list(BASE32)
+
+
+def _steps(low: float, high: float, size: float, span: float) -> range:
+    last = int(span / size) - 1
+    return range(min(int(floor(low / size)), last), min(int(floor(high / size)), last) + 1)
@@ -2,6 +2,8 @@ import uuid
 from django.db import models
 from math import radians, cos, sin, asin, sqrt
 
+from .geohash import encode as encode_geohash
+
 
 class LocationSearch(models.Model):
     """Model for location-based search criteria."""
@@ -66,6 +68,10 @@ class EventLocation(models.Model):
     latitude = models.FloatField()
     longitude = models.FloatField()
     
+    # Derived from the coordinates on save(). Rows written with bulk_create
+    # or update() keep the old value until saved again.
+    geohash = models.CharField(max_length=12, blank=True)
+    
     # Metadata
     is_verified = models.BooleanField(default=False)
     
@@ -80,8 +86,16 @@ class EventLocation(models.Model):
             models.Index(fields=['city']),
             models.Index(fields=['country']),
             models.Index(fields=['latitude', 'longitude']),
+            models.Index(fields=['geohash'], name='event_location_geohash', opclasses=['varchar_pattern_ops']),
         ]
     
+    def save(self, *args, **kwargs):
+        self.geohash = encode_geohash(self.latitude, self.longitude)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'geohash'}
+        super().save(*args, **kwargs)
+    
     def distance_to(self, lat: float, lon: float) -> float:
         """Calculate distance to given coordinates."""
         return LocationSearch.calculate_distance(
@@ -0,0 +1,61 @@
+# Generated by Django 6.0.1 on 2026-10-18 16:05
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+# Keeps search_vector in step with the indexed text on every INSERT and on
+# any UPDATE touching it, including bulk_create and queryset.update().
+CREATE_TRIGGER = """
+CREATE OR REPLACE FUNCTION event_search_index_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(
+            CASE WHEN jsonb_typeof(NEW.tags) = 'array' THEN
+                (SELECT string_agg(tag, ' ') FROM jsonb_array_elements_text(NEW.tags) AS tag)
+            END, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.category, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER event_search_index_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description, category, tags ON event_search_index
+    FOR EACH ROW EXECUTE FUNCTION event_search_index_vector_update();
+
+UPDATE event_search_index SET title = title;
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS event_search_index_vector_trigger ON event_search_index;
+DROP FUNCTION IF EXISTS event_search_index_vector_update();
+"""
+
+
+def create_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_TRIGGER)
+
+
+def drop_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_TRIGGER)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0012_eventcollaboration_collaborationtask'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='eventsearchindex',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='event_search_title_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.RunPython(create_trigger, drop_trigger),
+    ]
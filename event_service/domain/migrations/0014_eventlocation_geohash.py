@@ -0,0 +1,38 @@
+# Generated by Django 6.0.1 on 2026-10-18 17:20
+
+from django.db import migrations, models
+
+from domain.geohash import encode
+
+
+def backfill_geohash(apps, schema_editor):
+    EventLocation = apps.get_model('domain', 'EventLocation')
+    batch = []
+    for location in EventLocation.objects.only('id', 'latitude', 'longitude').iterator(chunk_size=2000):
+        location.geohash = encode(location.latitude, location.longitude)
+        batch.append(location)
+        if len(batch) >= 2000:
+            EventLocation.objects.bulk_update(batch, ['geohash'])
+            batch = []
+    if batch:
+        EventLocation.objects.bulk_update(batch, ['geohash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0013_search_vector_trigger'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventlocation',
+            name='geohash',
+            field=models.CharField(blank=True, max_length=12),
+        ),
+        migrations.AddIndex(
+            model_name='eventlocation',
+            index=models.Index(fields=['geohash'], name='event_location_geohash', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.RunPython(backfill_geohash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0014_eventlocation_geohash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventsearchindex',
+            name='trending_score',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddIndex(
+            model_name='eventsearchindex',
+            index=models.Index(fields=['trending_score'], name='event_searc_trendin_60ea69_idx'),
+        ),
+    ]
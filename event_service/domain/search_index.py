@@ -1,12 +1,23 @@
 import uuid
 from django.db import models
+from django.db.models import Case, ExpressionWrapper, F, FloatField, Func, Value, When
+from django.db.models.functions import Cast, Round
 from django.contrib.postgres.search import SearchVectorField
 from django.contrib.postgres.indexes import GinIndex
 
 
+class JSONArrayLength(Func):
+    """Number of elements in a JSON array column."""
+    
+    function = 'JSONB_ARRAY_LENGTH'
+    output_field = models.IntegerField()
+
+
 class EventSearchIndex(models.Model):
     """Search index model for event full-text search."""
     
+    TRENDING_WEIGHT = 0.5
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     event_id = models.UUIDField(unique=True)
     
@@ -27,8 +38,11 @@ class EventSearchIndex(models.Model):
     # Search ranking
     search_rank = models.FloatField(default=0.0)
     view_count = models.IntegerField(default=0)
+    # Recent views, decayed periodically so trending events rank higher
+    trending_score = models.FloatField(default=0.0)
     
-    # Full-text search vector
+    # Full-text search vector: title (A), tags and category (B), description (C).
+    # Maintained by a database trigger, see migration 0013.
     search_vector = SearchVectorField(null=True)
     
     # Timestamps
@@ -44,7 +58,9 @@ class EventSearchIndex(models.Model):
             models.Index(fields=['category']),
             models.Index(fields=['city']),
             models.Index(fields=['-search_rank']),
+            models.Index(fields=['trending_score']),
             GinIndex(fields=['search_vector']),
+            GinIndex(fields=['title'], name='event_search_title_trgm', opclasses=['gin_trgm_ops']),
         ]
     
     def calculate_rank(self) -> float:
@@ -61,8 +77,26 @@ class EventSearchIndex(models.Model):
         # Boost for events with tags
         rank += len(self.tags) * 0.5
         
+        # Boost for recent views
+        rank += self.trending_score * self.TRENDING_WEIGHT
+        
         return round(rank, 2)
     
+    @classmethod
+    def rank_expression(cls, view_count=F('view_count'), trending_score=F('trending_score')):
+        """calculate_rank() as a database expression, for set-based updates.
+        
+        The counters can be passed as expressions, so a single UPDATE can
+        change them and rank on the new values.
+        """
+        rank = (
+            Cast(view_count, FloatField()) * Value(0.1)
+            + Case(When(is_published=True, then=Value(10.0)), default=Value(0.0), output_field=FloatField())
+            + Cast(JSONArrayLength('tags'), FloatField()) * Value(0.5)
+            + trending_score * Value(cls.TRENDING_WEIGHT)
+        )
+        return Round(ExpressionWrapper(rank, output_field=FloatField()), 2)
+    
     def update_rank(self) -> None:
         """Update search rank."""
         self.search_rank = self.calculate_rank()
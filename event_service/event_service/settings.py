@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 from pathlib import Path
 
 import sentry_sdk
+from celery.schedules import crontab
 from decouple import Csv, config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -162,6 +163,20 @@ REDIS_PORT = config("REDIS_PORT", cast=int)
 REDIS_DB = config("REDIS_DB", cast=int)
 REDIS_PASSWORD = config("REDIS_PASSWORD")
 
+# Search results, precomputed recommendations and the catalog and location
+# versions that tell each process to rebuild its in-memory indexes all live
+# in the default cache, so web and worker processes must share it.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": f"redis://{':' + REDIS_PASSWORD + '@' if REDIS_PASSWORD else ''}{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}",
+    }
+}
+
+# Answer radius searches from an in-memory snapshot of all event locations
+# instead of querying the database.
+LOCATION_INDEX_IN_MEMORY = config("LOCATION_INDEX_IN_MEMORY", default=False, cast=bool)
+
 # RabbitMQ Configuration
 RABBITMQ_HOST = config("RABBITMQ_HOST")
 RABBITMQ_PORT = config("RABBITMQ_PORT", cast=int)
@@ -176,6 +191,20 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    'precompute-recommendations': {
+        'task': 'infrastructure.tasks.recommendation_tasks.precompute_recommendations',
+        'schedule': crontab(hour=3, minute=0),
+    },
+    'flush-view-counts': {
+        'task': 'infrastructure.tasks.search_tasks.flush_view_counts',
+        'schedule': 5.0,
+    },
+    'decay-trending-ranks': {
+        'task': 'infrastructure.tasks.search_tasks.decay_trending_ranks',
+        'schedule': 600.0,  # SearchRankingService.DECAY_INTERVAL
+    },
+}
 
 # REST Framework Configuration
 REST_FRAMEWORK = {
@@ -0,0 +1,96 @@
+import random
+import statistics
+import time
+import uuid
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from application.search_service import EventSearchService
+from domain.search_index import EventSearchIndex
+
+
+WORDS = [
+    'tech', 'music', 'festival', 'conference', 'summit', 'python', 'data', 'cloud',
+    'jazz', 'rock', 'startup', 'design', 'marketing', 'food', 'wine', 'yoga',
+    'marathon', 'film', 'art', 'science', 'health', 'finance', 'gaming', 'security',
+    'workshop', 'meetup', 'expo', 'night', 'summer', 'winter', 'annual', 'global',
+]
+CATEGORIES = ['Technology', 'Music', 'Business', 'Arts', 'Sports', 'Food', 'Health']
+CITIES = ['San Francisco', 'New York', 'London', 'Berlin', 'Tokyo', 'Kathmandu', 'Sydney']
+
+QUERIES = ['tech', 'music festival', 'pyth', 'conferenc', 'jaz nigth', 'data cloud summit']
+
+
+class Command(BaseCommand):
+    """Benchmark ranked full-text search against a large synthetic index."""
+    
+    help = 'Seed EventSearchIndex with synthetic events and time search queries (PostgreSQL only)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=1_000_000, help='Indexed events to seed')
+        parser.add_argument('--batch-size', type=int, default=10_000, help='Rows per bulk insert')
+        parser.add_argument('--runs', type=int, default=20, help='Timed runs per query')
+        parser.add_argument('--pages', type=int, default=5, help='Cursor pages fetched per query')
+        parser.add_argument('--skip-seed', action='store_true', help='Reuse the rows already indexed')
+        parser.add_argument('--explain', action='store_true', help='Print the plan of the first page')
+    
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Full-text search benchmarks need PostgreSQL')
+        
+        if not options['skip_seed']:
+            self._seed(options['events'], options['batch_size'])
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE event_search_index')
+        
+        service = EventSearchService()
+        for query in QUERIES:
+            first_page, deep_pages = [], []
+            for _ in range(options['runs']):
+                cursor = None
+                for page_number in range(options['pages']):
+                    start = time.perf_counter()
+                    page = service.search(query, limit=50, cursor=cursor)
+                    elapsed = (time.perf_counter() - start) * 1000
+                    (first_page if page_number == 0 else deep_pages).append(elapsed)
+                    cursor = page['next_cursor']
+                    if cursor is None:
+                        break
+            self.stdout.write(
+                f"{query!r}: first page p50={statistics.median(first_page):.1f}ms "
+                f"p95={self._p95(first_page):.1f}ms; "
+                f"next pages p50={statistics.median(deep_pages or [0]):.1f}ms "
+                f"p95={self._p95(deep_pages or [0]):.1f}ms"
+            )
+            if options['explain']:
+                queryset = EventSearchIndex.objects.filter(is_published=True)
+                queryset = service._full_text(queryset, query).order_by('-score', '-id')[:51]
+                self.stdout.write(queryset.explain(analyze=True))
+    
+    def _seed(self, count: int, batch_size: int) -> None:
+        rng = random.Random(42)
+        created = 0
+        while created < count:
+            size = min(batch_size, count - created)
+            EventSearchIndex.objects.bulk_create([
+                EventSearchIndex(
+                    event_id=uuid.uuid4(),
+                    title=' '.join(rng.sample(WORDS, 3)).title(),
+                    description=' '.join(rng.choices(WORDS, k=30)),
+                    category=rng.choice(CATEGORIES),
+                    tags=rng.sample(WORDS, 3),
+                    city=rng.choice(CITIES),
+                    status='published',
+                    is_published=rng.random() < 0.9,
+                    search_rank=round(rng.expovariate(0.1), 2),
+                    view_count=rng.randint(0, 5000),
+                )
+                for _ in range(size)
+            ], batch_size=size)
+            created += size
+            self.stdout.write(f"seeded {created}/{count}")
+    
+    @staticmethod
+    def _p95(samples) -> float:
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
@@ -0,0 +1,101 @@
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+import numpy as np
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from domain.geohash import EARTH_RADIUS_KM, bounding_box
+from domain.location import EventLocation
+from infrastructure.services.snapshot_registry import SnapshotRegistry
+
+
+# (event_id, city, country, latitude, longitude)
+LocationRow = Tuple[Any, str, str, float, float]
+
+LOCATION_FIELDS = ('event_id', 'city', 'country', 'latitude', 'longitude')
+
+
+def haversine_km(latitude: float, longitude: float,
+                 latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Great-circle distances from one point to many, in km."""
+    lat1 = np.radians(latitude)
+    lat2 = np.radians(latitudes)
+    dlat = lat2 - lat1
+    dlon = np.radians(longitudes - longitude)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class LocationIndex:
+    """Event locations as NumPy arrays sorted by latitude.
+    
+    A radius query binary-searches the latitude band of its bounding box,
+    masks that band by longitude and computes distances for what is left
+    in one vectorized pass.
+    """
+    
+    def __init__(self, rows: Iterable[LocationRow], version: int = 0):
+        self.version = version
+        self.built_at = time.monotonic()
+        rows = list(rows)
+        latitudes = np.fromiter((row[3] for row in rows), dtype=np.float64, count=len(rows))
+        order = np.argsort(latitudes, kind='stable')
+        self.rows = [rows[i] for i in order.tolist()]
+        self.latitudes = latitudes[order]
+        self.longitudes = np.fromiter((row[4] for row in self.rows), dtype=np.float64, count=len(rows))
+    
+    def __len__(self) -> int:
+        return len(self.rows)
+    
+    def search(self, latitude: float, longitude: float, radius_km: float) -> List[Dict[str, Any]]:
+        """Locations within `radius_km`, nearest first."""
+        if radius_km < 0 or not self.rows:
+            return []
+        min_lat, max_lat, lon_ranges = bounding_box(latitude, longitude, radius_km)
+        start = int(np.searchsorted(self.latitudes, min_lat, side='left'))
+        end = int(np.searchsorted(self.latitudes, max_lat, side='right'))
+        
+        longitudes = self.longitudes[start:end]
+        in_box = np.zeros(len(longitudes), dtype=bool)
+        for min_lon, max_lon in lon_ranges:
+            in_box |= (longitudes >= min_lon) & (longitudes <= max_lon)
+        candidates = start + np.flatnonzero(in_box)
+        
+        distances = haversine_km(latitude, longitude, self.latitudes[candidates], self.longitudes[candidates])
+        within = np.flatnonzero(distances <= radius_km)
+        within = within[np.argsort(distances[within], kind='stable')]
+        
+        results = []
+        for position, distance in zip(candidates[within].tolist(), distances[within].tolist()):
+            event_id, city, country, lat, lon = self.rows[position]
+            results.append({
+                'event_id': str(event_id),
+                'city': city,
+                'country': country,
+                'latitude': lat,
+                'longitude': lon,
+                'distance_km': round(distance, 2),
+            })
+        return results
+
+
+class LocationIndexRegistry(SnapshotRegistry):
+    """Process-wide snapshot of every event location.
+    
+    Saving or deleting a location bumps the version once the change
+    commits; see SnapshotRegistry for rebuilds and expiry.
+    """
+    
+    VERSION_KEY = 'locations:version'
+    
+    @classmethod
+    def _build(cls, version: int) -> LocationIndex:
+        rows = EventLocation.objects.order_by().values_list(*LOCATION_FIELDS).iterator(chunk_size=5000)
+        return LocationIndex(rows, version)
+
+
+@receiver(post_save, sender=EventLocation)
+@receiver(post_delete, sender=EventLocation)
+def _location_changed(sender, instance, **kwargs):
+    transaction.on_commit(LocationIndexRegistry.invalidate)
@@ -0,0 +1,43 @@
+import json
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+import uuid
+from django.core.cache import cache
+
+
+class RecommendationCacheService:
+    """Service for caching each user's top recommendations.
+    
+    Keys carry the catalog version and the time the user's preferences were
+    last saved, so either changing makes old entries unreachable.
+    """
+    
+    CACHE_TIMEOUT = 3600  # 1 hour
+    
+    def get(self, user_id: uuid.UUID, catalog_version: int,
+            preferences_updated_at: datetime) -> Optional[List[Dict[str, Any]]]:
+        """Get cached recommendations."""
+        data = cache.get(self._generate_key(user_id, catalog_version, preferences_updated_at))
+        if data:
+            return json.loads(data)
+        return None
+    
+    def set(self, user_id: uuid.UUID, catalog_version: int, preferences_updated_at: datetime,
+            recommendations: List[Dict[str, Any]], timeout: int = CACHE_TIMEOUT) -> None:
+        """Cache recommendations for one user."""
+        key = self._generate_key(user_id, catalog_version, preferences_updated_at)
+        cache.set(key, json.dumps(recommendations), timeout=timeout)
+    
+    def set_many(self, catalog_version: int, entries: List[tuple], timeout: int = CACHE_TIMEOUT) -> None:
+        """Cache recommendations for many users.
+        
+        `entries` holds (user_id, preferences_updated_at, recommendations).
+        """
+        cache.set_many({
+            self._generate_key(user_id, catalog_version, updated_at): json.dumps(recommendations)
+            for user_id, updated_at, recommendations in entries
+        }, timeout=timeout)
+    
+    def _generate_key(self, user_id: uuid.UUID, catalog_version: int, preferences_updated_at: datetime) -> str:
+        """Generate cache key."""
+        return f"recommendations:{user_id}:{catalog_version}:{preferences_updated_at.timestamp()}"
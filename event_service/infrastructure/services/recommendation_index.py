@@ -0,0 +1,178 @@
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+import numpy as np
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from domain.recommendation import UserPreference
+from domain.search_index import EventSearchIndex
+from infrastructure.services.snapshot_registry import SnapshotRegistry
+
+
+# Same weights as RecommendationScore.calculate_total_score
+CATEGORY_WEIGHT = 0.3
+TAG_WEIGHT = 0.25
+CITY_WEIGHT = 0.25
+MAX_POPULARITY = 0.2
+
+# Saves touching only these fields do not change what is recommended, only
+# how popular it is, which the periodic rebuild picks up.
+POPULARITY_FIELDS = frozenset({'view_count', 'search_rank', 'updated_at'})
+
+EMPTY = np.empty(0, dtype=np.int32)
+
+
+class RecommendationIndex:
+    """Immutable snapshot of the published catalog for scoring.
+    
+    Events are numbered by position. Inverted indexes map each category,
+    tag and city to a sorted array of positions, and popularity is a float
+    array over all positions. Scoring a user only touches the postings of
+    their preferences plus the `limit` most popular events.
+    """
+    
+    def __init__(self, version: int, rows: Iterable[Tuple[Any, str, str, str, Any, int]]):
+        self.version = version
+        self.built_at = time.monotonic()
+        self.event_ids: List[str] = []
+        self.titles: List[str] = []
+        self.categories: List[str] = []
+        self.cities: List[str] = []
+        self.tags: List[frozenset] = []
+        view_counts: List[int] = []
+        by_category: Dict[str, List[int]] = {}
+        by_tag: Dict[str, List[int]] = {}
+        by_city: Dict[str, List[int]] = {}
+        
+        for position, (event_id, title, category, city, tags, view_count) in enumerate(rows):
+            tags = frozenset(tags or [])
+            self.event_ids.append(str(event_id))
+            self.titles.append(title)
+            self.categories.append(category)
+            self.cities.append(city)
+            self.tags.append(tags)
+            view_counts.append(view_count)
+            by_category.setdefault(category, []).append(position)
+            by_city.setdefault(city, []).append(position)
+            for tag in tags:
+                by_tag.setdefault(tag, []).append(position)
+        
+        self.by_category = self._freeze(by_category)
+        self.by_tag = self._freeze(by_tag)
+        self.by_city = self._freeze(by_city)
+        self.popularity = np.minimum(np.asarray(view_counts, dtype=np.float64) / 1000, MAX_POPULARITY)
+        popular = np.argsort(-self.popularity, kind='stable').astype(np.int32)
+        self.popular = popular[self.popularity[popular] > 0]
+    
+    @staticmethod
+    def _freeze(postings: Dict[str, List[int]]) -> Dict[str, np.ndarray]:
+        return {key: np.asarray(positions, dtype=np.int32) for key, positions in postings.items()}
+    
+    @staticmethod
+    def _lookup(postings: Dict[str, np.ndarray], keys: Iterable[str]) -> np.ndarray:
+        arrays = [postings[key] for key in keys if key in postings]
+        return np.concatenate(arrays) if arrays else EMPTY
+    
+    def __len__(self) -> int:
+        return len(self.event_ids)
+    
+    def recommend(self, pref: UserPreference, limit: int) -> List[Dict[str, Any]]:
+        """Top `limit` events for a user, best first."""
+        if limit <= 0:
+            return []
+        categories = set(pref.preferred_categories)
+        tags = set(pref.preferred_tags)
+        cities = set(pref.preferred_cities)
+        
+        # Any event outside the matched postings scores on popularity alone,
+        # so only the `limit` most popular of them can make the cut.
+        segments = [
+            self._lookup(self.by_category, categories),
+            self._lookup(self.by_tag, tags),
+            self._lookup(self.by_city, cities),
+            self.popular[:limit],
+        ]
+        positions = np.concatenate(segments)
+        if not positions.size:
+            return []
+        candidates, inverse = np.unique(positions, return_inverse=True)
+        bounds = np.cumsum([len(segment) for segment in segments])
+        
+        def hits(start: int, end: int) -> np.ndarray:
+            return np.bincount(inverse[start:end], minlength=len(candidates))
+        
+        scores = (
+            CATEGORY_WEIGHT * hits(0, bounds[0])
+            + TAG_WEIGHT * hits(bounds[0], bounds[1]) / max(len(pref.preferred_tags), 1)
+            + CITY_WEIGHT * hits(bounds[1], bounds[2])
+            + self.popularity[candidates]
+        )
+        
+        keep = np.flatnonzero(scores > 0)
+        if keep.size > limit:
+            keep = keep[np.argpartition(-scores[keep], limit - 1)[:limit]]
+        keep = keep[np.lexsort((candidates[keep], -scores[keep]))]
+        
+        return [
+            {
+                'event_id': self.event_ids[position],
+                'title': self.titles[position],
+                'category': self.categories[position],
+                'score': round(float(score), 2),
+                'reason': self._reason(position, categories, tags, cities),
+            }
+            for position, score in zip(candidates[keep].tolist(), scores[keep].tolist())
+        ]
+    
+    def _reason(self, position: int, categories: set, tags: set, cities: set) -> str:
+        """Explain why an event was recommended."""
+        reasons = []
+        
+        category = self.categories[position]
+        if category in categories:
+            reasons.append(f"Matches your interest in {category}")
+        
+        matching_tags = self.tags[position] & tags
+        if matching_tags:
+            reasons.append(f"Tagged with {', '.join(sorted(matching_tags)[:2])}")
+        
+        city = self.cities[position]
+        if city in cities:
+            reasons.append(f"In your preferred city {city}")
+        
+        return '; '.join(reasons) if reasons else "Popular event"
+
+
+class RecommendationIndexRegistry(SnapshotRegistry):
+    """Process-wide recommendation index.
+    
+    The catalog version is bumped once a search index row is created,
+    deleted or edited and the change commits, so no process rebuilds from
+    rows it cannot see yet. Popularity-only changes do not bump it and are
+    picked up by the MAX_AGE rebuild; see SnapshotRegistry.
+    """
+    
+    VERSION_KEY = 'recommendations:catalog_version'
+    
+    @classmethod
+    def _build(cls, version: int) -> RecommendationIndex:
+        return RecommendationIndex(version, cls._load())
+    
+    @staticmethod
+    def _load():
+        return EventSearchIndex.objects.filter(is_published=True).order_by('id').values_list(
+            'event_id', 'title', 'category', 'city', 'tags', 'view_count'
+        ).iterator(chunk_size=5000)
+
+
+@receiver(post_save, sender=EventSearchIndex)
+def _catalog_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields and POPULARITY_FIELDS.issuperset(update_fields):
+        return
+    transaction.on_commit(RecommendationIndexRegistry.invalidate)
+
+
+@receiver(post_delete, sender=EventSearchIndex)
+def _catalog_deleted(sender, instance, **kwargs):
+    transaction.on_commit(RecommendationIndexRegistry.invalidate)
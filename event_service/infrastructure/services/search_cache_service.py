@@ -1,55 +1,248 @@
+import hashlib
 import json
-from typing import List, Dict, Any
+import math
+import random
+import time
+from typing import List, Dict, Any, Callable, Iterable, Optional, Tuple
 from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
 
 from domain.search_index import EventSearchIndex
 
 
+RESULT_FIELDS = (
+    'event_id', 'title', 'description', 'category', 'tags',
+    'location', 'city', 'status', 'search_rank', 'view_count',
+    'event_date', 'created_at',
+)
+
+# Saves touching only these fields reorder results slightly but never change
+# which events match, so they are left to expire with CACHE_TIMEOUT.
+RANK_FIELDS = frozenset({'view_count', 'search_rank', 'updated_at'})
+
+
 class SearchCacheService:
-    """Service for caching search results."""
+    """Service for caching search results.
+    
+    Keys embed generation counters for the scope a query reads: the
+    category and/or city it filters on, or 'all' when unfiltered, plus a
+    global generation. Changing an indexed event bumps the counters of the
+    category and city it moved from and to, and 'all', once the change
+    commits, so only affected entries become unreachable and none is
+    recomputed from rows the change has not committed yet.
+    
+    get_or_compute() lets one caller per key rebuild a missing entry while
+    the others wait for it, and refreshes hot entries shortly before they
+    expire with a probability that grows as expiry nears (XFetch), so
+    popular queries never all miss at once.
+    """
     
     CACHE_TIMEOUT = 300  # 5 minutes
+    LOCK_TIMEOUT = 10
+    LOCK_WAIT = 2.0
+    LOCK_POLL_INTERVAL = 0.05
+    EARLY_REFRESH_BETA = 1.0
     
-    def cache_results(self, query: str, filters: Dict[str, Any], 
-                     results: List[EventSearchIndex]) -> None:
-        """Cache search results."""
-        key = self._generate_key(query, filters)
-        data = [
-            {
-                'event_id': str(r.event_id),
-                'title': r.title,
-                'description': r.description,
-                'category': r.category,
-                'city': r.city,
-                'search_rank': r.search_rank,
-            }
-            for r in results
-        ]
-        cache.set(key, json.dumps(data), timeout=self.CACHE_TIMEOUT)
+    GENERATION_PREFIX = 'search:gen:'
+    METRICS_PREFIX = 'search:metrics:'
+    METRICS = ('hits', 'misses', 'refreshes', 'waits', 'compute_count', 'compute_ms')
+    
+    def cache_results(self, query: str, filters: Dict[str, Any],
+                     results: List[EventSearchIndex], next_cursor: Optional[str] = None) -> None:
+        """Cache a page of search results."""
+        page = {'results': self.serialize(results), 'next_cursor': next_cursor}
+        self._store(self._generate_key(query, filters), page, 0.0)
     
     def get_cached_results(self, query: str, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Get cached search results."""
-        key = self._generate_key(query, filters)
-        data = cache.get(key)
-        if data:
-            return json.loads(data)
-        return None
+        page = self.get_cached_page(query, filters)
+        return page['results'] if page else None
+    
+    def get_cached_page(self, query: str, filters: Dict[str, Any]) -> Dict[str, Any]:
+        """Get a cached page: {'results': [...], 'next_cursor': ...}."""
+        entry = self._load(self._generate_key(query, filters))
+        return entry['value'] if entry else None
+    
+    def get_or_compute(self, query: str, filters: Dict[str, Any], compute: Callable[[], Any],
+                       namespace: str = 'search') -> Tuple[Any, bool]:
+        """Cached value for (query, filters), computing it once on a miss.
+        
+        Returns (value, cached). `compute` must return JSON-serializable data.
+        """
+        key = self._generate_key(query, filters, namespace)
+        entry = self._load(key)
+        if entry is not None:
+            if self._should_refresh(entry) and self._acquire(key):
+                self._record('refreshes')
+                return self._compute_and_store(key, compute), False
+            self._record('hits')
+            return entry['value'], True
+        
+        self._record('misses')
+        if self._acquire(key):
+            return self._compute_and_store(key, compute), False
+        
+        # Someone else is computing this entry: wait for it rather than
+        # sending the same query to the database.
+        self._record('waits')
+        deadline = time.monotonic() + self.LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(self.LOCK_POLL_INTERVAL)
+            entry = self._load(key)
+            if entry is not None:
+                return entry['value'], True
+        return compute(), False
     
     def invalidate_cache(self, query: str = None) -> None:
         """Invalidate search cache."""
         if query:
             # Invalidate specific query
-            key = self._generate_key(query, {})
-            cache.delete(key)
+            cache.delete(self._generate_key(query, {}))
         else:
-            # Clear all search cache (would need pattern matching in production)
-            pass
+            self.bump_generations(['global'])
+    
+    def invalidate_scope(self, categories: Iterable[str] = (), cities: Iterable[str] = ()) -> None:
+        """Invalidate unfiltered queries and those filtered by these values."""
+        scopes = ['all']
+        scopes += [f'category:{category}' for category in set(categories)]
+        scopes += [f'city:{city}' for city in set(cities)]
+        self.bump_generations(scopes)
+    
+    def bump_generations(self, scopes: List[str]) -> None:
+        for scope in scopes:
+            self._incr(self._generation_key(scope), initial=self._fresh_generation())
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Hit/miss counters and average compute latency since the last reset."""
+        values = cache.get_many([self.METRICS_PREFIX + name for name in self.METRICS])
+        metrics = {name: int(values.get(self.METRICS_PREFIX + name, 0)) for name in self.METRICS}
+        lookups = metrics['hits'] + metrics['misses'] + metrics['refreshes']
+        compute_ms = metrics.pop('compute_ms')
+        metrics['hit_rate'] = round(metrics['hits'] / lookups, 4) if lookups else 0.0
+        metrics['avg_compute_ms'] = round(compute_ms / metrics['compute_count'], 2) if metrics['compute_count'] else 0.0
+        return metrics
+    
+    def reset_metrics(self) -> None:
+        cache.delete_many([self.METRICS_PREFIX + name for name in self.METRICS])
+    
+    @staticmethod
+    def serialize(results: List[EventSearchIndex]) -> List[Dict[str, Any]]:
+        """Search results as JSON-ready dicts."""
+        encoder = DjangoJSONEncoder()
+        serialized = []
+        for result in results:
+            data = {}
+            for field in RESULT_FIELDS:
+                value = getattr(result, field)
+                if value is not None and not isinstance(value, (str, int, float, list)):
+                    value = encoder.default(value)
+                data[field] = value
+            serialized.append(data)
+        return serialized
+    
+    def _compute_and_store(self, key: str, compute: Callable[[], Any]) -> Any:
+        try:
+            started = time.monotonic()
+            value = compute()
+            elapsed = time.monotonic() - started
+            self._store(key, value, elapsed)
+            self._record('compute_count')
+            self._record('compute_ms', int(elapsed * 1000))
+            return value
+        finally:
+            cache.delete(f"{key}:lock")
+    
+    def _store(self, key: str, value: Any, compute_seconds: float) -> None:
+        entry = {
+            'value': value,
+            'expires_at': time.time() + self.CACHE_TIMEOUT,
+            'compute_seconds': compute_seconds,
+        }
+        cache.set(key, json.dumps(entry), timeout=self.CACHE_TIMEOUT)
     
-    def _generate_key(self, query: str, filters: Dict[str, Any]) -> str:
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        data = cache.get(key)
+        if data:
+            return json.loads(data)
+        return None
+    
+    def _should_refresh(self, entry: Dict[str, Any]) -> bool:
+        """XFetch: refresh early with probability rising towards expiry."""
+        jitter = -math.log(1.0 - random.random())
+        early = entry['compute_seconds'] * self.EARLY_REFRESH_BETA * jitter
+        return time.time() + early >= entry['expires_at']
+    
+    def _acquire(self, key: str) -> bool:
+        return cache.add(f"{key}:lock", 1, timeout=self.LOCK_TIMEOUT)
+    
+    def _record(self, metric: str, amount: int = 1) -> None:
+        self._incr(self.METRICS_PREFIX + metric, amount)
+    
+    @staticmethod
+    def _incr(key: str, amount: int = 1, initial: Optional[int] = None) -> None:
+        try:
+            cache.incr(key, amount)
+        except ValueError:
+            if not cache.add(key, amount if initial is None else initial, timeout=None):
+                cache.incr(key, amount)
+    
+    @staticmethod
+    def _fresh_generation() -> int:
+        # A counter lost to eviction restarts above any value it had before,
+        # so old entries can never become reachable again.
+        return time.time_ns() // 1000
+    
+    def _generations(self, filters: Dict[str, Any]) -> List[int]:
+        scopes = ['global']
+        if filters and filters.get('category'):
+            scopes.append(f"category:{filters['category']}")
+        if filters and filters.get('city'):
+            scopes.append(f"city:{filters['city']}")
+        if len(scopes) == 1:
+            scopes.append('all')
+        keys = [self._generation_key(scope) for scope in scopes]
+        values = cache.get_many(keys)
+        for key in keys:
+            if key not in values:
+                cache.add(key, self._fresh_generation(), timeout=None)
+                values[key] = cache.get(key, 0)
+        return [int(values[key]) for key in keys]
+    
+    def _generation_key(self, scope: str) -> str:
+        # Category and city names may contain spaces
+        return self.GENERATION_PREFIX + hashlib.md5(scope.encode()).hexdigest()
+    
+    def _generate_key(self, query: str, filters: Dict[str, Any], namespace: str = 'search') -> str:
         """Generate cache key."""
-        import hashlib
         filter_str = json.dumps(filters, sort_keys=True) if filters else ''
+        generations = '.'.join(str(generation) for generation in self._generations(filters))
         # Create a hash to avoid special characters
-        key_content = f"{query}:{filter_str}"
+        key_content = f"{namespace}:{query}:{filter_str}:{generations}"
         key_hash = hashlib.md5(key_content.encode()).hexdigest()
         return f"search_{key_hash}"
+
+
+@receiver(post_init, sender=EventSearchIndex)
+def _remember_scope(sender, instance, **kwargs):
+    # Read from __dict__ so deferred fields are not loaded
+    instance._search_scope = (instance.__dict__.get('category'), instance.__dict__.get('city'))
+
+
+@receiver(post_save, sender=EventSearchIndex)
+def _index_saved(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields and RANK_FIELDS.issuperset(update_fields):
+        return
+    old_category, old_city = getattr(instance, '_search_scope', (None, None))
+    categories = {instance.category} | ({old_category} if old_category is not None else set())
+    cities = {instance.city} | ({old_city} if old_city is not None else set())
+    transaction.on_commit(lambda: SearchCacheService().invalidate_scope(categories, cities))
+    instance._search_scope = (instance.category, instance.city)
+
+
+@receiver(post_delete, sender=EventSearchIndex)
+def _index_deleted(sender, instance, **kwargs):
+    categories, cities = [instance.category], [instance.city]
+    transaction.on_commit(lambda: SearchCacheService().invalidate_scope(categories, cities))
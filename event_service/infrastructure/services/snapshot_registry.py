@@ -0,0 +1,78 @@
+import threading
+import time
+from typing import Any, Optional
+from django.core.cache import cache
+
+
+class SnapshotRegistry:
+    """Process-wide in-memory snapshot keyed by a version in the shared cache.
+    
+    invalidate() bumps the version, and every process rebuilds on its next
+    get(). Rows changed in bulk send no signals, so a snapshot is also
+    rebuilt once it is MAX_AGE seconds old. Subclasses set VERSION_KEY and
+    implement _build(version); snapshots must carry `version` and
+    `built_at` (a time.monotonic() reading).
+    """
+    
+    VERSION_KEY: str = ''
+    MAX_AGE = 300
+    
+    _index: Optional[Any] = None
+    _lock = threading.Lock()
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Each registry holds its own snapshot and build lock
+        cls._index = None
+        cls._lock = threading.Lock()
+    
+    @classmethod
+    def version(cls) -> int:
+        """Current version."""
+        version = cache.get(cls.VERSION_KEY)
+        if version is None:
+            cache.add(cls.VERSION_KEY, cls._fresh_version(), timeout=None)
+            version = cache.get(cls.VERSION_KEY, 0)
+        return int(version)
+    
+    @classmethod
+    def get(cls):
+        """Snapshot for the current version, building it if needed."""
+        version = cls.version()
+        index = cls._index
+        if index is not None and index.version == version and not cls._expired(index):
+            return index
+        
+        with cls._lock:
+            index = cls._index
+            if index is None or index.version != version or cls._expired(index):
+                index = cls._build(version)
+                cls._index = index
+        return index
+    
+    @classmethod
+    def _build(cls, version: int):
+        raise NotImplementedError
+    
+    @classmethod
+    def _expired(cls, index) -> bool:
+        return time.monotonic() - index.built_at > cls.MAX_AGE
+    
+    @staticmethod
+    def _fresh_version() -> int:
+        # Seeded from the clock so a counter lost to eviction never comes
+        # back at a value an old snapshot was built with.
+        return time.time_ns() // 1000
+    
+    @classmethod
+    def invalidate(cls) -> None:
+        """Bump the version so every process rebuilds its snapshot."""
+        try:
+            cache.incr(cls.VERSION_KEY)
+        except ValueError:
+            cache.add(cls.VERSION_KEY, cls._fresh_version(), timeout=None)
+    
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._index = None
@@ -0,0 +1,57 @@
+from typing import Dict
+import uuid
+import redis
+from django.conf import settings
+
+
+# KEYS: pending hash
+# Returns the hash as a flat [field, value, ...] list and clears it in the
+# same step, so views recorded meanwhile land in the next batch.
+DRAIN_SCRIPT = """
+local pending = redis.call('HGETALL', KEYS[1])
+redis.call('DEL', KEYS[1])
+return pending
+"""
+
+
+class ViewCounterService:
+    """Service for buffering event page views in Redis.
+    
+    Each view is one HINCRBY on a shared hash, so recording never touches
+    the database. A periodic flush drains the hash and applies the counts
+    in bulk.
+    """
+    
+    PENDING_KEY = 'search:views:pending'
+    
+    def __init__(self):
+        self.redis_client = redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            password=settings.REDIS_PASSWORD if settings.REDIS_PASSWORD else None,
+            decode_responses=True
+        )
+        self._drain = self.redis_client.register_script(DRAIN_SCRIPT)
+    
+    def record(self, event_id: uuid.UUID, count: int = 1) -> None:
+        """Buffer `count` views of an event."""
+        self.redis_client.hincrby(self.PENDING_KEY, str(event_id), count)
+    
+    def pending(self, event_id: uuid.UUID) -> int:
+        """Views buffered for an event and not yet flushed."""
+        return int(self.redis_client.hget(self.PENDING_KEY, str(event_id)) or 0)
+    
+    def drain(self) -> Dict[uuid.UUID, int]:
+        """Take every buffered count, leaving the buffer empty."""
+        flat = self._drain(keys=[self.PENDING_KEY])
+        return {uuid.UUID(event_id): int(count) for event_id, count in zip(flat[::2], flat[1::2])}
+    
+    def restore(self, counts: Dict[uuid.UUID, int]) -> None:
+        """Put drained counts back, e.g. after a failed flush."""
+        if not counts:
+            return
+        pipeline = self.redis_client.pipeline(transaction=False)
+        for event_id, count in counts.items():
+            pipeline.hincrby(self.PENDING_KEY, str(event_id), count)
+        pipeline.execute()
@@ -0,0 +1,3 @@
+from infrastructure.tasks.event_tasks import auto_complete_events, cleanup_old_drafts
+from infrastructure.tasks.recommendation_tasks import precompute_recommendations
+from infrastructure.tasks.search_tasks import decay_trending_ranks, flush_view_counts
@@ -0,0 +1,26 @@
+from datetime import timedelta
+from celery import shared_task
+from django.utils import timezone
+
+from domain.recommendation import UserPreference
+from application.recommendation_service import EventRecommendationService
+
+
+@shared_task
+def precompute_recommendations(active_days: int = 30, batch_size: int = 1000):
+    """Warm the recommendation cache for users active in the last `active_days`."""
+    service = EventRecommendationService()
+    cutoff = timezone.now() - timedelta(days=active_days)
+    preferences = UserPreference.objects.filter(updated_at__gte=cutoff).order_by().iterator(chunk_size=batch_size)
+    
+    users = 0
+    batch = []
+    for pref in preferences:
+        batch.append(pref)
+        if len(batch) >= batch_size:
+            users += service.precompute(batch)
+            batch = []
+    if batch:
+        users += service.precompute(batch)
+    
+    return f"Precomputed recommendations for {users} users"
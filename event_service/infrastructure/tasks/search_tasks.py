@@ -0,0 +1,17 @@
+from celery import shared_task
+
+from application.search_service import SearchRankingService
+
+
+@shared_task
+def flush_view_counts():
+    """Apply page views buffered in Redis to the search index."""
+    result = SearchRankingService().flush_view_counts()
+    return f"Flushed {result['views']} views for {result['events']} events"
+
+
+@shared_task
+def decay_trending_ranks():
+    """Age trending scores; scheduled every SearchRankingService.DECAY_INTERVAL."""
+    updated = SearchRankingService().decay_trending()
+    return f"Decayed trending scores for {updated} events"
@@ -22,6 +22,7 @@ from presentation.views.search_views import (
     search_events,
     get_search_filters,
     get_search_suggestions,
+    get_search_cache_metrics,
 )
 from presentation.views.category_views import (
     manage_categories,
@@ -92,6 +93,7 @@ urlpatterns = [
     path('search/', search_events, name='search_events'),
     path('search/filters/', get_search_filters, name='get_search_filters'),
     path('search/suggestions/', get_search_suggestions, name='get_search_suggestions'),
+    path('search/cache/metrics/', get_search_cache_metrics, name='get_search_cache_metrics'),
     path('search/analytics/', get_search_analytics, name='get_search_analytics'),
     path('search/performance/', get_search_performance, name='get_search_performance'),
     path('search/popular/', get_popular_searches, name='get_popular_searches'),
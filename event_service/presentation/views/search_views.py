@@ -1,3 +1,4 @@
+from django.core.exceptions import ValidationError
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
@@ -7,10 +8,7 @@ from application.search_service import (
     SearchFilterService,
 )
 from infrastructure.services.search_cache_service import SearchCacheService
-from presentation.serializers.search_serializers import (
-    EventSearchResultSerializer,
-    SearchFiltersSerializer,
-)
+from presentation.serializers.search_serializers import SearchFiltersSerializer
 
 
 @api_view(['GET'])
@@ -19,6 +17,12 @@ def search_events(request):
     query = request.GET.get('q', '')
     category = request.GET.get('category')
     city = request.GET.get('city')
+    cursor = request.GET.get('cursor')
+    
+    try:
+        limit = int(request.GET.get('limit', EventSearchService.DEFAULT_LIMIT))
+    except ValueError:
+        return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
     
     filters = {}
     if category:
@@ -26,29 +30,17 @@ def search_events(request):
     if city:
         filters['city'] = city
     
-    # Check cache first
-    cache_service = SearchCacheService()
-    cached = cache_service.get_cached_results(query, filters)
-    
-    if cached:
-        return Response({
-            'results': cached,
-            'count': len(cached),
-            'cached': True
-        })
-    
-    # Perform search
     search_service = EventSearchService()
-    results = search_service.execute(query, filters)
+    try:
+        page = search_service.search_cached(query, filters, limit=limit, cursor=cursor)
+    except ValidationError as e:
+        return Response({'error': e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
     
-    # Cache results
-    cache_service.cache_results(query, filters, results)
-    
-    serializer = EventSearchResultSerializer(results, many=True)
     return Response({
-        'results': serializer.data,
-        'count': len(results),
-        'cached': False
+        'results': page['results'],
+        'count': len(page['results']),
+        'next_cursor': page['next_cursor'],
+        'cached': page['cached']
     })
 
 
@@ -72,7 +64,7 @@ def get_search_suggestions(request):
     
     # Get top 5 matching titles
     search_service = EventSearchService()
-    results = search_service.execute(query)[:5]
+    results = search_service.execute(query, limit=5)
     
     suggestions = [
         {
@@ -84,3 +76,9 @@ def get_search_suggestions(request):
     ]
     
     return Response({'suggestions': suggestions})
+
+
+@api_view(['GET'])
+def get_search_cache_metrics(request):
+    """Get search cache hit/miss counters and compute latency."""
+    return Response(SearchCacheService().get_metrics())
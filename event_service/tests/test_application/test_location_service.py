@@ -1,5 +1,5 @@
 import uuid
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from domain.location import EventLocation
 from application.location_service import (
@@ -7,6 +7,7 @@ from application.location_service import (
     NearbyEventsService,
     GeoFilterService,
 )
+from infrastructure.services.location_index import LocationIndexRegistry
 
 
 class LocationSearchServiceTest(TestCase):
@@ -38,6 +39,40 @@ class LocationSearchServiceTest(TestCase):
         
         self.assertEqual(len(nearby), 2)
         self.assertLess(nearby[0]['distance_km'], nearby[1]['distance_km'])
+    
+    def test_search_nearby_excludes_distant_events(self):
+        """Test that events outside the radius are not returned."""
+        service = LocationSearchService()
+        nearby = service.search_nearby(37.7749, -122.4194, radius_km=5.0)
+        
+        self.assertEqual([r['city'] for r in nearby], ['San Francisco'])
+    
+    def test_search_nearby_finds_rows_without_geohash(self):
+        """Test that bulk-created rows are still found by bounding box."""
+        EventLocation.objects.bulk_create([EventLocation(
+            event_id=uuid.uuid4(),
+            address='1 Market St',
+            city='San Francisco',
+            country='USA',
+            latitude=37.7946,
+            longitude=-122.3950,
+        )])
+        
+        service = LocationSearchService()
+        nearby = service.search_nearby(37.7749, -122.4194, radius_km=5.0)
+        
+        self.assertEqual(len(nearby), 2)
+    
+    @override_settings(LOCATION_INDEX_IN_MEMORY=True)
+    def test_search_nearby_in_memory(self):
+        """Test that the in-memory snapshot gives the same results."""
+        expected = LocationSearchService().search_nearby(37.7749, -122.4194, radius_km=20.0)
+        
+        with self.assertNumQueries(1):
+            LocationIndexRegistry.clear()
+            nearby = LocationSearchService().search_nearby(37.7749, -122.4194, radius_km=20.0)
+        
+        self.assertEqual(nearby, expected)
 
 
 class NearbyEventsServiceTest(TestCase):
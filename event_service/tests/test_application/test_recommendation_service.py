@@ -87,3 +87,51 @@ class SimilarEventsServiceTest(TestCase):
         similar = service.find_similar(event1.event_id, limit=5)
         
         self.assertEqual(len(similar), 1)
+
+
+class RecommendationCachingTest(TestCase):
+    """Tests for cached recommendations."""
+    
+    def setUp(self):
+        self.user_id = uuid.uuid4()
+        UserPreference.objects.create(user_id=self.user_id, preferred_categories=['Technology'])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tech = EventSearchIndex.objects.create(
+                event_id=uuid.uuid4(), title='Tech', description='', category='Technology', is_published=True,
+            )
+            self.music = EventSearchIndex.objects.create(
+                event_id=uuid.uuid4(), title='Music', description='', category='Music', is_published=True,
+            )
+    
+    def test_preference_update_invalidates_cache(self):
+        """Test that new preferences are used immediately."""
+        service = EventRecommendationService()
+        first = service.generate_recommendations(self.user_id)
+        
+        UserPreferenceService().update_preferences(self.user_id, {'preferred_categories': ['Music']})
+        second = service.generate_recommendations(self.user_id)
+        
+        self.assertEqual(first[0]['event_id'], str(self.tech.event_id))
+        self.assertEqual(second[0]['event_id'], str(self.music.event_id))
+    
+    def test_catalog_change_invalidates_cache(self):
+        """Test that new events show up in cached recommendations."""
+        service = EventRecommendationService()
+        service.generate_recommendations(self.user_id)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            EventSearchIndex.objects.create(
+                event_id=uuid.uuid4(), title='Tech 2', description='', category='Technology', is_published=True,
+            )
+        
+        self.assertEqual(len(service.generate_recommendations(self.user_id)), 2)
+    
+    def test_precompute_warms_cache(self):
+        """Test that precomputed recommendations are served from cache."""
+        service = EventRecommendationService()
+        self.assertEqual(service.precompute(UserPreference.objects.filter(user_id=self.user_id)), 1)
+        
+        with self.assertNumQueries(1):
+            recommendations = service.generate_recommendations(self.user_id)
+        
+        self.assertEqual(recommendations[0]['event_id'], str(self.tech.event_id))
@@ -1,4 +1,6 @@
 import uuid
+from unittest import mock
+from django.core.cache import cache
 from django.test import TestCase
 
 from domain.search_index import EventSearchIndex
@@ -13,6 +15,7 @@ class EventSearchServiceTest(TestCase):
     """Tests for EventSearchService."""
     
     def setUp(self):
+        cache.clear()
         EventSearchIndex.objects.create(
             event_id=uuid.uuid4(),
             title='Tech Conference 2026',
@@ -45,11 +48,70 @@ class EventSearchServiceTest(TestCase):
         results = service.execute('', {'category': 'Music'})
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0].category, 'Music')
+        
+    def test_search_pages_with_cursor(self):
+        """Test keyset cursors walk all results without repeats."""
+        service = EventSearchService()
+        first = service.search('', limit=1)
+        self.assertEqual(first['results'][0].title, 'Tech Conference 2026')
+        
+        second = service.search('', limit=1, cursor=first['next_cursor'])
+        self.assertEqual(second['results'][0].title, 'Music Festival')
+        self.assertIsNone(second['next_cursor'])
+    
+    def test_text_search_pages_with_cursor(self):
+        """Test keyset cursors page through text matches by relevance."""
+        EventSearchIndex.objects.create(
+            event_id=uuid.uuid4(),
+            title='Tech Meetup',
+            description='Monthly technology meetup',
+            category='Technology',
+            is_published=True,
+            search_rank=1.0,
+        )
+        service = EventSearchService()
+        
+        titles = []
+        page = service.search('tech', limit=1)
+        while True:
+            self.assertEqual(len(page['results']), 1)
+            titles.append(page['results'][0].title)
+            if page['next_cursor'] is None:
+                break
+            page = service.search('tech', limit=1, cursor=page['next_cursor'])
+        
+        self.assertEqual(titles, ['Tech Conference 2026', 'Tech Meetup'])
+    
+    def test_search_cached(self):
+        """Test pages are served from cache until the index changes."""
+        service = EventSearchService()
+        first = service.search_cached('Tech')
+        second = service.search_cached('Tech')
+        
+        self.assertFalse(first['cached'])
+        self.assertTrue(second['cached'])
+        self.assertEqual(second['results'][0]['title'], 'Tech Conference 2026')
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            EventSearchIndex.objects.create(
+                event_id=uuid.uuid4(),
+                title='Tech Meetup',
+                description='Monthly meetup',
+                category='Technology',
+                is_published=True,
+            )
+        third = service.search_cached('Tech')
+        
+        self.assertFalse(third['cached'])
+        self.assertEqual(len(third['results']), 2)
 
 
 class SearchFilterServiceTest(TestCase):
     """Tests for SearchFilterService."""
     
+    def setUp(self):
+        cache.clear()
+    
     def test_get_filters(self):
         """Test getting available filters."""
         EventSearchIndex.objects.create(
@@ -68,6 +130,22 @@ class SearchFilterServiceTest(TestCase):
         self.assertIn('cities', filters)
         self.assertIn('Technology', filters['categories'])
         self.assertIn('New York', filters['cities'])
+    
+    def test_filters_refresh_on_index_change(self):
+        """Test that cached filters pick up new categories."""
+        service = SearchFilterService()
+        service.execute()
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            EventSearchIndex.objects.create(
+                event_id=uuid.uuid4(),
+                title='Art Show',
+                description='Test',
+                category='Art',
+                is_published=True,
+            )
+        
+        self.assertIn('Art', service.execute()['categories'])
 
 
 class SearchRankingServiceTest(TestCase):
@@ -103,6 +181,80 @@ class SearchRankingServiceTest(TestCase):
         
         service = SearchRankingService()
         service.increment_view_count(event_id)
+        service.increment_view_count(event_id)
+        
+        index.refresh_from_db()
+        self.assertEqual(index.view_count, 5)
+        
+        result = service.flush_view_counts()
+        
+        index.refresh_from_db()
+        self.assertEqual(result, {'events': 1, 'views': 2})
+        self.assertEqual(index.view_count, 7)
+        self.assertEqual(index.trending_score, 2.0)
+        self.assertEqual(index.search_rank, index.calculate_rank())
+    
+    def test_flush_groups_events_by_views(self):
+        """Test flushing many events with different view counts."""
+        service = SearchRankingService()
+        indexes = [
+            EventSearchIndex.objects.create(
+                event_id=uuid.uuid4(),
+                title=f'Event {i}',
+                description='Test',
+                tags=['a', 'b'],
+                is_published=True,
+            )
+            for i in range(3)
+        ]
+        for i, index in enumerate(indexes):
+            for _ in range(i + 1):
+                service.increment_view_count(index.event_id)
+        
+        service.flush_view_counts()
+        
+        for i, index in enumerate(indexes):
+            index.refresh_from_db()
+            self.assertEqual(index.view_count, i + 1)
+            self.assertEqual(index.search_rank, index.calculate_rank())
+        self.assertEqual(service.flush_view_counts(), {'events': 0, 'views': 0})
+    
+    def test_failed_flush_keeps_views(self):
+        """Test that views go back to the buffer if the flush fails."""
+        event_id = uuid.uuid4()
+        service = SearchRankingService()
+        service.increment_view_count(event_id)
+        
+        with mock.patch.object(EventSearchIndex, 'rank_expression', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                service.flush_view_counts()
+        
+        self.assertEqual(service.view_counter.pending(event_id), 1)
+        service.flush_view_counts()
+    
+    def test_decay_trending(self):
+        """Test that trending scores fade and ranks follow."""
+        index = EventSearchIndex.objects.create(
+            event_id=uuid.uuid4(),
+            title='Test Event',
+            description='Test',
+            is_published=True,
+            trending_score=100.0,
+        )
+        faded = EventSearchIndex.objects.create(
+            event_id=uuid.uuid4(),
+            title='Old Event',
+            description='Test',
+            is_published=True,
+            trending_score=0.001,
+        )
+        
+        updated = SearchRankingService().decay_trending()
         
         index.refresh_from_db()
-        self.assertEqual(index.view_count, 6)
+        faded.refresh_from_db()
+        self.assertEqual(updated, 2)
+        self.assertLess(index.trending_score, 100.0)
+        self.assertGreater(index.trending_score, 99.0)
+        self.assertEqual(index.search_rank, index.calculate_rank())
+        self.assertEqual(faded.trending_score, 0.0)
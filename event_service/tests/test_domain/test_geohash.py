@@ -0,0 +1,42 @@
+from django.test import SimpleTestCase
+
+from domain.geohash import bounding_box, cover, encode
+from domain.location import LocationSearch
+
+
+class GeohashTest(SimpleTestCase):
+    """Tests for geohash helpers."""
+    
+    def test_encode(self):
+        """Test encoding a known point."""
+        self.assertEqual(encode(57.64911, 10.40744, 11), 'u4pruydqqvj')
+    
+    def test_bounding_box_contains_circle(self):
+        """Test that every point within the radius falls inside the box."""
+        min_lat, max_lat, lon_ranges = bounding_box(37.7749, -122.4194, 10.0)
+        (min_lon, max_lon), = lon_ranges
+        
+        for i in range(-60, 61):
+            for j in range(-60, 61):
+                lat, lon = 37.7749 + i * 0.0015, -122.4194 + j * 0.002
+                if LocationSearch.calculate_distance(37.7749, -122.4194, lat, lon) <= 10.0:
+                    self.assertTrue(min_lat <= lat <= max_lat and min_lon <= lon <= max_lon)
+        self.assertAlmostEqual(LocationSearch.calculate_distance(37.7749, -122.4194, max_lat, -122.4194), 10.0, places=3)
+    
+    def test_bounding_box_across_antimeridian(self):
+        """Test that boxes crossing 180 degrees are split in two."""
+        _, _, lon_ranges = bounding_box(0.0, 179.99, 50.0)
+        
+        self.assertEqual(len(lon_ranges), 2)
+        self.assertEqual(lon_ranges[0][1], 180.0)
+        self.assertEqual(lon_ranges[1][0], -180.0)
+    
+    def test_cover_contains_points_in_box(self):
+        """Test that every point in the box has one of the cover prefixes."""
+        min_lat, max_lat, lon_ranges = bounding_box(37.7749, -122.4194, 10.0)
+        cells = cover(min_lat, max_lat, lon_ranges)
+        
+        self.assertLessEqual(len(cells), 32)
+        for lat in (min_lat, 37.7749, max_lat):
+            for lon in (lon_ranges[0][0], -122.4194, lon_ranges[0][1]):
+                self.assertTrue(any(encode(lat, lon).startswith(cell) for cell in cells))
@@ -1,6 +1,7 @@
 import uuid
 from django.test import TestCase
 
+from domain.geohash import encode
 from domain.location import LocationSearch, EventLocation
 
 
@@ -56,3 +57,22 @@ class EventLocationModelTest(TestCase):
         # Distance to LA
         distance = location.distance_to(34.0522, -118.2437)
         self.assertAlmostEqual(distance, 559, delta=10)
+    
+    def test_geohash_follows_coordinates(self):
+        """Test that the geohash is recomputed when coordinates change."""
+        location = EventLocation.objects.create(
+            event_id=uuid.uuid4(),
+            address='123 Main St',
+            city='San Francisco',
+            country='USA',
+            latitude=37.7749,
+            longitude=-122.4194,
+        )
+        self.assertEqual(location.geohash, '9q8yyk8yt')
+        
+        location.latitude = 34.0522
+        location.longitude = -118.2437
+        location.save(update_fields=['latitude', 'longitude'])
+        location.refresh_from_db()
+        
+        self.assertEqual(location.geohash, encode(34.0522, -118.2437))
@@ -2,7 +2,9 @@ import uuid
 from django.test import TestCase
 from django.utils import timezone
 from datetime import timedelta
+from django.conf import settings
 
+from event_service.celery import app
 from infrastructure.tasks.event_tasks import cleanup_old_drafts, auto_complete_events
 from domain.event import EventDraft, Event
 
@@ -70,3 +72,14 @@ class EventTasksTest(TestCase):
         recent_event.refresh_from_db()
         self.assertEqual(old_event.status, 'completed')
         self.assertEqual(recent_event.status, 'published')
+
+
+class TaskRegistrationTest(TestCase):
+    """Tests that the worker registers every scheduled task."""
+    
+    def test_scheduled_tasks_are_registered(self):
+        """Test autodiscovery finds each task in the beat schedule."""
+        app.loader.import_default_modules()
+        
+        for entry in settings.CELERY_BEAT_SCHEDULE.values():
+            self.assertIn(entry['task'], app.tasks)
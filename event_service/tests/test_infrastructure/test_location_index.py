@@ -0,0 +1,60 @@
+import uuid
+from django.test import TestCase
+
+from domain.location import EventLocation
+from infrastructure.services.location_index import LocationIndex, LocationIndexRegistry
+
+
+class LocationIndexTest(TestCase):
+    """Tests for LocationIndex."""
+    
+    def test_search_orders_by_distance(self):
+        """Test that only points within the radius are returned, nearest first."""
+        index = LocationIndex([
+            ('oakland', 'Oakland', 'USA', 37.8044, -122.2712),
+            ('sf', 'San Francisco', 'USA', 37.7749, -122.4194),
+            ('la', 'Los Angeles', 'USA', 34.0522, -118.2437),
+        ])
+        
+        results = index.search(37.7749, -122.4194, 20.0)
+        
+        self.assertEqual([r['event_id'] for r in results], ['sf', 'oakland'])
+        self.assertEqual(results[0]['distance_km'], 0.0)
+        self.assertAlmostEqual(results[1]['distance_km'], 13.4, delta=0.5)
+    
+    def test_search_across_antimeridian(self):
+        """Test that points on the other side of 180 degrees are found."""
+        index = LocationIndex([
+            ('east', 'Suva', 'Fiji', -17.0, 179.9),
+            ('west', 'Lau', 'Fiji', -17.0, -179.9),
+        ])
+        
+        results = index.search(-17.0, 179.95, 20.0)
+        
+        self.assertEqual(len(results), 2)
+
+
+class LocationIndexRegistryTest(TestCase):
+    """Tests for LocationIndexRegistry."""
+    
+    def setUp(self):
+        LocationIndexRegistry.clear()
+    
+    def test_location_change_rebuilds_snapshot(self):
+        """Test that saving a location refreshes the snapshot once it commits."""
+        first = LocationIndexRegistry.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            EventLocation.objects.create(
+                event_id=uuid.uuid4(),
+                address='123 Main St',
+                city='San Francisco',
+                country='USA',
+                latitude=37.7749,
+                longitude=-122.4194,
+            )
+            self.assertEqual(LocationIndexRegistry.version(), first.version)
+        
+        second = LocationIndexRegistry.get()
+        
+        self.assertGreater(second.version, first.version)
+        self.assertEqual(len(second.search(37.7749, -122.4194, 1.0)), 1)
@@ -0,0 +1,97 @@
+import uuid
+from django.test import TestCase
+
+from domain.recommendation import UserPreference
+from domain.search_index import EventSearchIndex
+from infrastructure.services.recommendation_index import RecommendationIndex, RecommendationIndexRegistry
+
+
+def make_event(**kwargs):
+    defaults = {
+        'event_id': uuid.uuid4(),
+        'title': 'Event',
+        'description': 'Description',
+        'is_published': True,
+    }
+    defaults.update(kwargs)
+    return EventSearchIndex.objects.create(**defaults)
+
+
+class RecommendationIndexTest(TestCase):
+    """Tests for RecommendationIndex."""
+    
+    def build(self):
+        return RecommendationIndex(1, RecommendationIndexRegistry._load())
+    
+    def test_scores_match_weights(self):
+        """Test that category, tag, city and popularity add up."""
+        event = make_event(category='Technology', tags=['python', 'django'], city='Berlin', view_count=100)
+        pref = UserPreference(
+            preferred_categories=['Technology'],
+            preferred_tags=['python'],
+            preferred_cities=['Berlin'],
+        )
+        
+        results = self.build().recommend(pref, 10)
+        
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['event_id'], str(event.event_id))
+        self.assertEqual(results[0]['score'], 0.9)
+        self.assertIn('Matches your interest in Technology', results[0]['reason'])
+    
+    def test_popular_events_fill_remaining_slots(self):
+        """Test that unmatched events only appear when they have views."""
+        matched = make_event(category='Technology')
+        popular = make_event(category='Music', view_count=500)
+        make_event(category='Music')
+        pref = UserPreference(preferred_categories=['Technology'])
+        
+        results = self.build().recommend(pref, 10)
+        
+        self.assertEqual([r['event_id'] for r in results], [str(matched.event_id), str(popular.event_id)])
+        self.assertEqual(results[1]['reason'], 'Popular event')
+    
+    def test_limit_keeps_best_scores(self):
+        """Test that only the top scores are returned, best first."""
+        for view_count in (0, 50, 150, 100):
+            make_event(category='Technology', view_count=view_count)
+        pref = UserPreference(preferred_categories=['Technology'])
+        
+        results = self.build().recommend(pref, 2)
+        
+        self.assertEqual([r['score'] for r in results], [0.45, 0.4])
+    
+    def test_unpublished_events_are_not_indexed(self):
+        """Test that unpublished events are never recommended."""
+        make_event(category='Technology', is_published=False)
+        
+        self.assertEqual(len(self.build()), 0)
+
+
+class RecommendationIndexRegistryTest(TestCase):
+    """Tests for RecommendationIndexRegistry."""
+    
+    def setUp(self):
+        RecommendationIndexRegistry.clear()
+    
+    def test_catalog_change_rebuilds_index(self):
+        """Test that saving an event bumps the catalog version once it commits."""
+        first = RecommendationIndexRegistry.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            make_event(category='Technology')
+            self.assertEqual(RecommendationIndexRegistry.version(), first.version)
+        
+        second = RecommendationIndexRegistry.get()
+        
+        self.assertGreater(second.version, first.version)
+        self.assertEqual(len(second), len(first) + 1)
+    
+    def test_popularity_update_keeps_version(self):
+        """Test that view count updates do not invalidate the index."""
+        event = make_event(category='Technology')
+        version = RecommendationIndexRegistry.version()
+        
+        event.view_count = 10
+        event.save(update_fields=['view_count', 'search_rank', 'updated_at'])
+        
+        self.assertEqual(RecommendationIndexRegistry.version(), version)
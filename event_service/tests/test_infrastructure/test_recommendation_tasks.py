@@ -0,0 +1,21 @@
+import uuid
+from django.test import TestCase
+from django.utils import timezone
+from datetime import timedelta
+
+from infrastructure.tasks.recommendation_tasks import precompute_recommendations
+from domain.recommendation import UserPreference
+
+
+class RecommendationTasksTest(TestCase):
+    """Tests for recommendation Celery tasks."""
+    
+    def test_precompute_recommendations(self):
+        """Test that only recently active users are precomputed."""
+        UserPreference.objects.create(user_id=uuid.uuid4(), preferred_categories=['Technology'])
+        stale = UserPreference.objects.create(user_id=uuid.uuid4(), preferred_categories=['Music'])
+        UserPreference.objects.filter(id=stale.id).update(updated_at=timezone.now() - timedelta(days=31))
+        
+        result = precompute_recommendations()
+        
+        self.assertIn('for 1 users', result)
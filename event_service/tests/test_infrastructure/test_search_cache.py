@@ -1,4 +1,6 @@
 import uuid
+from unittest import mock
+from django.core.cache import cache
 from django.test import TestCase
 
 from domain.search_index import EventSearchIndex
@@ -63,3 +65,118 @@ class SearchCacheServiceTest(TestCase):
         
         cached = service.get_cached_results('test', {})
         self.assertIsNone(cached)
+    
+    def test_invalidate_all(self):
+        """Test that invalidating without a query drops every entry."""
+        service = SearchCacheService()
+        service.cache_results('test', {'category': 'Technology'}, [])
+        
+        service.invalidate_cache()
+        
+        self.assertIsNone(service.get_cached_results('test', {'category': 'Technology'}))
+
+
+class SearchCacheGenerationTest(TestCase):
+    """Tests for scoped invalidation on index changes."""
+    
+    def setUp(self):
+        self.service = SearchCacheService()
+        self.index = EventSearchIndex.objects.create(
+            event_id=uuid.uuid4(),
+            title='Jazz Night',
+            description='Test',
+            category='Music',
+            city='Berlin',
+            is_published=True,
+        )
+        for filters in ({}, {'category': 'Music'}, {'category': 'Technology'}, {'city': 'Berlin'}):
+            self.service.cache_results('', filters, [self.index])
+    
+    def cached(self, filters):
+        return self.service.get_cached_results('', filters) is not None
+    
+    def test_change_invalidates_matching_scopes_only(self):
+        """Test that an edit drops unfiltered and matching entries only, once it commits."""
+        self.index.title = 'Jazz Evening'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.index.save()
+            self.assertTrue(self.cached({}))
+        
+        self.assertFalse(self.cached({}))
+        self.assertFalse(self.cached({'category': 'Music'}))
+        self.assertFalse(self.cached({'city': 'Berlin'}))
+        self.assertTrue(self.cached({'category': 'Technology'}))
+    
+    def test_category_move_invalidates_both_categories(self):
+        """Test that moving an event drops its old and new category."""
+        self.index.category = 'Technology'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.index.save()
+        
+        self.assertFalse(self.cached({'category': 'Music'}))
+        self.assertFalse(self.cached({'category': 'Technology'}))
+    
+    def test_rank_update_keeps_entries(self):
+        """Test that view count updates leave the cache alone."""
+        self.index.view_count = 10
+        with self.captureOnCommitCallbacks(execute=True):
+            self.index.save(update_fields=['view_count', 'search_rank', 'updated_at'])
+        
+        self.assertTrue(self.cached({}))
+    
+    def test_delete_invalidates(self):
+        """Test that deleting an event drops its scopes."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.index.delete()
+        
+        self.assertFalse(self.cached({'category': 'Music'}))
+
+
+class SearchCacheComputeTest(TestCase):
+    """Tests for get_or_compute."""
+    
+    def setUp(self):
+        cache.clear()
+        self.service = SearchCacheService()
+    
+    def test_computes_once(self):
+        """Test that a second lookup is served from cache."""
+        compute = mock.Mock(return_value={'results': []})
+        
+        first = self.service.get_or_compute('tech', {}, compute)
+        second = self.service.get_or_compute('tech', {}, compute)
+        
+        self.assertEqual(first, ({'results': []}, False))
+        self.assertEqual(second, ({'results': []}, True))
+        compute.assert_called_once()
+        metrics = self.service.get_metrics()
+        self.assertEqual(metrics['hits'], 1)
+        self.assertEqual(metrics['misses'], 1)
+        self.assertEqual(metrics['hit_rate'], 0.5)
+    
+    def test_waits_for_concurrent_compute(self):
+        """Test that a miss waits for the caller already computing it."""
+        key = self.service._generate_key('tech', {})
+        self.service._acquire(key)
+        compute = mock.Mock(return_value='mine')
+        
+        with mock.patch('infrastructure.services.search_cache_service.time.sleep',
+                        side_effect=lambda _: self.service._store(key, 'theirs', 0.1)):
+            value, cached = self.service.get_or_compute('tech', {}, compute)
+        
+        self.assertEqual((value, cached), ('theirs', True))
+        compute.assert_not_called()
+        self.assertEqual(self.service.get_metrics()['waits'], 1)
+    
+    def test_refreshes_early_near_expiry(self):
+        """Test that an entry about to expire is recomputed by one caller."""
+        key = self.service._generate_key('tech', {})
+        # Took longer to compute than it has left to live
+        self.service._store(key, 'old', self.service.CACHE_TIMEOUT * 10)
+        
+        with mock.patch('infrastructure.services.search_cache_service.random.random', return_value=0.5):
+            value, cached = self.service.get_or_compute('tech', {}, lambda: 'new')
+        
+        self.assertEqual((value, cached), ('new', False))
+        self.assertEqual(self.service.get_cached_page('tech', {}), 'new')
+        self.assertEqual(self.service.get_metrics()['refreshes'], 1)
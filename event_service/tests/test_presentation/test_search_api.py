@@ -1,4 +1,5 @@
 import uuid
+from django.core.cache import cache
 from django.test import TestCase, Client
 
 from domain.search_index import EventSearchIndex
@@ -9,6 +10,7 @@ class SearchAPITest(TestCase):
     
     def setUp(self):
         self.client = Client()
+        cache.clear()
         
         EventSearchIndex.objects.create(
             event_id=uuid.uuid4(),
@@ -73,3 +75,13 @@ class SearchAPITest(TestCase):
         # Second request (should be cached)
         response2 = self.client.get('/api/events/search/?q=Tech')
         self.assertTrue(response2.json()['cached'])
+    
+    def test_get_search_cache_metrics(self):
+        """Test getting search cache metrics via API."""
+        self.client.get('/api/events/search/?q=Tech')
+        
+        response = self.client.get('/api/events/search/cache/metrics/')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertIn('hit_rate', data)
+        self.assertGreaterEqual(data['misses'], 1)
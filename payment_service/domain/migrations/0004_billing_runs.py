@@ -0,0 +1,43 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:12
+
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0003_recurringpayment_subscription'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recurringpayment',
+            name='idempotency_key',
+            field=models.CharField(blank=True, max_length=100, null=True, unique=True),
+        ),
+        migrations.CreateModel(
+            name='BillingRun',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('shard_index', models.PositiveIntegerField(default=0)),
+                ('shard_count', models.PositiveIntegerField(default=1)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='running', max_length=20)),
+                ('due_before', models.DateTimeField()),
+                ('cursor_billing_date', models.DateTimeField(blank=True, null=True)),
+                ('cursor_subscription_id', models.UUIDField(blank=True, null=True)),
+                ('processed', models.PositiveIntegerField(default=0)),
+                ('succeeded', models.PositiveIntegerField(default=0)),
+                ('failed', models.PositiveIntegerField(default=0)),
+                ('skipped', models.PositiveIntegerField(default=0)),
+                ('gateway_seconds', models.FloatField(default=0)),
+                ('started_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'billing_runs',
+                'indexes': [models.Index(fields=['shard_count', 'shard_index', 'status'], name='billing_run_shard_c_7d5b22_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 6.0.1 on 2026-10-18 10:04
+
+import uuid
+from decimal import Decimal
+from django.db import migrations, models
+
+
+def backfill_cancelled_at(apps, schema_editor):
+    Subscription = apps.get_model('domain', 'Subscription')
+    Subscription.objects.filter(status='cancelled', cancelled_at__isnull=True).update(
+        cancelled_at=models.F('updated_at')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0004_billing_runs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubscriptionSnapshot',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('date', models.DateField(unique=True)),
+                ('total_count', models.PositiveIntegerField(default=0)),
+                ('active_count', models.PositiveIntegerField(default=0)),
+                ('paused_count', models.PositiveIntegerField(default=0)),
+                ('cancelled_count', models.PositiveIntegerField(default=0)),
+                ('new_count', models.PositiveIntegerField(default=0)),
+                ('churned_count', models.PositiveIntegerField(default=0)),
+                ('mrr', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'subscription_snapshots',
+                'ordering': ['date'],
+            },
+        ),
+        migrations.AddField(
+            model_name='subscription',
+            name='cancelled_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_cancelled_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(fields=['start_date', 'status'], name='subscriptio_start_d_c0e241_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(fields=['cancelled_at'], name='subscriptio_cancell_b70a05_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.1 on 2026-10-18 16:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0005_subscription_snapshots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recurringpayment',
+            name='attempt_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='recurringpayment',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='recurringpayment',
+            name='last_error',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='billingrun',
+            name='heartbeat_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -1,3 +1,3 @@
 from domain.payment import Payment, PaymentMethod
 from domain.wallet import MobileWallet, WalletTransaction
-from domain.subscription import Subscription, RecurringPayment
+from domain.subscription import Subscription, RecurringPayment, BillingRun, SubscriptionSnapshot
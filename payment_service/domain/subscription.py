@@ -30,6 +30,7 @@ class Subscription(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
     start_date = models.DateTimeField(default=timezone.now)
     next_billing_date = models.DateTimeField()
+    cancelled_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -38,6 +39,8 @@ class Subscription(models.Model):
         indexes = [
             models.Index(fields=['user_id', 'status']),
             models.Index(fields=['next_billing_date']),
+            models.Index(fields=['start_date', 'status']),
+            models.Index(fields=['cancelled_at']),
         ]
     
     def __str__(self):
@@ -59,17 +62,53 @@ class Subscription(models.Model):
         if self.status == 'cancelled':
             raise ValidationError("Subscription already cancelled")
         self.status = 'cancelled'
+        self.cancelled_at = timezone.now()
         self.save()
     
     def calculate_next_billing_date(self) -> None:
         """Calculate next billing date based on cycle."""
+        self.advance_billing_date()
+        self.save()
+    
+    def advance_billing_date(self) -> None:
+        """Move next billing date forward one cycle without saving."""
         if self.billing_cycle == 'monthly':
             self.next_billing_date = self.next_billing_date + timedelta(days=30)
         elif self.billing_cycle == 'quarterly':
             self.next_billing_date = self.next_billing_date + timedelta(days=90)
         elif self.billing_cycle == 'yearly':
             self.next_billing_date = self.next_billing_date + timedelta(days=365)
-        self.save()
+        self.updated_at = timezone.now()
+
+
+class SubscriptionSnapshot(models.Model):
+    """End-of-day subscription metrics, one row per day."""
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    date = models.DateField(unique=True)
+    total_count = models.PositiveIntegerField(default=0)
+    active_count = models.PositiveIntegerField(default=0)
+    paused_count = models.PositiveIntegerField(default=0)
+    cancelled_count = models.PositiveIntegerField(default=0)
+    new_count = models.PositiveIntegerField(default=0)
+    churned_count = models.PositiveIntegerField(default=0)
+    mrr = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'subscription_snapshots'
+        ordering = ['date']
+    
+    def __str__(self):
+        return f"Subscription snapshot {self.date}"
+    
+    def churn_rate(self) -> float:
+        """Share of the day's opening subscriber base that cancelled, in percent."""
+        opening = self.active_count + self.paused_count + self.churned_count - self.new_count
+        if opening <= 0:
+            return 0.0
+        return (self.churned_count / opening) * 100
 
 
 class RecurringPayment(models.Model):
@@ -88,6 +127,10 @@ class RecurringPayment(models.Model):
     billing_date = models.DateTimeField()
     payment_method = models.CharField(max_length=50)
     transaction_id = models.CharField(max_length=255, blank=True)
+    idempotency_key = models.CharField(max_length=100, unique=True, null=True, blank=True)
+    attempt_count = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.CharField(max_length=255, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     processed_at = models.DateTimeField(null=True, blank=True)
     
@@ -101,6 +144,25 @@ class RecurringPayment(models.Model):
     def __str__(self):
         return f"Payment {self.id} - {self.amount}"
     
+    @staticmethod
+    def idempotency_key_for(subscription: Subscription) -> str:
+        """Key identifying one billing period of a subscription."""
+        return f"{subscription.id}:{subscription.next_billing_date:%Y%m%dT%H%M%S}"
+    
+    def attempt_key(self) -> str:
+        """Gateway idempotency key for the next charge attempt.
+        
+        Gateways replay the stored result for a reused key, decline
+        included, so each retry of the period gets its own key.
+        """
+        if self.attempt_count == 0:
+            return self.idempotency_key
+        return f"{self.idempotency_key}:{self.attempt_count + 1}"
+    
+    def is_retry_due(self, now) -> bool:
+        """Whether a failed charge is scheduled for another attempt by now."""
+        return self.status == 'failed' and self.next_attempt_at is not None and self.next_attempt_at <= now
+    
     def process(self, transaction_id: str) -> None:
         """Mark payment as processed."""
         if self.status != 'pending':
@@ -116,3 +178,58 @@ class RecurringPayment(models.Model):
             raise ValidationError("Cannot fail completed payment")
         self.status = 'failed'
         self.save()
+
+
+class BillingRun(models.Model):
+    """Checkpoint and throughput metrics for one shard of a billing run."""
+    
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    shard_index = models.PositiveIntegerField(default=0)
+    shard_count = models.PositiveIntegerField(default=1)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running')
+    due_before = models.DateTimeField()
+    cursor_billing_date = models.DateTimeField(null=True, blank=True)
+    cursor_subscription_id = models.UUIDField(null=True, blank=True)
+    processed = models.PositiveIntegerField(default=0)
+    succeeded = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0)
+    gateway_seconds = models.FloatField(default=0)
+    started_at = models.DateTimeField(default=timezone.now)
+    heartbeat_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'billing_runs'
+        indexes = [
+            models.Index(fields=['shard_count', 'shard_index', 'status']),
+        ]
+    
+    def __str__(self):
+        return f"Billing run {self.id} - shard {self.shard_index}/{self.shard_count}"
+    
+    def elapsed_seconds(self) -> float:
+        """Wall-clock time of the run so far."""
+        return ((self.finished_at or timezone.now()) - self.started_at).total_seconds()
+    
+    def metrics(self) -> dict:
+        """Throughput summary of the run."""
+        elapsed = self.elapsed_seconds()
+        return {
+            'run_id': self.id,
+            'shard': f"{self.shard_index}/{self.shard_count}",
+            'status': self.status,
+            'processed': self.processed,
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+            'skipped': self.skipped,
+            'elapsed_seconds': round(elapsed, 3),
+            'throughput_per_second': round(self.processed / elapsed, 2) if elapsed > 0 else 0.0,
+            'avg_gateway_ms': round(self.gateway_seconds * 1000 / self.processed, 2) if self.processed else 0.0,
+        }
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from infrastructure.services.billing_runner import BillingRunInProgress, BillingRunner
+
+
+class Command(BaseCommand):
+    """Charge due subscriptions for one shard."""
+    
+    help = 'Bill due subscriptions, resuming the shard\'s last unfinished run'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--shard', type=int, default=0, help='Shard index handled by this process')
+        parser.add_argument('--shards', type=int, default=1, help='Total number of shards')
+        parser.add_argument('--workers', type=int, default=None, help='Concurrent gateway calls')
+        parser.add_argument('--page-size', type=int, default=None, help='Subscriptions fetched per page')
+        parser.add_argument('--fresh', action='store_true', help='Start a new run instead of resuming')
+    
+    def handle(self, *args, **options):
+        runner = BillingRunner(workers=options['workers'], page_size=options['page_size'])
+        try:
+            run = runner.run(
+                shard_index=options['shard'],
+                shard_count=options['shards'],
+                resume=not options['fresh']
+            )
+        except BillingRunInProgress as e:
+            raise CommandError(str(e))
+        metrics = run.metrics()
+        self.stdout.write(' '.join(f"{key}={value}" for key, value in metrics.items()))
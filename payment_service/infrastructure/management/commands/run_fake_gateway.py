@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from infrastructure.services.fake_gateway import FakeGatewayServer
+
+
+class Command(BaseCommand):
+    """Serve fake Stripe and PayPal endpoints for load testing."""
+    
+    help = 'Run a local fake payment gateway server'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8099)
+        parser.add_argument('--latency-ms', type=float, default=50, help='Base response latency')
+        parser.add_argument('--jitter-ms', type=float, default=50, help='Random extra latency')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests answered with 503')
+    
+    def handle(self, *args, **options):
+        server = FakeGatewayServer(
+            (options['host'], options['port']),
+            latency=options['latency_ms'] / 1000,
+            jitter=options['jitter_ms'] / 1000,
+            error_rate=options['error_rate']
+        )
+        self.stdout.write(f"Fake gateway listening on {server.url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
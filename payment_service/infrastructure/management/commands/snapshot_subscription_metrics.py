@@ -0,0 +1,27 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+
+from infrastructure.services.subscription_analytics import SubscriptionAnalytics
+
+
+class Command(BaseCommand):
+    """Record the daily subscription metrics snapshot."""
+    
+    help = 'Store MRR and churn counts for a day in subscription_snapshots'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date', type=date.fromisoformat, default=None,
+            help='Day to record (YYYY-MM-DD); defaults to today. Status counts and MRR '
+                 'are only recorded for today; a past day backfills new and churned counts only'
+        )
+    
+    def handle(self, *args, **options):
+        try:
+            snapshot = SubscriptionAnalytics().take_snapshot(options['date'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(
+            f"date={snapshot.date} active={snapshot.active_count} mrr={snapshot.mrr} "
+            f"new={snapshot.new_count} churned={snapshot.churned_count}"
+        )
@@ -8,6 +8,7 @@ from application.subscription_service import (
     BillingManagementService,
     RecurringPaymentService
 )
+from infrastructure.services.billing_runner import BillingRunner
 
 
 class BillingEngine:
@@ -17,30 +18,16 @@ class BillingEngine:
         self.billing_service = BillingManagementService()
         self.payment_service = RecurringPaymentService()
     
-    def process_due_subscriptions(self) -> List[Dict]:
-        """Process all subscriptions due for billing."""
-        due_subscriptions = self.billing_service.get_due_subscriptions()
-        results = []
+    def process_due_subscriptions(self, shard_index: int = 0, shard_count: int = 1) -> List[Dict]:
+        """Process all subscriptions due for billing.
         
-        for subscription in due_subscriptions:
-            try:
-                payment = self.charge_subscription(
-                    subscription.id,
-                    payment_method="stripe"  # Default payment method
-                )
-                results.append({
-                    'subscription_id': subscription.id,
-                    'payment_id': payment.id,
-                    'status': 'success'
-                })
-            except Exception as e:
-                results.append({
-                    'subscription_id': subscription.id,
-                    'status': 'failed',
-                    'error': str(e)
-                })
-        
-        return results
+        Charges run through BillingRunner, which pages through due
+        subscriptions and calls gateways concurrently. An interrupted run for
+        the same shard is resumed from its checkpoint.
+        """
+        runner = BillingRunner(collect_results=True)
+        runner.run(shard_index=shard_index, shard_count=shard_count)
+        return runner.results
     
     def charge_subscription(
         self,
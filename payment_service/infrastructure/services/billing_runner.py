@@ -0,0 +1,285 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from domain.subscription import Subscription, RecurringPayment, BillingRun
+
+
+# Gateway charge callables take the pending payment and its idempotency key
+# and return the gateway transaction id, raising if the charge is declined.
+GatewayCharge = Callable[[RecurringPayment, str], str]
+
+
+def simulate_charge(payment: RecurringPayment, idempotency_key: str) -> str:
+    """Simulated gateway charge used when no client is configured."""
+    return f"txn_{uuid.uuid4().hex[:12]}"
+
+
+class RateLimiter:
+    """Thread-safe token bucket allowing `rate` calls per second."""
+    
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst or max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until a call is allowed."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class BillingRunInProgress(Exception):
+    """Another live process holds the shard's billing run."""
+
+
+def shard_bounds(shard_index: int, shard_count: int) -> Tuple[uuid.UUID, Optional[uuid.UUID]]:
+    """Split the UUID key space into equal contiguous ranges."""
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(f"Invalid shard {shard_index}/{shard_count}")
+    space = 1 << 128
+    lower = uuid.UUID(int=space * shard_index // shard_count)
+    upper = uuid.UUID(int=space * (shard_index + 1) // shard_count) if shard_index + 1 < shard_count else None
+    return lower, upper
+
+
+class BillingRunner:
+    """Sharded, resumable runner that charges due subscriptions concurrently.
+    
+    Due subscriptions are scanned a page at a time with a keyset cursor on
+    (next_billing_date, id), restricted to the shard's slice of the id space
+    so shards can run in separate processes. Each page is written with a
+    handful of bulk queries; only the gateway calls fan out to a bounded
+    thread pool, throttled per gateway. Every charge carries an idempotency
+    key for its billing period, so a run resumed from its last checkpoint
+    never bills a period twice.
+    
+    A declined period is retried by later runs with exponential backoff, and
+    the subscription is paused once max_attempts charges have been declined.
+    A run holds its shard through a heartbeat lease; only a failed run or
+    one whose heartbeat has lapsed can be resumed by another process.
+    """
+    
+    def __init__(
+        self,
+        gateways: Optional[Dict[str, GatewayCharge]] = None,
+        rate_limits: Optional[Dict[str, float]] = None,
+        workers: Optional[int] = None,
+        page_size: Optional[int] = None,
+        payment_method: str = 'stripe',
+        collect_results: bool = False
+    ):
+        self.gateways = gateways or {}
+        limits = settings.BILLING_GATEWAY_RATE_LIMITS if rate_limits is None else rate_limits
+        self.limiters = {gateway: RateLimiter(rate) for gateway, rate in limits.items()}
+        self.workers = workers or settings.BILLING_WORKERS
+        self.page_size = page_size or settings.BILLING_PAGE_SIZE
+        self.payment_method = payment_method
+        self.results: Optional[List[Dict]] = [] if collect_results else None
+        self.max_attempts = settings.BILLING_MAX_ATTEMPTS
+        self.retry_backoff = timedelta(hours=settings.BILLING_RETRY_BACKOFF_HOURS)
+        self.lease = timedelta(seconds=settings.BILLING_RUN_LEASE_SECONDS)
+    
+    def run(
+        self,
+        shard_index: int = 0,
+        shard_count: int = 1,
+        resume: bool = True,
+        due_before=None
+    ) -> BillingRun:
+        """Bill every due subscription in the shard and return the run record."""
+        run = self._start_run(shard_index, shard_count, resume, due_before)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                while True:
+                    page = self._next_page(run)
+                    if not page:
+                        break
+                    self._process_page(run, page, executor)
+        except BaseException:
+            # Interrupts too, so the shard can be resumed without waiting
+            # for the lease to lapse
+            run.status = 'failed'
+            run.finished_at = timezone.now()
+            run.save(update_fields=['status', 'finished_at'])
+            raise
+        
+        run.status = 'completed'
+        run.finished_at = timezone.now()
+        run.save(update_fields=['status', 'finished_at'])
+        return run
+    
+    def _start_run(self, shard_index: int, shard_count: int, resume: bool, due_before) -> BillingRun:
+        """Claim the shard's unfinished run or start a new one.
+        
+        Raises BillingRunInProgress while another process's run on the
+        shard still has a live heartbeat.
+        """
+        shard_bounds(shard_index, shard_count)
+        now = timezone.now()
+        with transaction.atomic():
+            unfinished = list(BillingRun.objects.select_for_update(skip_locked=True).filter(
+                shard_index=shard_index,
+                shard_count=shard_count,
+                status__in=['running', 'failed']
+            ).order_by('-started_at'))
+            if any(run.status == 'running' and run.heartbeat_at > now - self.lease for run in unfinished):
+                raise BillingRunInProgress(f"Shard {shard_index}/{shard_count} is being billed by another process")
+            
+            if resume and unfinished:
+                run = unfinished[0]
+                run.status = 'running'
+                run.finished_at = None
+                run.heartbeat_at = now
+                run.save(update_fields=['status', 'finished_at', 'heartbeat_at'])
+                return run
+            
+            return BillingRun.objects.create(
+                shard_index=shard_index,
+                shard_count=shard_count,
+                due_before=due_before or now + timedelta(days=1),
+                heartbeat_at=now
+            )
+    
+    def _next_page(self, run: BillingRun) -> List[Subscription]:
+        """Fetch the next page of due subscriptions after the run's cursor."""
+        lower, upper = shard_bounds(run.shard_index, run.shard_count)
+        queryset = Subscription.objects.filter(
+            status='active',
+            next_billing_date__lte=run.due_before,
+            id__gte=lower
+        )
+        if upper is not None:
+            queryset = queryset.filter(id__lt=upper)
+        if run.cursor_billing_date is not None:
+            queryset = queryset.filter(
+                Q(next_billing_date__gt=run.cursor_billing_date) |
+                Q(next_billing_date=run.cursor_billing_date, id__gt=run.cursor_subscription_id)
+            )
+        return list(queryset.order_by('next_billing_date', 'id')[:self.page_size])
+    
+    def _process_page(self, run: BillingRun, page: List[Subscription], executor: ThreadPoolExecutor) -> None:
+        """Charge one page and checkpoint it in a single transaction."""
+        cursor = (page[-1].next_billing_date, page[-1].id)
+        keys = {subscription.id: RecurringPayment.idempotency_key_for(subscription) for subscription in page}
+        RecurringPayment.objects.bulk_create(
+            [
+                RecurringPayment(
+                    subscription_id=subscription.id,
+                    amount=subscription.amount,
+                    billing_date=subscription.next_billing_date,
+                    payment_method=self.payment_method,
+                    idempotency_key=keys[subscription.id]
+                )
+                for subscription in page
+            ],
+            ignore_conflicts=True
+        )
+        payments = RecurringPayment.objects.in_bulk(list(keys.values()), field_name='idempotency_key')
+        
+        # Periods already completed by an interrupted run only need their
+        # billing date advanced; declined ones are retried once their
+        # backoff has passed.
+        now = timezone.now()
+        due = [
+            payments[keys[subscription.id]]
+            for subscription in page
+            if payments[keys[subscription.id]].status == 'pending' or payments[keys[subscription.id]].is_retry_due(now)
+        ]
+        outcomes = dict(zip(
+            [payment.id for payment in due],
+            executor.map(self._charge, due)
+        ))
+        
+        now = timezone.now()
+        charged, billed, paused = [], [], []
+        for subscription in page:
+            payment = payments[keys[subscription.id]]
+            outcome = outcomes.get(payment.id)
+            if outcome is not None:
+                transaction_id, error, elapsed = outcome
+                run.gateway_seconds += elapsed
+                payment.attempt_count += 1
+                if error is None:
+                    payment.status = 'completed'
+                    payment.transaction_id = transaction_id
+                    payment.processed_at = now
+                    payment.next_attempt_at = None
+                else:
+                    payment.status = 'failed'
+                    payment.last_error = error[:255]
+                    if payment.attempt_count < self.max_attempts:
+                        payment.next_attempt_at = now + self.retry_backoff * 2 ** (payment.attempt_count - 1)
+                    else:
+                        payment.next_attempt_at = None
+                        subscription.status = 'paused'
+                        subscription.updated_at = now
+                        paused.append(subscription)
+                charged.append(payment)
+            
+            if payment.status == 'completed':
+                subscription.advance_billing_date()
+                billed.append(subscription)
+                run.succeeded += 1
+                self._record(subscription, payment, 'success')
+            elif outcome is not None:
+                run.failed += 1
+                self._record(subscription, payment, 'failed', outcome[1])
+            else:
+                run.skipped += 1
+            run.processed += 1
+        
+        run.cursor_billing_date, run.cursor_subscription_id = cursor
+        run.heartbeat_at = now
+        
+        with transaction.atomic():
+            RecurringPayment.objects.bulk_update(charged, [
+                'status', 'transaction_id', 'processed_at', 'attempt_count', 'next_attempt_at', 'last_error'
+            ])
+            Subscription.objects.bulk_update(billed, ['next_billing_date', 'updated_at'])
+            Subscription.objects.bulk_update(paused, ['status', 'updated_at'])
+            run.save(update_fields=[
+                'cursor_billing_date', 'cursor_subscription_id', 'processed',
+                'succeeded', 'failed', 'skipped', 'gateway_seconds', 'heartbeat_at'
+            ])
+    
+    def _charge(self, payment: RecurringPayment) -> Tuple[Optional[str], Optional[str], float]:
+        """Call the payment's gateway under its rate limit. Runs in a worker thread."""
+        limiter = self.limiters.get(payment.payment_method)
+        if limiter is not None:
+            limiter.acquire()
+        gateway = self.gateways.get(payment.payment_method, simulate_charge)
+        started = time.monotonic()
+        try:
+            return gateway(payment, payment.attempt_key()), None, time.monotonic() - started
+        except Exception as e:
+            return None, str(e), time.monotonic() - started
+    
+    def _record(self, subscription: Subscription, payment: RecurringPayment, status: str, error: Optional[str] = None) -> None:
+        """Keep a per-subscription result when results are collected."""
+        if self.results is None:
+            return
+        result = {'subscription_id': subscription.id, 'payment_id': payment.id, 'status': status}
+        if error is not None:
+            result['error'] = error
+        self.results.append(result)
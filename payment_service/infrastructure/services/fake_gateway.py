@@ -0,0 +1,176 @@
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+IDEMPOTENCY_HEADERS = ('Idempotency-Key', 'PayPal-Request-Id')
+
+
+class FakeGatewayHandler(BaseHTTPRequestHandler):
+    """Serves the subset of the Stripe and PayPal APIs we call."""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    def setup(self):
+        super().setup()
+        self.server.count_connection()
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_GET(self):
+        self._handle('GET')
+    
+    def do_POST(self):
+        self._handle('POST')
+    
+    def _handle(self, method: str) -> None:
+        server: FakeGatewayServer = self.server
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length).decode() if length else ''
+        url = urlparse(self.path)
+        
+        delay, fail = server.next_behaviour()
+        if delay:
+            time.sleep(delay)
+        if fail:
+            self._respond(503, {'error': {'message': 'Injected failure'}})
+            return
+        
+        key = next((self.headers[header] for header in IDEMPOTENCY_HEADERS if self.headers.get(header)), None)
+        if key is not None:
+            replay = server.replay(method, url.path, key)
+            if replay is not None:
+                self._respond(*replay)
+                return
+        
+        if self.headers.get('Content-Type', '').startswith('application/json'):
+            body = json.loads(raw or '{}')
+        else:
+            body = {name: values[0] for name, values in parse_qs(raw).items()}
+        body.update({name: values[0] for name, values in parse_qs(url.query).items()})
+        
+        handler = ROUTES.get((method, url.path))
+        status, payload = handler(body) if handler else (404, {'error': {'message': 'Not found'}})
+        if key is not None:
+            server.remember(method, url.path, key, status, payload)
+        self._respond(status, payload)
+    
+    def _respond(self, status: int, payload: Dict[str, Any]) -> None:
+        content = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+def _token(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:16]}"
+
+
+ROUTES = {
+    ('GET', '/v1/account'): lambda body: (200, {'id': 'acct_fake', 'object': 'account'}),
+    ('POST', '/v1/payment_intents'): lambda body: (200, {
+        'id': _token('pi'),
+        'object': 'payment_intent',
+        'amount': int(body.get('amount', 0)),
+        'currency': body.get('currency', 'usd'),
+        'status': 'requires_payment_method',
+        'client_secret': _token('secret'),
+    }),
+    ('POST', '/v1/refunds'): lambda body: (200, {
+        'id': _token('re'),
+        'object': 'refund',
+        'amount': int(body.get('amount', 0)),
+        'status': 'succeeded',
+    }),
+    ('POST', '/v1/oauth2/token'): lambda body: (200, {
+        'access_token': _token('A21'),
+        'token_type': 'Bearer',
+        'expires_in': 32400,
+    }),
+}
+
+
+class FakeGatewayServer(ThreadingHTTPServer):
+    """Local stand-in for the payment gateways, for load and failure testing.
+    
+    Point STRIPE_API_BASE and PAYPAL_API_BASE at it. Latency, jitter and a
+    random error rate can be configured, and fail_next()/delay_next()
+    script the next responses.
+    Responses to requests with an idempotency key are replayed on repeats.
+    """
+    
+    daemon_threads = True
+    
+    def __init__(
+        self,
+        address: Tuple[str, int] = ('127.0.0.1', 0),
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0
+    ):
+        super().__init__(address, FakeGatewayHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.request_count = 0
+        self.connection_count = 0
+        self._failures = 0
+        self._delays: list = []
+        self._responses: Dict[Tuple[str, str, str], Tuple[int, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> 'FakeGatewayServer':
+        """Serve from a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+    
+    def fail_next(self, count: int) -> None:
+        """Answer the next `count` requests with 503."""
+        with self._lock:
+            self._failures += count
+    
+    def delay_next(self, seconds: float, count: int = 1) -> None:
+        """Hold the next `count` requests for `seconds` before answering."""
+        with self._lock:
+            self._delays.extend([seconds] * count)
+    
+    def count_connection(self) -> None:
+        with self._lock:
+            self.connection_count += 1
+    
+    def next_behaviour(self) -> Tuple[float, bool]:
+        """Delay and failure decision for an incoming request."""
+        with self._lock:
+            self.request_count += 1
+            delay = self._delays.pop(0) if self._delays else self.latency + random.uniform(0, self.jitter)
+            if self._failures:
+                self._failures -= 1
+                return delay, True
+        return delay, random.random() < self.error_rate
+    
+    def replay(self, method: str, path: str, key: str) -> Optional[Tuple[int, Dict[str, Any]]]:
+        with self._lock:
+            return self._responses.get((method, path, key))
+    
+    def remember(self, method: str, path: str, key: str, status: int, payload: Dict[str, Any]) -> None:
+        with self._lock:
+            self._responses.setdefault((method, path, key), (status, payload))
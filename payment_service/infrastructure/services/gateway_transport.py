@@ -0,0 +1,262 @@
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+
+IDEMPOTENCY_HEADERS = {
+    'stripe': 'Idempotency-Key',
+    'paypal': 'PayPal-Request-Id',
+}
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class GatewayError(Exception):
+    """Raised when a gateway request fails after retries."""
+    
+    def __init__(self, gateway: str, message: str, status_code: Optional[int] = None):
+        self.gateway = gateway
+        self.status_code = status_code
+        super().__init__(f"{gateway}: {message}")
+
+
+class CircuitOpenError(GatewayError):
+    """Raised without calling the gateway while its circuit is open."""
+    
+    def __init__(self, gateway: str):
+        super().__init__(gateway, "circuit open, gateway temporarily unavailable")
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe."""
+    
+    def __init__(self, gateway: str, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.gateway = gateway
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+    
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go through."""
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return
+            if state == 'half_open' and not self._probing:
+                self._probing = True
+                return
+        raise CircuitOpenError(self.gateway)
+    
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+    
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._probing = False
+    
+    def release(self) -> None:
+        """End a call whose outcome says nothing about the gateway's health."""
+        with self._lock:
+            self._probing = False
+
+
+class GatewayTransport:
+    """Shared HTTP transport for one payment gateway.
+    
+    Holds a keep-alive connection pool, applies the gateway's connect/read
+    timeouts to every call and guards it with a circuit breaker. Requests
+    that are safe to repeat (reads, or writes carrying an idempotency key)
+    are retried with jittered backoff on connection errors, 429 and 5xx, and
+    can be hedged: if no response arrives within `hedge_after` seconds a
+    second identical request is raced against the first.
+    """
+    
+    _transports: Dict[str, 'GatewayTransport'] = {}
+    _lock = threading.Lock()
+    
+    def __init__(
+        self,
+        gateway: str,
+        base_url: str = '',
+        timeout: Tuple[float, float] = (3.05, 10),
+        max_retries: int = 2,
+        backoff: float = 0.2,
+        hedge_after: Optional[float] = None,
+        pool_size: int = 20,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        self.gateway = gateway
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.hedge_after = hedge_after
+        self.pool_size = pool_size
+        self.idempotency_header = IDEMPOTENCY_HEADERS.get(gateway, 'Idempotency-Key')
+        self.breaker = breaker or CircuitBreaker(gateway)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix=f"gateway-{gateway}")
+    
+    @classmethod
+    def for_gateway(cls, gateway: str, base_url: str = '') -> 'GatewayTransport':
+        """Get the process-wide transport for a gateway, configured from settings."""
+        with cls._lock:
+            transport = cls._transports.get(gateway)
+            if transport is None:
+                transport = cls(
+                    gateway,
+                    base_url=base_url,
+                    timeout=(settings.GATEWAY_CONNECT_TIMEOUT, settings.GATEWAY_READ_TIMEOUTS[gateway]),
+                    max_retries=settings.GATEWAY_MAX_RETRIES,
+                    hedge_after=settings.GATEWAY_HEDGE_AFTER or None,
+                    pool_size=settings.GATEWAY_POOL_SIZE,
+                    breaker=CircuitBreaker(
+                        gateway,
+                        failure_threshold=settings.GATEWAY_BREAKER_THRESHOLD,
+                        reset_timeout=settings.GATEWAY_BREAKER_RESET
+                    )
+                )
+                cls._transports[gateway] = transport
+            return transport
+    
+    @classmethod
+    def reset(cls) -> None:
+        """Drop all shared transports, closing their pools."""
+        with cls._lock:
+            for transport in cls._transports.values():
+                transport.close()
+            cls._transports = {}
+    
+    def close(self) -> None:
+        self.executor.shutdown(wait=False)
+        self.session.close()
+    
+    def request(
+        self,
+        method: str,
+        path: str,
+        idempotency_key: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Send a request and return the decoded JSON body."""
+        if idempotency_key:
+            kwargs['headers'] = {**kwargs.get('headers', {}), self.idempotency_header: idempotency_key}
+        response = self.send(method, f"{self.base_url}{path}", **kwargs)
+        if response.status_code >= 400:
+            raise GatewayError(self.gateway, f"HTTP {response.status_code}: {response.text[:200]}", response.status_code)
+        return response.json() if response.content else {}
+    
+    def send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the breaker, retries and hedging.
+        
+        Returns the final response, including 4xx responses; raises
+        GatewayError when the gateway could not be reached or kept failing.
+        """
+        self.breaker.before_call()
+        kwargs.setdefault('timeout', self.timeout)
+        repeatable = method.upper() in SAFE_METHODS or self.idempotency_header in kwargs.get('headers', {})
+        attempts = 1 + self.max_retries if repeatable else 1
+        
+        error: Optional[Exception] = None
+        for attempt in range(attempts):
+            if attempt:
+                time.sleep(self.backoff * (2 ** (attempt - 1)) * (0.5 + random.random()))
+            try:
+                response = self._attempt(method, url, repeatable, **kwargs)
+            except requests.RequestException as e:
+                error = e
+                continue
+            if response.status_code == 429 or response.status_code >= 500:
+                error = GatewayError(self.gateway, f"HTTP {response.status_code}", response.status_code)
+                continue
+            self.breaker.record_success()
+            return response
+        
+        self.breaker.record_failure()
+        if isinstance(error, GatewayError):
+            raise error
+        raise GatewayError(self.gateway, str(error))
+    
+    def _attempt(self, method: str, url: str, repeatable: bool, **kwargs) -> requests.Response:
+        """One attempt, hedged with a duplicate request if it is slow."""
+        if not (repeatable and self.hedge_after):
+            return self.session.request(method, url, **kwargs)
+        
+        first = self.executor.submit(self.session.request, method, url, **kwargs)
+        done, _ = wait([first], timeout=self.hedge_after)
+        if done:
+            return first.result()
+        
+        pending = {first, self.executor.submit(self.session.request, method, url, **kwargs)}
+        error: Optional[Exception] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    return future.result()
+                except requests.RequestException as e:
+                    error = e
+        raise error
+
+
+class AsyncGatewayTransport:
+    """Awaitable facade over a GatewayTransport for ASGI views.
+    
+    Calls share the transport's connection pool, breaker and retry policy
+    and run on a separate bounded thread pool (hedges use the transport's
+    own pool), so awaiting a gateway never blocks the event loop.
+    """
+    
+    _transports: Dict[str, 'AsyncGatewayTransport'] = {}
+    _lock = threading.Lock()
+    
+    def __init__(self, transport: GatewayTransport):
+        self.transport = transport
+        self.executor = ThreadPoolExecutor(
+            max_workers=transport.pool_size,
+            thread_name_prefix=f"gateway-{transport.gateway}-async"
+        )
+    
+    @classmethod
+    def for_gateway(cls, gateway: str, base_url: str = '') -> 'AsyncGatewayTransport':
+        """Get the process-wide async transport for a gateway."""
+        with cls._lock:
+            transport = cls._transports.get(gateway)
+            if transport is None or transport.transport is not GatewayTransport.for_gateway(gateway, base_url):
+                transport = cls(GatewayTransport.for_gateway(gateway, base_url))
+                cls._transports[gateway] = transport
+            return transport
+    
+    async def request(self, method: str, path: str, idempotency_key: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        """Send a request and return the decoded JSON body."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            lambda: self.transport.request(method, path, idempotency_key=idempotency_key, **kwargs)
+        )
@@ -1,16 +1,33 @@
 import paypalrestsdk
 from django.conf import settings
 
+from infrastructure.services.gateway_transport import GatewayTransport
+
+
+class PooledPayPalApi(paypalrestsdk.Api):
+    """PayPal SDK API that sends requests through the shared gateway transport."""
+    
+    def __init__(self, options=None, transport: GatewayTransport = None, **kwargs):
+        super().__init__(options, **kwargs)
+        self.transport = transport
+    
+    def http_call(self, url, method, **kwargs):
+        response = self.transport.send(method, url, **kwargs)
+        return self.handle_response(response, response.content.decode('utf-8'))
+
 
 class PayPalClient:
     """PayPal payment gateway client for USD payments."""
     
     def __init__(self):
-        self.api = paypalrestsdk.Api({
+        options = {
             "mode": settings.PAYPAL_MODE,
             "client_id": settings.PAYPAL_CLIENT_ID,
             "client_secret": settings.PAYPAL_CLIENT_SECRET
-        })
+        }
+        if settings.PAYPAL_API_BASE:
+            options["endpoint"] = settings.PAYPAL_API_BASE
+        self.api = PooledPayPalApi(options, transport=GatewayTransport.for_gateway('paypal'))
     
     def check_connection(self):
         """Verify PayPal API connection."""
@@ -1,57 +1,111 @@
 import stripe
 from decimal import Decimal
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Optional
 from django.conf import settings
 
+from infrastructure.services.gateway_transport import GatewayTransport, CircuitOpenError
+
+
+# Errors that mean Stripe itself is unhealthy, as opposed to a declined or
+# invalid request; only these count against the circuit breaker.
+STRIPE_UNAVAILABLE_ERRORS = (
+    stripe.error.APIConnectionError,
+    stripe.error.APIError,
+    stripe.error.RateLimitError,
+)
+
 
 class StripeClient:
     """Stripe payment gateway client for USD payments."""
     
     def __init__(self):
         stripe.api_key = settings.STRIPE_SECRET_KEY
+        stripe.api_base = settings.STRIPE_API_BASE
         self.publishable_key = settings.STRIPE_PUBLISHABLE_KEY
+        self.transport = GatewayTransport.for_gateway('stripe', settings.STRIPE_API_BASE)
+        
+        # The SDK keeps its own request/retry logic; point it at the shared
+        # keep-alive pool and timeouts. SDK retries reuse one idempotency key.
+        http_client = stripe.default_http_client
+        if getattr(http_client, 'transport', None) is not self.transport:
+            http_client = stripe.RequestsClient(timeout=self.transport.timeout, session=self.transport.session)
+            http_client.transport = self.transport
+            stripe.default_http_client = http_client
+        stripe.max_network_retries = self.transport.max_retries
+    
+    def _call(self, operation: Callable, **params) -> Any:
+        """Run an SDK call behind the Stripe circuit breaker."""
+        breaker = self.transport.breaker
+        breaker.before_call()
+        try:
+            result = operation(**params)
+        except STRIPE_UNAVAILABLE_ERRORS:
+            breaker.record_failure()
+            raise
+        except stripe.error.StripeError:
+            # Stripe answered, e.g. with a decline, so it is reachable
+            breaker.record_success()
+            raise
+        except BaseException:
+            # Never leave a half-open probe claimed
+            breaker.release()
+            raise
+        breaker.record_success()
+        return result
     
     def check_connection(self):
         """Verify Stripe API connection."""
         try:
-            stripe.Account.retrieve()
+            self._call(stripe.Account.retrieve)
             return True
         except Exception as e:
             raise Exception(f"Stripe connection failed: {str(e)}")
     
-    def create_payment_intent(self, amount: Decimal, currency: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    def create_payment_intent(
+        self,
+        amount: Decimal,
+        currency: str,
+        metadata: Dict[str, Any],
+        idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Create a payment intent."""
+        params = {
+            'amount': int(amount * 100),  # Convert to cents
+            'currency': currency.lower(),
+            'metadata': metadata,
+        }
+        if idempotency_key:
+            params['idempotency_key'] = idempotency_key
         try:
-            intent = stripe.PaymentIntent.create(
-                amount=int(amount * 100),  # Convert to cents
-                currency=currency.lower(),
-                metadata=metadata
-            )
+            intent = self._call(stripe.PaymentIntent.create, **params)
             return {
                 'success': True,
                 'transaction_id': intent.id,
                 'status': intent.status,
                 'client_secret': intent.client_secret
             }
-        except stripe.error.StripeError as e:
+        except (stripe.error.StripeError, CircuitOpenError) as e:
             return {
                 'success': False,
                 'error': str(e)
             }
     
-    def refund_payment(self, transaction_id: str, amount: Decimal) -> Dict[str, Any]:
+    def refund_payment(self, transaction_id: str, amount: Decimal, idempotency_key: Optional[str] = None) -> Dict[str, Any]:
         """Refund a payment."""
+        params = {
+            'payment_intent': transaction_id,
+            'amount': int(amount * 100),
+        }
+        if idempotency_key:
+            params['idempotency_key'] = idempotency_key
         try:
-            refund = stripe.Refund.create(
-                payment_intent=transaction_id,
-                amount=int(amount * 100)
-            )
+            refund = self._call(stripe.Refund.create, **params)
             return {
                 'success': True,
                 'refund_id': refund.id,
                 'status': refund.status
             }
-        except stripe.error.StripeError as e:
+        except (stripe.error.StripeError, CircuitOpenError) as e:
             return {
                 'success': False,
                 'error': str(e)
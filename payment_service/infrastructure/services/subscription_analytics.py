@@ -1,7 +1,29 @@
+from datetime import date, datetime, time, timedelta
 from decimal import Decimal
-from typing import Dict
-from django.db.models import Count, Sum
-from domain.subscription import Subscription
+from typing import Dict, List, Optional
+from django.db.models import Case, Count, DecimalField, F, Q, Sum, Value, When
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+from domain.subscription import Subscription, SubscriptionSnapshot
+
+
+# Yearly revenue of one subscription, normalised by billing cycle. Summed in
+# SQL and divided by 12 once, so MRR stays exact without per-row division.
+ANNUALIZED_AMOUNT = Case(
+    When(billing_cycle='monthly', then=F('amount') * 12),
+    When(billing_cycle='quarterly', then=F('amount') * 4),
+    When(billing_cycle='yearly', then=F('amount')),
+    default=Value(Decimal('0')),
+    output_field=DecimalField(max_digits=16, decimal_places=2)
+)
+
+METRIC_AGGREGATES = {
+    'total_count': Count('id'),
+    'active_count': Count('id', filter=Q(status='active')),
+    'paused_count': Count('id', filter=Q(status='paused')),
+    'cancelled_count': Count('id', filter=Q(status='cancelled')),
+    'annual_revenue': Sum(ANNUALIZED_AMOUNT, filter=Q(status='active')),
+}
 
 
 class SubscriptionAnalytics:
@@ -13,35 +35,98 @@ class SubscriptionAnalytics:
     
     def get_monthly_recurring_revenue(self) -> Decimal:
         """Calculate monthly recurring revenue (MRR)."""
-        subscriptions = Subscription.objects.filter(status='active')
-        
-        mrr = Decimal('0')
-        for sub in subscriptions:
-            if sub.billing_cycle == 'monthly':
-                mrr += sub.amount
-            elif sub.billing_cycle == 'quarterly':
-                mrr += sub.amount / 3
-            elif sub.billing_cycle == 'yearly':
-                mrr += sub.amount / 12
-        
-        return mrr
+        annual = Subscription.objects.aggregate(annual_revenue=METRIC_AGGREGATES['annual_revenue'])['annual_revenue']
+        return (annual or Decimal('0')) / 12
     
     def get_churn_rate(self) -> float:
         """Calculate subscription churn rate."""
-        total_count = Subscription.objects.count()
-        if total_count == 0:
-            return 0.0
-        
-        cancelled_count = Subscription.objects.filter(status='cancelled').count()
-        return (cancelled_count / total_count) * 100
+        counts = Subscription.objects.aggregate(
+            total_count=METRIC_AGGREGATES['total_count'],
+            cancelled_count=METRIC_AGGREGATES['cancelled_count']
+        )
+        return self._churn_rate(counts['cancelled_count'], counts['total_count'])
     
     def get_subscription_metrics(self) -> Dict:
-        """Get comprehensive subscription metrics."""
-        return {
-            'active_count': self.get_active_subscriptions_count(),
-            'mrr': self.get_monthly_recurring_revenue(),
-            'churn_rate': self.get_churn_rate(),
-            'total_count': Subscription.objects.count(),
-            'paused_count': Subscription.objects.filter(status='paused').count(),
-            'cancelled_count': Subscription.objects.filter(status='cancelled').count(),
+        """Get comprehensive subscription metrics in a single query."""
+        metrics = Subscription.objects.aggregate(**METRIC_AGGREGATES)
+        annual = metrics.pop('annual_revenue') or Decimal('0')
+        metrics['mrr'] = annual / 12
+        metrics['churn_rate'] = self._churn_rate(metrics['cancelled_count'], metrics['total_count'])
+        return metrics
+    
+    def take_snapshot(self, day: Optional[date] = None) -> SubscriptionSnapshot:
+        """Record the current metrics as the snapshot for a day (default today).
+        
+        Status counts and MRR reflect the moment the snapshot is taken, so it
+        is meant to run once at the end of each day; new and churned counts
+        come from the day's start and cancellation timestamps. For a past day
+        only new and churned counts can be rebuilt, so only those are
+        written. Future days raise ValueError.
+        """
+        today = timezone.localdate()
+        day = day or today
+        if day > today:
+            raise ValueError(f"Cannot snapshot {day}: it is in the future")
+        day_start = timezone.make_aware(datetime.combine(day, time.min))
+        day_end = day_start + timedelta(days=1)
+        
+        aggregates = {
+            'new_count': Count('id', filter=Q(start_date__gte=day_start, start_date__lt=day_end)),
+            'churned_count': Count('id', filter=Q(cancelled_at__gte=day_start, cancelled_at__lt=day_end)),
         }
+        if day == today:
+            aggregates.update(METRIC_AGGREGATES)
+        metrics = Subscription.objects.aggregate(**aggregates)
+        if day == today:
+            annual = metrics.pop('annual_revenue') or Decimal('0')
+            metrics['mrr'] = (annual / 12).quantize(Decimal('0.01'))
+        
+        snapshot, _ = SubscriptionSnapshot.objects.update_or_create(date=day, defaults=metrics)
+        return snapshot
+    
+    def get_metrics_series(self, start: date, end: date) -> List[Dict]:
+        """Daily MRR and churn between two dates, read from snapshots."""
+        snapshots = SubscriptionSnapshot.objects.filter(date__gte=start, date__lte=end)
+        return [
+            {
+                'date': snapshot.date,
+                'mrr': snapshot.mrr,
+                'active_count': snapshot.active_count,
+                'new_count': snapshot.new_count,
+                'churned_count': snapshot.churned_count,
+                'churn_rate': snapshot.churn_rate(),
+            }
+            for snapshot in snapshots
+        ]
+    
+    def get_cohort_churn(self, start: Optional[date] = None, end: Optional[date] = None) -> List[Dict]:
+        """Churn per monthly signup cohort, grouped in the database."""
+        queryset = Subscription.objects.all()
+        if start is not None:
+            queryset = queryset.filter(start_date__gte=timezone.make_aware(datetime.combine(start, time.min)))
+        if end is not None:
+            queryset = queryset.filter(start_date__lt=timezone.make_aware(datetime.combine(end, time.min)))
+        
+        cohorts = queryset.annotate(cohort=TruncMonth('start_date')).values('cohort').annotate(
+            size=Count('id'),
+            active_count=Count('id', filter=Q(status='active')),
+            cancelled_count=Count('id', filter=Q(status='cancelled')),
+        ).order_by('cohort')
+        
+        return [
+            {
+                'cohort': cohort['cohort'].date(),
+                'size': cohort['size'],
+                'active_count': cohort['active_count'],
+                'cancelled_count': cohort['cancelled_count'],
+                'churn_rate': self._churn_rate(cohort['cancelled_count'], cohort['size']),
+            }
+            for cohort in cohorts
+        ]
+    
+    @staticmethod
+    def _churn_rate(cancelled_count: int, total_count: int) -> float:
+        """Cancelled share of a subscriber count, in percent."""
+        if total_count == 0:
+            return 0.0
+        return (cancelled_count / total_count) * 100
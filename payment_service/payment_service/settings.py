@@ -142,11 +142,13 @@ RABBITMQ_VHOST = config('RABBITMQ_VHOST', default='/')
 STRIPE_SECRET_KEY = config('STRIPE_SECRET_KEY')
 STRIPE_PUBLISHABLE_KEY = config('STRIPE_PUBLISHABLE_KEY')
 STRIPE_WEBHOOK_SECRET = config('STRIPE_WEBHOOK_SECRET', default='')
+STRIPE_API_BASE = config('STRIPE_API_BASE', default='https://api.stripe.com')
 
 # PayPal Configuration (USD)
 PAYPAL_MODE = config('PAYPAL_MODE', default='sandbox')
 PAYPAL_CLIENT_ID = config('PAYPAL_CLIENT_ID')
 PAYPAL_CLIENT_SECRET = config('PAYPAL_CLIENT_SECRET')
+PAYPAL_API_BASE = config('PAYPAL_API_BASE', default='')
 
 # eSewa Configuration (NPR)
 ESEWA_MERCHANT_ID = config('ESEWA_MERCHANT_ID')
@@ -158,6 +160,34 @@ KHALTI_SECRET_KEY = config('KHALTI_SECRET_KEY')
 KHALTI_PUBLIC_KEY = config('KHALTI_PUBLIC_KEY')
 KHALTI_BASE_URL = config('KHALTI_BASE_URL', default='https://khalti.com')
 
+# Payment Gateway Transport
+GATEWAY_POOL_SIZE = config('GATEWAY_POOL_SIZE', cast=int, default=20)
+GATEWAY_CONNECT_TIMEOUT = config('GATEWAY_CONNECT_TIMEOUT', cast=float, default=3.05)
+GATEWAY_READ_TIMEOUTS = {
+    'stripe': config('STRIPE_READ_TIMEOUT', cast=float, default=20),
+    'paypal': config('PAYPAL_READ_TIMEOUT', cast=float, default=20),
+}
+GATEWAY_MAX_RETRIES = config('GATEWAY_MAX_RETRIES', cast=int, default=2)
+GATEWAY_HEDGE_AFTER = config('GATEWAY_HEDGE_AFTER', cast=float, default=0)  # seconds, 0 disables hedging
+GATEWAY_BREAKER_THRESHOLD = config('GATEWAY_BREAKER_THRESHOLD', cast=int, default=5)
+GATEWAY_BREAKER_RESET = config('GATEWAY_BREAKER_RESET', cast=float, default=30)
+
+# Subscription Billing Runner
+BILLING_WORKERS = config('BILLING_WORKERS', cast=int, default=8)
+BILLING_PAGE_SIZE = config('BILLING_PAGE_SIZE', cast=int, default=200)
+# Declined charges are retried after BILLING_RETRY_BACKOFF_HOURS, doubling each
+# time; the subscription is paused after BILLING_MAX_ATTEMPTS declines.
+BILLING_MAX_ATTEMPTS = config('BILLING_MAX_ATTEMPTS', cast=int, default=4)
+BILLING_RETRY_BACKOFF_HOURS = config('BILLING_RETRY_BACKOFF_HOURS', cast=float, default=24)
+# A running shard whose heartbeat is older than this may be taken over
+BILLING_RUN_LEASE_SECONDS = config('BILLING_RUN_LEASE_SECONDS', cast=int, default=300)
+BILLING_GATEWAY_RATE_LIMITS = {
+    'stripe': config('BILLING_STRIPE_RATE_LIMIT', cast=float, default=25),
+    'paypal': config('BILLING_PAYPAL_RATE_LIMIT', cast=float, default=10),
+    'esewa': config('BILLING_ESEWA_RATE_LIMIT', cast=float, default=10),
+    'khalti': config('BILLING_KHALTI_RATE_LIMIT', cast=float, default=10),
+}
+
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
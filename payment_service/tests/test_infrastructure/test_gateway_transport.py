@@ -0,0 +1,136 @@
+import asyncio
+import time
+from decimal import Decimal
+from django.test import SimpleTestCase, override_settings
+
+from infrastructure.services.fake_gateway import FakeGatewayServer
+from infrastructure.services.gateway_transport import (
+    AsyncGatewayTransport,
+    CircuitBreaker,
+    CircuitOpenError,
+    GatewayError,
+    GatewayTransport,
+)
+
+
+class GatewayTransportTest(SimpleTestCase):
+    """Tests for GatewayTransport against the fake gateway server."""
+    
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = FakeGatewayServer().start()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+        super().tearDownClass()
+    
+    def setUp(self):
+        self.transport = GatewayTransport('stripe', self.server.url, timeout=(1, 2), backoff=0.01)
+    
+    def tearDown(self):
+        self.transport.close()
+    
+    def test_request_reuses_pooled_connection(self):
+        """Test requests share one keep-alive connection."""
+        connections = self.server.connection_count
+        for _ in range(3):
+            self.transport.request('GET', '/v1/account')
+        
+        self.assertEqual(self.server.connection_count, connections + 1)
+    
+    def test_retry_replays_idempotent_request(self):
+        """Test a failed write is retried with the same idempotency key."""
+        self.server.fail_next(1)
+        
+        first = self.transport.request('POST', '/v1/payment_intents', idempotency_key='order-1', data={'amount': 100})
+        second = self.transport.request('POST', '/v1/payment_intents', idempotency_key='order-1', data={'amount': 100})
+        
+        self.assertEqual(first['id'], second['id'])
+    
+    def test_write_without_key_is_not_retried(self):
+        """Test writes without an idempotency key fail on the first error."""
+        self.server.fail_next(1)
+        
+        with self.assertRaises(GatewayError):
+            self.transport.request('POST', '/v1/refunds', data={'amount': 100})
+    
+    def test_circuit_opens_after_failures(self):
+        """Test the breaker short-circuits calls after repeated failures."""
+        transport = GatewayTransport(
+            'khalti', self.server.url, max_retries=0, breaker=CircuitBreaker('khalti', failure_threshold=2, reset_timeout=60)
+        )
+        self.server.fail_next(2)
+        for _ in range(2):
+            with self.assertRaises(GatewayError):
+                transport.request('GET', '/v1/account')
+        
+        count = self.server.request_count
+        with self.assertRaises(CircuitOpenError):
+            transport.request('GET', '/v1/account')
+        self.assertEqual(self.server.request_count, count)
+        transport.close()
+    
+    def test_hedged_request_beats_slow_response(self):
+        """Test a slow read is hedged with a second request."""
+        transport = GatewayTransport('paypal', self.server.url, hedge_after=0.05)
+        self.server.delay_next(1.0)
+        
+        started = time.monotonic()
+        data = transport.request('GET', '/v1/account')
+        
+        self.assertEqual(data['id'], 'acct_fake')
+        self.assertLess(time.monotonic() - started, 0.9)
+        transport.close()
+    
+    def test_async_request(self):
+        """Test the async facade runs requests concurrently."""
+        transport = AsyncGatewayTransport(self.transport)
+        
+        async def lookup_all():
+            return await asyncio.gather(*[
+                transport.request('POST', '/v1/payment_intents', idempotency_key=f'p{i}', data={'amount': i})
+                for i in range(5)
+            ])
+        
+        results = asyncio.run(lookup_all())
+        
+        self.assertEqual([result['amount'] for result in results], list(range(5)))
+
+
+class GatewayClientTest(SimpleTestCase):
+    """Tests for gateway clients using the shared transport."""
+    
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = FakeGatewayServer().start()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+        GatewayTransport.reset()
+        super().tearDownClass()
+    
+    def setUp(self):
+        GatewayTransport.reset()
+    
+    def test_stripe_idempotent_intent(self):
+        """Test the Stripe SDK uses the pooled session and idempotency keys."""
+        from infrastructure.services.stripe_client import StripeClient
+        
+        with override_settings(STRIPE_API_BASE=self.server.url):
+            client = StripeClient()
+            first = client.create_payment_intent(Decimal('10.00'), 'USD', {}, idempotency_key='order-9')
+            second = client.create_payment_intent(Decimal('10.00'), 'USD', {}, idempotency_key='order-9')
+        
+        self.assertTrue(first['success'])
+        self.assertEqual(first['transaction_id'], second['transaction_id'])
+    
+    def test_paypal_token(self):
+        """Test the PayPal SDK sends through the pooled transport."""
+        from infrastructure.services.paypal_client import PayPalClient
+        
+        with override_settings(PAYPAL_API_BASE=self.server.url):
+            self.assertTrue(PayPalClient().check_connection())
@@ -1,7 +1,10 @@
+import time
+import stripe
 from decimal import Decimal
 from django.test import TestCase
 from unittest.mock import patch, MagicMock
 
+from infrastructure.services.gateway_transport import GatewayTransport
 from infrastructure.services.stripe_client import StripeClient
 
 
@@ -9,8 +12,17 @@ class StripeClientTest(TestCase):
     """Tests for StripeClient."""
     
     def setUp(self):
+        GatewayTransport.reset()
         self.client = StripeClient()
     
+    def tearDown(self):
+        GatewayTransport.reset()
+    
+    def _half_open(self):
+        breaker = self.client.transport.breaker
+        breaker.opened_at = time.monotonic() - breaker.reset_timeout - 1
+        return breaker
+    
     @patch('infrastructure.services.stripe_client.stripe.PaymentIntent.create')
     def test_create_payment_intent(self, mock_create):
         """Test creating payment intent."""
@@ -41,3 +53,26 @@ class StripeClientTest(TestCase):
         
         self.assertTrue(result['success'])
         self.assertEqual(result['refund_id'], 're_123')
+    
+    @patch('infrastructure.services.stripe_client.stripe.PaymentIntent.create')
+    def test_decline_closes_half_open_breaker(self, mock_create):
+        """Test a decline during the half-open probe shows Stripe is reachable."""
+        mock_create.side_effect = stripe.error.CardError('Card declined', None, 'card_declined')
+        breaker = self._half_open()
+        
+        result = self.client.create_payment_intent(Decimal('100.00'), 'USD', {})
+        
+        self.assertFalse(result['success'])
+        self.assertEqual(breaker.state, 'closed')
+    
+    @patch('infrastructure.services.stripe_client.stripe.PaymentIntent.create')
+    def test_unexpected_error_releases_probe(self, mock_create):
+        """Test an unrelated error does not keep the half-open probe claimed."""
+        mock_create.side_effect = ValueError('bad metadata')
+        breaker = self._half_open()
+        
+        with self.assertRaises(ValueError):
+            self.client.create_payment_intent(Decimal('100.00'), 'USD', {})
+        
+        self.assertEqual(breaker.state, 'half_open')
+        breaker.before_call()
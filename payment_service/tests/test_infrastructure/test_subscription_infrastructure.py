@@ -3,8 +3,9 @@ from decimal import Decimal
 from datetime import timedelta
 from django.test import TestCase
 from django.utils import timezone
-from domain.subscription import Subscription, RecurringPayment
+from domain.subscription import Subscription, RecurringPayment, BillingRun, SubscriptionSnapshot
 from infrastructure.services.billing_engine import BillingEngine
+from infrastructure.services.billing_runner import BillingRunInProgress, BillingRunner, shard_bounds
 from infrastructure.services.subscription_analytics import SubscriptionAnalytics
 from infrastructure.services.billing_notification import BillingNotificationService
 
@@ -56,6 +57,142 @@ class BillingEngineTest(TestCase):
         self.assertEqual(updated_payment.status, "failed")
 
 
+class BillingRunnerTest(TestCase):
+    """Test cases for BillingRunner."""
+    
+    def setUp(self):
+        self.now = timezone.now()
+        self.subscriptions = [
+            Subscription.objects.create(
+                user_id=uuid.uuid4(),
+                plan_name="Test Plan",
+                amount=Decimal("50.00"),
+                billing_cycle="monthly",
+                next_billing_date=self.now - timedelta(minutes=i)
+            )
+            for i in range(7)
+        ]
+    
+    def test_run_bills_every_due_subscription(self):
+        """Test a run pages through all due subscriptions and records metrics."""
+        runner = BillingRunner(workers=4, page_size=3, rate_limits={})
+        run = runner.run()
+        
+        self.assertEqual(run.status, 'completed')
+        self.assertEqual(run.processed, 7)
+        self.assertEqual(run.succeeded, 7)
+        self.assertEqual(RecurringPayment.objects.filter(status='completed').count(), 7)
+        self.assertFalse(Subscription.objects.filter(next_billing_date__lte=self.now).exists())
+        self.assertEqual(run.metrics()['processed'], 7)
+    
+    def test_declined_charge_is_failed(self):
+        """Test a gateway error fails the payment without advancing billing."""
+        declined = self.subscriptions[0]
+        
+        def charge(payment, idempotency_key):
+            if payment.subscription_id == declined.id:
+                raise Exception("Card declined")
+            return f"txn_{idempotency_key}"
+        
+        runner = BillingRunner(gateways={'stripe': charge}, rate_limits={}, collect_results=True)
+        run = runner.run()
+        
+        self.assertEqual(run.failed, 1)
+        self.assertEqual(RecurringPayment.objects.get(subscription_id=declined.id).status, 'failed')
+        declined.refresh_from_db()
+        self.assertLessEqual(declined.next_billing_date, self.now)
+        failures = [result for result in runner.results if result['status'] == 'failed']
+        self.assertEqual(failures[0]['error'], "Card declined")
+    
+    def test_resumed_run_does_not_charge_twice(self):
+        """Test resuming after a crash reuses idempotency keys and the checkpoint."""
+        keys = []
+        
+        def crashing_charge(payment, idempotency_key):
+            keys.append(idempotency_key)
+            if len(keys) > 3:
+                raise KeyboardInterrupt
+            return f"txn_{idempotency_key}"
+        
+        with self.assertRaises(KeyboardInterrupt):
+            BillingRunner(gateways={'stripe': crashing_charge}, rate_limits={}, workers=1, page_size=3).run()
+        
+        def charge(payment, idempotency_key):
+            keys.append(idempotency_key)
+            return f"txn_{idempotency_key}"
+        
+        run = BillingRunner(gateways={'stripe': charge}, rate_limits={}, workers=1, page_size=3).run()
+        
+        self.assertEqual(BillingRun.objects.count(), 1)
+        self.assertEqual(run.succeeded, 7)
+        self.assertEqual(RecurringPayment.objects.count(), 7)
+        self.assertEqual(len(set(keys)), 7)
+    
+    def test_declined_charge_is_retried_after_backoff(self):
+        """Test a later run retries a declined period with a fresh idempotency key."""
+        declined = self.subscriptions[0]
+        keys = []
+        
+        def decline_once(payment, idempotency_key):
+            if payment.subscription_id == declined.id:
+                keys.append(idempotency_key)
+                if len(keys) == 1:
+                    raise Exception("Card declined")
+            return f"txn_{idempotency_key}"
+        
+        BillingRunner(gateways={'stripe': decline_once}, rate_limits={}).run()
+        payment = RecurringPayment.objects.get(subscription_id=declined.id)
+        self.assertEqual(payment.attempt_count, 1)
+        self.assertEqual(payment.last_error, "Card declined")
+        
+        run = BillingRunner(gateways={'stripe': decline_once}, rate_limits={}).run(resume=False)
+        self.assertEqual(run.skipped, 1)
+        self.assertEqual(len(keys), 1)
+        
+        RecurringPayment.objects.filter(id=payment.id).update(next_attempt_at=timezone.now())
+        run = BillingRunner(gateways={'stripe': decline_once}, rate_limits={}).run(resume=False)
+        self.assertEqual(run.succeeded, 1)
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, 'completed')
+        self.assertEqual(payment.attempt_count, 2)
+        self.assertNotEqual(keys[0], keys[1])
+    
+    def test_subscription_paused_after_max_attempts(self):
+        """Test the last allowed decline pauses the subscription."""
+        def decline(payment, idempotency_key):
+            raise Exception("Card declined")
+        
+        with self.settings(BILLING_MAX_ATTEMPTS=2):
+            BillingRunner(gateways={'stripe': decline}, rate_limits={}).run()
+            RecurringPayment.objects.update(next_attempt_at=timezone.now())
+            run = BillingRunner(gateways={'stripe': decline}, rate_limits={}).run(resume=False)
+        
+        self.assertEqual(run.failed, 7)
+        self.assertFalse(RecurringPayment.objects.filter(next_attempt_at__isnull=False).exists())
+        self.assertEqual(Subscription.objects.filter(status='paused').count(), 7)
+    
+    def test_live_run_is_not_taken_over(self):
+        """Test a shard held by a live run cannot be resumed, but a lapsed one can."""
+        run = BillingRun.objects.create(due_before=self.now)
+        
+        with self.assertRaises(BillingRunInProgress):
+            BillingRunner(rate_limits={}).run()
+        self.assertFalse(RecurringPayment.objects.exists())
+        
+        BillingRun.objects.filter(id=run.id).update(heartbeat_at=self.now - timedelta(hours=1))
+        resumed = BillingRunner(rate_limits={}).run()
+        self.assertEqual(resumed.id, run.id)
+        self.assertEqual(resumed.status, 'completed')
+    
+    def test_shards_partition_subscriptions(self):
+        """Test shards cover every subscription exactly once."""
+        for shard_index in range(3):
+            BillingRunner(rate_limits={}).run(shard_index=shard_index, shard_count=3)
+        
+        self.assertEqual(RecurringPayment.objects.count(), 7)
+        self.assertEqual(shard_bounds(2, 3)[1], None)
+
+
 class SubscriptionAnalyticsTest(TestCase):
     """Test cases for SubscriptionAnalytics."""
     
@@ -108,6 +245,69 @@ class SubscriptionAnalyticsTest(TestCase):
         self.assertIn('active_count', metrics)
         self.assertIn('mrr', metrics)
         self.assertIn('churn_rate', metrics)
+    
+    def test_metrics_use_single_query(self):
+        """Test all metrics come from one aggregate with cycle-normalized MRR."""
+        Subscription.objects.create(
+            user_id=uuid.uuid4(),
+            plan_name="Plan 3",
+            amount=Decimal("120.00"),
+            billing_cycle="yearly",
+            next_billing_date=timezone.now() + timedelta(days=365)
+        )
+        
+        with self.assertNumQueries(1):
+            metrics = self.analytics.get_subscription_metrics()
+        
+        self.assertEqual(metrics['mrr'], Decimal("60.00"))
+        self.assertEqual(metrics['total_count'], 3)
+        self.assertEqual(metrics['cancelled_count'], 1)
+    
+    def test_take_snapshot(self):
+        """Test the daily snapshot records counts and churned subscriptions."""
+        subscription = Subscription.objects.get(plan_name="Plan 1")
+        subscription.cancel()
+        
+        snapshot = self.analytics.take_snapshot()
+        self.analytics.take_snapshot()
+        
+        self.assertEqual(SubscriptionSnapshot.objects.count(), 1)
+        self.assertEqual(snapshot.churned_count, 1)
+        self.assertEqual(snapshot.new_count, 2)
+        series = self.analytics.get_metrics_series(snapshot.date, snapshot.date)
+        self.assertEqual(series[0]['mrr'], Decimal("0.00"))
+    
+    def test_past_snapshot_only_backfills_daily_counts(self):
+        """Test a past day keeps its recorded status counts and MRR."""
+        yesterday = timezone.localdate() - timedelta(days=1)
+        SubscriptionSnapshot.objects.create(date=yesterday, active_count=5, mrr=Decimal("99.00"))
+        
+        snapshot = self.analytics.take_snapshot(yesterday)
+        
+        snapshot.refresh_from_db()
+        self.assertEqual(snapshot.active_count, 5)
+        self.assertEqual(snapshot.mrr, Decimal("99.00"))
+        self.assertEqual(snapshot.new_count, 0)
+        with self.assertRaises(ValueError):
+            self.analytics.take_snapshot(timezone.localdate() + timedelta(days=1))
+    
+    def test_get_cohort_churn(self):
+        """Test churn is grouped by signup month."""
+        Subscription.objects.create(
+            user_id=uuid.uuid4(),
+            plan_name="Plan 3",
+            amount=Decimal("10.00"),
+            billing_cycle="monthly",
+            start_date=timezone.now() - timedelta(days=400),
+            next_billing_date=timezone.now()
+        )
+        
+        cohorts = self.analytics.get_cohort_churn()
+        
+        self.assertEqual(len(cohorts), 2)
+        self.assertEqual(cohorts[0]['size'], 1)
+        self.assertEqual(cohorts[1]['size'], 2)
+        self.assertEqual(cohorts[1]['churn_rate'], 50.0)
 
 
 class BillingNotificationServiceTest(TestCase):
@@ -1,12 +1,21 @@
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Optional
 import uuid
-from django.db.models import Count, Q
+from decimal import Decimal
+from django.db.models import Count, Q, Sum
 
 from domain.analytics import RegistrationAnalytics
 from domain.registration import Registration
 from domain.waitlist import Waitlist
 from domain.group_registration import GroupRegistration
 from domain.capacity_rule import CapacityRule
+from infrastructure.services.analytics_cache_service import AnalyticsCacheService
+
+
+METRIC_FIELDS = [
+    'total_registrations', 'confirmed_registrations', 'cancelled_registrations',
+    'total_waitlist', 'promoted_from_waitlist', 'total_groups', 'total_group_members',
+    'capacity_utilization', 'last_updated',
+]
 
 
 class GenerateAnalyticsService:
@@ -14,65 +23,128 @@ class GenerateAnalyticsService:
     
     def execute(self, event_id: uuid.UUID) -> RegistrationAnalytics:
         """Generate or update analytics for an event."""
-        # Get or create analytics
-        analytics, created = RegistrationAnalytics.objects.get_or_create(
-            event_id=event_id
-        )
-        
-        # Calculate registration metrics
-        registrations = Registration.objects.filter(event_id=event_id)
-        analytics.total_registrations = registrations.count()
-        analytics.confirmed_registrations = registrations.filter(status='confirmed').count()
-        analytics.cancelled_registrations = registrations.filter(status='cancelled').count()
+        return self.execute_many([event_id])[0]
+    
+    def execute_many(self, event_ids: Iterable[uuid.UUID]) -> List[RegistrationAnalytics]:
+        """Generate or update analytics for several events at once.
         
-        # Calculate waitlist metrics
-        waitlist = Waitlist.objects.filter(event_id=event_id)
-        analytics.total_waitlist = waitlist.count()
-        analytics.promoted_from_waitlist = waitlist.filter(is_promoted=True).count()
+        Each source table is read with one grouped, conditional-aggregate
+        query covering every event, and the results are upserted in bulk.
+        """
+        event_ids = list(dict.fromkeys(uuid.UUID(str(event_id)) for event_id in event_ids))
+        if not event_ids:
+            return []
         
-        # Calculate group metrics
-        groups = GroupRegistration.objects.filter(event_id=event_id)
-        analytics.total_groups = groups.count()
-        analytics.total_group_members = sum(g.current_size for g in groups)
+        registrations = self._grouped(
+            Registration.objects.filter(event_id__in=event_ids),
+            total=Count('id'),
+            confirmed=Count('id', filter=Q(status='confirmed')),
+            cancelled=Count('id', filter=Q(status='cancelled')),
+        )
+        waitlist = self._grouped(
+            Waitlist.objects.filter(event_id__in=event_ids),
+            total=Count('id'),
+            promoted=Count('id', filter=Q(is_promoted=True)),
+        )
+        groups = self._grouped(
+            GroupRegistration.objects.filter(event_id__in=event_ids),
+            total=Count('id'),
+            members=Sum('current_size'),
+        )
+        capacities = dict(
+            CapacityRule.objects.filter(event_id__in=event_ids).values_list('event_id', 'max_capacity')
+        )
         
-        # Calculate capacity utilization
-        try:
-            capacity_rule = CapacityRule.objects.get(event_id=event_id)
-            analytics.capacity_utilization = analytics.calculate_utilization(
-                capacity_rule.max_capacity
+        rows = []
+        for event_id in event_ids:
+            counts = registrations.get(event_id, {})
+            waiting = waitlist.get(event_id, {})
+            grouped = groups.get(event_id, {})
+            analytics = RegistrationAnalytics(
+                event_id=event_id,
+                total_registrations=counts.get('total', 0),
+                confirmed_registrations=counts.get('confirmed', 0),
+                cancelled_registrations=counts.get('cancelled', 0),
+                total_waitlist=waiting.get('total', 0),
+                promoted_from_waitlist=waiting.get('promoted', 0),
+                total_groups=grouped.get('total', 0),
+                total_group_members=grouped.get('members') or 0,
             )
-        except CapacityRule.DoesNotExist:
-            analytics.capacity_utilization = 0
+            max_capacity = capacities.get(event_id)
+            analytics.capacity_utilization = (
+                analytics.calculate_utilization(max_capacity).quantize(Decimal('0.01'))
+                if max_capacity is not None else 0
+            )
+            rows.append(analytics)
         
-        analytics.save()
-        return analytics
+        RegistrationAnalytics.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['event_id'],
+            update_fields=METRIC_FIELDS,
+        )
+        # Re-read so existing rows come back with their own ids
+        saved = RegistrationAnalytics.objects.in_bulk(event_ids, field_name='event_id')
+        return [saved[event_id] for event_id in event_ids]
+    
+    @staticmethod
+    def _grouped(queryset, **aggregates) -> Dict[uuid.UUID, Dict[str, Any]]:
+        return {
+            row.pop('event_id'): row
+            for row in queryset.order_by().values('event_id').annotate(**aggregates)
+        }
+
+
+def build_report(analytics: RegistrationAnalytics) -> Dict[str, Any]:
+    """Shape an analytics row as a registration report."""
+    return {
+        'event_id': str(analytics.event_id),
+        'registrations': {
+            'total': analytics.total_registrations,
+            'confirmed': analytics.confirmed_registrations,
+            'cancelled': analytics.cancelled_registrations,
+        },
+        'waitlist': {
+            'total': analytics.total_waitlist,
+            'promoted': analytics.promoted_from_waitlist,
+            'conversion_rate': float(analytics.get_conversion_rate()),
+        },
+        'groups': {
+            'total_groups': analytics.total_groups,
+            'total_members': analytics.total_group_members,
+        },
+        'capacity': {
+            'utilization': float(analytics.capacity_utilization),
+        },
+    }
 
 
 class RegistrationReportService:
     """Service for generating registration reports."""
     
+    def __init__(self, cache_service: Optional[AnalyticsCacheService] = None):
+        self.cache_service = cache_service or AnalyticsCacheService()
+    
     def execute(self, event_id: uuid.UUID) -> Dict[str, Any]:
         """Generate comprehensive registration report."""
-        analytics_service = GenerateAnalyticsService()
-        analytics = analytics_service.execute(event_id)
+        return self.execute_many([event_id])[0]
+    
+    def execute_many(self, event_ids: Iterable[uuid.UUID]) -> List[Dict[str, Any]]:
+        """Reports for several events, served from cache where possible.
         
-        return {
-            'event_id': str(event_id),
-            'registrations': {
-                'total': analytics.total_registrations,
-                'confirmed': analytics.confirmed_registrations,
-                'cancelled': analytics.cancelled_registrations,
-            },
-            'waitlist': {
-                'total': analytics.total_waitlist,
-                'promoted': analytics.promoted_from_waitlist,
-                'conversion_rate': float(analytics.get_conversion_rate()),
-            },
-            'groups': {
-                'total_groups': analytics.total_groups,
-                'total_members': analytics.total_group_members,
-            },
-            'capacity': {
-                'utilization': float(analytics.capacity_utilization),
-            },
-        }
+        Cached reports are fetched in one round trip; the rest are generated
+        together and cached until a registration change invalidates them.
+        """
+        event_ids = list(dict.fromkeys(uuid.UUID(str(event_id)) for event_id in event_ids))
+        reports = self.cache_service.get_cached_reports(event_ids)
+        
+        missing = [event_id for event_id in event_ids if event_id not in reports]
+        if missing:
+            fresh = {
+                analytics.event_id: build_report(analytics)
+                for analytics in GenerateAnalyticsService().execute_many(missing)
+            }
+            self.cache_service.cache_reports(fresh)
+            reports.update(fresh)
+        
+        return [reports[event_id] for event_id in event_ids]
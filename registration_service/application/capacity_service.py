@@ -1,37 +1,74 @@
-from typing import Dict, Any
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
 import uuid
 from django.core.exceptions import ValidationError
 
 from domain.capacity_rule import CapacityRule
-from domain.registration import Registration
+from infrastructure.services.analytics_cache_service import AnalyticsCacheService
+from infrastructure.services.capacity_tracking_service import CapacityTrackingService
+
+
+def _get_rule(event_id: uuid.UUID) -> CapacityRule:
+    try:
+        return CapacityRule.objects.get(event_id=event_id)
+    except CapacityRule.DoesNotExist:
+        raise ValidationError('Capacity rule not found for event', code='not_found')
 
 
 class CapacityManagementService:
     """Service for managing event capacity."""
     
+    def __init__(self, tracker: Optional[CapacityTrackingService] = None):
+        self.tracker = tracker or CapacityTrackingService()
+    
     def execute(self, event_id: uuid.UUID) -> Dict[str, Any]:
         """Get capacity information for an event."""
-        try:
-            rule = CapacityRule.objects.get(event_id=event_id)
-        except CapacityRule.DoesNotExist:
-            raise ValidationError('Capacity rule not found for event')
+        rule = _get_rule(event_id)
         
-        confirmed_count = Registration.objects.filter(
-            event_id=event_id,
-            status='confirmed'
-        ).count()
+        confirmed_count = self.tracker.get_registered_count(event_id)
+        held_count = self.tracker.get_held_count(event_id)
+        claimed = confirmed_count + held_count
         
         return {
             'event_id': str(event_id),
             'max_capacity': rule.max_capacity,
             'confirmed_count': confirmed_count,
-            'available': rule.available_spots(confirmed_count),
-            'is_at_capacity': rule.is_at_capacity(confirmed_count),
-            'is_near_capacity': rule.is_near_capacity(confirmed_count),
+            'held_count': held_count,
+            'available': rule.available_spots(claimed),
+            'is_at_capacity': rule.is_at_capacity(claimed),
+            'is_near_capacity': rule.is_near_capacity(claimed),
             'warning_threshold': rule.warning_threshold,
         }
 
 
+class CapacityReservationService:
+    """Service for holding seats while a registration is completed."""
+    
+    def __init__(self, tracker: Optional[CapacityTrackingService] = None):
+        self.tracker = tracker or CapacityTrackingService()
+    
+    def reserve(self, event_id: uuid.UUID) -> Dict[str, Any]:
+        """Hold a seat for the rule's reservation timeout."""
+        rule = _get_rule(event_id)
+        if not rule.allow_reservations:
+            raise ValidationError('Reservations are not allowed for this event', code='reservations_disabled')
+        
+        hold = self.tracker.reserve(event_id, rule.max_capacity, rule.reservation_timeout_minutes * 60)
+        if hold is None:
+            raise ValidationError('Event is at full capacity', code='full')
+        
+        return {
+            'event_id': str(event_id),
+            'hold_id': hold['hold_id'],
+            'expires_at': datetime.fromtimestamp(hold['expires_at'], tz=timezone.utc),
+        }
+    
+    def release(self, event_id: uuid.UUID, hold_id: str) -> None:
+        """Give a held seat back."""
+        if not self.tracker.release(event_id, hold_id):
+            raise ValidationError('Reservation not found')
+
+
 class CreateCapacityRuleService:
     """Service for creating capacity rules."""
     
@@ -46,4 +83,5 @@ class CreateCapacityRuleService:
         )
         rule.clean()
         rule.save()
+        AnalyticsCacheService().invalidate_on_commit(rule.event_id)
         return rule
@@ -1,8 +1,10 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, TextIO
+import csv
 import uuid
 from django.core.exceptions import ValidationError
 
 from domain.registration_form import RegistrationForm, CustomField
+from infrastructure.services.form_validator import FormValidator, FormValidatorRegistry
 
 
 class CreateRegistrationFormService:
@@ -24,6 +26,8 @@ class CreateRegistrationFormService:
                 is_required=field_data.get('is_required', False),
                 order=field_data.get('order', 0),
                 options=field_data.get('options'),
+                min_length=field_data.get('min_length'),
+                max_length=field_data.get('max_length'),
             )
             field.clean()
             field.save()
@@ -36,28 +40,65 @@ class ValidateRegistrationDataService:
     
     def execute(self, form_id: uuid.UUID, data: Dict[str, Any]) -> bool:
         """Validate form submission data."""
-        try:
-            form = RegistrationForm.objects.get(id=form_id)
-        except RegistrationForm.DoesNotExist:
+        validator = FormValidatorRegistry.get(form_id)
+        if validator is None:
             raise ValidationError('Form not found')
+        return self._validate(validator, data)
+    
+    def execute_for_event(self, event_id: uuid.UUID, data: Dict[str, Any]) -> uuid.UUID:
+        """Validate a submission against an event's form and return the form id."""
+        validator = FormValidatorRegistry.get_for_event(event_id)
+        if validator is None:
+            raise ValidationError('Form not found for event')
+        self._validate(validator, data)
+        return validator.form_id
+    
+    def _validate(self, validator: FormValidator, data: Dict[str, Any]) -> bool:
+        errors = validator.validate(data)
+        if errors:
+            raise ValidationError(errors)
+        return True
+
+
+class BulkValidateRegistrationDataService:
+    """Service for validating attendee imports against a registration form."""
+    
+    def execute(self, form_id: uuid.UUID, csv_file: TextIO,
+                max_errors: Optional[int] = 1000) -> Dict[str, Any]:
+        """Validate every row of a CSV file whose header names the form fields.
         
-        fields = form.fields.all()
-        errors = {}
+        Rows are streamed, so memory stays flat however large the file is.
+        Errors are reported per row (numbered from 1, after the header) up to
+        `max_errors`; the totals always cover the whole file.
+        """
+        validator = FormValidatorRegistry.get(form_id)
+        if validator is None:
+            raise ValidationError('Form not found')
         
-        for field in fields:
-            field_value = data.get(field.label)
-            
-            if field.is_required and not field_value:
-                errors[field.label] = 'This field is required'
-            
-            if field_value and field.field_type == 'email':
-                if '@' not in str(field_value):
-                    errors[field.label] = 'Invalid email format'
+        reader = csv.DictReader(csv_file)
+        if reader.fieldnames is None:
+            raise ValidationError('CSV file is empty')
         
-        if errors:
-            raise ValidationError(errors)
+        total_rows = invalid_rows = 0
+        errors = []
+        for row_number, row in enumerate(reader, start=1):
+            total_rows = row_number
+            row_errors = validator.validate(row)
+            if not row_errors:
+                continue
+            invalid_rows += 1
+            if max_errors is None or len(errors) < max_errors:
+                errors.append({'row': row_number, 'errors': row_errors})
         
-        return True
+        return {
+            'form_id': str(validator.form_id),
+            'total_rows': total_rows,
+            'valid_rows': total_rows - invalid_rows,
+            'invalid_rows': invalid_rows,
+            'missing_columns': [label for label in validator.labels if label not in reader.fieldnames],
+            'errors': errors,
+            'errors_truncated': invalid_rows > len(errors),
+        }
 
 
 class GetRegistrationFormService:
@@ -5,6 +5,7 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 
 from domain.group_registration import GroupRegistration, GroupMember
+from infrastructure.services.analytics_cache_service import AnalyticsCacheService
 
 
 class CreateGroupRegistrationService:
@@ -31,6 +32,7 @@ class CreateGroupRegistrationService:
         )
         group.clean()
         group.save()
+        AnalyticsCacheService().invalidate_on_commit(group.event_id)
         return group
 
 
@@ -66,6 +68,7 @@ class AddGroupMemberService:
         group.current_size += 1
         group.calculate_total()
         group.save()
+        AnalyticsCacheService().invalidate_on_commit(group.event_id)
         
         return member
 
@@ -85,6 +88,7 @@ class ConfirmGroupRegistrationService:
         
         group.status = 'confirmed'
         group.save()
+        AnalyticsCacheService().invalidate_on_commit(group.event_id)
         return group
 
 
@@ -101,4 +105,5 @@ class CancelGroupRegistrationService:
         group.status = 'cancelled'
         group.cancelled_at = timezone.now()
         group.save()
+        AnalyticsCacheService().invalidate_on_commit(group.event_id)
         return group
@@ -0,0 +1,94 @@
+from typing import Any, Iterator, Optional
+import csv
+import json
+import os
+import uuid
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import transaction
+
+from domain.registration_import import RegistrationImport
+from infrastructure.repositories.registration_repository import RegistrationRepository
+from infrastructure.services.registration_importer import import_storage
+from infrastructure.tasks.registration_tasks import import_registrations
+
+
+EXPORT_FIELDS = [
+    'id', 'user_id', 'status', 'attendee_name', 'attendee_email',
+    'attendee_phone', 'registered_at', 'cancelled_at',
+]
+
+FORMATS = dict(RegistrationImport.FORMAT_CHOICES)
+
+
+class ImportRegistrationsService:
+    """Service for starting bulk attendee imports."""
+    
+    def execute(self, event_id: uuid.UUID, upload: File,
+                file_format: Optional[str] = None) -> RegistrationImport:
+        """Stage an uploaded CSV or JSON Lines file and queue its import."""
+        if file_format is None:
+            file_format = os.path.splitext(upload.name or '')[1].lstrip('.').lower()
+        if file_format not in FORMATS:
+            raise ValidationError('File format must be csv or jsonl')
+        
+        job = RegistrationImport(event_id=event_id, file_format=file_format)
+        job.file_name = import_storage().save(f"{job.id}.{file_format}", upload)
+        job.save()
+        
+        transaction.on_commit(lambda: import_registrations.delay(str(job.id)))
+        return job
+
+
+class GetImportStatusService:
+    """Service for checking bulk import progress."""
+    
+    def execute(self, event_id: uuid.UUID, import_id: uuid.UUID) -> RegistrationImport:
+        """Get an import job for an event."""
+        try:
+            return RegistrationImport.objects.get(id=import_id, event_id=event_id)
+        except RegistrationImport.DoesNotExist:
+            raise ValidationError('Import not found')
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to csv.writer."""
+    
+    def write(self, value: str) -> str:
+        return value
+
+
+class ExportRegistrationsService:
+    """Service for streaming an event's registrations."""
+    
+    def __init__(self, repository: Optional[RegistrationRepository] = None):
+        self.repository = repository or RegistrationRepository()
+    
+    def execute(self, event_id: uuid.UUID, file_format: str = 'csv',
+                status: Optional[str] = None) -> Iterator[str]:
+        """Yield the export line by line, never holding all rows in memory."""
+        if file_format not in FORMATS:
+            raise ValidationError('File format must be csv or jsonl')
+        
+        rows = self.repository.iter_event_registrations(event_id, EXPORT_FIELDS, status=status)
+        if file_format == 'csv':
+            return self._csv(rows)
+        return self._jsonl(rows)
+    
+    def _csv(self, rows: Iterator[tuple]) -> Iterator[str]:
+        writer = csv.writer(_Echo())
+        yield writer.writerow(EXPORT_FIELDS)
+        for row in rows:
+            yield writer.writerow([self._text(value) for value in row])
+    
+    def _jsonl(self, rows: Iterator[tuple]) -> Iterator[str]:
+        for row in rows:
+            yield json.dumps(dict(zip(EXPORT_FIELDS, (self._text(value) for value in row)))) + '\n'
+    
+    @staticmethod
+    def _text(value: Any) -> Any:
+        if value is None or isinstance(value, str):
+            return value
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        return str(value)
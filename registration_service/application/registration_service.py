@@ -1,16 +1,47 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import uuid
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError
+from django.db import transaction
 
+from domain.capacity_rule import CapacityRule
 from domain.registration import Registration
+from infrastructure.services.analytics_cache_service import AnalyticsCacheService
+from infrastructure.services.capacity_tracking_service import CapacityTrackingService
 
 
 class RegisterForEventService:
     """Service for registering users for events."""
     
+    def __init__(self, tracker: Optional[CapacityTrackingService] = None):
+        self.tracker = tracker or CapacityTrackingService()
+    
     def execute(self, data: Dict[str, Any]) -> Registration:
-        """Register a user for an event."""
+        """Register a user for an event.
+        
+        For events with a capacity rule, a confirmed registration first
+        claims its seat in Redis - converting the caller's hold if one is
+        given - and gives it back if the row cannot be written.
+        """
+        status = data.get('status', 'confirmed')
+        rule = CapacityRule.objects.filter(event_id=data['event_id']).first() if status == 'confirmed' else None
+        if rule is not None:
+            hold_id = data.get('hold_id')
+            if hold_id:
+                claimed = self.tracker.confirm(data['event_id'], str(hold_id), rule.max_capacity)
+            else:
+                claimed = self.tracker.acquire(data['event_id'], rule.max_capacity)
+            if not claimed:
+                raise ValidationError('Event is at full capacity')
+        
+        try:
+            return self._create(data, status)
+        except Exception:
+            if rule is not None:
+                self.tracker.adjust(data['event_id'], -1)
+            raise
+    
+    def _create(self, data: Dict[str, Any], status: str) -> Registration:
         try:
             registration = Registration(
                 event_id=data['event_id'],
@@ -18,10 +49,11 @@ class RegisterForEventService:
                 attendee_name=data['attendee_name'],
                 attendee_email=data['attendee_email'],
                 attendee_phone=data.get('attendee_phone', ''),
-                status=data.get('status', 'confirmed'),
+                status=status,
             )
             registration.clean()
             registration.save()
+            AnalyticsCacheService().invalidate_on_commit(registration.event_id)
             return registration
         except IntegrityError:
             raise ValidationError('User is already registered for this event')
@@ -30,6 +62,9 @@ class RegisterForEventService:
 class CancelRegistrationService:
     """Service for cancelling registrations."""
     
+    def __init__(self, tracker: Optional[CapacityTrackingService] = None):
+        self.tracker = tracker or CapacityTrackingService()
+    
     def execute(self, event_id: uuid.UUID, user_id: uuid.UUID) -> Registration:
         """Cancel a registration."""
         try:
@@ -40,27 +75,34 @@ class CancelRegistrationService:
         except Registration.DoesNotExist:
             raise ValidationError('Registration not found')
         
-        registration.cancel()
+        was_confirmed = registration.status == 'confirmed'
+        with transaction.atomic():
+            registration.cancel()
+            if was_confirmed:
+                transaction.on_commit(lambda: self.tracker.adjust(event_id, -1))
+            AnalyticsCacheService().invalidate_on_commit(event_id)
         return registration
 
 
 class CheckCapacityService:
     """Service for checking event capacity."""
     
+    def __init__(self, tracker: Optional[CapacityTrackingService] = None):
+        self.tracker = tracker or CapacityTrackingService()
+    
     def execute(self, event_id: uuid.UUID, max_capacity: int) -> Dict[str, Any]:
         """Check if event has capacity."""
-        confirmed_count = Registration.objects.filter(
-            event_id=event_id,
-            status='confirmed'
-        ).count()
+        confirmed_count = self.tracker.get_registered_count(event_id)
+        held_count = self.tracker.get_held_count(event_id)
         
-        available = max_capacity - confirmed_count
+        available = max_capacity - confirmed_count - held_count
         has_capacity = available > 0
         
         return {
             'event_id': str(event_id),
             'max_capacity': max_capacity,
             'confirmed_count': confirmed_count,
+            'held_count': held_count,
             'available': available,
             'has_capacity': has_capacity,
         }
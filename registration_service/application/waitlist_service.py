@@ -1,41 +1,54 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import uuid
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError
-from django.db import models
+from django.db import transaction
+from django.utils import timezone
 
+from domain.capacity_rule import CapacityRule
 from domain.waitlist import Waitlist
 from domain.registration import Registration
+from infrastructure.services.analytics_cache_service import AnalyticsCacheService
+from infrastructure.services.capacity_tracking_service import CapacityTrackingService
+from infrastructure.services.waitlist_engine import WaitlistEngine
 
 
 class JoinWaitlistService:
     """Service for joining event waitlist."""
     
+    def __init__(self, engine: Optional[WaitlistEngine] = None):
+        self.engine = engine or WaitlistEngine()
+    
     def execute(self, data: Dict[str, Any]) -> Waitlist:
         """Add user to waitlist."""
+        priority = data.get('priority', 0)
+        # The join sequence comes from an atomic Redis counter, so concurrent
+        # joins can never share a position.
+        sequence = self.engine.join(data['event_id'], data['user_id'], priority)
+        if sequence is None:
+            raise ValidationError('User is already on waitlist for this event')
+        
         try:
-            # Get next position
-            last_position = Waitlist.objects.filter(
-                event_id=data['event_id']
-            ).order_by('-position').first()
-            
-            next_position = (last_position.position + 1) if last_position else 1
-            
             waitlist = Waitlist(
                 event_id=data['event_id'],
                 user_id=data['user_id'],
-                position=next_position,
-                priority=data.get('priority', 0),
+                position=sequence,
+                priority=priority,
             )
             waitlist.save()
+            AnalyticsCacheService().invalidate_on_commit(waitlist.event_id)
             return waitlist
         except IntegrityError:
+            self.engine.remove(data['event_id'], data['user_id'])
             raise ValidationError('User is already on waitlist for this event')
 
 
 class LeaveWaitlistService:
     """Service for leaving waitlist."""
     
+    def __init__(self, engine: Optional[WaitlistEngine] = None):
+        self.engine = engine or WaitlistEngine()
+    
     def execute(self, event_id: uuid.UUID, user_id: uuid.UUID) -> Waitlist:
         """Remove user from waitlist."""
         try:
@@ -47,43 +60,97 @@ class LeaveWaitlistService:
         except Waitlist.DoesNotExist:
             raise ValidationError('Waitlist entry not found')
         
-        position = waitlist.position
+        # Positions are join sequences, so nobody behind needs renumbering
         waitlist.delete()
-        
-        # Update positions of remaining waitlist entries
-        Waitlist.objects.filter(
-            event_id=event_id,
-            position__gt=position
-        ).update(position=models.F('position') - 1)
-        
+        self.engine.remove(event_id, user_id)
+        AnalyticsCacheService().invalidate_on_commit(event_id)
         return waitlist
 
 
 class ProcessWaitlistService:
     """Service for processing waitlist and promoting users."""
     
+    def __init__(
+        self,
+        engine: Optional[WaitlistEngine] = None,
+        tracker: Optional[CapacityTrackingService] = None
+    ):
+        self.engine = engine or WaitlistEngine()
+        self.tracker = tracker or CapacityTrackingService()
+    
     def execute(self, event_id: uuid.UUID, available_spots: int) -> List[Waitlist]:
-        """Promote users from waitlist to registration."""
+        """Promote users from waitlist to registration.
+        
+        The next users are popped off the queue atomically. Users with a
+        waitlisted registration need a seat, claimed in Redis against live
+        holds; if fewer are granted, the queue is cut at the first user left
+        without one and the rest go back. Promotions and confirmations are
+        then one UPDATE each.
+        """
         if available_spots <= 0:
             return []
         
-        # Get waitlist entries ordered by priority then position
-        waitlist_entries = Waitlist.objects.filter(
-            event_id=event_id,
-            is_promoted=False
-        ).order_by('-priority', 'position')[:available_spots]
+        popped = self.engine.pop(event_id, available_spots)
+        if not popped:
+            return []
         
-        promoted = []
-        for entry in waitlist_entries:
-            entry.promote()
-            promoted.append(entry)
+        rule = CapacityRule.objects.filter(event_id=event_id).first()
+        granted = 0
+        if rule is not None:
+            waiting = {
+                str(user_id) for user_id in Registration.objects.filter(
+                    event_id=event_id,
+                    user_id__in=[user_id for user_id, _ in popped],
+                    status='waitlisted'
+                ).values_list('user_id', flat=True)
+            }
+            needed = [index for index, (user_id, _) in enumerate(popped) if user_id in waiting]
+            granted = self.tracker.acquire_many(event_id, rule.max_capacity, len(needed)) if needed else 0
+            if granted < len(needed):
+                cut = needed[granted]
+                self.engine.restore(event_id, popped[cut:])
+                popped = popped[:cut]
+                if not popped:
+                    return []
+        user_ids = [user_id for user_id, _ in popped]
         
-        return promoted
+        now = timezone.now()
+        try:
+            with transaction.atomic():
+                Waitlist.objects.filter(
+                    event_id=event_id,
+                    user_id__in=user_ids,
+                    is_promoted=False
+                ).update(is_promoted=True, promoted_at=now, updated_at=now)
+                confirmed = Registration.objects.filter(
+                    event_id=event_id,
+                    user_id__in=user_ids,
+                    status='waitlisted'
+                ).update(status='confirmed', updated_at=now)
+                AnalyticsCacheService().invalidate_on_commit(event_id)
+        except Exception:
+            if granted:
+                self.tracker.adjust(event_id, -granted)
+            self.engine.restore(event_id, popped)
+            raise
+        
+        # Registrations changed since the seats were claimed give theirs back
+        if confirmed < granted:
+            self.tracker.adjust(event_id, confirmed - granted)
+        
+        entries = {
+            str(entry.user_id): entry
+            for entry in Waitlist.objects.filter(event_id=event_id, user_id__in=user_ids, promoted_at=now)
+        }
+        return [entries[user_id] for user_id in user_ids if user_id in entries]
 
 
 class GetWaitlistPositionService:
     """Service for getting user's waitlist position."""
     
+    def __init__(self, engine: Optional[WaitlistEngine] = None):
+        self.engine = engine or WaitlistEngine()
+    
     def execute(self, event_id: uuid.UUID, user_id: uuid.UUID) -> Dict[str, Any]:
         """Get waitlist position for user."""
         try:
@@ -92,18 +159,15 @@ class GetWaitlistPositionService:
                 user_id=user_id,
                 is_promoted=False
             )
-            
-            # Count users ahead
-            ahead = Waitlist.objects.filter(
-                event_id=event_id,
-                is_promoted=False,
-                position__lt=waitlist.position
-            ).count()
-            
-            return {
-                'position': waitlist.position,
-                'users_ahead': ahead,
-                'joined_at': waitlist.joined_at,
-            }
         except Waitlist.DoesNotExist:
             raise ValidationError('Not on waitlist')
+        
+        ahead = self.engine.rank(event_id, user_id)
+        if ahead is None:
+            raise ValidationError('Not on waitlist')
+        
+        return {
+            'position': ahead + 1,
+            'users_ahead': ahead,
+            'joined_at': waitlist.joined_at,
+        }
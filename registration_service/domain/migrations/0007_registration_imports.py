@@ -0,0 +1,38 @@
+# Generated by Django 6.0.1 on 2026-10-18 15:40
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0006_registrationanalytics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistrationImport',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('event_id', models.UUIDField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('file_format', models.CharField(choices=[('csv', 'CSV'), ('jsonl', 'JSON Lines')], max_length=10)),
+                ('file_name', models.CharField(max_length=255)),
+                ('processed_rows', models.IntegerField(default=0)),
+                ('imported_count', models.IntegerField(default=0)),
+                ('duplicate_count', models.IntegerField(default=0)),
+                ('invalid_count', models.IntegerField(default=0)),
+                ('over_capacity_count', models.IntegerField(default=0)),
+                ('errors', models.JSONField(blank=True, default=list)),
+                ('failure_reason', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'registration_imports',
+                'indexes': [models.Index(fields=['event_id', 'created_at'], name='registratio_event_i_0673f7_idx')],
+            },
+        ),
+    ]
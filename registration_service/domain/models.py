@@ -4,6 +4,7 @@ from .capacity_rule import CapacityRule
 from .registration_form import RegistrationForm, CustomField
 from .group_registration import GroupRegistration, GroupMember
 from .analytics import RegistrationAnalytics
+from .registration_import import RegistrationImport
 
 __all__ = [
     "Registration",
@@ -14,4 +15,5 @@ __all__ = [
     "GroupRegistration",
     "GroupMember",
     "RegistrationAnalytics",
+    "RegistrationImport",
 ]
@@ -0,0 +1,52 @@
+import uuid
+from django.db import models
+
+
+class RegistrationImport(models.Model):
+    """Bulk attendee import job and its progress."""
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('jsonl', 'JSON Lines'),
+    ]
+    
+    MAX_REPORTED_ERRORS = 1000
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    event_id = models.UUIDField()
+    
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    file_format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    file_name = models.CharField(max_length=255)
+    
+    # Progress counters
+    processed_rows = models.IntegerField(default=0)
+    imported_count = models.IntegerField(default=0)
+    duplicate_count = models.IntegerField(default=0)
+    invalid_count = models.IntegerField(default=0)
+    over_capacity_count = models.IntegerField(default=0)
+    
+    # Per-row errors, capped at MAX_REPORTED_ERRORS
+    errors = models.JSONField(default=list, blank=True)
+    failure_reason = models.TextField(blank=True)
+    
+    # Audit fields
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'registration_imports'
+        indexes = [
+            models.Index(fields=['event_id', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"Import {self.id} for Event {self.event_id} ({self.status})"
@@ -12,7 +12,7 @@ class Waitlist(models.Model):
     user_id = models.UUIDField()
     
     # Waitlist details
-    position = models.IntegerField()
+    position = models.IntegerField()  # Join sequence; live rank comes from WaitlistEngine
     priority = models.IntegerField(default=0)  # Higher priority = promoted first
     
     # Status
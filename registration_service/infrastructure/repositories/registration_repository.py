@@ -1,4 +1,4 @@
-from typing import List
+from typing import Iterator, List, Sequence, Tuple
 import uuid
 
 from domain.registration import Registration
@@ -29,3 +29,17 @@ class RegistrationRepository:
             event_id=event_id,
             status='confirmed'
         ).count()
+    
+    def iter_event_registrations(self, event_id: uuid.UUID, fields: Sequence[str],
+                                 status: str = None, chunk_size: int = 2000) -> Iterator[Tuple]:
+        """Stream an event's registrations as value tuples.
+        
+        Uses a server-side cursor where the database supports one, so only
+        `chunk_size` rows are held in memory at a time.
+        """
+        queryset = Registration.objects.filter(event_id=event_id)
+        
+        if status:
+            queryset = queryset.filter(status=status)
+        
+        return queryset.order_by('registered_at', 'id').values_list(*fields).iterator(chunk_size=chunk_size)
@@ -1,6 +1,13 @@
-from typing import List
+from datetime import timedelta
+from typing import List, Tuple
 import uuid
+from django.conf import settings
+from django.db.models import Count, Exists, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
+from domain.capacity_rule import CapacityRule
+from domain.registration import Registration
 from domain.waitlist import Waitlist
 
 
@@ -8,11 +15,11 @@ class WaitlistRepository:
     """Repository for complex waitlist queries."""
     
     def get_event_waitlist(self, event_id: uuid.UUID) -> List[Waitlist]:
-        """Get all waitlist entries for an event."""
+        """Get all waitlist entries for an event, in promotion order."""
         return list(Waitlist.objects.filter(
             event_id=event_id,
             is_promoted=False
-        ).order_by('position'))
+        ).order_by('-priority', 'position'))
     
     def get_waitlist_count(self, event_id: uuid.UUID) -> int:
         """Get count of users on waitlist."""
@@ -20,3 +27,37 @@ class WaitlistRepository:
             event_id=event_id,
             is_promoted=False
         ).count()
+    
+    def get_events_with_free_capacity(self) -> List[Tuple[uuid.UUID, int]]:
+        """Events with waiting users and unclaimed capacity, in one query.
+        
+        Capacity is taken by confirmed registrations and by promoted users
+        who have not confirmed a registration yet. An offer lapses
+        WAITLIST_OFFER_HOURS after promotion and its seat is freed.
+        """
+        offered_since = timezone.now() - timedelta(hours=settings.WAITLIST_OFFER_HOURS)
+        confirmed = Registration.objects.filter(
+            event_id=OuterRef('event_id'),
+            status='confirmed'
+        ).order_by().values('event_id').annotate(count=Count('id')).values('count')
+        
+        pending_offers = Waitlist.objects.filter(
+            event_id=OuterRef('event_id'),
+            is_promoted=True,
+            promoted_at__gte=offered_since
+        ).exclude(
+            Exists(Registration.objects.filter(
+                event_id=OuterRef('event_id'),
+                user_id=OuterRef('user_id'),
+                status='confirmed'
+            ))
+        ).order_by().values('event_id').annotate(count=Count('id')).values('count')
+        
+        rules = CapacityRule.objects.filter(
+            event_id__in=Waitlist.objects.filter(is_promoted=False).values('event_id')
+        ).annotate(
+            taken=Coalesce(Subquery(confirmed, output_field=IntegerField()), Value(0))
+            + Coalesce(Subquery(pending_offers, output_field=IntegerField()), Value(0))
+        ).filter(taken__lt=F('max_capacity')).values_list('event_id', 'max_capacity', 'taken')
+        
+        return [(event_id, max_capacity - taken) for event_id, max_capacity, taken in rules]
@@ -1,7 +1,8 @@
 import uuid
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Iterable
 from django.core.cache import cache
+from django.db import transaction
 
 
 class AnalyticsCacheService:
@@ -9,6 +10,10 @@ class AnalyticsCacheService:
     
     CACHE_TIMEOUT = 300  # 5 minutes
     
+    @staticmethod
+    def _report_key(event_id: uuid.UUID) -> str:
+        return f"analytics_report:{event_id}"
+    
     def cache_analytics(self, event_id: uuid.UUID, data: Dict[str, Any]) -> None:
         """Cache analytics data."""
         key = f"analytics:{event_id}"
@@ -22,7 +27,22 @@ class AnalyticsCacheService:
             return json.loads(data)
         return None
     
+    def cache_reports(self, reports: Dict[uuid.UUID, Dict[str, Any]]) -> None:
+        """Cache registration reports, keyed by event."""
+        cache.set_many(
+            {self._report_key(event_id): json.dumps(report) for event_id, report in reports.items()},
+            timeout=self.CACHE_TIMEOUT
+        )
+    
+    def get_cached_reports(self, event_ids: Iterable[uuid.UUID]) -> Dict[uuid.UUID, Dict[str, Any]]:
+        """Get the cached reports among `event_ids` in one round trip."""
+        keys = {self._report_key(event_id): event_id for event_id in event_ids}
+        return {keys[key]: json.loads(data) for key, data in cache.get_many(list(keys)).items()}
+    
     def invalidate_cache(self, event_id: uuid.UUID) -> None:
         """Invalidate analytics cache."""
-        key = f"analytics:{event_id}"
-        cache.delete(key)
+        cache.delete_many([f"analytics:{event_id}", self._report_key(event_id)])
+    
+    def invalidate_on_commit(self, event_id: uuid.UUID) -> None:
+        """Invalidate once the current transaction commits, or now outside one."""
+        transaction.on_commit(lambda: self.invalidate_cache(event_id))
@@ -1,10 +1,119 @@
+import time
 import redis
 from django.conf import settings
+from django.db.models import Count
+from typing import Dict, Iterable, Optional
 import uuid
 
+from domain.registration import Registration
+
+
+# KEYS: registered counter
+# ARGV: confirmed count from the database
+PRIME_SCRIPT = """
+redis.call('SET', KEYS[1], ARGV[1], 'NX')
+return tonumber(redis.call('GET', KEYS[1]))
+"""
+
+# KEYS: registered counter, holds zset
+# ARGV: hold_id, now, expires_at, max_capacity
+RESERVE_SCRIPT = """
+local registered = redis.call('GET', KEYS[1])
+if not registered then
+    return -1
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', ARGV[2])
+if tonumber(registered) + redis.call('ZCARD', KEYS[2]) >= tonumber(ARGV[4]) then
+    return 0
+end
+redis.call('ZADD', KEYS[2], ARGV[3], ARGV[1])
+return 1
+"""
+
+# KEYS: registered counter, holds zset
+# ARGV: hold_id, now, max_capacity
+# A live hold always converts. An expired one converts only if a seat is
+# still free, so late confirmations never push the event over capacity.
+CONFIRM_SCRIPT = """
+local registered = redis.call('GET', KEYS[1])
+if not registered then
+    return -1
+end
+local expires_at = redis.call('ZSCORE', KEYS[2], ARGV[1])
+redis.call('ZREM', KEYS[2], ARGV[1])
+if not expires_at or tonumber(expires_at) <= tonumber(ARGV[2]) then
+    redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', ARGV[2])
+    if tonumber(registered) + redis.call('ZCARD', KEYS[2]) >= tonumber(ARGV[3]) then
+        return 0
+    end
+end
+return redis.call('INCR', KEYS[1])
+"""
+
+# KEYS: registered counter, holds zset
+# ARGV: now, max_capacity, requested
+ACQUIRE_MANY_SCRIPT = """
+local registered = redis.call('GET', KEYS[1])
+if not registered then
+    return -1
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+local free = tonumber(ARGV[2]) - tonumber(registered) - redis.call('ZCARD', KEYS[2])
+local granted = math.max(0, math.min(free, tonumber(ARGV[3])))
+if granted > 0 then
+    redis.call('INCRBY', KEYS[1], granted)
+end
+return granted
+"""
+
+# KEYS: registered counter
+# ARGV: delta
+ADJUST_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return -1
+end
+local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+if value < 0 then
+    redis.call('SET', KEYS[1], 0)
+    return 0
+end
+return value
+"""
+
+# KEYS: registered counter, drift marker
+# ARGV: value read before counting, counted value, drift marker TTL
+# Lowering a counter waits until the same excess is seen on two runs: a
+# registration between its INCR and its commit shows up as a one-off excess.
+RECONCILE_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if current and current ~= ARGV[1] then
+    return 0
+end
+if current and tonumber(current) > tonumber(ARGV[2]) then
+    local seen = ARGV[1] .. ':' .. ARGV[2]
+    if redis.call('GET', KEYS[2]) ~= seen then
+        redis.call('SET', KEYS[2], seen, 'EX', ARGV[3])
+        return 0
+    end
+end
+redis.call('SET', KEYS[1], ARGV[2])
+redis.call('DEL', KEYS[2])
+return 1
+"""
+
 
 class CapacityTrackingService:
-    """Service for tracking event capacity in Redis."""
+    """Service for tracking event capacity in Redis.
+    
+    The registered counter holds confirmed registrations and is loaded from
+    the database once per event. Seats are claimed through holds kept in a
+    sorted set scored by expiry: reserve() adds a hold only if registered
+    plus live holds stays under capacity, confirm() turns it into a
+    registration, release() gives it back. Every check-and-claim is a single
+    Lua call, so concurrent requests can never oversell.
+    """
+    
+    DRIFT_TTL = 3600
     
     def __init__(self):
         self.redis_client = redis.Redis(
@@ -14,24 +123,130 @@ class CapacityTrackingService:
             password=settings.REDIS_PASSWORD if settings.REDIS_PASSWORD else None,
             decode_responses=True
         )
+        self._prime = self.redis_client.register_script(PRIME_SCRIPT)
+        self._reserve = self.redis_client.register_script(RESERVE_SCRIPT)
+        self._confirm = self.redis_client.register_script(CONFIRM_SCRIPT)
+        self._acquire_many = self.redis_client.register_script(ACQUIRE_MANY_SCRIPT)
+        self._adjust = self.redis_client.register_script(ADJUST_SCRIPT)
+        self._reconcile = self.redis_client.register_script(RECONCILE_SCRIPT)
+    
+    @staticmethod
+    def _registered_key(event_id: uuid.UUID) -> str:
+        return f"event:{event_id}:registered"
+    
+    @staticmethod
+    def _holds_key(event_id: uuid.UUID) -> str:
+        return f"event:{event_id}:holds"
+    
+    def prime(self, event_id: uuid.UUID) -> int:
+        """Load the confirmed count from the database unless already cached."""
+        count = self.redis_client.get(self._registered_key(event_id))
+        if count is not None:
+            return int(count)
+        confirmed = Registration.objects.filter(event_id=event_id, status='confirmed').count()
+        return int(self._prime(keys=[self._registered_key(event_id)], args=[confirmed]))
     
     def increment_capacity(self, event_id: uuid.UUID) -> int:
         """Increment registered count for event."""
-        key = f"event:{event_id}:registered"
-        return self.redis_client.incr(key)
+        self.prime(event_id)
+        return self.adjust(event_id, 1)
     
     def decrement_capacity(self, event_id: uuid.UUID) -> int:
         """Decrement registered count for event."""
-        key = f"event:{event_id}:registered"
-        return self.redis_client.decr(key)
+        self.prime(event_id)
+        return self.adjust(event_id, -1)
+    
+    def adjust(self, event_id: uuid.UUID, delta: int) -> int:
+        """Shift a cached counter, never below zero. Returns -1 if not cached."""
+        return int(self._adjust(keys=[self._registered_key(event_id)], args=[delta]))
     
     def get_registered_count(self, event_id: uuid.UUID) -> int:
         """Get current registered count."""
-        key = f"event:{event_id}:registered"
-        count = self.redis_client.get(key)
-        return int(count) if count else 0
+        return self.prime(event_id)
+    
+    def get_held_count(self, event_id: uuid.UUID) -> int:
+        """Get number of unexpired holds."""
+        return self.redis_client.zcount(self._holds_key(event_id), f"({time.time()}", '+inf')
     
     def check_capacity(self, event_id: uuid.UUID, max_capacity: int) -> bool:
         """Check if event has available capacity."""
-        registered = self.get_registered_count(event_id)
-        return registered < max_capacity
+        return self.get_registered_count(event_id) + self.get_held_count(event_id) < max_capacity
+    
+    def reserve(self, event_id: uuid.UUID, max_capacity: int, ttl_seconds: int) -> Optional[Dict[str, float]]:
+        """Hold a seat for `ttl_seconds`. Returns None when the event is full."""
+        hold_id = str(uuid.uuid4())
+        now = time.time()
+        keys = [self._registered_key(event_id), self._holds_key(event_id)]
+        args = [hold_id, now, now + ttl_seconds, max_capacity]
+        
+        result = self._reserve(keys=keys, args=args)
+        if result == -1:
+            self.prime(event_id)
+            result = self._reserve(keys=keys, args=args)
+        if result != 1:
+            return None
+        return {'hold_id': hold_id, 'expires_at': now + ttl_seconds}
+    
+    def acquire(self, event_id: uuid.UUID, max_capacity: int) -> bool:
+        """Claim a seat directly, without a prior hold."""
+        return self.confirm(event_id, '', max_capacity)
+    
+    def acquire_many(self, event_id: uuid.UUID, max_capacity: int, count: int) -> int:
+        """Claim up to `count` seats at once. Returns how many were granted."""
+        keys = [self._registered_key(event_id), self._holds_key(event_id)]
+        args = [time.time(), max_capacity, count]
+        
+        result = self._acquire_many(keys=keys, args=args)
+        if result == -1:
+            self.prime(event_id)
+            result = self._acquire_many(keys=keys, args=args)
+        return max(0, int(result))
+    
+    def confirm(self, event_id: uuid.UUID, hold_id: str, max_capacity: int) -> bool:
+        """Convert a hold into a registered seat."""
+        keys = [self._registered_key(event_id), self._holds_key(event_id)]
+        args = [hold_id, time.time(), max_capacity]
+        
+        result = self._confirm(keys=keys, args=args)
+        if result == -1:
+            self.prime(event_id)
+            result = self._confirm(keys=keys, args=args)
+        return result > 0
+    
+    def release(self, event_id: uuid.UUID, hold_id: str) -> bool:
+        """Give a held seat back."""
+        return bool(self.redis_client.zrem(self._holds_key(event_id), hold_id))
+    
+    def reconcile(self, event_ids: Iterable[uuid.UUID]) -> Dict[str, int]:
+        """Reset counters to the confirmed registrations in the database.
+        
+        Counts come from one grouped query. A counter that changed while it
+        was being counted is left for the next run rather than overwritten,
+        and counters above the database count are only lowered once the same
+        excess has been seen twice.
+        """
+        event_ids = [uuid.UUID(str(event_id)) for event_id in event_ids]
+        if not event_ids:
+            return {'events': 0, 'corrected': 0}
+        
+        pipeline = self.redis_client.pipeline(transaction=False)
+        for event_id in event_ids:
+            pipeline.get(self._registered_key(event_id))
+            pipeline.zremrangebyscore(self._holds_key(event_id), '-inf', time.time())
+        cached = pipeline.execute()[::2]
+        
+        counts = dict(
+            Registration.objects.filter(event_id__in=event_ids, status='confirmed')
+            .order_by().values('event_id').annotate(count=Count('id')).values_list('event_id', 'count')
+        )
+        
+        corrected = 0
+        for event_id, before in zip(event_ids, cached):
+            actual = counts.get(event_id, 0)
+            if before is not None and int(before) == actual:
+                continue
+            corrected += self._reconcile(
+                keys=[self._registered_key(event_id), f"event:{event_id}:drift"],
+                args=[before if before is not None else '', actual, self.DRIFT_TTL]
+            )
+        return {'events': len(event_ids), 'corrected': corrected}
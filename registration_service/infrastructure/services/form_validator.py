@@ -0,0 +1,237 @@
+import re
+import threading
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import uuid
+import redis
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from domain.registration_form import RegistrationForm, CustomField
+
+
+EMAIL_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+TRUE_VALUES = {'true', '1', 'yes', 'on', 'y'}
+FALSE_VALUES = {'false', '0', 'no', 'off', 'n', ''}
+
+# A check returns an error message, or None if the (non-empty) value is valid
+Check = Callable[[Any], Optional[str]]
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == '' or value == [] or value is False
+
+
+def _length_check(min_length: Optional[int], max_length: Optional[int]) -> Optional[Check]:
+    if not min_length and max_length is None:
+        return None
+    
+    def check(value: Any) -> Optional[str]:
+        length = len(str(value))
+        if min_length and length < min_length:
+            return f'Must be at least {min_length} characters'
+        if max_length is not None and length > max_length:
+            return f'Must be at most {max_length} characters'
+        return None
+    return check
+
+
+def _email_check(value: Any) -> Optional[str]:
+    if not EMAIL_PATTERN.match(str(value)):
+        return 'Invalid email format'
+    return None
+
+
+def _number_check(value: Any) -> Optional[str]:
+    if isinstance(value, bool):
+        return 'Must be a number'
+    try:
+        number = Decimal(str(value).strip())
+    except InvalidOperation:
+        return 'Must be a number'
+    if not number.is_finite():
+        return 'Must be a number'
+    return None
+
+
+def _checkbox_check(value: Any) -> Optional[str]:
+    if isinstance(value, bool) or str(value).strip().lower() in TRUE_VALUES | FALSE_VALUES:
+        return None
+    return 'Must be true or false'
+
+
+def _select_check(options: Any) -> Check:
+    choices = set()
+    for option in options or []:
+        if isinstance(option, dict):
+            option = option.get('value', option.get('label'))
+        choices.add(str(option))
+    
+    def check(value: Any) -> Optional[str]:
+        if str(value) not in choices:
+            return 'Invalid choice'
+        return None
+    return check
+
+
+class FormValidator:
+    """A registration form's fields compiled into a list of checks.
+    
+    Built once per form version, so validating a submission is a single
+    pass over plain tuples with no database access.
+    """
+    
+    def __init__(self, form_id: uuid.UUID, event_id: uuid.UUID, version: int, fields: Iterable[CustomField]):
+        self.form_id = form_id
+        self.event_id = event_id
+        self.version = version
+        self.rules: List[Tuple[str, bool, bool, Tuple[Check, ...]]] = []
+        for field in fields:
+            self.rules.append((
+                field.label,
+                field.is_required,
+                field.field_type == 'checkbox',
+                self._compile(field),
+            ))
+        self.labels = [label for label, _, _, _ in self.rules]
+    
+    @staticmethod
+    def _compile(field: CustomField) -> Tuple[Check, ...]:
+        checks: List[Optional[Check]] = []
+        if field.field_type in ('text', 'textarea', 'email'):
+            checks.append(_length_check(field.min_length, field.max_length))
+        if field.field_type == 'email':
+            checks.append(_email_check)
+        elif field.field_type == 'number':
+            checks.append(_number_check)
+        elif field.field_type == 'select':
+            checks.append(_select_check(field.options))
+        elif field.field_type == 'checkbox':
+            checks.append(_checkbox_check)
+        return tuple(check for check in checks if check is not None)
+    
+    def validate(self, data: Dict[str, Any]) -> Dict[str, str]:
+        """Return {label: message} for every invalid field."""
+        errors = {}
+        for label, required, is_checkbox, checks in self.rules:
+            value = data.get(label)
+            if isinstance(value, str):
+                value = value.strip()
+            if is_checkbox and isinstance(value, str) and value.lower() in FALSE_VALUES:
+                value = False
+            if _is_empty(value):
+                if required:
+                    errors[label] = 'This field is required'
+                continue
+            for check in checks:
+                message = check(value)
+                if message:
+                    errors[label] = message
+                    break
+        return errors
+
+
+class FormValidatorRegistry:
+    """Process-wide cache of compiled form validators.
+    
+    Each entry is tagged with the form's version counter in Redis. Saving
+    or deleting a form or one of its fields bumps the counter, and every
+    process recompiles on its next lookup.
+    """
+    
+    _validators: Dict[uuid.UUID, FormValidator] = {}
+    _event_forms: Dict[uuid.UUID, uuid.UUID] = {}
+    _redis_client: Optional[redis.Redis] = None
+    _lock = threading.Lock()
+    
+    @classmethod
+    def _redis(cls) -> redis.Redis:
+        if cls._redis_client is None:
+            cls._redis_client = redis.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.REDIS_DB,
+                password=settings.REDIS_PASSWORD if settings.REDIS_PASSWORD else None,
+                decode_responses=True
+            )
+        return cls._redis_client
+    
+    @staticmethod
+    def _version_key(form_id: uuid.UUID) -> str:
+        return f"form:{form_id}:version"
+    
+    @classmethod
+    def get(cls, form_id: uuid.UUID) -> Optional[FormValidator]:
+        """Compiled validator for a form, or None if the form does not exist."""
+        form_id = uuid.UUID(str(form_id))
+        version = int(cls._redis().get(cls._version_key(form_id)) or 0)
+        validator = cls._validators.get(form_id)
+        if validator is not None and validator.version == version:
+            return validator
+        
+        try:
+            form = RegistrationForm.objects.prefetch_related('fields').get(id=form_id)
+        except RegistrationForm.DoesNotExist:
+            cls.discard(form_id)
+            return None
+        
+        validator = FormValidator(form.id, form.event_id, version, form.fields.all())
+        with cls._lock:
+            cls._validators[form_id] = validator
+            cls._event_forms[form.event_id] = form_id
+        return validator
+    
+    @classmethod
+    def get_for_event(cls, event_id: uuid.UUID) -> Optional[FormValidator]:
+        """Compiled validator for an event's form, or None if it has none."""
+        event_id = uuid.UUID(str(event_id))
+        form_id = cls._event_forms.get(event_id)
+        if form_id is None:
+            form_id = RegistrationForm.objects.filter(event_id=event_id).values_list('id', flat=True).first()
+            if form_id is None:
+                return None
+        validator = cls.get(form_id)
+        if validator is None or validator.event_id != event_id:
+            with cls._lock:
+                cls._event_forms.pop(event_id, None)
+            return None
+        return validator
+    
+    @classmethod
+    def invalidate(cls, form_id: uuid.UUID) -> None:
+        """Bump the form's version so every process recompiles it."""
+        cls._redis().incr(cls._version_key(form_id))
+        cls.discard(form_id)
+    
+    @classmethod
+    def discard(cls, form_id: uuid.UUID) -> None:
+        """Drop this process's compiled validator for a form."""
+        with cls._lock:
+            validator = cls._validators.pop(uuid.UUID(str(form_id)), None)
+            if validator is not None:
+                cls._event_forms.pop(validator.event_id, None)
+    
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._validators = {}
+            cls._event_forms = {}
+
+
+@receiver(post_save, sender=RegistrationForm)
+@receiver(post_delete, sender=RegistrationForm)
+def _form_changed(sender, instance, **kwargs):
+    # Invalidate after commit so no process recompiles from the old rows;
+    # delete() clears the instance pk before the callback runs
+    form_id = instance.id
+    transaction.on_commit(lambda: FormValidatorRegistry.invalidate(form_id))
+
+
+@receiver(post_save, sender=CustomField)
+@receiver(post_delete, sender=CustomField)
+def _field_changed(sender, instance, **kwargs):
+    form_id = instance.form_id
+    transaction.on_commit(lambda: FormValidatorRegistry.invalidate(form_id))
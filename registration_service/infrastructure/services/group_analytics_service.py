@@ -1,6 +1,7 @@
 from typing import Dict, Any
 import uuid
 from django.core.cache import cache
+from django.db.models import Count, Q, Sum
 
 from domain.group_registration import GroupRegistration
 
@@ -10,11 +11,14 @@ class GroupAnalyticsService:
     
     def get_group_stats(self, event_id: uuid.UUID) -> Dict[str, Any]:
         """Get group statistics for an event."""
-        groups = GroupRegistration.objects.filter(event_id=event_id)
-        
-        total_groups = groups.count()
-        confirmed_groups = groups.filter(status='confirmed').count()
-        total_members = sum(g.current_size for g in groups)
+        stats = GroupRegistration.objects.filter(event_id=event_id).aggregate(
+            total_groups=Count('id'),
+            confirmed_groups=Count('id', filter=Q(status='confirmed')),
+            total_members=Sum('current_size'),
+        )
+        total_groups = stats['total_groups']
+        confirmed_groups = stats['confirmed_groups']
+        total_members = stats['total_members'] or 0
         
         return {
             'total_groups': total_groups,
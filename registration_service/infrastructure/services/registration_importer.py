@@ -0,0 +1,194 @@
+import csv
+import json
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+import uuid
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.storage import FileSystemStorage
+from django.core.validators import validate_email
+from django.db import transaction
+
+from domain.capacity_rule import CapacityRule
+from domain.registration import Registration
+from domain.registration_import import RegistrationImport
+from infrastructure.services.analytics_cache_service import AnalyticsCacheService
+from infrastructure.services.capacity_tracking_service import CapacityTrackingService
+
+
+# (row number, parsed row or None if the line could not be parsed)
+Row = Tuple[int, Optional[Dict[str, Any]]]
+
+
+def import_storage() -> FileSystemStorage:
+    """Staging area for uploaded import files."""
+    return FileSystemStorage(location=settings.REGISTRATION_IMPORT_DIR)
+
+
+def read_rows(stream: TextIO, file_format: str) -> Iterator[Row]:
+    """Lazily parse a CSV (with header) or JSON Lines stream into rows."""
+    if file_format == 'csv':
+        yield from enumerate(csv.DictReader(stream), start=1)
+        return
+    
+    number = 0
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        number += 1
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield number, row if isinstance(row, dict) else None
+
+
+def chunked(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class RegistrationImporter:
+    """Streams attendee rows into registrations chunk by chunk.
+    
+    Each chunk is validated in memory, checked against user ids seen earlier
+    in the file and already registered (one query), given as many seats as
+    the event has left (one Redis call) and written with a single
+    bulk_create. Memory use depends on the chunk size, not the file size.
+    """
+    
+    def __init__(
+        self,
+        event_id: uuid.UUID,
+        chunk_size: int = 1000,
+        tracker: Optional[CapacityTrackingService] = None,
+        max_errors: int = RegistrationImport.MAX_REPORTED_ERRORS
+    ):
+        self.event_id = event_id
+        self.chunk_size = chunk_size
+        self.tracker = tracker or CapacityTrackingService()
+        self.max_errors = max_errors
+    
+    def run(
+        self,
+        rows: Iterable[Row],
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """Import all rows, calling `on_progress` with the totals after each chunk."""
+        self.rule = CapacityRule.objects.filter(event_id=self.event_id).first()
+        self.seen = set()
+        self.stats = {
+            'processed_rows': 0,
+            'imported_count': 0,
+            'duplicate_count': 0,
+            'invalid_count': 0,
+            'over_capacity_count': 0,
+            'errors': [],
+        }
+        for chunk in chunked(rows, self.chunk_size):
+            self._import_chunk(chunk)
+            if on_progress:
+                on_progress(self.stats)
+        return self.stats
+    
+    def _error(self, row_number: int, message: Any) -> None:
+        if len(self.stats['errors']) < self.max_errors:
+            self.stats['errors'].append({'row': row_number, 'error': message})
+    
+    def _build(self, data: Dict[str, Any]) -> Registration:
+        """Turn a row into an unsaved registration, or raise ValidationError."""
+        try:
+            user_id = uuid.UUID(str(data.get('user_id') or '').strip())
+        except ValueError:
+            raise ValidationError('Invalid user_id')
+        
+        name = str(data.get('attendee_name') or '').strip()
+        email = str(data.get('attendee_email') or '').strip()
+        phone = str(data.get('attendee_phone') or '').strip()
+        if not name:
+            raise ValidationError('attendee_name is required')
+        if len(name) > 255:
+            raise ValidationError('attendee_name is too long')
+        validate_email(email)
+        if len(phone) > 20:
+            raise ValidationError('attendee_phone is too long')
+        
+        return Registration(
+            event_id=self.event_id,
+            user_id=user_id,
+            attendee_name=name,
+            attendee_email=email,
+            attendee_phone=phone,
+            status='confirmed',
+        )
+    
+    def _import_chunk(self, chunk: List[Row]) -> None:
+        stats = self.stats
+        stats['processed_rows'] += len(chunk)
+        
+        candidates: List[Tuple[int, Registration]] = []
+        for row_number, data in chunk:
+            if data is None:
+                stats['invalid_count'] += 1
+                self._error(row_number, 'Malformed row')
+                continue
+            try:
+                registration = self._build(data)
+            except ValidationError as e:
+                stats['invalid_count'] += 1
+                self._error(row_number, '; '.join(e.messages))
+                continue
+            if registration.user_id in self.seen:
+                stats['duplicate_count'] += 1
+                self._error(row_number, 'Duplicate user_id in file')
+                continue
+            self.seen.add(registration.user_id)
+            candidates.append((row_number, registration))
+        
+        if candidates:
+            registered = set(Registration.objects.filter(
+                event_id=self.event_id,
+                user_id__in=[registration.user_id for _, registration in candidates]
+            ).values_list('user_id', flat=True))
+            fresh = []
+            for row_number, registration in candidates:
+                if registration.user_id in registered:
+                    stats['duplicate_count'] += 1
+                    self._error(row_number, 'User is already registered for this event')
+                else:
+                    fresh.append((row_number, registration))
+            candidates = fresh
+        
+        if candidates and self.rule is not None:
+            granted = self.tracker.acquire_many(self.event_id, self.rule.max_capacity, len(candidates))
+            for row_number, _ in candidates[granted:]:
+                stats['over_capacity_count'] += 1
+                self._error(row_number, 'Event is at full capacity')
+            candidates = candidates[:granted]
+        
+        if not candidates:
+            return
+        
+        registrations = [registration for _, registration in candidates]
+        try:
+            with transaction.atomic():
+                Registration.objects.bulk_create(registrations, ignore_conflicts=True)
+                inserted = Registration.objects.filter(id__in=[r.id for r in registrations]).count()
+                AnalyticsCacheService().invalidate_on_commit(self.event_id)
+        except Exception:
+            if self.rule is not None:
+                self.tracker.adjust(self.event_id, -len(registrations))
+            raise
+        
+        # Rows that lost a race with a concurrent registration were skipped
+        lost = len(registrations) - inserted
+        if lost:
+            stats['duplicate_count'] += lost
+            if self.rule is not None:
+                self.tracker.adjust(self.event_id, -lost)
+        stats['imported_count'] += inserted
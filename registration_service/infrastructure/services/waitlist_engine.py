@@ -0,0 +1,118 @@
+import redis
+from django.conf import settings
+from django.db.models import Max
+from typing import List, Optional, Tuple
+import uuid
+
+from domain.waitlist import Waitlist
+
+
+# Scores order by priority (higher first) then join sequence. Sequences stay
+# below 2**32 and priorities small, so scores are exact in a double.
+SEQUENCE_SPACE = 2 ** 32
+
+# KEYS: queue, sequence
+# ARGV: user_id, priority
+JOIN_SCRIPT = """
+if redis.call('ZSCORE', KEYS[1], ARGV[1]) then
+    return -1
+end
+local seq = redis.call('INCR', KEYS[2])
+redis.call('ZADD', KEYS[1], -tonumber(ARGV[2]) * 4294967296 + seq, ARGV[1])
+return seq
+"""
+
+# KEYS: sequence
+# ARGV: value
+RAISE_SEQUENCE_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+if current < tonumber(ARGV[1]) then
+    redis.call('SET', KEYS[1], ARGV[1])
+end
+return 1
+"""
+
+
+class WaitlistEngine:
+    """Per-event waitlist queue on a Redis sorted set.
+    
+    Members are user ids scored by (priority, join sequence), so a user's
+    place in line is a ZRANK and leaving is a ZREM - nothing is renumbered.
+    The waitlists table stays the source of truth; an event's queue is
+    loaded from it the first time the event is touched.
+    """
+    
+    PRIME_CHUNK = 5000
+    
+    def __init__(self):
+        self.redis_client = redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            password=settings.REDIS_PASSWORD if settings.REDIS_PASSWORD else None,
+            decode_responses=True
+        )
+        self._join = self.redis_client.register_script(JOIN_SCRIPT)
+        self._raise_sequence = self.redis_client.register_script(RAISE_SEQUENCE_SCRIPT)
+    
+    @staticmethod
+    def _keys(event_id: uuid.UUID) -> Tuple[str, str, str]:
+        prefix = f"waitlist:{event_id}"
+        return f"{prefix}:queue", f"{prefix}:seq", f"{prefix}:primed"
+    
+    @staticmethod
+    def score(priority: int, sequence: int) -> int:
+        return -priority * SEQUENCE_SPACE + sequence
+    
+    def prime(self, event_id: uuid.UUID) -> None:
+        """Load the event's queue from the database if Redis does not have it."""
+        queue_key, seq_key, primed_key = self._keys(event_id)
+        if self.redis_client.exists(primed_key):
+            return
+        
+        entries = Waitlist.objects.filter(event_id=event_id, is_promoted=False).values_list(
+            'user_id', 'priority', 'position'
+        ).iterator(chunk_size=self.PRIME_CHUNK)
+        mapping = {}
+        for user_id, priority, position in entries:
+            mapping[str(user_id)] = self.score(priority, position)
+            if len(mapping) >= self.PRIME_CHUNK:
+                self.redis_client.zadd(queue_key, mapping)
+                mapping = {}
+        if mapping:
+            self.redis_client.zadd(queue_key, mapping)
+        
+        last_position = Waitlist.objects.filter(event_id=event_id).aggregate(last=Max('position'))['last']
+        self._raise_sequence(keys=[seq_key], args=[last_position or 0])
+        self.redis_client.set(primed_key, 1)
+    
+    def join(self, event_id: uuid.UUID, user_id: uuid.UUID, priority: int = 0) -> Optional[int]:
+        """Queue a user. Returns their join sequence, or None if already queued."""
+        self.prime(event_id)
+        queue_key, seq_key, _ = self._keys(event_id)
+        sequence = int(self._join(keys=[queue_key, seq_key], args=[str(user_id), priority]))
+        return None if sequence < 0 else sequence
+    
+    def remove(self, event_id: uuid.UUID, user_id: uuid.UUID) -> bool:
+        """Take a user out of the queue."""
+        self.prime(event_id)
+        return bool(self.redis_client.zrem(self._keys(event_id)[0], str(user_id)))
+    
+    def rank(self, event_id: uuid.UUID, user_id: uuid.UUID) -> Optional[int]:
+        """Number of users ahead of a user, or None if they are not queued."""
+        self.prime(event_id)
+        return self.redis_client.zrank(self._keys(event_id)[0], str(user_id))
+    
+    def size(self, event_id: uuid.UUID) -> int:
+        self.prime(event_id)
+        return self.redis_client.zcard(self._keys(event_id)[0])
+    
+    def pop(self, event_id: uuid.UUID, count: int) -> List[Tuple[str, float]]:
+        """Atomically take the first `count` users off the queue, in order."""
+        self.prime(event_id)
+        return self.redis_client.zpopmin(self._keys(event_id)[0], count)
+    
+    def restore(self, event_id: uuid.UUID, entries: List[Tuple[str, float]]) -> None:
+        """Put popped users back with their original scores."""
+        if entries:
+            self.redis_client.zadd(self._keys(event_id)[0], dict(entries))
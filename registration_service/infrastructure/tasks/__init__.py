@@ -0,0 +1,3 @@
+from infrastructure.tasks.capacity_tasks import reconcile_capacity
+from infrastructure.tasks.registration_tasks import import_registrations
+from infrastructure.tasks.waitlist_tasks import process_waitlists
@@ -0,0 +1,26 @@
+from celery import shared_task
+from domain.capacity_rule import CapacityRule
+from infrastructure.services.capacity_tracking_service import CapacityTrackingService
+
+
+@shared_task
+def reconcile_capacity(batch_size: int = 1000):
+    """Bring Redis capacity counters back in line with the database."""
+    tracker = CapacityTrackingService()
+    event_ids = CapacityRule.objects.order_by().values_list('event_id', flat=True).iterator(chunk_size=batch_size)
+    
+    events = corrected = 0
+    batch = []
+    for event_id in event_ids:
+        batch.append(event_id)
+        if len(batch) >= batch_size:
+            result = tracker.reconcile(batch)
+            events += result['events']
+            corrected += result['corrected']
+            batch = []
+    if batch:
+        result = tracker.reconcile(batch)
+        events += result['events']
+        corrected += result['corrected']
+    
+    return f"Capacity reconciliation completed: corrected {corrected} of {events} events"
@@ -0,0 +1,49 @@
+import io
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+from domain.registration_import import RegistrationImport
+from infrastructure.services.registration_importer import (
+    RegistrationImporter,
+    import_storage,
+    read_rows,
+)
+
+
+@shared_task
+def import_registrations(import_id: str):
+    """Run a staged bulk registration import, recording progress per chunk."""
+    job = RegistrationImport.objects.get(id=import_id)
+    if job.status != 'pending':
+        return f"Import {import_id} already {job.status}"
+    
+    job.status = 'running'
+    job.started_at = timezone.now()
+    job.save(update_fields=['status', 'started_at'])
+    
+    def record_progress(stats):
+        RegistrationImport.objects.filter(id=job.id).update(**stats)
+    
+    storage = import_storage()
+    importer = RegistrationImporter(job.event_id, chunk_size=settings.REGISTRATION_IMPORT_CHUNK_SIZE)
+    try:
+        with storage.open(job.file_name, 'rb') as raw:
+            stream = io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+            stats = importer.run(read_rows(stream, job.file_format), on_progress=record_progress)
+    except Exception as e:
+        RegistrationImport.objects.filter(id=job.id).update(
+            status='failed',
+            failure_reason=str(e),
+            finished_at=timezone.now()
+        )
+        raise
+    finally:
+        storage.delete(job.file_name)
+    
+    RegistrationImport.objects.filter(id=job.id).update(
+        status='completed',
+        finished_at=timezone.now(),
+        **stats
+    )
+    return f"Import {import_id} completed: {stats['imported_count']} of {stats['processed_rows']} rows imported"
@@ -1,10 +1,16 @@
 from celery import shared_task
 from application.waitlist_service import ProcessWaitlistService
+from infrastructure.repositories.waitlist_repository import WaitlistRepository
 
 
 @shared_task
 def process_waitlists():
     """Process waitlists for events with available capacity."""
-    # This would typically check events with available spots
-    # and process their waitlists automatically
-    return "Waitlist processing completed"
+    service = ProcessWaitlistService()
+    events = WaitlistRepository().get_events_with_free_capacity()
+    
+    promoted = 0
+    for event_id, available_spots in events:
+        promoted += len(service.execute(event_id, available_spots))
+    
+    return f"Waitlist processing completed: promoted {promoted} users across {len(events)} events"
@@ -19,3 +19,13 @@ class RegistrationAnalyticsSerializer(serializers.ModelSerializer):
     
     def get_conversion_rate(self, obj):
         return float(obj.get_conversion_rate())
+
+
+class BulkReportSerializer(serializers.Serializer):
+    """Serializer for cross-event report requests."""
+    
+    event_ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        max_length=1000
+    )
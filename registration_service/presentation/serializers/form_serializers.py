@@ -8,7 +8,10 @@ class CustomFieldSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = CustomField
-        fields = ['id', 'label', 'field_type', 'is_required', 'order', 'options']
+        fields = [
+            'id', 'label', 'field_type', 'is_required', 'order', 'options',
+            'min_length', 'max_length'
+        ]
 
 
 class RegistrationFormSerializer(serializers.ModelSerializer):
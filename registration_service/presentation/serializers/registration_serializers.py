@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from domain.registration import Registration
+from domain.registration_import import RegistrationImport
 
 
 class RegistrationSerializer(serializers.ModelSerializer):
@@ -13,3 +14,17 @@ class RegistrationSerializer(serializers.ModelSerializer):
             'registered_at', 'cancelled_at', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'registered_at', 'cancelled_at', 'created_at', 'updated_at']
+
+
+class RegistrationImportSerializer(serializers.ModelSerializer):
+    """Serializer for RegistrationImport progress."""
+    
+    class Meta:
+        model = RegistrationImport
+        fields = [
+            'id', 'event_id', 'status', 'file_format',
+            'processed_rows', 'imported_count', 'duplicate_count',
+            'invalid_count', 'over_capacity_count', 'errors', 'failure_reason',
+            'created_at', 'started_at', 'finished_at'
+        ]
+        read_only_fields = fields
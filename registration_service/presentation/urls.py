@@ -6,6 +6,9 @@ from presentation.views.registration_views import (
     cancel_registration,
     get_event_registrations,
     check_capacity,
+    start_registration_import,
+    get_registration_import,
+    export_registrations,
 )
 from presentation.views.waitlist_views import (
     join_waitlist,
@@ -16,11 +19,14 @@ from presentation.views.waitlist_views import (
 from presentation.views.capacity_views import (
     get_capacity,
     create_capacity_rule,
+    reserve_capacity,
+    release_reservation,
 )
 from presentation.views.form_views import (
     create_form,
     get_form,
     submit_form,
+    validate_bulk,
 )
 from presentation.views.group_views import (
     create_group,
@@ -34,6 +40,7 @@ from presentation.views.analytics_views import (
     get_analytics,
     get_dashboard,
     export_analytics,
+    get_bulk_report,
 )
 
 urlpatterns = [
@@ -42,8 +49,13 @@ urlpatterns = [
     path('events/<str:event_id>/cancel/', cancel_registration, name='cancel_registration'),
     path('events/<str:event_id>/', get_event_registrations, name='get_event_registrations'),
     path('events/<str:event_id>/capacity/', check_capacity, name='check_capacity'),
+    path('events/<str:event_id>/import/', start_registration_import, name='start_registration_import'),
+    path('events/<str:event_id>/import/<str:import_id>/', get_registration_import, name='get_registration_import'),
+    path('events/<str:event_id>/export/', export_registrations, name='export_registrations'),
     path('events/<str:event_id>/capacity/info/', get_capacity, name='get_capacity'),
     path('events/<str:event_id>/capacity/rule/', create_capacity_rule, name='create_capacity_rule'),
+    path('events/<str:event_id>/capacity/reserve/', reserve_capacity, name='reserve_capacity'),
+    path('events/<str:event_id>/capacity/reserve/<str:hold_id>/', release_reservation, name='release_reservation'),
     path('events/<str:event_id>/waitlist/', join_waitlist, name='join_waitlist'),
     path('events/<str:event_id>/waitlist/leave/', leave_waitlist, name='leave_waitlist'),
     path('events/<str:event_id>/waitlist/position/', get_waitlist_position, name='get_waitlist_position'),
@@ -51,6 +63,7 @@ urlpatterns = [
     path('events/<str:event_id>/form/', create_form, name='create_form'),
     path('events/<str:event_id>/form/get/', get_form, name='get_form'),
     path('events/<str:event_id>/form/submit/', submit_form, name='submit_form'),
+    path('events/<str:event_id>/form/validate-bulk/', validate_bulk, name='validate_bulk'),
     path('events/<str:event_id>/groups/stats/', get_group_stats, name='get_group_stats'),
     path('events/<str:event_id>/groups/', create_group, name='create_group'),
     path('events/<str:event_id>/groups/<str:group_id>/', get_group, name='get_group'),
@@ -60,4 +73,5 @@ urlpatterns = [
     path('events/<str:event_id>/analytics/', get_analytics, name='get_analytics'),
     path('events/<str:event_id>/analytics/dashboard/', get_dashboard, name='get_dashboard'),
     path('events/<str:event_id>/analytics/export/', export_analytics, name='export_analytics'),
+    path('analytics/reports/', get_bulk_report, name='get_bulk_report'),
 ]
@@ -8,7 +8,10 @@ from application.analytics_service import (
     RegistrationReportService,
 )
 from infrastructure.services.analytics_cache_service import AnalyticsCacheService
-from presentation.serializers.analytics_serializers import RegistrationAnalyticsSerializer
+from presentation.serializers.analytics_serializers import (
+    RegistrationAnalyticsSerializer,
+    BulkReportSerializer,
+)
 
 
 @api_view(['GET'])
@@ -52,3 +55,18 @@ def export_analytics(request, event_id):
     report['exported_at'] = str(uuid.uuid4())  # Placeholder for timestamp
     
     return Response(report)
+
+
+@api_view(['POST'])
+def get_bulk_report(request):
+    """Get registration reports for many events in one call."""
+    serializer = BulkReportSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    service = RegistrationReportService()
+    reports = service.execute_many(serializer.validated_data['event_ids'])
+    return Response({
+        'count': len(reports),
+        'results': reports,
+    })
@@ -6,6 +6,7 @@ from django.core.exceptions import ValidationError
 
 from application.capacity_service import (
     CapacityManagementService,
+    CapacityReservationService,
     CreateCapacityRuleService,
 )
 from presentation.serializers.capacity_serializers import CapacityRuleSerializer
@@ -43,3 +44,35 @@ def create_capacity_rule(request, event_id):
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except ValueError:
         return Response({'error': 'Invalid event ID'}, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['POST'])
+def reserve_capacity(request, event_id):
+    """Hold a seat while the attendee completes registration."""
+    try:
+        service = CapacityReservationService()
+        result = service.reserve(uuid.UUID(event_id))
+        
+        return Response(result, status=status.HTTP_201_CREATED)
+    except ValidationError as e:
+        if e.code == 'not_found':
+            return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+        if e.code == 'full':
+            return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except ValueError:
+        return Response({'error': 'Invalid event ID'}, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['DELETE'])
+def release_reservation(request, event_id, hold_id):
+    """Release a held seat."""
+    try:
+        service = CapacityReservationService()
+        service.release(uuid.UUID(event_id), hold_id)
+        
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    except ValidationError as e:
+        return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+    except ValueError:
+        return Response({'error': 'Invalid event ID'}, status=status.HTTP_400_BAD_REQUEST)
@@ -1,5 +1,7 @@
+import io
 import uuid
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, parser_classes
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework import status
 from django.core.exceptions import ValidationError
@@ -7,6 +9,7 @@ from django.core.exceptions import ValidationError
 from application.form_service import (
     CreateRegistrationFormService,
     ValidateRegistrationDataService,
+    BulkValidateRegistrationDataService,
     GetRegistrationFormService,
 )
 from infrastructure.services.form_storage_service import FormDataStorageService
@@ -58,19 +61,15 @@ def submit_form(request, event_id):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
     try:
-        # Get form
-        form_service = GetRegistrationFormService()
-        form = form_service.execute(uuid.UUID(event_id))
-        
-        # Validate data
+        # Validate data against the event's compiled form
         validate_service = ValidateRegistrationDataService()
-        validate_service.execute(form.id, serializer.validated_data['data'])
+        form_id = validate_service.execute_for_event(uuid.UUID(event_id), serializer.validated_data['data'])
         
         # Store submission
         storage_service = FormDataStorageService()
         user_id = uuid.uuid4()  # TODO: Get from auth
         submission_id = storage_service.store_submission(
-            form.id,
+            form_id,
             user_id,
             serializer.validated_data['data']
         )
@@ -81,3 +80,24 @@ def submit_form(request, event_id):
         )
     except ValidationError as e:
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['POST'])
+@parser_classes([MultiPartParser])
+def validate_bulk(request, event_id):
+    """Validate an attendee CSV import against the event's form."""
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({'error': 'file is required'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        form_service = GetRegistrationFormService()
+        form = form_service.execute(uuid.UUID(event_id))
+        
+        service = BulkValidateRegistrationDataService()
+        result = service.execute(form.id, io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline=''))
+        return Response(result)
+    except ValidationError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except UnicodeDecodeError:
+        return Response({'error': 'File must be UTF-8 encoded CSV'}, status=status.HTTP_400_BAD_REQUEST)
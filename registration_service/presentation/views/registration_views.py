@@ -1,6 +1,8 @@
 import uuid
+from django.http import StreamingHttpResponse
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, parser_classes
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from django.core.exceptions import ValidationError
 
@@ -9,8 +11,16 @@ from application.registration_service import (
     CancelRegistrationService,
     CheckCapacityService,
 )
+from application.registration_import_service import (
+    ImportRegistrationsService,
+    GetImportStatusService,
+    ExportRegistrationsService,
+)
 from infrastructure.repositories.registration_repository import RegistrationRepository
-from presentation.serializers.registration_serializers import RegistrationSerializer
+from presentation.serializers.registration_serializers import (
+    RegistrationSerializer,
+    RegistrationImportSerializer,
+)
 
 
 @api_view(['POST'])
@@ -80,3 +90,58 @@ def check_capacity(request, event_id):
         return Response(result)
     except ValueError:
         return Response({'error': 'Invalid parameters'}, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['POST'])
+@parser_classes([MultiPartParser])
+def start_registration_import(request, event_id):
+    """Upload an attendee list (CSV or JSON Lines) for background import."""
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({'error': 'file is required'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        service = ImportRegistrationsService()
+        job = service.execute(uuid.UUID(event_id), upload, request.data.get('file_format'))
+        
+        return Response(
+            RegistrationImportSerializer(job).data,
+            status=status.HTTP_202_ACCEPTED
+        )
+    except ValidationError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except ValueError:
+        return Response({'error': 'Invalid event ID'}, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET'])
+def get_registration_import(request, event_id, import_id):
+    """Get progress of a bulk import."""
+    try:
+        service = GetImportStatusService()
+        job = service.execute(uuid.UUID(event_id), uuid.UUID(import_id))
+        
+        return Response(RegistrationImportSerializer(job).data)
+    except ValidationError as e:
+        return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+    except ValueError:
+        return Response({'error': 'Invalid ID'}, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET'])
+def export_registrations(request, event_id):
+    """Stream an event's registrations as CSV or JSON Lines."""
+    file_format = request.query_params.get('file_format', 'csv')
+    
+    try:
+        service = ExportRegistrationsService()
+        lines = service.execute(uuid.UUID(event_id), file_format, request.query_params.get('status'))
+    except ValidationError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except ValueError:
+        return Response({'error': 'Invalid event ID'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    content_type = 'text/csv' if file_format == 'csv' else 'application/x-ndjson'
+    response = StreamingHttpResponse(lines, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="registrations-{event_id}.{file_format}"'
+    return response
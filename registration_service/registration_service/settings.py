@@ -147,6 +147,15 @@ REDIS_PORT = config("REDIS_PORT", cast=int)
 REDIS_DB = config("REDIS_DB", cast=int)
 REDIS_PASSWORD = config("REDIS_PASSWORD", default="")
 
+# Cached analytics are invalidated by whichever process writes a
+# registration, so every web and worker process must share one cache.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": f"redis://:{REDIS_PASSWORD}@{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}" if REDIS_PASSWORD else f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}",
+    }
+}
+
 # RabbitMQ Configuration
 RABBITMQ_HOST = config("RABBITMQ_HOST")
 RABBITMQ_PORT = config("RABBITMQ_PORT", cast=int)
@@ -161,6 +170,25 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
+CELERY_BEAT_SCHEDULE = {
+    'process-waitlists': {
+        'task': 'infrastructure.tasks.waitlist_tasks.process_waitlists',
+        'schedule': 60.0,
+    },
+    'reconcile-capacity': {
+        'task': 'infrastructure.tasks.capacity_tasks.reconcile_capacity',
+        'schedule': 300.0,
+    },
+}
+
+# Hours a promoted waitlist user has to register before their seat is
+# offered to the next user in line.
+WAITLIST_OFFER_HOURS = config("WAITLIST_OFFER_HOURS", default=48, cast=int)
+
+# Bulk registration imports. Uploads are staged here for the celery worker,
+# so the directory must be shared between web and worker hosts.
+REGISTRATION_IMPORT_DIR = config("REGISTRATION_IMPORT_DIR", default=str(BASE_DIR / 'imports'))
+REGISTRATION_IMPORT_CHUNK_SIZE = config("REGISTRATION_IMPORT_CHUNK_SIZE", default=1000, cast=int)
 
 # REST Framework Configuration
 REST_FRAMEWORK = {
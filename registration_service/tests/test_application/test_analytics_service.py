@@ -63,3 +63,32 @@ class RegistrationReportServiceTest(TestCase):
         self.assertEqual(report['registrations']['confirmed'], 1)
         self.assertIn('waitlist', report)
         self.assertIn('groups', report)
+        
+    def test_generate_report_for_many_events(self):
+        """Test reports for several events are built and cached together."""
+        event_ids = [uuid.uuid4() for _ in range(3)]
+        for event_id in event_ids[:2]:
+            Registration.objects.create(
+                event_id=event_id,
+                user_id=uuid.uuid4(),
+                status='confirmed',
+                attendee_name='John Doe',
+                attendee_email='john@example.com',
+            )
+        GroupRegistration.objects.create(
+            event_id=event_ids[0],
+            group_name='Team',
+            group_leader_id=uuid.uuid4(),
+            group_leader_email='lead@example.com',
+            max_size=5,
+            current_size=3,
+        )
+        
+        service = RegistrationReportService()
+        reports = service.execute_many(event_ids)
+        
+        self.assertEqual([report['event_id'] for report in reports], [str(e) for e in event_ids])
+        self.assertEqual([report['registrations']['total'] for report in reports], [1, 1, 0])
+        self.assertEqual(reports[0]['groups']['total_members'], 3)
+        with self.assertNumQueries(0):
+            self.assertEqual(service.execute_many(event_ids), reports)
@@ -4,6 +4,7 @@ from django.core.exceptions import ValidationError
 
 from application.capacity_service import (
     CapacityManagementService,
+    CapacityReservationService,
     CreateCapacityRuleService,
 )
 from domain.capacity_rule import CapacityRule
@@ -41,6 +42,35 @@ class CapacityManagementServiceTest(TestCase):
         self.assertFalse(result['is_at_capacity'])
 
 
+class CapacityReservationServiceTest(TestCase):
+    """Tests for CapacityReservationService."""
+    
+    def setUp(self):
+        self.service = CapacityReservationService()
+        self.event_id = uuid.uuid4()
+        
+    def test_reserve_holds_seat(self):
+        """Test a reservation counts against capacity until released."""
+        CapacityRule.objects.create(event_id=self.event_id, max_capacity=1, warning_threshold=80)
+        hold = self.service.reserve(self.event_id)
+        
+        with self.assertRaises(ValidationError):
+            self.service.reserve(self.event_id)
+        self.service.release(self.event_id, hold['hold_id'])
+        self.assertIsNotNone(self.service.reserve(self.event_id)['hold_id'])
+        
+    def test_reservations_disabled(self):
+        """Test reservations are refused when the rule disallows them."""
+        CapacityRule.objects.create(
+            event_id=self.event_id,
+            max_capacity=10,
+            warning_threshold=80,
+            allow_reservations=False,
+        )
+        with self.assertRaises(ValidationError):
+            self.service.reserve(self.event_id)
+
+
 class CreateCapacityRuleServiceTest(TestCase):
     """Tests for CreateCapacityRuleService."""
     
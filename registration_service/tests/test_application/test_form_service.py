@@ -1,11 +1,13 @@
+import io
 import uuid
 from django.test import TestCase
 from django.core.exceptions import ValidationError
 
-from domain.registration_form import RegistrationForm
+from domain.registration_form import RegistrationForm, CustomField
 from application.form_service import (
     CreateRegistrationFormService,
     ValidateRegistrationDataService,
+    BulkValidateRegistrationDataService,
     GetRegistrationFormService,
 )
 
@@ -56,6 +58,34 @@ class ValidateRegistrationDataServiceTest(TestCase):
             service.execute(self.form.id, {})
 
 
+class BulkValidateRegistrationDataServiceTest(TestCase):
+    """Tests for BulkValidateRegistrationDataService."""
+    
+    def setUp(self):
+        self.form = RegistrationForm.objects.create(event_id=uuid.uuid4(), title='Registration')
+        CustomField.objects.create(form=self.form, label='Name', field_type='text', is_required=True)
+        CustomField.objects.create(form=self.form, label='Email', field_type='email', is_required=True)
+        
+    def test_reports_errors_per_row(self):
+        """Test invalid rows are reported with their row numbers."""
+        rows = ['Name,Email', 'Jane,jane@example.com', ',john@example.com', 'Ann,not-an-email']
+        result = BulkValidateRegistrationDataService().execute(self.form.id, io.StringIO('\n'.join(rows)))
+        
+        self.assertEqual(result['total_rows'], 3)
+        self.assertEqual(result['valid_rows'], 1)
+        self.assertEqual([error['row'] for error in result['errors']], [2, 3])
+        self.assertEqual(result['errors'][1]['errors'], {'Email': 'Invalid email format'})
+        
+    def test_error_report_is_capped(self):
+        """Test only the first max_errors rows are listed."""
+        csv_file = io.StringIO('Name,Email\n' + ',\n' * 5)
+        result = BulkValidateRegistrationDataService().execute(self.form.id, csv_file, max_errors=2)
+        
+        self.assertEqual(result['invalid_rows'], 5)
+        self.assertEqual(len(result['errors']), 2)
+        self.assertTrue(result['errors_truncated'])
+
+
 class GetRegistrationFormServiceTest(TestCase):
     """Tests for GetRegistrationFormService."""
     
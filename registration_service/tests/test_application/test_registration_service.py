@@ -8,6 +8,7 @@ from application.registration_service import (
     CheckCapacityService,
     GetRegistrationService,
 )
+from domain.capacity_rule import CapacityRule
 from domain.registration import Registration
 
 
@@ -42,6 +43,19 @@ class RegisterForEventServiceTest(TestCase):
         self.service.execute(data)
         with self.assertRaises(ValidationError):
             self.service.execute(data)
+        
+    def test_register_rejected_at_capacity(self):
+        """Test registration fails once the capacity rule is reached."""
+        CapacityRule.objects.create(event_id=self.event_id, max_capacity=1, warning_threshold=80)
+        data = {
+            'event_id': self.event_id,
+            'user_id': self.user_id,
+            'attendee_name': 'John Doe',
+            'attendee_email': 'john@example.com',
+        }
+        self.service.execute(data)
+        with self.assertRaises(ValidationError):
+            self.service.execute({**data, 'user_id': uuid.uuid4()})
 
 
 class CancelRegistrationServiceTest(TestCase):
@@ -8,7 +8,10 @@ from application.waitlist_service import (
     ProcessWaitlistService,
     GetWaitlistPositionService,
 )
+from domain.capacity_rule import CapacityRule
 from domain.waitlist import Waitlist
+from domain.registration import Registration
+from infrastructure.services.capacity_tracking_service import CapacityTrackingService
 
 
 class JoinWaitlistServiceTest(TestCase):
@@ -32,6 +35,34 @@ class JoinWaitlistServiceTest(TestCase):
         self.service.execute({'event_id': self.event_id, 'user_id': uuid.uuid4()})
         waitlist2 = self.service.execute({'event_id': self.event_id, 'user_id': uuid.uuid4()})
         self.assertEqual(waitlist2.position, 2)
+        
+    def test_join_waitlist_twice(self):
+        """Test joining twice is rejected."""
+        user_id = uuid.uuid4()
+        self.service.execute({'event_id': self.event_id, 'user_id': user_id})
+        with self.assertRaises(ValidationError):
+            self.service.execute({'event_id': self.event_id, 'user_id': user_id})
+
+
+class LeaveWaitlistServiceTest(TestCase):
+    """Tests for LeaveWaitlistService."""
+    
+    def setUp(self):
+        self.service = LeaveWaitlistService()
+        self.event_id = uuid.uuid4()
+        
+    def test_leave_waitlist_moves_others_up(self):
+        """Test leaving moves later users up without renumbering rows."""
+        join = JoinWaitlistService()
+        users = [uuid.uuid4() for _ in range(3)]
+        for user_id in users:
+            join.execute({'event_id': self.event_id, 'user_id': user_id})
+        
+        self.service.execute(self.event_id, users[0])
+        
+        result = GetWaitlistPositionService().execute(self.event_id, users[2])
+        self.assertEqual(result['position'], 2)
+        self.assertEqual(Waitlist.objects.get(event_id=self.event_id, user_id=users[2]).position, 3)
 
 
 class ProcessWaitlistServiceTest(TestCase):
@@ -54,6 +85,48 @@ class ProcessWaitlistServiceTest(TestCase):
         promoted = self.service.execute(self.event_id, available_spots=2)
         self.assertEqual(len(promoted), 2)
         self.assertTrue(all(w.is_promoted for w in promoted))
+        
+    def test_process_waitlist_order(self):
+        """Test priority users are promoted first and registrations confirmed."""
+        join = JoinWaitlistService()
+        first = join.execute({'event_id': self.event_id, 'user_id': uuid.uuid4()})
+        vip = join.execute({'event_id': self.event_id, 'user_id': uuid.uuid4(), 'priority': 5})
+        Registration.objects.create(
+            event_id=self.event_id,
+            user_id=vip.user_id,
+            attendee_name='VIP',
+            attendee_email='vip@example.com',
+            status='waitlisted',
+        )
+        
+        promoted = self.service.execute(self.event_id, available_spots=1)
+        
+        self.assertEqual([w.user_id for w in promoted], [vip.user_id])
+        self.assertEqual(Registration.objects.get(user_id=vip.user_id).status, 'confirmed')
+        self.assertEqual(self.service.execute(self.event_id, available_spots=5)[0].user_id, first.user_id)
+        
+    def test_process_waitlist_respects_holds(self):
+        """Test seats held in Redis are not promoted away and unserved users keep their place."""
+        CapacityRule.objects.create(event_id=self.event_id, max_capacity=2, warning_threshold=80)
+        tracker = CapacityTrackingService()
+        self.assertIsNotNone(tracker.reserve(self.event_id, 2, 600))
+        join = JoinWaitlistService()
+        users = [join.execute({'event_id': self.event_id, 'user_id': uuid.uuid4()}).user_id for _ in range(2)]
+        for user_id in users:
+            Registration.objects.create(
+                event_id=self.event_id,
+                user_id=user_id,
+                attendee_name='Waiting',
+                attendee_email=f'{user_id}@example.com',
+                status='waitlisted',
+            )
+        
+        promoted = self.service.execute(self.event_id, available_spots=2)
+        
+        self.assertEqual([w.user_id for w in promoted], users[:1])
+        self.assertEqual(Registration.objects.get(user_id=users[1]).status, 'waitlisted')
+        self.assertEqual(self.service.engine.rank(self.event_id, users[1]), 0)
+        self.assertEqual(tracker.get_registered_count(self.event_id), 1)
 
 
 class GetWaitlistPositionServiceTest(TestCase):
@@ -30,3 +30,15 @@ class AnalyticsCacheServiceTest(TestCase):
         cached = service.get_cached_analytics(event_id)
         
         self.assertIsNone(cached)
+        
+    def test_invalidate_on_commit(self):
+        """Test cached reports are dropped once the transaction commits."""
+        service = AnalyticsCacheService()
+        event_id = uuid.uuid4()
+        service.cache_reports({event_id: {'event_id': str(event_id)}})
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            service.invalidate_on_commit(event_id)
+            self.assertIn(event_id, service.get_cached_reports([event_id]))
+        
+        self.assertEqual(service.get_cached_reports([event_id]), {})
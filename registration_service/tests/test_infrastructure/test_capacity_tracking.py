@@ -1,6 +1,8 @@
+import time
 import uuid
 from django.test import TestCase
 
+from domain.registration import Registration
 from infrastructure.services.capacity_tracking_service import CapacityTrackingService
 
 
@@ -28,3 +30,58 @@ class CapacityTrackingServiceTest(TestCase):
         self.service.increment_capacity(self.event_id)
         has_capacity = self.service.check_capacity(self.event_id, max_capacity=5)
         self.assertTrue(has_capacity)
+
+    def test_counter_primed_from_database(self):
+        """Test the first read counts existing registrations."""
+        Registration.objects.create(
+            event_id=self.event_id,
+            user_id=uuid.uuid4(),
+            attendee_name='Jane Doe',
+            attendee_email='jane@example.com',
+        )
+        self.assertEqual(self.service.get_registered_count(self.event_id), 1)
+    
+    def test_reserve_until_full(self):
+        """Test holds stop at max capacity."""
+        holds = [self.service.reserve(self.event_id, max_capacity=2, ttl_seconds=60) for _ in range(3)]
+        self.assertIsNotNone(holds[0])
+        self.assertIsNotNone(holds[1])
+        self.assertIsNone(holds[2])
+        self.assertEqual(self.service.get_held_count(self.event_id), 2)
+    
+    def test_confirm_and_release(self):
+        """Test confirming converts a hold and releasing frees one."""
+        first = self.service.reserve(self.event_id, max_capacity=2, ttl_seconds=60)
+        second = self.service.reserve(self.event_id, max_capacity=2, ttl_seconds=60)
+        
+        self.assertTrue(self.service.confirm(self.event_id, first['hold_id'], max_capacity=2))
+        self.assertTrue(self.service.release(self.event_id, second['hold_id']))
+        self.assertEqual(self.service.get_registered_count(self.event_id), 1)
+        self.assertEqual(self.service.get_held_count(self.event_id), 0)
+        self.assertTrue(self.service.acquire(self.event_id, max_capacity=2))
+        self.assertFalse(self.service.acquire(self.event_id, max_capacity=2))
+    
+    def test_expired_holds_free_seats(self):
+        """Test expired holds no longer count against capacity."""
+        hold = self.service.reserve(self.event_id, max_capacity=1, ttl_seconds=0.01)
+        time.sleep(0.05)
+        self.assertIsNotNone(self.service.reserve(self.event_id, max_capacity=1, ttl_seconds=60))
+        self.assertFalse(self.service.confirm(self.event_id, hold['hold_id'], max_capacity=1))
+    
+    def test_reconcile_corrects_drift(self):
+        """Test reconcile raises at once and lowers on a repeated excess."""
+        self.service.prime(self.event_id)
+        self.service.adjust(self.event_id, 5)
+        
+        self.assertEqual(self.service.reconcile([self.event_id])['corrected'], 0)
+        self.assertEqual(self.service.reconcile([self.event_id])['corrected'], 1)
+        self.assertEqual(self.service.get_registered_count(self.event_id), 0)
+        
+        Registration.objects.create(
+            event_id=self.event_id,
+            user_id=uuid.uuid4(),
+            attendee_name='Jane Doe',
+            attendee_email='jane@example.com',
+        )
+        self.assertEqual(self.service.reconcile([self.event_id])['corrected'], 1)
+        self.assertEqual(self.service.get_registered_count(self.event_id), 1)
@@ -0,0 +1,51 @@
+import uuid
+from django.test import TestCase
+
+from domain.registration_form import RegistrationForm, CustomField
+from infrastructure.services.form_validator import FormValidatorRegistry
+
+
+class FormValidatorTest(TestCase):
+    """Tests for FormValidator and FormValidatorRegistry."""
+    
+    def setUp(self):
+        self.form = RegistrationForm.objects.create(event_id=uuid.uuid4(), title='Registration')
+        CustomField.objects.create(form=self.form, label='Name', field_type='text',
+                                   is_required=True, min_length=2, max_length=10)
+        CustomField.objects.create(form=self.form, label='Email', field_type='email', is_required=True)
+        CustomField.objects.create(form=self.form, label='Age', field_type='number')
+        CustomField.objects.create(form=self.form, label='Size', field_type='select', options=['S', 'M', 'L'])
+        CustomField.objects.create(form=self.form, label='Consent', field_type='checkbox', is_required=True)
+        
+    def test_validate_all_field_types(self):
+        """Test lengths, emails, numbers, options and checkboxes are checked."""
+        validator = FormValidatorRegistry.get(self.form.id)
+        valid = {'Name': 'Jane', 'Email': 'jane@example.com', 'Age': '30', 'Size': 'M', 'Consent': 'yes'}
+        self.assertEqual(validator.validate(valid), {})
+        
+        errors = validator.validate({'Name': 'J', 'Email': 'jane@', 'Age': 'old', 'Size': 'XL', 'Consent': 'no'})
+        self.assertEqual(set(errors), {'Name', 'Email', 'Age', 'Size', 'Consent'})
+        
+    def test_validator_cached_until_form_changes(self):
+        """Test the compiled validator is reused and rebuilt after a field change."""
+        validator = FormValidatorRegistry.get(self.form.id)
+        with self.assertNumQueries(0):
+            self.assertIs(FormValidatorRegistry.get(self.form.id), validator)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            CustomField.objects.create(form=self.form, label='Company', field_type='text', is_required=True)
+        rebuilt = FormValidatorRegistry.get(self.form.id)
+        self.assertIsNot(rebuilt, validator)
+        self.assertIn('Company', rebuilt.validate({}))
+        
+    def test_invalidated_only_after_commit(self):
+        """Test a change does not invalidate the validator until its transaction commits."""
+        validator = FormValidatorRegistry.get(self.form.id)
+        
+        with self.captureOnCommitCallbacks() as callbacks:
+            CustomField.objects.get(form=self.form, label='Age').delete()
+            self.assertIs(FormValidatorRegistry.get(self.form.id), validator)
+        
+        for callback in callbacks:
+            callback()
+        self.assertIsNot(FormValidatorRegistry.get(self.form.id), validator)
@@ -0,0 +1,72 @@
+import io
+import tempfile
+import uuid
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+
+from domain.capacity_rule import CapacityRule
+from domain.registration import Registration
+from domain.registration_import import RegistrationImport
+from infrastructure.services.registration_importer import RegistrationImporter, import_storage, read_rows
+from infrastructure.tasks.registration_tasks import import_registrations
+
+
+def attendee_csv(user_ids):
+    lines = ['user_id,attendee_name,attendee_email']
+    lines += [f'{user_id},User {i},user{i}@example.com' for i, user_id in enumerate(user_ids)]
+    return '\n'.join(lines) + '\n'
+
+
+class RegistrationImporterTest(TestCase):
+    """Tests for RegistrationImporter."""
+    
+    def setUp(self):
+        self.event_id = uuid.uuid4()
+        
+    def test_import_skips_duplicates_and_invalid_rows(self):
+        """Test duplicates in the file and in the database are skipped."""
+        existing = uuid.uuid4()
+        Registration.objects.create(
+            event_id=self.event_id,
+            user_id=existing,
+            attendee_name='Jane Doe',
+            attendee_email='jane@example.com',
+        )
+        new_user = uuid.uuid4()
+        csv_file = io.StringIO(attendee_csv([new_user, new_user, existing]) + 'not-a-uuid,Bad,bad@example.com\n')
+        
+        stats = RegistrationImporter(self.event_id, chunk_size=2).run(read_rows(csv_file, 'csv'))
+        
+        self.assertEqual(stats['processed_rows'], 4)
+        self.assertEqual(stats['imported_count'], 1)
+        self.assertEqual(stats['duplicate_count'], 2)
+        self.assertEqual(stats['invalid_count'], 1)
+        self.assertEqual(sorted(error['row'] for error in stats['errors']), [2, 3, 4])
+        self.assertEqual(Registration.objects.filter(event_id=self.event_id).count(), 2)
+        
+    def test_import_respects_capacity(self):
+        """Test rows beyond the event's capacity are not imported."""
+        CapacityRule.objects.create(event_id=self.event_id, max_capacity=3, warning_threshold=80)
+        rows = '\n'.join(
+            f'{{"user_id": "{uuid.uuid4()}", "attendee_name": "User", "attendee_email": "u@example.com"}}'
+            for _ in range(5)
+        )
+        
+        stats = RegistrationImporter(self.event_id, chunk_size=2).run(read_rows(io.StringIO(rows), 'jsonl'))
+        
+        self.assertEqual(stats['imported_count'], 3)
+        self.assertEqual(stats['over_capacity_count'], 2)
+        
+    def test_import_task_records_progress(self):
+        """Test the celery task imports a staged file and completes the job."""
+        with tempfile.TemporaryDirectory() as directory, override_settings(REGISTRATION_IMPORT_DIR=directory):
+            job = RegistrationImport(event_id=self.event_id, file_format='csv')
+            job.file_name = import_storage().save(f'{job.id}.csv', ContentFile(attendee_csv([uuid.uuid4(), uuid.uuid4()])))
+            job.save()
+            
+            import_registrations(str(job.id))
+            
+            job.refresh_from_db()
+            self.assertEqual(job.status, 'completed')
+            self.assertEqual(job.imported_count, 2)
+            self.assertFalse(import_storage().exists(job.file_name))
@@ -0,0 +1,76 @@
+from datetime import timedelta
+import uuid
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from domain.capacity_rule import CapacityRule
+from domain.registration import Registration
+from domain.waitlist import Waitlist
+from infrastructure.repositories.waitlist_repository import WaitlistRepository
+from infrastructure.services.waitlist_engine import WaitlistEngine
+from infrastructure.tasks.waitlist_tasks import process_waitlists
+
+
+class WaitlistEngineTest(TestCase):
+    """Tests for WaitlistEngine."""
+    
+    def setUp(self):
+        self.engine = WaitlistEngine()
+        self.event_id = uuid.uuid4()
+        
+    def test_primes_from_database(self):
+        """Test an event's queue is loaded from existing rows."""
+        users = [uuid.uuid4() for _ in range(3)]
+        for position, user_id in enumerate(users, start=1):
+            Waitlist.objects.create(event_id=self.event_id, user_id=user_id, position=position)
+        
+        self.assertEqual(self.engine.rank(self.event_id, users[2]), 2)
+        self.assertEqual(self.engine.join(self.event_id, uuid.uuid4()), 4)
+        
+    def test_priority_orders_before_join_time(self):
+        """Test higher priority users rank ahead of earlier joiners."""
+        early, vip = uuid.uuid4(), uuid.uuid4()
+        self.engine.join(self.event_id, early)
+        self.engine.join(self.event_id, vip, priority=1)
+        
+        self.assertEqual(self.engine.rank(self.event_id, vip), 0)
+        self.assertEqual([user_id for user_id, _ in self.engine.pop(self.event_id, 2)], [str(vip), str(early)])
+
+
+class ProcessWaitlistsTaskTest(TestCase):
+    """Tests for the process_waitlists task."""
+    
+    def setUp(self):
+        self.event_id = uuid.uuid4()
+        CapacityRule.objects.create(event_id=self.event_id, max_capacity=3, warning_threshold=80)
+        Registration.objects.create(
+            event_id=self.event_id,
+            user_id=uuid.uuid4(),
+            attendee_name='Attendee',
+            attendee_email='attendee@example.com',
+        )
+        for position in range(1, 5):
+            Waitlist.objects.create(event_id=self.event_id, user_id=uuid.uuid4(), position=position)
+        
+    def test_free_capacity(self):
+        """Test free capacity accounts for confirmed registrations."""
+        self.assertEqual(WaitlistRepository().get_events_with_free_capacity(), [(self.event_id, 2)])
+    
+    @override_settings(WAITLIST_OFFER_HOURS=24)
+    def test_lapsed_offers_free_capacity(self):
+        """Test a promoted user who never registered holds a seat only until the offer lapses."""
+        entries = Waitlist.objects.filter(event_id=self.event_id).order_by('position')
+        Waitlist.objects.filter(id=entries[0].id).update(is_promoted=True, promoted_at=timezone.now())
+        Waitlist.objects.filter(id=entries[1].id).update(
+            is_promoted=True, promoted_at=timezone.now() - timedelta(hours=25)
+        )
+        
+        self.assertEqual(WaitlistRepository().get_events_with_free_capacity(), [(self.event_id, 1)])
+    
+    def test_process_waitlists(self):
+        """Test the task drains waitlists into freed capacity only once."""
+        process_waitlists()
+        process_waitlists()
+        
+        self.assertEqual(Waitlist.objects.filter(event_id=self.event_id, is_promoted=True).count(), 2)
+        self.assertEqual(WaitlistRepository().get_events_with_free_capacity(), [])
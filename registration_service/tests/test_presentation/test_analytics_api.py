@@ -52,3 +52,23 @@ class AnalyticsAPITest(TestCase):
         )
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json()['export_format'], 'json')
+        
+    def test_get_bulk_report(self):
+        """Test getting reports for several events via API."""
+        other_event_id = uuid.uuid4()
+        Registration.objects.create(
+            event_id=other_event_id,
+            user_id=uuid.uuid4(),
+            status='confirmed',
+            attendee_name='John Doe',
+            attendee_email='john@example.com',
+        )
+        
+        response = self.client.post(
+            '/api/registrations/analytics/reports/',
+            data={'event_ids': [str(self.event_id), str(other_event_id)]},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 2)
+        self.assertEqual(response.json()['results'][1]['registrations']['confirmed'], 1)
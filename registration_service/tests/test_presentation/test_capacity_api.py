@@ -40,3 +40,21 @@ class CapacityAPITest(TestCase):
         data = response.json()
         self.assertEqual(data['max_capacity'], 100)
         self.assertIn('available', data)
+        
+    def test_reserve_capacity_errors(self):
+        """Test reservation failures map to 404, 400 and 409."""
+        url = f'/api/registrations/events/{self.event_id}/capacity/reserve/'
+        self.assertEqual(self.client.post(url).status_code, 404)
+        
+        rule = CapacityRule.objects.create(
+            event_id=self.event_id,
+            max_capacity=1,
+            warning_threshold=80,
+            allow_reservations=False,
+        )
+        self.assertEqual(self.client.post(url).status_code, 400)
+        
+        rule.allow_reservations = True
+        rule.save()
+        self.assertEqual(self.client.post(url).status_code, 201)
+        self.assertEqual(self.client.post(url).status_code, 409)
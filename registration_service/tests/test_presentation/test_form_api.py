@@ -66,3 +66,28 @@ class FormAPITest(TestCase):
         )
         self.assertEqual(response.status_code, 201)
         self.assertIn('submission_id', response.json())
+        
+    def test_validate_bulk(self):
+        """Test validating a CSV import via API."""
+        form = RegistrationForm.objects.create(
+            event_id=self.event_id,
+            title='Registration',
+        )
+        from domain.registration_form import CustomField
+        CustomField.objects.create(
+            form=form,
+            label='Full Name',
+            field_type='text',
+            is_required=True,
+            order=1,
+        )
+        
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        upload = SimpleUploadedFile('attendees.csv', b'Full Name\nJohn Doe\n\n,\n', content_type='text/csv')
+        response = self.client.post(
+            f'/api/registrations/events/{self.event_id}/form/validate-bulk/',
+            data={'file': upload}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total_rows'], 2)
+        self.assertEqual(response.json()['errors'][0]['row'], 2)
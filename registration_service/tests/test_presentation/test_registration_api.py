@@ -75,3 +75,20 @@ class RegistrationAPITest(TestCase):
         data = response.json()
         self.assertEqual(data['confirmed_count'], 1)
         self.assertTrue(data['has_capacity'])
+        
+    def test_export_registrations(self):
+        """Test streaming an event's registrations as CSV."""
+        Registration.objects.create(
+            event_id=self.event_id,
+            user_id=uuid.uuid4(),
+            attendee_name='John Doe',
+            attendee_email='john@example.com',
+        )
+        
+        response = self.client.get(
+            f'/api/registrations/events/{self.event_id}/export/'
+        )
+        self.assertEqual(response.status_code, 200)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn('john@example.com', lines[1])
@@ -3,6 +3,7 @@ from decimal import Decimal
 from typing import Dict, Optional
 from django.utils import timezone
 from domain.analytics import TicketAnalytics, SalesMetrics
+from infrastructure.services.analytics_counters import TicketAnalyticsCounters
 
 
 class TicketAnalyticsService:
@@ -36,20 +37,20 @@ class TicketAnalyticsService:
         return analytics
     
     def get_event_analytics(self, event_id: uuid.UUID) -> Optional[Dict]:
-        """Get event analytics with calculations."""
-        try:
-            analytics = TicketAnalytics.objects.get(event_id=event_id)
-            return {
-                'event_id': str(analytics.event_id),
-                'total_tickets': analytics.total_tickets,
-                'sold_tickets': analytics.sold_tickets,
-                'revenue': analytics.revenue,
-                'sold_percentage': analytics.calculate_sold_percentage(),
-                'average_price': analytics.calculate_average_ticket_price(),
-                'is_sold_out': analytics.is_sold_out()
-            }
-        except TicketAnalytics.DoesNotExist:
+        """Get event analytics with calculations, including unflushed sales."""
+        analytics = TicketAnalyticsCounters().load(event_id)
+        if analytics is None:
             return None
+        
+        return {
+            'event_id': str(analytics.event_id),
+            'total_tickets': analytics.total_tickets,
+            'sold_tickets': analytics.sold_tickets,
+            'revenue': analytics.revenue,
+            'sold_percentage': analytics.calculate_sold_percentage(),
+            'average_price': analytics.calculate_average_ticket_price(),
+            'is_sold_out': analytics.is_sold_out()
+        }
 
 
 class SalesReportingService:
@@ -133,7 +134,7 @@ class BusinessIntelligenceService:
     
     def calculate_kpis(self, event_id: uuid.UUID) -> Dict:
         """Calculate key performance indicators."""
-        analytics = TicketAnalytics.objects.filter(event_id=event_id).first()
+        analytics = TicketAnalyticsCounters().load(event_id)
         
         if not analytics:
             return {}
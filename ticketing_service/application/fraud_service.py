@@ -1,29 +1,68 @@
 import uuid
 from decimal import Decimal
-from typing import Dict, Any
-from django.utils import timezone
-from datetime import timedelta
-from django.db.models import Count
+from typing import Dict, Any, List, Optional
 
-from domain.fraud import SecurityRule, FraudAlert
+from domain.fraud import FraudAlert
 from domain.order import Order
+from infrastructure.services.fraud_velocity import OrderSignals, SecurityRuleSet, VelocityTracker
+
+
+HOUR = 3600
+DAY = 24 * 3600
+
+# Risk points added by each triggered configured rule type
+RULE_WEIGHTS = {
+    'velocity': 30,
+    'amount': 20,
+    'pattern': 30,
+}
 
 
 class FraudDetectionService:
     """Service for detecting fraudulent activities."""
     
-    def check_order(self, order: Order) -> FraudAlert:
+    def __init__(self, tracker: Optional[VelocityTracker] = None):
+        self.tracker = tracker or VelocityTracker()
+    
+    def check_order(
+        self,
+        order: Order,
+        ip_address: Optional[str] = None,
+        card_fingerprint: Optional[str] = None
+    ) -> Optional[FraudAlert]:
         """Check order for fraud."""
+        signals = OrderSignals.from_order(order, ip_address, card_fingerprint)
+        return self.check_orders([order], {order.id: signals})[0]
+    
+    def check_orders(
+        self,
+        orders: List[Order],
+        signals: Optional[Dict[uuid.UUID, OrderSignals]] = None
+    ) -> List[Optional[FraudAlert]]:
+        """Check several orders and insert their alerts in one batch."""
+        signals = signals or {}
+        windows = [HOUR] + SecurityRuleSet.windows()
+        results: List[Optional[FraudAlert]] = []
+        alerts = []
+        
+        for order in orders:
+            order_signals = signals.get(order.id) or OrderSignals.from_order(order)
+            counts = self.tracker.observe_and_count(order_signals, windows)
+            alert = self._evaluate(order, counts)
+            results.append(alert)
+            if alert:
+                alerts.append(alert)
+        
+        FraudAlert.objects.bulk_create(alerts)
+        return results
+    
+    def _evaluate(self, order: Order, counts: Dict) -> Optional[FraudAlert]:
+        """Score an order and build (unsaved) alert if risk is detected."""
         risk_score = 0
         alerts = []
         
         # Check velocity (multiple orders in short time)
-        recent_orders = Order.objects.filter(
-            user_id=order.user_id,
-            created_at__gte=timezone.now() - timedelta(hours=1)
-        ).count()
-        
-        if recent_orders > 5:
+        if counts[('user', HOUR)] > 5:
             risk_score += 30
             alerts.append('High velocity detected')
         
@@ -32,6 +71,12 @@ class FraudDetectionService:
             risk_score += 20
             alerts.append('High amount transaction')
         
+        triggered = SecurityRuleSet.evaluate(order.total_amount, counts)
+        for rule in triggered:
+            risk_score += RULE_WEIGHTS.get(rule.rule_type, 0)
+            alerts.append(f"Rule triggered: {rule.name}")
+        risk_score = min(risk_score, 100)
+        
         # Determine severity
         if risk_score >= 70:
             severity = 'critical'
@@ -44,24 +89,15 @@ class FraudDetectionService:
         
         # Create alert if risk detected
         if risk_score > 0:
-            rule = SecurityRule.objects.filter(is_active=True).first()
-            if not rule:
-                rule = SecurityRule.objects.create(
-                    name='Default Rule',
-                    rule_type='pattern',
-                    threshold_value=Decimal('50.00')
-                )
-            
-            alert = FraudAlert.objects.create(
+            rule_id = triggered[0].rule_id if triggered else SecurityRuleSet.default_rule_id()
+            return FraudAlert(
                 order_id=order.id,
                 user_id=order.user_id,
-                rule_id=rule.id,
+                rule_id=rule_id,
                 severity=severity,
                 description='; '.join(alerts),
                 risk_score=risk_score
             )
-            
-            return alert
         
         return None
 
@@ -69,6 +105,9 @@ class FraudDetectionService:
 class SecurityValidationService:
     """Service for security validation."""
     
+    def __init__(self, tracker: Optional[VelocityTracker] = None):
+        self.tracker = tracker or VelocityTracker()
+    
     def validate_order(self, order: Order) -> Dict[str, Any]:
         """Validate order security."""
         issues = []
@@ -78,7 +117,8 @@ class SecurityValidationService:
             issues.append('Zero amount order')
         
         # Check user history
-        user_orders = Order.objects.filter(user_id=order.user_id).count()
+        self.tracker.observe_and_count(OrderSignals.from_order(order), [])
+        user_orders = self.tracker.lifetime_orders(str(order.user_id))
         if user_orders == 1:
             issues.append('First time user')
         
@@ -94,7 +134,15 @@ class SecurityValidationService:
 class RiskAssessmentService:
     """Service for risk assessment."""
     
-    def assess_order(self, order: Order) -> Dict[str, Any]:
+    def __init__(self, tracker: Optional[VelocityTracker] = None):
+        self.tracker = tracker or VelocityTracker()
+    
+    def assess_order(
+        self,
+        order: Order,
+        ip_address: Optional[str] = None,
+        card_fingerprint: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Assess order risk."""
         risk_factors = []
         risk_score = 0
@@ -105,15 +153,17 @@ class RiskAssessmentService:
             risk_score += 25
         
         # Check user activity
-        recent_orders = Order.objects.filter(
-            user_id=order.user_id,
-            created_at__gte=timezone.now() - timedelta(days=1)
-        ).count()
+        signals = OrderSignals.from_order(order, ip_address, card_fingerprint)
+        counts = self.tracker.observe_and_count(signals, [DAY])
         
-        if recent_orders > 3:
+        if counts[('user', DAY)] > 3:
             risk_factors.append('Multiple recent orders')
             risk_score += 35
         
+        if max(counts[('ip', DAY)], counts[('card', DAY)]) > 10:
+            risk_factors.append('Shared device or card')
+            risk_score += 20
+        
         # Check for existing alerts
         existing_alerts = FraudAlert.objects.filter(
             user_id=order.user_id,
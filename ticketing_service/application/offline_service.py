@@ -1,10 +1,13 @@
 import uuid
 from datetime import timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.utils import timezone
 
 from domain.offline import OfflineTicket, ValidationCache
+from infrastructure.offline_engine import OfflineManifestStore
+from infrastructure.validation_index import ValidationIndexRegistry
 
 
 class OfflineValidationService:
@@ -12,13 +15,26 @@ class OfflineValidationService:
     
     def validate_ticket(self, qr_code: str) -> Dict[str, Any]:
         """Validate ticket offline."""
-        try:
-            ticket = OfflineTicket.objects.get(qr_code=qr_code)
-        except OfflineTicket.DoesNotExist:
-            raise ValidationError("Ticket not found")
+        index = ValidationIndexRegistry.find(qr_code)
+        if index is not None:
+            result = index.check_in(qr_code)
+            if not result['valid']:
+                raise ValidationError(result['reason'])
+            return {
+                'ticket_id': result['ticket_id'],
+                'status': 'validated',
+                'attendee_name': result['attendee_name']
+            }
         
-        ticket.validate_offline()
-        ticket.mark_used()
+        with transaction.atomic():
+            # Locked so concurrent scans of the same ticket admit it once
+            try:
+                ticket = OfflineTicket.objects.select_for_update().get(qr_code=qr_code)
+            except OfflineTicket.DoesNotExist:
+                raise ValidationError("Ticket not found")
+            
+            ticket.validate_offline()
+            ticket.mark_used()
         
         return {
             'ticket_id': str(ticket.ticket_id),
@@ -27,31 +43,46 @@ class OfflineValidationService:
         }
 
 
+    def load_index(self, event_id: uuid.UUID) -> Dict[str, Any]:
+        """Preload the in-memory validation index for an event's gates."""
+        index = ValidationIndexRegistry.load(event_id)
+        return {
+            'event_id': str(event_id),
+            'ticket_count': len(index),
+            'pending_check_ins': len(index.pending_records())
+        }
+    
+    def reconcile_index(self, event_id: uuid.UUID) -> Dict[str, Any]:
+        """Write check-ins recorded by the index back to the database."""
+        index = ValidationIndexRegistry.get(event_id)
+        if index is None:
+            raise ValidationError("Validation index not loaded")
+        return {
+            'event_id': str(event_id),
+            'reconciled': index.reconcile()
+        }
+
+
 class TicketSyncService:
     """Service for ticket synchronization."""
     
     def sync_tickets(self, event_id: uuid.UUID, tickets: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Sync tickets for offline use."""
-        synced_count = 0
-        
-        for ticket_data in tickets:
-            OfflineTicket.objects.update_or_create(
-                ticket_id=ticket_data['ticket_id'],
-                defaults={
-                    'qr_code': ticket_data['qr_code'],
-                    'event_id': event_id,
-                    'attendee_name': ticket_data['attendee_name'],
-                    'status': ticket_data.get('status', 'active'),
-                    'valid_until': ticket_data['valid_until']
-                }
-            )
-            synced_count += 1
+        store = OfflineManifestStore()
+        synced = store.upsert(event_id, tickets)
         
         return {
             'event_id': str(event_id),
-            'synced_count': synced_count,
+            'synced_count': len(synced),
+            'change_token': store.latest_token(event_id),
             'synced_at': timezone.now().isoformat()
         }
+    
+    def get_manifest(self, event_id: uuid.UUID, since_token: int = 0) -> Iterator[bytes]:
+        """Get the gzip NDJSON manifest of tickets changed after since_token."""
+        if since_token < 0:
+            raise ValidationError("Change token cannot be negative")
+        return OfflineManifestStore().stream_manifest(event_id, since_token)
 
 
 class CacheManagementService:
@@ -1,49 +1,138 @@
 import uuid
+import redis
 from decimal import Decimal
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from django.core.exceptions import ValidationError
 from django.db import transaction
 
 from domain.order import Order, OrderItem
 from domain.ticket_type import TicketType
 from domain.ticket import Ticket
+from domain.tax import TaxCalculation
+from application.promo_code_service import ValidatePromoCodeService
+from application.tax_service import TaxCalculationService
+from infrastructure.services.fraud_velocity import OrderSignals, VelocityTracker
+from infrastructure.services.inventory_reservation import (
+    InsufficientInventoryError,
+    TicketReservationEngine,
+)
+from infrastructure.services.tax_rules import TaxRuleTable
+from infrastructure.services.ticket_issuance import BulkTicketIssuer
 
 
 class CreateOrderService:
     """Service for creating orders."""
     
+    MAX_BATCH = 500
+    
+    def __init__(
+        self,
+        promo_validator: Optional[ValidatePromoCodeService] = None,
+        tax_service: Optional[TaxCalculationService] = None,
+        tracker: Optional[VelocityTracker] = None
+    ):
+        self.promo_validator = promo_validator or ValidatePromoCodeService()
+        self.tax_service = tax_service or TaxCalculationService()
+        self.tracker = tracker or VelocityTracker()
+    
     def execute(self, data: Dict[str, Any]) -> Order:
         """Create a new order with items."""
+        return self.execute_batch([data])[0]
+    
+    def execute_batch(self, orders_data: List[Dict[str, Any]]) -> List[Order]:
+        """Create several orders in one transaction.
+        
+        Ticket types are loaded in one query and validated in memory, items
+        are bulk inserted, and promo discount and tax are priced in the same
+        pass. The whole batch fails if any order is invalid.
+        """
+        if len(orders_data) > self.MAX_BATCH:
+            raise ValidationError(f"Cannot create more than {self.MAX_BATCH} orders at once")
+        
+        requested: Dict[uuid.UUID, int] = {}
+        for data in orders_data:
+            for item_data in data['items']:
+                ticket_type_id = item_data['ticket_type_id']
+                requested[ticket_type_id] = requested.get(ticket_type_id, 0) + item_data['quantity']
+        
         with transaction.atomic():
-            order = Order.objects.create(
-                user_id=data['user_id'],
-                event_id=data['event_id'],
-                total_amount=Decimal('0.00'),
-                currency=data.get('currency', 'USD')
-            )
+            ticket_types = TicketType.objects.in_bulk(list(requested))
             
-            for item_data in data['items']:
-                ticket_type = TicketType.objects.get(id=item_data['ticket_type_id'])
-                
-                if not ticket_type.can_purchase(item_data['quantity']):
-                    raise ValidationError(f"Cannot purchase {item_data['quantity']} tickets for {ticket_type.name}")
-                
-                OrderItem.objects.create(
-                    order=order,
-                    ticket_type_id=ticket_type.id,
-                    quantity=item_data['quantity'],
-                    unit_price=ticket_type.price
+            for data in orders_data:
+                for item_data in data['items']:
+                    ticket_type = ticket_types.get(item_data['ticket_type_id'])
+                    if ticket_type is None:
+                        raise ValidationError("Ticket type not found")
+                    if not ticket_type.can_purchase(item_data['quantity']):
+                        raise ValidationError(f"Cannot purchase {item_data['quantity']} tickets for {ticket_type.name}")
+            
+            for ticket_type_id, quantity in requested.items():
+                if quantity > ticket_types[ticket_type_id].available_quantity():
+                    raise ValidationError(f"Not enough tickets available for {ticket_types[ticket_type_id].name}")
+            
+            orders, items, tax_calculations = [], [], []
+            for data in orders_data:
+                order = Order(
+                    user_id=data['user_id'],
+                    event_id=data['event_id'],
+                    total_amount=Decimal('0.00'),
+                    currency=data.get('currency', 'USD')
                 )
+                for item_data in data['items']:
+                    item = OrderItem(
+                        order=order,
+                        ticket_type_id=item_data['ticket_type_id'],
+                        quantity=item_data['quantity'],
+                        unit_price=ticket_types[item_data['ticket_type_id']].price
+                    )
+                    item.prepare()
+                    order.total_amount += item.subtotal
+                    items.append(item)
+                
+                if data.get('promo_code'):
+                    self._apply_promo(order, data['promo_code'])
+                if data.get('country'):
+                    tax_rule = TaxRuleTable.lookup(data['country'], data.get('state', ''))
+                    tax_calculations.append(self.tax_service.build_for_order(order, tax_rule))
+                orders.append(order)
             
-            order.calculate_total()
-            return order
+            Order.objects.bulk_create(orders)
+            OrderItem.objects.bulk_create(items)
+            TaxCalculation.objects.bulk_create(tax_calculations)
+            transaction.on_commit(lambda: self._observe(orders, orders_data))
+            return orders
+    
+    def _observe(self, orders: List[Order], orders_data: List[Dict[str, Any]]) -> None:
+        """Feed new orders to the fraud velocity counters."""
+        try:
+            for order, data in zip(orders, orders_data):
+                self.tracker.observe(OrderSignals.from_order(
+                    order, data.get('ip_address'), data.get('card_fingerprint')
+                ))
+        except redis.RedisError:
+            # Risk checks fall back to counting orders in the database
+            pass
+    
+    def _apply_promo(self, order: Order, code: str) -> None:
+        """Discount an unsaved order and count the promo code use."""
+        result = self.promo_validator.execute(code, order.total_amount, order.event_id)
+        promo = result['promo_code']
+        if result['serial'] is not None:
+            self.promo_validator.single_use.redeem(promo.id, result['serial'], order.id)
+        promo.apply()
+        order.total_amount = result['final_amount']
+        transaction.on_commit(lambda: self.promo_validator.cache.record_use(promo.code))
 
 
 class ProcessTicketPurchaseService:
     """Service for processing ticket purchases."""
     
-    def execute(self, order_id: uuid.UUID, payment_id: uuid.UUID) -> List[Ticket]:
-        """Process purchase and generate tickets."""
+    def execute(self, order_id: uuid.UUID, payment_id: uuid.UUID, hold_id: Optional[str] = None) -> List[Ticket]:
+        """Process purchase and generate tickets.
+        
+        When a reservation hold is given, inventory was already taken by the
+        reservation engine and is written back to ticket_types asynchronously.
+        """
         try:
             order = Order.objects.get(id=order_id)
         except Order.DoesNotExist:
@@ -52,25 +141,69 @@ class ProcessTicketPurchaseService:
         if not order.can_purchase():
             raise ValidationError("Order cannot be purchased")
         
-        with transaction.atomic():
-            # Reserve inventory and generate tickets
-            tickets = []
-            for item in order.items.all():
-                ticket_type = TicketType.objects.get(id=item.ticket_type_id)
-                ticket_type.reserve_tickets(item.quantity)
+        items = list(order.items.all())
+        if hold_id:
+            return self._execute_with_hold(order, items, payment_id, hold_id)
+        
+        # Take the tickets from the reservation counters first so this path
+        # and hold-based checkouts draw from the same inventory.
+        engine = TicketReservationEngine()
+        try:
+            claimed = engine.claim([
+                {'ticket_type_id': item.ticket_type_id, 'quantity': item.quantity} for item in items
+            ])
+        except InsufficientInventoryError as e:
+            raise ValidationError(str(e))
+        
+        try:
+            with transaction.atomic():
+                # Reserve inventory and generate tickets
+                ticket_types = TicketType.objects.select_for_update().in_bulk(
+                    [item.ticket_type_id for item in items]
+                )
+                for item in items:
+                    ticket_types[item.ticket_type_id].reserve_tickets(item.quantity)
                 
-                # Generate tickets
-                for _ in range(item.quantity):
-                    ticket = Ticket.objects.create(
-                        ticket_type_id=ticket_type.id,
-                        order_id=order.id,
-                        attendee_name=f"Attendee",  # Will be updated later
-                        attendee_email="temp@example.com"
-                    )
-                    tickets.append(ticket)
-            
-            order.confirm(payment_id)
-            return tickets
+                # Attendee details are updated later
+                tickets = BulkTicketIssuer().issue_for_order(
+                    order.id,
+                    [(item.ticket_type_id, item.quantity) for item in items],
+                    event_id=order.event_id
+                )
+                
+                order.confirm(payment_id)
+                return tickets
+        except Exception:
+            engine.adjust(claimed)
+            raise
+    
+    def _execute_with_hold(self, order: Order, items: List[OrderItem], payment_id: uuid.UUID, hold_id: str) -> List[Ticket]:
+        """Confirm a reservation hold and generate tickets for it."""
+        engine = TicketReservationEngine()
+        
+        expected: Dict[str, int] = {}
+        for item in items:
+            key = str(item.ticket_type_id)
+            expected[key] = expected.get(key, 0) + item.quantity
+        if engine.get_hold(hold_id) != expected:
+            raise ValidationError("Reservation does not match order items")
+        
+        if engine.confirm(hold_id) is None:
+            raise ValidationError("Reservation not found or expired")
+        
+        try:
+            with transaction.atomic():
+                tickets = BulkTicketIssuer().issue_for_order(
+                    order.id,
+                    [(item.ticket_type_id, item.quantity) for item in items],
+                    event_id=order.event_id
+                )
+                order.confirm(payment_id)
+                return tickets
+        except Exception:
+            for ticket_type_id, quantity in expected.items():
+                engine.restock(ticket_type_id, quantity)
+            raise
 
 
 class OrderManagementService:
@@ -84,15 +217,28 @@ class OrderManagementService:
             raise ValidationError("Order not found")
     
     def cancel_order(self, order_id: uuid.UUID) -> Order:
-        """Cancel an order and release inventory."""
+        """Cancel an order and release inventory.
+        
+        Sold tickets go back through the reservation engine, which returns them
+        to the available counters and has the reconciler take them off
+        quantity_sold, whichever purchase path sold them.
+        """
         order = self.get_order(order_id)
         
         with transaction.atomic():
             # Only release inventory if order was confirmed
             if order.status == 'confirmed':
+                sold: Dict[str, int] = {}
                 for item in order.items.all():
-                    ticket_type = TicketType.objects.get(id=item.ticket_type_id)
-                    ticket_type.release_tickets(item.quantity)
+                    key = str(item.ticket_type_id)
+                    sold[key] = sold.get(key, 0) + item.quantity
+                transaction.on_commit(lambda: self._restock(sold))
             
             order.cancel()
             return order
+    
+    @staticmethod
+    def _restock(sold: Dict[str, int]) -> None:
+        engine = TicketReservationEngine()
+        for ticket_type_id, quantity in sold.items():
+            engine.restock(ticket_type_id, quantity)
@@ -1,11 +1,14 @@
 import uuid
 from decimal import Decimal
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, Optional
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.utils import timezone
 
 from domain.promo_code import PromoCode
 from domain.order import Order
+from infrastructure.services.promo_code_cache import PromoCodeCache
+from infrastructure.services.single_use_codes import SingleUseCodeService
 
 
 class CreatePromoCodeService:
@@ -27,15 +30,42 @@ class CreatePromoCodeService:
         return promo
 
 
+class GenerateSingleUseCodesService:
+    """Service for bulk pre-generating single-use codes."""
+    
+    MAX_BATCH = 5_000_000
+    
+    def __init__(self, single_use: Optional[SingleUseCodeService] = None):
+        self.single_use = single_use or SingleUseCodeService()
+    
+    def execute(self, promo_code_id: uuid.UUID, count: int) -> Iterator[str]:
+        """Allocate count codes under a promo code and return them lazily."""
+        if count < 1 or count > self.MAX_BATCH:
+            raise ValidationError(f"Count must be between 1 and {self.MAX_BATCH}")
+        
+        promo, serials = self.single_use.allocate(promo_code_id, count)
+        return self.single_use.iter_codes(promo, serials)
+
+
 class ValidatePromoCodeService:
     """Service for validating promo codes."""
     
+    def __init__(self, cache: Optional[PromoCodeCache] = None, single_use: Optional[SingleUseCodeService] = None):
+        self.cache = cache or PromoCodeCache()
+        self.single_use = single_use or SingleUseCodeService(self.cache)
+    
     def execute(self, code: str, order_amount: Decimal, event_id: uuid.UUID = None) -> Dict[str, Any]:
         """Validate promo code and return discount info."""
-        try:
-            promo = PromoCode.objects.get(code=code.upper())
-        except PromoCode.DoesNotExist:
-            raise ValidationError("Promo code not found")
+        serial = None
+        resolved = self.single_use.resolve(code)
+        if resolved:
+            promo, serial = resolved
+            if self.single_use.is_redeemed(promo.id, serial):
+                raise ValidationError("Promo code has already been used")
+        else:
+            promo = self.cache.get(code)
+            if promo is None:
+                raise ValidationError("Promo code not found")
         
         if event_id and promo.event_id and promo.event_id != event_id:
             raise ValidationError("Promo code not valid for this event")
@@ -52,7 +82,8 @@ class ValidatePromoCodeService:
             'discount_amount': discount,
             'final_amount': order_amount - discount,
             'discount_type': promo.discount_type,
-            'discount_value': promo.discount_value
+            'discount_value': promo.discount_value,
+            'serial': serial
         }
 
 
@@ -73,10 +104,14 @@ class ApplyDiscountService:
         result = validator.execute(promo_code, order.total_amount, order.event_id)
         
         promo = result['promo_code']
-        promo.apply()
-        
-        # Update order with discount
-        order.total_amount = result['final_amount']
-        order.save()
+        with transaction.atomic():
+            if result['serial'] is not None:
+                validator.single_use.redeem(promo.id, result['serial'], order.id)
+            promo.apply()
+            
+            # Update order with discount
+            order.total_amount = result['final_amount']
+            order.save()
         
+        validator.cache.record_use(promo.code)
         return order
@@ -1,11 +1,11 @@
 import uuid
 from decimal import Decimal
 from typing import Dict, Any
-from django.db.models import Sum, Count
+from django.db.models import Count, Q, Sum
 from django.utils import timezone
-from datetime import timedelta
+from datetime import datetime, timedelta
 
-from domain.revenue import Revenue, RevenueReport
+from domain.revenue import Revenue, RevenueReport, RevenueRollup
 from domain.order import Order
 from domain.refund import Refund
 
@@ -55,43 +55,80 @@ class RevenueReportService:
             start_date = now - timedelta(days=30)
             end_date = now
         
-        # Get revenue data
-        revenues = Revenue.objects.filter(
-            event_id=event_id,
-            created_at__gte=start_date,
-            created_at__lt=end_date
-        )
-        
-        stats = revenues.aggregate(
-            total_gross=Sum('gross_amount'),
-            total_fees=Sum('platform_fee') + Sum('payment_fee'),
-            total_net=Sum('net_amount'),
-            total_orders=Count('order_id', distinct=True)
-        )
-        
-        # Get refund data
-        refunds = Refund.objects.filter(
-            order_id__in=revenues.values_list('order_id', flat=True),
-            created_at__gte=start_date,
-            created_at__lt=end_date,
-            status='completed'
-        )
-        
-        total_refunds = refunds.aggregate(total=Sum('refund_amount'))['total'] or Decimal('0.00')
+        stats = self._window_totals(event_id, start_date, end_date)
         
         report = RevenueReport.objects.create(
             event_id=event_id,
             period=period,
             start_date=start_date,
             end_date=end_date,
-            total_gross=stats['total_gross'] or Decimal('0.00'),
-            total_fees=stats['total_fees'] or Decimal('0.00'),
-            total_net=stats['total_net'] or Decimal('0.00'),
-            total_orders=stats['total_orders'] or 0,
-            total_refunds=total_refunds
+            total_gross=stats['total_gross'],
+            total_fees=stats['total_fees'],
+            total_net=stats['total_net'],
+            total_orders=stats['total_orders'],
+            total_refunds=stats['total_refunds']
         )
         
         return report
+    
+    def _window_totals(self, event_id: uuid.UUID, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+        """Sum whole hours from the rollups and partial edge hours from raw rows."""
+        first_hour = RevenueRollup.bucket_for(start_date)
+        if first_hour < start_date:
+            first_hour += timedelta(hours=1)
+        last_hour = RevenueRollup.bucket_for(end_date)
+        
+        if first_hour < last_hour:
+            buckets = RevenueRollup.objects.filter(
+                event_id=event_id,
+                bucket_start__gte=first_hour,
+                bucket_start__lt=last_hour
+            ).aggregate(
+                gross=Sum('gross_amount'),
+                platform=Sum('platform_fee'),
+                payment=Sum('payment_fee'),
+                net=Sum('net_amount'),
+                orders=Sum('order_count'),
+                refunds=Sum('refund_amount')
+            )
+            edges = [(start_date, first_hour), (last_hour, end_date)]
+        else:
+            buckets = {}
+            edges = [(start_date, end_date)]
+        edges = [(low, high) for low, high in edges if low < high]
+        
+        # Rows in the partial hours at either end of the window
+        edge_revenue = {}
+        edge_refunds = {}
+        if edges:
+            revenue_window = Q()
+            refund_window = Q()
+            for low, high in edges:
+                revenue_window |= Q(created_at__gte=low, created_at__lt=high)
+                refund_window |= Q(processed_at__gte=low, processed_at__lt=high)
+            edge_revenue = Revenue.objects.filter(revenue_window, event_id=event_id).aggregate(
+                gross=Sum('gross_amount'),
+                platform=Sum('platform_fee'),
+                payment=Sum('payment_fee'),
+                net=Sum('net_amount'),
+                orders=Count('id')
+            )
+            edge_refunds = Refund.objects.filter(
+                refund_window,
+                status='completed',
+                order_id__in=Order.objects.filter(event_id=event_id).values('id')
+            ).aggregate(refunds=Sum('refund_amount'))
+        
+        def total(field, default=Decimal('0.00')):
+            return sum((part.get(field) or default for part in (buckets, edge_revenue, edge_refunds)), default)
+        
+        return {
+            'total_gross': total('gross'),
+            'total_fees': total('platform') + total('payment'),
+            'total_net': total('net'),
+            'total_orders': total('orders', 0),
+            'total_refunds': total('refunds')
+        }
 
 
 class PayoutManagementService:
@@ -99,18 +136,13 @@ class PayoutManagementService:
     
     def calculate_payout(self, event_id: uuid.UUID) -> Dict[str, Any]:
         """Calculate payout amount for an event."""
-        revenues = Revenue.objects.filter(event_id=event_id)
-        
-        total_net = revenues.aggregate(total=Sum('net_amount'))['total'] or Decimal('0.00')
-        
-        # Get refunds for orders in this event
-        order_ids = revenues.values_list('order_id', flat=True)
-        refunds = Refund.objects.filter(
-            order_id__in=order_ids,
-            status='completed'
+        stats = RevenueRollup.objects.filter(event_id=event_id).aggregate(
+            total_net=Sum('net_amount'),
+            total_refunds=Sum('refund_amount')
         )
         
-        total_refunds = refunds.aggregate(total=Sum('refund_amount'))['total'] or Decimal('0.00')
+        total_net = stats['total_net'] or Decimal('0.00')
+        total_refunds = stats['total_refunds'] or Decimal('0.00')
         
         payout_amount = total_net - total_refunds
         
@@ -1,10 +1,12 @@
 import uuid
 from decimal import Decimal
-from typing import Dict, Any
-from django.db.models import Sum, Count
+from typing import Dict, Any, List
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q, Sum
 
 from domain.tax import TaxRule, TaxCalculation
 from domain.order import Order
+from infrastructure.services.tax_rules import CompiledTaxRule, TaxRuleTable
 
 
 class TaxCalculationService:
@@ -12,50 +14,55 @@ class TaxCalculationService:
     
     def calculate_for_order(self, order: Order, country: str = 'US', state: str = '') -> TaxCalculation:
         """Calculate tax for an order."""
-        # Get applicable tax rule
-        try:
-            if state:
-                tax_rule = TaxRule.objects.get(country=country, state=state, is_active=True)
-            else:
-                tax_rule = TaxRule.objects.get(country=country, state='', is_active=True)
-        except TaxRule.DoesNotExist:
-            # Default to 0% tax if no rule found
-            tax_rule = TaxRule(
-                name='No Tax',
-                country=country,
-                tax_rate=Decimal('0.00')
-            )
-            tax_rule.save()
-        
-        # Calculate tax
-        tax_amount = tax_rule.calculate_tax(order.total_amount)
-        
-        # Create tax calculation
-        calc = TaxCalculation.objects.create(
+        return self.calculate_for_orders([order], country, state)[0]
+    
+    def calculate_for_orders(self, orders: List[Order], country: str = 'US', state: str = '') -> List[TaxCalculation]:
+        """Calculate tax for a batch of orders in one jurisdiction with one insert."""
+        tax_rule = TaxRuleTable.lookup(country, state)
+        calculations = [self.build_for_order(order, tax_rule) for order in orders]
+        return TaxCalculation.objects.bulk_create(calculations)
+    
+    def build_for_order(self, order: Order, tax_rule: CompiledTaxRule) -> TaxCalculation:
+        """Build an unsaved tax calculation for bulk insertion."""
+        calc = TaxCalculation(
             order_id=order.id,
-            tax_rule_id=tax_rule.id,
+            tax_rule_id=tax_rule.rule_id,
             subtotal=order.total_amount,
-            tax_amount=tax_amount,
+            tax_amount=tax_rule.calculate_tax(order.total_amount),
             currency=order.currency
         )
-        
+        calc.total = calc.calculate_total()
         return calc
 
 
+class TaxRuleService:
+    """Service for changing tax rules."""
+    
+    def create_rule(self, data: Dict[str, Any]) -> TaxRule:
+        """Create a tax rule; saving it publishes the change."""
+        rule = TaxRule(**data)
+        rule.clean()
+        rule.save()
+        return rule
+    
+    def deactivate_rule(self, rule_id: uuid.UUID) -> None:
+        """Deactivate a tax rule and publish the change."""
+        # Queryset updates send no signals
+        TaxRule.objects.filter(id=rule_id).update(is_active=False)
+        transaction.on_commit(TaxRuleTable.publish)
+
+
 class TaxComplianceService:
     """Service for tax compliance tracking."""
     
     def check_compliance(self, event_id: uuid.UUID) -> Dict[str, Any]:
         """Check tax compliance for an event."""
-        # Get all orders for event
-        orders = Order.objects.filter(event_id=event_id, status='confirmed')
-        
-        # Get tax calculations
-        order_ids = orders.values_list('id', flat=True)
-        calculations = TaxCalculation.objects.filter(order_id__in=order_ids)
-        
-        total_orders = orders.count()
-        taxed_orders = calculations.count()
+        stats = Order.objects.filter(event_id=event_id, status='confirmed').aggregate(
+            total_orders=Count('id'),
+            taxed_orders=Count('id', filter=Q(Exists(TaxCalculation.objects.filter(order_id=OuterRef('id')))))
+        )
+        total_orders = stats['total_orders']
+        taxed_orders = stats['taxed_orders']
         
         compliance_rate = (taxed_orders / total_orders * 100) if total_orders > 0 else 0
         
@@ -73,12 +80,9 @@ class TaxReportingService:
     
     def generate_report(self, event_id: uuid.UUID) -> Dict[str, Any]:
         """Generate tax report for an event."""
-        # Get all orders for event
-        orders = Order.objects.filter(event_id=event_id, status='confirmed')
-        order_ids = orders.values_list('id', flat=True)
-        
-        # Get tax calculations
-        calculations = TaxCalculation.objects.filter(order_id__in=order_ids)
+        calculations = TaxCalculation.objects.filter(Exists(
+            Order.objects.filter(id=OuterRef('order_id'), event_id=event_id, status='confirmed')
+        ))
         
         stats = calculations.aggregate(
             total_subtotal=Sum('subtotal'),
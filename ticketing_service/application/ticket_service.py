@@ -1,7 +1,12 @@
 import uuid
-from typing import Dict, Any, List
+from datetime import datetime, timezone as dt_timezone
+from typing import Dict, Any, List, Optional
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 from domain.ticket import Ticket
+from infrastructure.services.ticket_issuance import BulkTicketIssuer
+from infrastructure.services.ticket_signing import TicketRevocationRegistry, TicketTokenVerifier
+from infrastructure.validation_index import ValidationIndexRegistry
 
 
 class GenerateTicketService:
@@ -18,12 +23,8 @@ class GenerateTicketService:
         return ticket
     
     def bulk_generate(self, data: Dict[str, Any], quantity: int) -> List[Ticket]:
-        """Generate multiple tickets."""
-        tickets = []
-        for _ in range(quantity):
-            ticket = self.execute(data)
-            tickets.append(ticket)
-        return tickets
+        """Generate multiple tickets with batched inserts."""
+        return BulkTicketIssuer().issue_batch(data, quantity)
 
 
 class ValidateQRCodeService:
@@ -31,6 +32,23 @@ class ValidateQRCodeService:
     
     def execute(self, qr_code_data: str) -> Dict[str, Any]:
         """Validate QR code and return ticket info."""
+        # Forged or expired signed tokens are rejected without a database read
+        if TicketTokenVerifier.is_token(qr_code_data):
+            TicketTokenVerifier().verify(qr_code_data)
+        
+        index = ValidationIndexRegistry.find(qr_code_data)
+        if index is not None:
+            entry, used_at = index.lookup(qr_code_data)
+            status = 'used' if used_at is not None else entry.status
+            return {
+                'valid': status == 'active',
+                'ticket_id': entry.ticket_id,
+                'status': status,
+                'attendee_name': entry.attendee_name,
+                'checked_in': used_at is not None,
+                'checked_in_at': datetime.fromtimestamp(used_at, tz=dt_timezone.utc) if used_at else None,
+            }
+        
         try:
             ticket = Ticket.objects.get(qr_code_data=qr_code_data)
         except Ticket.DoesNotExist:
@@ -46,6 +64,55 @@ class ValidateQRCodeService:
         }
 
 
+class VerifyTicketTokenService:
+    """Service for verifying signed ticket tokens.
+    
+    Verifying reads nothing from the database. Admitting a ticket is one
+    conditional UPDATE, so a ticket is admitted once across every process.
+    """
+    
+    def __init__(self, verifier: Optional[TicketTokenVerifier] = None):
+        self.verifier = verifier or TicketTokenVerifier()
+    
+    def execute(self, token: str, event_id: Optional[uuid.UUID] = None, admit: bool = False) -> Dict[str, Any]:
+        """Verify a token and optionally admit the ticket."""
+        try:
+            claims = self.verifier.verify(token)
+        except ValidationError as e:
+            return {'valid': False, 'reason': e.messages[0]}
+        
+        if event_id and claims.event_id != event_id:
+            return {'valid': False, 'reason': 'Ticket is for a different event'}
+        
+        revocations = TicketRevocationRegistry.get(claims.event_id)
+        revoked = revocations.status_of(claims.ticket_id)
+        if revoked:
+            return {'valid': False, 'reason': f'Ticket {revoked}'}
+        if admit:
+            if not revocations.mark_used(claims.ticket_id):
+                return {'valid': False, 'reason': 'Ticket used'}
+            # The set only knows this process's admissions; the database
+            # decides between scanners served by different workers.
+            admitted = Ticket.objects.filter(id=claims.ticket_id, status='active').update(
+                status='used',
+                checked_in_at=timezone.now()
+            )
+            if not admitted:
+                status = Ticket.objects.filter(id=claims.ticket_id).values_list('status', flat=True).first()
+                if status is None:
+                    return {'valid': False, 'reason': 'Ticket not found'}
+                revocations.add([claims.ticket_id], status)
+                return {'valid': False, 'reason': f'Ticket {status}'}
+        
+        return {
+            'valid': True,
+            'ticket_id': str(claims.ticket_id),
+            'event_id': str(claims.event_id),
+            'ticket_type_id': str(claims.ticket_type_id),
+            'admitted': admit
+        }
+
+
 class TicketCheckInService:
     """Service for checking in tickets."""
     
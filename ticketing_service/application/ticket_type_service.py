@@ -1,7 +1,13 @@
 import uuid
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
 from domain.ticket_type import TicketType
+from infrastructure.services.inventory_reservation import (
+    InsufficientInventoryError,
+    TicketReservationEngine,
+)
 
 
 class CreateTicketTypeService:
@@ -36,18 +42,33 @@ class UpdateTicketTypeService:
         except TicketType.DoesNotExist:
             raise ValidationError("Ticket type not found")
         
+        previous_quantity = ticket_type.quantity
+        
         # Update fields
         for field in ['name', 'description', 'price', 'quantity', 'min_purchase', 'max_purchase', 'sale_start', 'sale_end', 'is_active']:
             if field in data:
                 setattr(ticket_type, field, data[field])
         
         ticket_type.clean()
-        ticket_type.save()
+        with transaction.atomic():
+            ticket_type.save()
+            # Shift the cached available count by the capacity change;
+            # holds already taken from it stay valid.
+            delta = ticket_type.quantity - previous_quantity
+            if delta:
+                transaction.on_commit(lambda: TicketReservationEngine().adjust({ticket_type.id: delta}))
         return ticket_type
 
 
 class ManageTicketInventoryService:
-    """Service for managing ticket inventory."""
+    """Service for managing ticket inventory.
+    
+    Sold counts are written to ticket_types directly, with the same
+    quantities taken from or returned to the reservation engine's counters.
+    """
+    
+    def __init__(self, engine: Optional[TicketReservationEngine] = None):
+        self.engine = engine or TicketReservationEngine()
     
     def reserve_tickets(self, ticket_type_id: uuid.UUID, quantity: int) -> TicketType:
         """Reserve tickets from inventory."""
@@ -56,7 +77,15 @@ class ManageTicketInventoryService:
         except TicketType.DoesNotExist:
             raise ValidationError("Ticket type not found")
         
-        ticket_type.reserve_tickets(quantity)
+        try:
+            claimed = self.engine.claim([{'ticket_type_id': ticket_type_id, 'quantity': quantity}])
+        except InsufficientInventoryError as e:
+            raise ValidationError(str(e))
+        try:
+            ticket_type.reserve_tickets(quantity)
+        except Exception:
+            self.engine.adjust(claimed)
+            raise
         return ticket_type
     
     def release_tickets(self, ticket_type_id: uuid.UUID, quantity: int) -> TicketType:
@@ -67,6 +96,7 @@ class ManageTicketInventoryService:
             raise ValidationError("Ticket type not found")
         
         ticket_type.release_tickets(quantity)
+        self.engine.adjust({ticket_type_id: quantity})
         return ticket_type
     
     def get_availability(self, ticket_type_id: uuid.UUID) -> Dict[str, Any]:
@@ -83,3 +113,39 @@ class ManageTicketInventoryService:
             'available_quantity': ticket_type.available_quantity(),
             'is_available': ticket_type.is_available(),
         }
+
+
+class TicketReservationService:
+    """Service for holding tickets through the Redis reservation engine."""
+    
+    def __init__(self, engine: Optional[TicketReservationEngine] = None):
+        self.engine = engine or TicketReservationEngine()
+    
+    def reserve(self, items: List[Dict[str, Any]], ttl: int = TicketReservationEngine.DEFAULT_HOLD_TTL) -> Dict[str, Any]:
+        """Hold tickets for checkout without touching ticket_types rows."""
+        ticket_types = TicketType.objects.in_bulk([item['ticket_type_id'] for item in items])
+        
+        for item in items:
+            ticket_type = ticket_types.get(item['ticket_type_id'])
+            if ticket_type is None:
+                raise ValidationError("Ticket type not found")
+            if not ticket_type.is_active or not ticket_type.sale_start <= timezone.now() <= ticket_type.sale_end:
+                raise ValidationError(f"Tickets for {ticket_type.name} are not on sale")
+            if not ticket_type.min_purchase <= item['quantity'] <= ticket_type.max_purchase:
+                raise ValidationError(f"Cannot purchase {item['quantity']} tickets for {ticket_type.name}")
+        
+        try:
+            return self.engine.reserve(items, ttl=ttl)
+        except InsufficientInventoryError as e:
+            raise ValidationError(str(e))
+    
+    def confirm(self, hold_id: str) -> Dict[str, int]:
+        """Confirm a hold as sold."""
+        items = self.engine.confirm(hold_id)
+        if items is None:
+            raise ValidationError("Reservation not found or expired")
+        return items
+    
+    def release(self, hold_id: str) -> bool:
+        """Release a hold back to inventory."""
+        return self.engine.release(hold_id)
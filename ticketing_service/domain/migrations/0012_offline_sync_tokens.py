@@ -0,0 +1,80 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:00
+
+import uuid
+from django.db import migrations, models
+
+
+def dedupe_ticket_ids(apps, schema_editor):
+    """Keep the most recently synced row per ticket_id before it becomes unique."""
+    OfflineTicket = apps.get_model('domain', 'OfflineTicket')
+    duplicated = (
+        OfflineTicket.objects.values('ticket_id')
+        .annotate(rows=models.Count('id'))
+        .filter(rows__gt=1)
+        .values_list('ticket_id', flat=True)
+    )
+    for ticket_id in duplicated.iterator():
+        stale = list(
+            OfflineTicket.objects.filter(ticket_id=ticket_id)
+            .order_by('-last_synced', '-created_at')
+            .values_list('id', flat=True)[1:]
+        )
+        OfflineTicket.objects.filter(id__in=stale).delete()
+
+
+def backfill_change_tokens(apps, schema_editor):
+    """Number existing rows per event so the first delta pull includes them."""
+    OfflineTicket = apps.get_model('domain', 'OfflineTicket')
+    OfflineSyncCursor = apps.get_model('domain', 'OfflineSyncCursor')
+    event_ids = OfflineTicket.objects.values_list('event_id', flat=True).distinct()
+    for event_id in event_ids.iterator():
+        ids = OfflineTicket.objects.filter(event_id=event_id).order_by('created_at', 'id').values_list('id', flat=True)
+        batch = []
+        token = 0
+        for ticket_id in ids.iterator(chunk_size=1000):
+            token += 1
+            batch.append(OfflineTicket(id=ticket_id, change_token=token))
+            if len(batch) >= 1000:
+                OfflineTicket.objects.bulk_update(batch, ['change_token'])
+                batch = []
+        if batch:
+            OfflineTicket.objects.bulk_update(batch, ['change_token'])
+        OfflineSyncCursor.objects.update_or_create(event_id=event_id, defaults={'last_token': token})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0011_salesmetrics_ticketanalytics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfflineSyncCursor',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('event_id', models.UUIDField(unique=True)),
+                ('last_token', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'offline_sync_cursors',
+            },
+        ),
+        migrations.AddField(
+            model_name='offlineticket',
+            name='change_token',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(dedupe_ticket_ids, migrations.RunPython.noop),
+        migrations.RunPython(backfill_change_tokens, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='offlineticket',
+            name='ticket_id',
+            field=models.UUIDField(unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='offlineticket',
+            index=models.Index(fields=['event_id', 'change_token'], name='offline_tic_event_i_c2dbfc_idx'),
+        ),
+    ]
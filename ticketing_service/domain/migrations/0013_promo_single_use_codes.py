@@ -0,0 +1,33 @@
+# Generated by Django 6.0.1 on 2026-10-18 14:25
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0012_offline_sync_tokens'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='promocode',
+            name='single_use_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='PromoCodeRedemption',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('promo_code_id', models.UUIDField()),
+                ('serial', models.IntegerField()),
+                ('order_id', models.UUIDField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'promo_code_redemptions',
+                'constraints': [models.UniqueConstraint(fields=('promo_code_id', 'serial'), name='unique_promo_code_serial')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.0.1 on 2026-10-18 15:10
+
+import uuid
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domain', '0013_promo_single_use_codes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevenueRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('event_id', models.UUIDField()),
+                ('bucket_start', models.DateTimeField()),
+                ('gross_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('platform_fee', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('payment_fee', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('net_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('refund_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('order_count', models.IntegerField(default=0)),
+                ('refund_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'revenue_rollups',
+                'constraints': [models.UniqueConstraint(fields=('event_id', 'bucket_start'), name='unique_revenue_rollup_bucket')],
+            },
+        ),
+    ]
@@ -1,11 +1,11 @@
 from domain.ticket_type import TicketType
 from domain.ticket import Ticket
 from domain.order import Order, OrderItem
-from domain.promo_code import PromoCode
+from domain.promo_code import PromoCode, PromoCodeRedemption
 from domain.refund import Refund, RefundPolicy
-from domain.revenue import Revenue, RevenueReport
+from domain.revenue import Revenue, RevenueReport, RevenueRollup
 from domain.tax import TaxRule, TaxCalculation
 from domain.fraud import SecurityRule, FraudAlert
-from domain.offline import OfflineTicket, ValidationCache
+from domain.offline import OfflineTicket, ValidationCache, OfflineSyncCursor
 from domain.group_booking import GroupBooking, BulkDiscount
 from domain.analytics import TicketAnalytics, SalesMetrics
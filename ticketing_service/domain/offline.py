@@ -1,5 +1,6 @@
 import uuid
 from django.db import models
+from django.db.models import F
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 
@@ -7,6 +8,9 @@ from django.utils import timezone
 class OfflineTicket(models.Model):
     """Offline ticket model for validation without internet."""
     
+    # Rows changed one at a time wait at this token for the next delta read
+    PENDING_TOKEN = 0
+    
     STATUS_CHOICES = [
         ('active', 'Active'),
         ('used', 'Used'),
@@ -14,12 +18,13 @@ class OfflineTicket(models.Model):
     ]
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    ticket_id = models.UUIDField(db_index=True)
+    ticket_id = models.UUIDField(unique=True)
     qr_code = models.CharField(max_length=255, unique=True)
     event_id = models.UUIDField(db_index=True)
     attendee_name = models.CharField(max_length=255)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
     valid_until = models.DateTimeField()
+    change_token = models.BigIntegerField(default=0)
     last_synced = models.DateTimeField(auto_now=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
@@ -28,11 +33,24 @@ class OfflineTicket(models.Model):
         indexes = [
             models.Index(fields=['ticket_id', 'status']),
             models.Index(fields=['event_id']),
+            models.Index(fields=['event_id', 'change_token']),
         ]
     
     def __str__(self):
         return f"Offline Ticket {self.ticket_id}"
     
+    def save(self, *args, **kwargs):
+        """Save and queue the row for a new change token.
+        
+        Tokens are handed out in bulk by OfflineManifestStore before delta
+        reads, so single-row writes never wait on the event's sync cursor.
+        """
+        self.change_token = self.PENDING_TOKEN
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'change_token'}
+        super().save(*args, **kwargs)
+    
     def is_valid(self) -> bool:
         """Check if ticket is valid for offline use."""
         return self.status == 'active' and self.valid_until > timezone.now()
@@ -82,3 +100,29 @@ class ValidationCache(models.Model):
         self.cache_data = data
         self.ticket_count = len(data.get('tickets', []))
         self.save()
+
+
+class OfflineSyncCursor(models.Model):
+    """Per-event sequence of change tokens for offline manifest deltas."""
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    event_id = models.UUIDField(unique=True)
+    last_token = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'offline_sync_cursors'
+    
+    def __str__(self):
+        return f"Sync cursor for Event {self.event_id} at {self.last_token}"
+    
+    @classmethod
+    def allocate(cls, event_id: uuid.UUID, count: int = 1) -> int:
+        """Reserve count consecutive tokens for an event; returns the first one.
+        
+        Must run inside the transaction that writes the rows. The cursor row
+        stays locked until it commits, so commit order matches token order.
+        """
+        cursor, _ = cls.objects.select_for_update().get_or_create(event_id=event_id)
+        cls.objects.filter(pk=cursor.pk).update(last_token=F('last_token') + count)
+        return cursor.last_token + 1
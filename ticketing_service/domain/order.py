@@ -88,7 +88,11 @@ class OrderItem(models.Model):
         if self.unit_price < 0:
             raise ValidationError("Unit price cannot be negative")
     
+    def prepare(self) -> None:
+        """Calculate subtotal (bulk_create does not call save)."""
+        self.subtotal = self.quantity * self.unit_price
+    
     def save(self, *args, **kwargs):
         """Calculate subtotal before saving."""
-        self.subtotal = self.quantity * self.unit_price
+        self.prepare()
         super().save(*args, **kwargs)
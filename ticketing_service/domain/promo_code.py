@@ -1,6 +1,7 @@
 import uuid
 from decimal import Decimal
 from django.db import models
+from django.db.models import F, Q
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 
@@ -20,6 +21,7 @@ class PromoCode(models.Model):
     discount_value = models.DecimalField(max_digits=10, decimal_places=2)
     max_uses = models.IntegerField(default=0)
     current_uses = models.IntegerField(default=0)
+    single_use_count = models.IntegerField(default=0)
     valid_from = models.DateTimeField()
     valid_until = models.DateTimeField()
     min_purchase_amount = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
@@ -81,11 +83,36 @@ class PromoCode(models.Model):
         if self.max_uses > 0 and self.current_uses >= self.max_uses:
             raise ValidationError("Promo code usage limit reached")
         
+        # Conditional increment so concurrent checkouts cannot exceed max_uses
+        updated = PromoCode.objects.filter(pk=self.pk).filter(
+            Q(max_uses=0) | Q(current_uses__lt=F('max_uses'))
+        ).update(current_uses=F('current_uses') + 1, updated_at=timezone.now())
+        if not updated:
+            raise ValidationError("Promo code usage limit reached")
+        
         self.current_uses += 1
-        self.save()
     
     def remaining_uses(self) -> int:
         """Get remaining uses."""
         if self.max_uses == 0:
             return -1  # Unlimited
         return max(0, self.max_uses - self.current_uses)
+
+
+class PromoCodeRedemption(models.Model):
+    """Redemption of one pre-generated single-use code."""
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    promo_code_id = models.UUIDField()
+    serial = models.IntegerField()
+    order_id = models.UUIDField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'promo_code_redemptions'
+        constraints = [
+            models.UniqueConstraint(fields=['promo_code_id', 'serial'], name='unique_promo_code_serial'),
+        ]
+    
+    def __str__(self):
+        return f"{self.promo_code_id} #{self.serial}"
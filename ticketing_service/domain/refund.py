@@ -1,9 +1,12 @@
 import uuid
 from decimal import Decimal
-from django.db import models
+from django.db import models, transaction
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 
+from domain.order import Order
+from domain.revenue import RevenueRollup
+
 
 class RefundPolicy(models.Model):
     """Refund policy model for events."""
@@ -70,6 +73,37 @@ class Refund(models.Model):
     def __str__(self):
         return f"Refund {self.id} - {self.refund_amount}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        refund = super().from_db(db, field_names, values)
+        refund._loaded_status = refund.status if 'status' in field_names else None
+        return refund
+    
+    def save(self, *args, **kwargs):
+        """Save and roll the refund up once it becomes completed."""
+        newly_completed = self.status == 'completed' and getattr(self, '_loaded_status', None) != 'completed'
+        if not newly_completed:
+            super().save(*args, **kwargs)
+            return
+        
+        # Refunds are bucketed on completion, so it must be recorded
+        if self.processed_at is None:
+            self.processed_at = timezone.now()
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'processed_at'}
+        
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            event_id = Order.objects.filter(id=self.order_id).values_list('event_id', flat=True).first()
+            if event_id:
+                RevenueRollup.add(
+                    event_id,
+                    self.processed_at,
+                    refund_amount=self.refund_amount,
+                    refund_count=1
+                )
+        self._loaded_status = self.status
+    
     def clean(self):
         """Validate refund."""
         if self.original_amount < 0:
@@ -1,6 +1,8 @@
 import uuid
 from decimal import Decimal
-from django.db import models
+from datetime import datetime
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 
@@ -43,9 +45,23 @@ class Revenue(models.Model):
         return self.gross_amount - self.platform_fee - self.payment_fee
     
     def save(self, *args, **kwargs):
-        """Calculate net amount before saving."""
+        """Calculate net amount before saving and roll new revenue up."""
         self.net_amount = self.calculate_net()
-        super().save(*args, **kwargs)
+        if not self._state.adding:
+            super().save(*args, **kwargs)
+            return
+        
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            RevenueRollup.add(
+                self.event_id,
+                self.created_at,
+                gross_amount=self.gross_amount,
+                platform_fee=self.platform_fee,
+                payment_fee=self.payment_fee,
+                net_amount=self.net_amount,
+                order_count=1
+            )
 
 
 class RevenueReport(models.Model):
@@ -83,3 +99,49 @@ class RevenueReport(models.Model):
         """Validate report."""
         if self.end_date <= self.start_date:
             raise ValidationError("End date must be after start date")
+
+
+class RevenueRollup(models.Model):
+    """Hourly revenue and refund totals per event, maintained on write."""
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    event_id = models.UUIDField()
+    bucket_start = models.DateTimeField()
+    gross_amount = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    platform_fee = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    payment_fee = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    net_amount = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    refund_amount = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    order_count = models.IntegerField(default=0)
+    refund_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'revenue_rollups'
+        constraints = [
+            models.UniqueConstraint(fields=['event_id', 'bucket_start'], name='unique_revenue_rollup_bucket'),
+        ]
+    
+    def __str__(self):
+        return f"Rollup {self.event_id} @ {self.bucket_start}"
+    
+    @staticmethod
+    def bucket_for(moment: datetime) -> datetime:
+        """Start of the hour bucket containing a moment."""
+        return moment.replace(minute=0, second=0, microsecond=0)
+    
+    @classmethod
+    def add(cls, event_id: uuid.UUID, moment: datetime, **deltas) -> None:
+        """Add deltas to a bucket with F() updates, creating it on first use."""
+        bucket_start = cls.bucket_for(moment)
+        updates = {field: F(field) + value for field, value in deltas.items()}
+        updates['updated_at'] = timezone.now()
+        bucket = cls.objects.filter(event_id=event_id, bucket_start=bucket_start)
+        if bucket.update(**updates):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(event_id=event_id, bucket_start=bucket_start, **deltas)
+        except IntegrityError:
+            # Another writer created the bucket first
+            bucket.update(**updates)
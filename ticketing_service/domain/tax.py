@@ -4,6 +4,10 @@ from django.db import models
 from django.core.exceptions import ValidationError
 
 
+# tax_rule_id recorded for calculations where no rule applies (zero tax)
+NO_TAX_RULE_ID = uuid.UUID(int=0)
+
+
 class TaxRule(models.Model):
     """Tax rule model for different jurisdictions."""
     
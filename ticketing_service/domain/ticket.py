@@ -78,10 +78,14 @@ class Ticket(models.Model):
         """Check if ticket is valid for use."""
         return self.status == 'active'
     
-    def save(self, *args, **kwargs):
-        """Override save to generate QR data and security hash."""
+    def prepare(self) -> None:
+        """Fill in QR data and security hash (bulk_create does not call save)."""
         if not self.qr_code_data:
             self.qr_code_data = self.generate_qr_data()
         if not self.security_hash:
             self.security_hash = self.generate_security_hash()
+    
+    def save(self, *args, **kwargs):
+        """Override save to generate QR data and security hash."""
+        self.prepare()
         super().save(*args, **kwargs)
@@ -1,8 +1,9 @@
 import uuid
+import redis
 from decimal import Decimal
 from typing import Dict, Optional
-from domain.analytics import TicketAnalytics
 from application.analytics_service import TicketAnalyticsService
+from infrastructure.services.analytics_counters import TicketAnalyticsCounters
 
 
 class AnalyticsPipeline:
@@ -10,32 +11,42 @@ class AnalyticsPipeline:
     
     def __init__(self):
         self.analytics_service = TicketAnalyticsService()
+        self.counters = TicketAnalyticsCounters()
     
     def process_ticket_sale(
         self,
         event_id: uuid.UUID,
-        ticket_price: Decimal
+        ticket_price: Decimal,
+        quantity: int = 1
     ) -> bool:
         """Process a ticket sale and update analytics."""
         try:
-            analytics = self.analytics_service.get_or_create_analytics(event_id)
-            analytics.sold_tickets += 1
-            analytics.revenue += ticket_price
-            analytics.save()
+            self.counters.record_sale(event_id, ticket_price * quantity, quantity)
+            return True
+        except redis.RedisError:
+            pass
+        
+        # Without Redis, fall back to an atomic row update
+        try:
+            TicketAnalyticsCounters.apply(event_id, quantity, ticket_price * quantity)
             return True
         except Exception:
             return False
     
+    def flush(self) -> Dict:
+        """Write buffered sales to ticket_analytics."""
+        return self.counters.flush()
+    
     def aggregate_sales_data(self, event_id: uuid.UUID) -> Optional[Dict]:
-        """Aggregate sales data for an event."""
-        try:
-            analytics = TicketAnalytics.objects.get(event_id=event_id)
-            return {
-                'event_id': str(analytics.event_id),
-                'total_tickets': analytics.total_tickets,
-                'sold_tickets': analytics.sold_tickets,
-                'revenue': analytics.revenue,
-                'sold_percentage': analytics.calculate_sold_percentage()
-            }
-        except TicketAnalytics.DoesNotExist:
+        """Aggregate sales data for an event, including unflushed sales."""
+        analytics = self.counters.load(event_id)
+        if analytics is None:
             return None
+        
+        return {
+            'event_id': str(analytics.event_id),
+            'total_tickets': analytics.total_tickets,
+            'sold_tickets': analytics.sold_tickets,
+            'revenue': analytics.revenue,
+            'sold_percentage': analytics.calculate_sold_percentage()
+        }
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class InfrastructureConfig(AppConfig):
+    """Infrastructure layer; connects model signal receivers at startup."""
+    
+    name = 'infrastructure'
+    
+    def ready(self):
+        # Cache invalidation must run in every process that writes these
+        # models, not only in those whose services import the cache
+        from infrastructure.services import promo_code_cache, tax_rules  # noqa: F401
@@ -0,0 +1,45 @@
+import time
+import uuid
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from domain.ticket import Ticket
+from infrastructure.services.ticket_issuance import BulkTicketIssuer
+
+
+class Command(BaseCommand):
+    """Time bulk ticket issuance against one create() per ticket."""
+    
+    help = 'Compare BulkTicketIssuer with a Ticket.objects.create() loop; nothing is kept'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--quantity', type=int, default=2000)
+        parser.add_argument('--chunk-size', type=int, default=BulkTicketIssuer.DEFAULT_CHUNK_SIZE)
+    
+    def handle(self, *args, **options):
+        quantity = options['quantity']
+        data = {
+            'ticket_type_id': uuid.uuid4(),
+            'order_id': uuid.uuid4(),
+            'attendee_name': 'Benchmark Guest',
+            'attendee_email': 'benchmark@example.com'
+        }
+        
+        # Both runs are rolled back, so neither rows nor queued QR renders remain
+        with transaction.atomic():
+            started = time.perf_counter()
+            for _ in range(quantity):
+                Ticket.objects.create(**data)
+            loop_elapsed = time.perf_counter() - started
+            transaction.set_rollback(True)
+        
+        with transaction.atomic():
+            started = time.perf_counter()
+            BulkTicketIssuer(chunk_size=options['chunk_size']).issue_batch(data, quantity)
+            bulk_elapsed = time.perf_counter() - started
+            transaction.set_rollback(True)
+        
+        self.stdout.write(
+            f"quantity={quantity} loop={loop_elapsed:.3f}s bulk={bulk_elapsed:.3f}s "
+            f"speedup={loop_elapsed / max(bulk_elapsed, 1e-9):.1f}x"
+        )
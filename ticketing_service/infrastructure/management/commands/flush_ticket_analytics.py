@@ -0,0 +1,23 @@
+import time
+from django.core.management.base import BaseCommand
+
+from infrastructure.services.analytics_counters import TicketAnalyticsCounters
+
+
+class Command(BaseCommand):
+    """Flush buffered ticket sale counters into ticket_analytics."""
+    
+    help = 'Write buffered ticket analytics counters to the database'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=0, help='Seconds between runs; 0 runs once')
+    
+    def handle(self, *args, **options):
+        counters = TicketAnalyticsCounters()
+        
+        while True:
+            result = counters.flush()
+            self.stdout.write(f"events={result['events']}")
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,17 @@
+import uuid
+from django.core.management.base import BaseCommand
+
+from infrastructure.repositories.revenue_repository import RevenueRollupBuilder
+
+
+class Command(BaseCommand):
+    """Rebuild hourly revenue rollups from revenues and refunds."""
+    
+    help = 'Recompute revenue rollups (run once after migrating, or to repair them)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--event-id', type=uuid.UUID, default=None, help='Only rebuild this event')
+    
+    def handle(self, *args, **options):
+        buckets = RevenueRollupBuilder().rebuild(options['event_id'])
+        self.stdout.write(f"buckets={buckets}")
@@ -0,0 +1,31 @@
+import time
+from django.core.management.base import BaseCommand
+
+from infrastructure.services.inventory_reservation import (
+    InventoryReconciler,
+    TicketReservationEngine,
+)
+
+
+class Command(BaseCommand):
+    """Expire stale ticket holds and flush sold counts to ticket_types."""
+    
+    help = 'Expire ticket holds and write confirmed sales back to the database'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=0, help='Seconds between runs; 0 runs once')
+        parser.add_argument('--batch-size', type=int, default=500)
+    
+    def handle(self, *args, **options):
+        engine = TicketReservationEngine()
+        reconciler = InventoryReconciler(engine.inventory_cache)
+        
+        while True:
+            expired = engine.expire_holds()
+            flushed = reconciler.flush(batch_size=options['batch_size'])
+            self.stdout.write(
+                f"expired_holds={expired} ticket_types={flushed['ticket_types']} tickets={flushed['tickets']}"
+            )
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,30 @@
+import time
+from django.core.management.base import BaseCommand
+
+from infrastructure.services.qr_code_service import QRRenderQueue
+
+
+class Command(BaseCommand):
+    """Render queued QR payloads into the render cache."""
+    
+    help = 'Drain the QR render queue filled by bulk ticket issuance'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=0, help='Seconds between runs; 0 runs once')
+        parser.add_argument('--batch-size', type=int, default=100)
+    
+    def handle(self, *args, **options):
+        queue = QRRenderQueue()
+        
+        while True:
+            rendered = 0
+            # Drain what is queued now, then wait for the next interval
+            while True:
+                count = queue.process(batch_size=options['batch_size'])
+                rendered += count
+                if count < options['batch_size']:
+                    break
+            self.stdout.write(f"rendered={rendered} pending={queue.pending()}")
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
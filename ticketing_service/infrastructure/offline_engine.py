@@ -1,9 +1,15 @@
+import json
 import uuid
-from typing import Dict, Any, List
+import zlib
+from typing import Dict, Any, Iterator, List
 from datetime import timedelta
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import BigIntegerField, Case, Value, When
 from django.utils import timezone
 
-from domain.offline import OfflineTicket
+from domain.offline import OfflineTicket, OfflineSyncCursor
+from infrastructure.validation_index import ValidationIndexRegistry
 
 
 class OfflineValidationEngine:
@@ -11,6 +17,10 @@ class OfflineValidationEngine:
     
     def validate(self, qr_code: str) -> Dict[str, Any]:
         """Validate ticket using offline engine."""
+        index = ValidationIndexRegistry.find(qr_code)
+        if index is not None:
+            return index.validate(qr_code)
+        
         try:
             ticket = OfflineTicket.objects.get(qr_code=qr_code)
         except OfflineTicket.DoesNotExist:
@@ -34,20 +44,7 @@ class TicketDataSync:
     
     def sync_from_server(self, event_id: uuid.UUID, tickets: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Sync tickets from server."""
-        synced = []
-        
-        for ticket_data in tickets:
-            ticket, created = OfflineTicket.objects.update_or_create(
-                ticket_id=ticket_data['ticket_id'],
-                defaults={
-                    'qr_code': ticket_data['qr_code'],
-                    'event_id': event_id,
-                    'attendee_name': ticket_data['attendee_name'],
-                    'status': ticket_data.get('status', 'active'),
-                    'valid_until': ticket_data['valid_until']
-                }
-            )
-            synced.append(str(ticket.id))
+        synced = [str(ticket.id) for ticket in OfflineManifestStore().upsert(event_id, tickets)]
         
         return {
             'synced_count': len(synced),
@@ -55,6 +52,117 @@ class TicketDataSync:
         }
 
 
+class OfflineManifestStore:
+    """Chunked bulk upserts and token-based delta reads of the offline manifest.
+    
+    Every upserted row gets a change token from a per-event sequence. Tokens are
+    allocated under a row lock on the event's OfflineSyncCursor in the same
+    transaction as the upsert, so commit order matches token order and a
+    scanner that pulls "token > last seen" never skips a row. OfflineTicket.save()
+    only marks the row pending; stamp_pending() numbers committed pending rows
+    the same way before every delta read.
+    """
+    
+    CHUNK_SIZE = 1000
+    MANIFEST_FIELDS = ['ticket_id', 'qr_code', 'attendee_name', 'status', 'valid_until', 'change_token']
+    UPDATE_FIELDS = ['qr_code', 'event_id', 'attendee_name', 'status', 'valid_until', 'change_token', 'last_synced']
+    
+    def upsert(self, event_id: uuid.UUID, tickets: List[Dict[str, Any]], chunk_size: int = CHUNK_SIZE) -> List[OfflineTicket]:
+        """Insert or update tickets by ticket_id, one statement per chunk."""
+        # Last write wins for duplicates; ON CONFLICT cannot touch a row twice
+        unique = list({str(ticket_data['ticket_id']): ticket_data for ticket_data in tickets}.values())
+        synced = []
+        
+        for start in range(0, len(unique), chunk_size):
+            chunk = unique[start:start + chunk_size]
+            with transaction.atomic():
+                first_token = OfflineSyncCursor.allocate(event_id, len(chunk))
+                objects = [
+                    OfflineTicket(
+                        ticket_id=ticket_data['ticket_id'],
+                        qr_code=ticket_data['qr_code'],
+                        event_id=event_id,
+                        attendee_name=ticket_data['attendee_name'],
+                        status=ticket_data.get('status', 'active'),
+                        valid_until=ticket_data['valid_until'],
+                        change_token=first_token + offset
+                    )
+                    for offset, ticket_data in enumerate(chunk)
+                ]
+                synced += OfflineTicket.objects.bulk_create(
+                    objects,
+                    update_conflicts=True,
+                    unique_fields=['ticket_id'],
+                    update_fields=self.UPDATE_FIELDS
+                )
+        
+        return synced
+    
+    def stamp_pending(self, event_id: uuid.UUID, chunk_size: int = CHUNK_SIZE) -> int:
+        """Give rows saved one at a time their change tokens, in write order."""
+        pending = list(
+            OfflineTicket.objects.filter(event_id=event_id, change_token=OfflineTicket.PENDING_TOKEN)
+            .order_by('last_synced', 'id').values_list('id', flat=True)
+        )
+        stamped = 0
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start:start + chunk_size]
+            with transaction.atomic():
+                first_token = OfflineSyncCursor.allocate(event_id, len(chunk))
+                # Rows saved again meanwhile keep waiting for the next read
+                stamped += OfflineTicket.objects.filter(
+                    id__in=chunk, change_token=OfflineTicket.PENDING_TOKEN
+                ).update(change_token=Case(
+                    *[When(id=pk, then=Value(first_token + offset)) for offset, pk in enumerate(chunk)],
+                    output_field=BigIntegerField()
+                ))
+        return stamped
+    
+    def latest_token(self, event_id: uuid.UUID) -> int:
+        """Get the newest change token issued for an event."""
+        self.stamp_pending(event_id)
+        cursor = OfflineSyncCursor.objects.filter(event_id=event_id).values_list('last_token', flat=True).first()
+        return cursor or 0
+    
+    def iter_changes(self, event_id: uuid.UUID, since_token: int = 0, chunk_size: int = CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+        """Yield manifest rows changed after since_token, in token order."""
+        self.stamp_pending(event_id)
+        token = since_token
+        while True:
+            rows = list(
+                OfflineTicket.objects.filter(event_id=event_id, change_token__gt=token)
+                .order_by('change_token')
+                .values(*self.MANIFEST_FIELDS)[:chunk_size]
+            )
+            yield from rows
+            if len(rows) < chunk_size:
+                return
+            token = rows[-1]['change_token']
+    
+    def stream_manifest(self, event_id: uuid.UUID, since_token: int = 0) -> Iterator[bytes]:
+        """Stream the manifest delta as gzip-compressed NDJSON.
+        
+        One JSON object per ticket, followed by a trailer line holding
+        next_token, which the scanner sends back as since_token next time.
+        """
+        compressor = zlib.compressobj(wbits=31)  # gzip container
+        next_token = since_token
+        count = 0
+        lines = []
+        
+        for row in self.iter_changes(event_id, since_token):
+            lines.append(json.dumps(row, cls=DjangoJSONEncoder))
+            next_token = row['change_token']
+            count += 1
+            if len(lines) >= self.CHUNK_SIZE:
+                yield compressor.compress(('\n'.join(lines) + '\n').encode())
+                lines = []
+        
+        lines.append(json.dumps({'next_token': next_token, 'count': count}))
+        yield compressor.compress(('\n'.join(lines) + '\n').encode())
+        yield compressor.flush()
+
+
 class OfflineAnalytics:
     """Offline analytics tracking."""
     
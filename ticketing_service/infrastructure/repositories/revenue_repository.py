@@ -1,11 +1,15 @@
 import uuid
 from typing import List, Dict, Any
 from decimal import Decimal
-from django.db.models import Sum, Avg, Count, Q
+from django.db import transaction
+from django.db.models import Sum, Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce, TruncHour
 from django.utils import timezone
-from datetime import timedelta
+from datetime import timedelta, timezone as dt_timezone
 
-from domain.revenue import Revenue, RevenueReport
+from domain.order import Order
+from domain.refund import Refund
+from domain.revenue import Revenue, RevenueReport, RevenueRollup
 
 
 class RevenueRepository:
@@ -17,24 +21,25 @@ class RevenueRepository:
     
     def get_revenue_analytics(self, event_id: uuid.UUID) -> Dict[str, Any]:
         """Get revenue analytics for an event."""
-        revenues = Revenue.objects.filter(event_id=event_id)
-        
-        stats = revenues.aggregate(
+        stats = RevenueRollup.objects.filter(event_id=event_id).aggregate(
             total_gross=Sum('gross_amount'),
             total_platform_fees=Sum('platform_fee'),
             total_payment_fees=Sum('payment_fee'),
             total_net=Sum('net_amount'),
-            avg_order_value=Avg('gross_amount'),
-            total_orders=Count('order_id', distinct=True)
+            total_orders=Sum('order_count')
         )
         
+        total_gross = stats['total_gross'] or Decimal('0.00')
+        total_orders = stats['total_orders'] or 0
+        avg_order_value = (total_gross / total_orders).quantize(Decimal('0.01')) if total_orders else Decimal('0.00')
+        
         return {
-            'total_gross': stats['total_gross'] or Decimal('0.00'),
+            'total_gross': total_gross,
             'total_platform_fees': stats['total_platform_fees'] or Decimal('0.00'),
             'total_payment_fees': stats['total_payment_fees'] or Decimal('0.00'),
             'total_net': stats['total_net'] or Decimal('0.00'),
-            'avg_order_value': stats['avg_order_value'] or Decimal('0.00'),
-            'total_orders': stats['total_orders'] or 0
+            'avg_order_value': avg_order_value,
+            'total_orders': total_orders
         }
     
     def get_recent_reports(self, event_id: uuid.UUID, limit: int = 10) -> List[RevenueReport]:
@@ -58,3 +63,64 @@ class RevenueTracker:
             platform_fee=platform_fee,
             payment_fee=payment_fee
         )
+
+
+class RevenueRollupBuilder:
+    """Rebuilds hourly revenue rollups from the source tables.
+    
+    Rollups are maintained on write; this is for backfilling after the
+    rollup table is introduced or repairing it after manual data fixes.
+    """
+    
+    def rebuild(self, event_id: uuid.UUID = None) -> int:
+        """Recompute rollups for one event (or all). Returns the bucket count."""
+        revenues = Revenue.objects.all()
+        refunds = Refund.objects.filter(status='completed').annotate(
+            event_id=Subquery(Order.objects.filter(id=OuterRef('order_id')).values('event_id')[:1])
+        )
+        rollups = RevenueRollup.objects.all()
+        if event_id:
+            revenues = revenues.filter(event_id=event_id)
+            refunds = refunds.filter(event_id=event_id)
+            rollups = rollups.filter(event_id=event_id)
+        
+        buckets: Dict[tuple, RevenueRollup] = {}
+        
+        def bucket(row_event_id, bucket_start):
+            key = (row_event_id, bucket_start)
+            if key not in buckets:
+                buckets[key] = RevenueRollup(event_id=row_event_id, bucket_start=bucket_start)
+            return buckets[key]
+        
+        revenue_rows = revenues.annotate(
+            bucket=TruncHour('created_at', tzinfo=dt_timezone.utc)
+        ).values('event_id', 'bucket').annotate(
+            gross=Sum('gross_amount'),
+            platform=Sum('platform_fee'),
+            payment=Sum('payment_fee'),
+            net=Sum('net_amount'),
+            orders=Count('id')
+        )
+        for row in revenue_rows:
+            rollup = bucket(row['event_id'], row['bucket'])
+            rollup.gross_amount = row['gross']
+            rollup.platform_fee = row['platform']
+            rollup.payment_fee = row['payment']
+            rollup.net_amount = row['net']
+            rollup.order_count = row['orders']
+        
+        refund_rows = refunds.exclude(event_id=None).annotate(
+            bucket=TruncHour(Coalesce('processed_at', 'created_at'), tzinfo=dt_timezone.utc)
+        ).values('event_id', 'bucket').annotate(
+            total=Sum('refund_amount'),
+            count=Count('id')
+        )
+        for row in refund_rows:
+            rollup = bucket(row['event_id'], row['bucket'])
+            rollup.refund_amount = row['total']
+            rollup.refund_count = row['count']
+        
+        with transaction.atomic():
+            rollups.delete()
+            RevenueRollup.objects.bulk_create(buckets.values(), batch_size=1000)
+        return len(buckets)
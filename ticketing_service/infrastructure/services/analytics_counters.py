@@ -0,0 +1,121 @@
+import uuid
+import redis
+from decimal import Decimal
+from typing import Dict, Any, Optional, Tuple
+from django.conf import settings
+from django.db.models import F
+
+from domain.analytics import TicketAnalytics
+
+
+# Read and reset an event's pending deltas and clear its dirty flag in one
+# step, so a sale recorded afterwards marks the event dirty again.
+# KEYS: pending hash, dirty set; ARGV: event id
+DRAIN_SCRIPT = """
+redis.call('SREM', KEYS[2], ARGV[1])
+local values = redis.call('HGETALL', KEYS[1])
+redis.call('DEL', KEYS[1])
+return values
+"""
+
+
+class TicketAnalyticsCounters:
+    """Redis-buffered sale counters for TicketAnalytics.
+    
+    Sales are recorded with HINCRBY (revenue in cents), so concurrent sales
+    never contend on the ticket_analytics row. flush() applies the pending
+    deltas with F() expressions, and readers add pending deltas to the
+    persisted values.
+    """
+    
+    PENDING_KEY_PREFIX = 'ticket:analytics:pending:'
+    DIRTY_KEY = 'ticket:analytics:dirty'
+    
+    def __init__(self):
+        self.redis_client = redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            decode_responses=True
+        )
+        self._drain = self.redis_client.register_script(DRAIN_SCRIPT)
+    
+    def _key(self, event_id: uuid.UUID) -> str:
+        return f"{self.PENDING_KEY_PREFIX}{event_id}"
+    
+    def record_sale(self, event_id: uuid.UUID, amount: Decimal, quantity: int = 1) -> None:
+        """Buffer a sale of quantity tickets totalling amount."""
+        pipe = self.redis_client.pipeline()
+        pipe.hincrby(self._key(event_id), 'sold_tickets', quantity)
+        pipe.hincrby(self._key(event_id), 'revenue_cents', int(Decimal(amount) * 100))
+        pipe.sadd(self.DIRTY_KEY, str(event_id))
+        pipe.execute()
+    
+    def pending(self, event_id: uuid.UUID) -> Tuple[int, Decimal]:
+        """Get (sold_tickets, revenue) not yet flushed; zeros if Redis is unavailable."""
+        try:
+            values = self.redis_client.hgetall(self._key(event_id))
+        except redis.RedisError:
+            return 0, Decimal("0.00")
+        return int(values.get('sold_tickets', 0)), Decimal(int(values.get('revenue_cents', 0))) / 100
+    
+    def merge(self, analytics: TicketAnalytics) -> TicketAnalytics:
+        """Add pending deltas to an analytics instance in memory (not saved)."""
+        sold, revenue = self.pending(analytics.event_id)
+        analytics.sold_tickets += sold
+        analytics.revenue += revenue
+        return analytics
+    
+    def load(self, event_id: uuid.UUID) -> Optional[TicketAnalytics]:
+        """Persisted analytics with pending deltas merged (not saved).
+        
+        An event whose sales have not been flushed yet gets a default row;
+        None only when there is neither a row nor pending sales.
+        """
+        analytics = TicketAnalytics.objects.filter(event_id=event_id).first()
+        if analytics is None:
+            analytics = TicketAnalytics(event_id=event_id)
+            self.merge(analytics)
+            return analytics if analytics.sold_tickets or analytics.revenue else None
+        return self.merge(analytics)
+    
+    def flush(self, limit: int = 1000) -> Dict[str, Any]:
+        """Apply pending deltas for dirty events with F() updates.
+        
+        Events stay in the dirty set until their deltas are drained, so a
+        failed apply never strands the events that were not reached yet.
+        """
+        event_ids = self.redis_client.srandmember(self.DIRTY_KEY, limit) or []
+        flushed = 0
+        
+        for event_id in event_ids:
+            values = self._drain(keys=[self._key(event_id), self.DIRTY_KEY], args=[event_id])
+            deltas = dict(zip(values[::2], values[1::2]))
+            sold = int(deltas.get('sold_tickets', 0))
+            revenue_cents = int(deltas.get('revenue_cents', 0))
+            if not sold and not revenue_cents:
+                continue
+            
+            try:
+                self.apply(uuid.UUID(event_id), sold, Decimal(revenue_cents) / 100)
+            except Exception:
+                # Put the deltas back so the next flush retries them
+                pipe = self.redis_client.pipeline()
+                pipe.hincrby(self._key(event_id), 'sold_tickets', sold)
+                pipe.hincrby(self._key(event_id), 'revenue_cents', revenue_cents)
+                pipe.sadd(self.DIRTY_KEY, event_id)
+                pipe.execute()
+                raise
+            flushed += 1
+        
+        return {'events': flushed}
+    
+    @staticmethod
+    def apply(event_id: uuid.UUID, sold: int, revenue: Decimal) -> None:
+        """Add deltas to the persisted row without reading it."""
+        updated = TicketAnalytics.objects.filter(event_id=event_id).update(
+            sold_tickets=F('sold_tickets') + sold,
+            revenue=F('revenue') + revenue
+        )
+        if not updated:
+            TicketAnalytics.objects.create(event_id=event_id, sold_tickets=sold, revenue=revenue)
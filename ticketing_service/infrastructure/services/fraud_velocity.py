@@ -0,0 +1,231 @@
+import time
+import uuid
+import redis
+from decimal import Decimal
+from datetime import timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from django.conf import settings
+from django.utils import timezone
+
+from domain.fraud import SecurityRule
+from domain.order import Order
+
+
+VELOCITY_KEY_PREFIX = 'fraud:velocity:'
+PRIMED_KEY_PREFIX = 'fraud:velocity:primed:'
+LIFETIME_KEY = 'fraud:velocity:lifetime'
+
+# KEYS: user zset, other dimension zsets..., lifetime hash
+# ARGV: order_id, created_at, cutoff, ttl, user_id
+OBSERVE_SCRIPT = """
+local added = 0
+for i = 1, #KEYS - 1 do
+    local new = redis.call('ZADD', KEYS[i], ARGV[2], ARGV[1])
+    if i == 1 then
+        added = new
+    end
+    redis.call('ZREMRANGEBYSCORE', KEYS[i], '-inf', ARGV[3])
+    redis.call('EXPIRE', KEYS[i], ARGV[4])
+end
+if added == 1 then
+    redis.call('HINCRBY', KEYS[#KEYS], ARGV[5], 1)
+end
+return added
+"""
+
+
+class OrderSignals(NamedTuple):
+    """Order attributes the velocity engine is keyed by."""
+    order_id: str
+    user_id: str
+    created_at: float
+    ip_address: Optional[str] = None
+    card_fingerprint: Optional[str] = None
+    
+    @classmethod
+    def from_order(cls, order: Order, ip_address: Optional[str] = None, card_fingerprint: Optional[str] = None) -> 'OrderSignals':
+        created_at = order.created_at.timestamp() if order.created_at else time.time()
+        return cls(str(order.id), str(order.user_id), created_at, ip_address, card_fingerprint)
+    
+    def dimensions(self) -> List[Tuple[str, str]]:
+        """(dimension, value) pairs, user first."""
+        pairs = [('user', self.user_id)]
+        if self.ip_address:
+            pairs.append(('ip', self.ip_address))
+        if self.card_fingerprint:
+            pairs.append(('card', self.card_fingerprint))
+        return pairs
+
+
+class VelocityTracker:
+    """Sliding-window order counts per user, IP and card fingerprint.
+    
+    Each dimension value is a Redis sorted set of order ids scored by creation
+    time, trimmed to the retention window on every write. Window counts are
+    ZCOUNTs sent in one pipeline, so no query touches the orders table after a
+    user's history has been primed once.
+    """
+    
+    DEFAULT_RETENTION = 24 * 3600
+    
+    def __init__(self, retention: int = DEFAULT_RETENTION):
+        self.retention = retention
+        self.redis_client = redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            decode_responses=True
+        )
+        self._observe = self.redis_client.register_script(OBSERVE_SCRIPT)
+    
+    def _key(self, dimension: str, value: str) -> str:
+        return f"{VELOCITY_KEY_PREFIX}{dimension}:{value}"
+    
+    def prime(self, user_id: str) -> bool:
+        """Load a user's recent orders from the database once per retention window."""
+        if not self.redis_client.set(f"{PRIMED_KEY_PREFIX}{user_id}", 1, nx=True, ex=self.retention):
+            return False
+        
+        cutoff = timezone.now() - timedelta(seconds=self.retention)
+        recent = Order.objects.filter(user_id=user_id, created_at__gte=cutoff).values_list('id', 'created_at')
+        lifetime = Order.objects.filter(user_id=user_id).count()
+        
+        pipe = self.redis_client.pipeline()
+        key = self._key('user', user_id)
+        for order_id, created_at in recent:
+            pipe.zadd(key, {str(order_id): created_at.timestamp()})
+        pipe.expire(key, self.retention)
+        pipe.hset(LIFETIME_KEY, user_id, lifetime)
+        pipe.execute()
+        return True
+    
+    def observe(self, signals: OrderSignals) -> bool:
+        """Record an order in every dimension. Re-observing an order is a no-op."""
+        self.prime(signals.user_id)
+        cutoff = time.time() - self.retention
+        if signals.created_at <= cutoff:
+            return False
+        keys = [self._key(dimension, value) for dimension, value in signals.dimensions()]
+        return bool(self._observe(
+            keys=keys + [LIFETIME_KEY],
+            args=[signals.order_id, signals.created_at, cutoff, self.retention, signals.user_id]
+        ))
+    
+    def counts(self, signals: OrderSignals, windows: Iterable[int]) -> Dict[Tuple[str, int], int]:
+        """Orders seen per (dimension, window seconds) ending now."""
+        now = time.time()
+        windows = sorted(set(windows))
+        requests = [
+            (dimension, value, window)
+            for dimension, value in signals.dimensions()
+            for window in windows
+        ]
+        
+        pipe = self.redis_client.pipeline()
+        for dimension, value, window in requests:
+            pipe.zcount(self._key(dimension, value), now - window, '+inf')
+        results = pipe.execute()
+        
+        counts = {(dimension, window): 0 for dimension in ('user', 'ip', 'card') for window in windows}
+        for (dimension, _, window), count in zip(requests, results):
+            counts[(dimension, window)] = int(count)
+        return counts
+    
+    def lifetime_orders(self, user_id: str) -> int:
+        """Total orders placed by a user."""
+        return int(self.redis_client.hget(LIFETIME_KEY, user_id) or 0)
+    
+    def observe_and_count(self, signals: OrderSignals, windows: Iterable[int]) -> Dict[Tuple[str, int], int]:
+        """Record an order and return window counts, falling back to the database without Redis."""
+        windows = list(windows)
+        self.retention = max([self.retention] + windows)
+        try:
+            self.observe(signals)
+            return self.counts(signals, windows)
+        except redis.RedisError:
+            now = timezone.now()
+            counts = {(dimension, window): 0 for dimension in ('user', 'ip', 'card') for window in windows}
+            for window in set(windows):
+                counts[('user', window)] = Order.objects.filter(
+                    user_id=signals.user_id,
+                    created_at__gte=now - timedelta(seconds=window)
+                ).count()
+            return counts
+
+
+class CompiledRule(NamedTuple):
+    """An active SecurityRule reduced to what evaluation needs."""
+    rule_id: uuid.UUID
+    name: str
+    rule_type: str
+    threshold: Decimal
+    window_seconds: int
+
+
+class SecurityRuleSet:
+    """Process-wide compiled set of active security rules.
+    
+    Rules are loaded in one query and kept for RELOAD_INTERVAL seconds, or
+    until invalidate() is called after rules change.
+    """
+    
+    RELOAD_INTERVAL = 60
+    
+    _rules: Optional[List[CompiledRule]] = None
+    _default_rule_id: Optional[uuid.UUID] = None
+    _loaded_at: float = 0.0
+    
+    @classmethod
+    def rules(cls) -> List[CompiledRule]:
+        """Get the compiled active rules, reloading when stale."""
+        if cls._rules is None or time.time() - cls._loaded_at > cls.RELOAD_INTERVAL:
+            rules = SecurityRule.objects.filter(is_active=True).order_by('created_at').values_list(
+                'id', 'name', 'rule_type', 'threshold_value', 'time_window_minutes'
+            )
+            cls._rules = [
+                CompiledRule(rule_id, name, rule_type, threshold, max(minutes, 1) * 60)
+                for rule_id, name, rule_type, threshold, minutes in rules
+            ]
+            cls._default_rule_id = None
+            cls._loaded_at = time.time()
+        return cls._rules
+    
+    @classmethod
+    def windows(cls) -> List[int]:
+        """Distinct time windows used by velocity and pattern rules."""
+        return sorted({rule.window_seconds for rule in cls.rules() if rule.rule_type != 'amount'})
+    
+    @classmethod
+    def default_rule_id(cls) -> uuid.UUID:
+        """Rule that alerts without a matching configured rule are filed under."""
+        rules = cls.rules()
+        if rules:
+            return rules[0].rule_id
+        if cls._default_rule_id is None:
+            rule, _ = SecurityRule.objects.get_or_create(
+                name='Default Rule',
+                defaults={'rule_type': 'pattern', 'threshold_value': Decimal('50.00'), 'is_active': False}
+            )
+            cls._default_rule_id = rule.id
+        return cls._default_rule_id
+    
+    @classmethod
+    def evaluate(cls, amount: Decimal, counts: Dict[Tuple[str, int], int]) -> List[CompiledRule]:
+        """Rules triggered by an order amount and its velocity counts."""
+        triggered = []
+        for rule in cls.rules():
+            if rule.rule_type == 'amount':
+                value = amount
+            elif rule.rule_type == 'velocity':
+                value = counts.get(('user', rule.window_seconds), 0)
+            else:
+                value = max(counts.get(('ip', rule.window_seconds), 0), counts.get(('card', rule.window_seconds), 0))
+            if value > rule.threshold:
+                triggered.append(rule)
+        return triggered
+    
+    @classmethod
+    def invalidate(cls) -> None:
+        """Force a reload on next use."""
+        cls._rules = None
+        cls._default_rule_id = None
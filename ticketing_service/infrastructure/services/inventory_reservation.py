@@ -0,0 +1,317 @@
+import time
+import uuid
+import redis
+from typing import Dict, Any, List, Optional
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from domain.ticket_type import TicketType
+from infrastructure.services.inventory_cache import TicketInventoryCache
+
+
+INVENTORY_KEY_PREFIX = 'ticket:inventory:'
+HOLD_KEY_PREFIX = 'ticket:hold:'
+HOLD_EXPIRY_KEY = 'ticket:holds:expiring'
+PENDING_SOLD_KEY = 'ticket:inventory:pending_sold'
+FLUSHING_SOLD_KEY = 'ticket:inventory:flushing_sold'
+
+
+# KEYS: hold, expiry zset, inventory keys...
+# ARGV: hold_id, deadline, then (ticket_type_id, quantity) pairs aligned with inventory keys
+RESERVE_SCRIPT = """
+local n = #KEYS - 2
+for i = 1, n do
+    local available = redis.call('GET', KEYS[i + 2])
+    if not available then
+        return {-1, i}
+    end
+    if tonumber(available) < tonumber(ARGV[2 + 2 * i]) then
+        return {0, i}
+    end
+end
+for i = 1, n do
+    redis.call('DECRBY', KEYS[i + 2], ARGV[2 + 2 * i])
+    redis.call('HINCRBY', KEYS[1], ARGV[1 + 2 * i], ARGV[2 + 2 * i])
+end
+redis.call('ZADD', KEYS[2], ARGV[2], ARGV[1])
+return {1, 0}
+"""
+
+# KEYS: hold, expiry zset, pending sold hash
+# ARGV: hold_id, now, inventory key prefix, '1' to record the sale as pending
+CONFIRM_SCRIPT = """
+local items = redis.call('HGETALL', KEYS[1])
+if #items == 0 then
+    redis.call('ZREM', KEYS[2], ARGV[1])
+    return {0}
+end
+local deadline = redis.call('ZSCORE', KEYS[2], ARGV[1])
+local expired = deadline and tonumber(deadline) < tonumber(ARGV[2])
+for i = 1, #items, 2 do
+    if expired then
+        redis.call('INCRBY', ARGV[3] .. items[i], items[i + 1])
+    elseif ARGV[4] == '1' then
+        redis.call('HINCRBY', KEYS[3], items[i], items[i + 1])
+    end
+end
+redis.call('DEL', KEYS[1])
+redis.call('ZREM', KEYS[2], ARGV[1])
+if expired then
+    return {-1}
+end
+return {1, items}
+"""
+
+# KEYS: hold, expiry zset
+# ARGV: hold_id, inventory key prefix
+RELEASE_SCRIPT = """
+local items = redis.call('HGETALL', KEYS[1])
+redis.call('ZREM', KEYS[2], ARGV[1])
+if #items == 0 then
+    return 0
+end
+for i = 1, #items, 2 do
+    redis.call('INCRBY', ARGV[2] .. items[i], items[i + 1])
+end
+redis.call('DEL', KEYS[1])
+return 1
+"""
+
+# KEYS: expiry zset
+# ARGV: now, limit, hold key prefix, inventory key prefix
+EXPIRE_SCRIPT = """
+local hold_ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, hold_id in ipairs(hold_ids) do
+    local hold_key = ARGV[3] .. hold_id
+    local items = redis.call('HGETALL', hold_key)
+    for i = 1, #items, 2 do
+        redis.call('INCRBY', ARGV[4] .. items[i], items[i + 1])
+    end
+    redis.call('DEL', hold_key)
+    redis.call('ZREM', KEYS[1], hold_id)
+end
+return #hold_ids
+"""
+
+# KEYS: inventory key, pending sold hash, flushing sold hash
+# ARGV: ticket_type_id, quantity, quantity_sold
+PRIME_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return tonumber(redis.call('GET', KEYS[1]))
+end
+local pending = tonumber(redis.call('HGET', KEYS[2], ARGV[1]) or '0')
+local flushing = tonumber(redis.call('HGET', KEYS[3], ARGV[1]) or '0')
+local available = tonumber(ARGV[2]) - tonumber(ARGV[3]) - pending - flushing
+if available < 0 then
+    available = 0
+end
+redis.call('SET', KEYS[1], available)
+return available
+"""
+
+# KEYS: inventory key, pending sold hash
+# ARGV: ticket_type_id, quantity
+RESTOCK_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('INCRBY', KEYS[1], ARGV[2])
+end
+redis.call('HINCRBY', KEYS[2], ARGV[1], -tonumber(ARGV[2]))
+return 1
+"""
+
+# KEYS: inventory keys
+# ARGV: quantity deltas aligned with KEYS
+ADJUST_SCRIPT = """
+for i = 1, #KEYS do
+    if redis.call('EXISTS', KEYS[i]) == 1 then
+        redis.call('INCRBY', KEYS[i], ARGV[i])
+    end
+end
+return 1
+"""
+
+
+class InsufficientInventoryError(Exception):
+    """Raised when a reservation cannot be satisfied."""
+    
+    def __init__(self, ticket_type_id: str):
+        self.ticket_type_id = ticket_type_id
+        super().__init__(f"Not enough tickets available for ticket type {ticket_type_id}")
+
+
+class TicketReservationEngine:
+    """Atomic multi-ticket-type reservations backed by Redis counters.
+    
+    Available counts live in the same keys as TicketInventoryCache. Holds are
+    created with a single Lua call that checks and decrements every ticket type
+    at once, so concurrent purchases can never take the counter below zero.
+    Confirmed holds are accumulated as pending sold deltas and written back to
+    ticket_types by InventoryReconciler.
+    
+    Code that writes quantity_sold itself must still take tickets with
+    claim() and hand back what it did not sell with adjust(), otherwise the
+    counters and the database drift apart.
+    """
+    
+    DEFAULT_HOLD_TTL = 600
+    
+    def __init__(self, inventory_cache: Optional[TicketInventoryCache] = None):
+        self.inventory_cache = inventory_cache or TicketInventoryCache()
+        self.redis_client = self.inventory_cache.redis_client
+        self._reserve = self.redis_client.register_script(RESERVE_SCRIPT)
+        self._confirm = self.redis_client.register_script(CONFIRM_SCRIPT)
+        self._release = self.redis_client.register_script(RELEASE_SCRIPT)
+        self._expire = self.redis_client.register_script(EXPIRE_SCRIPT)
+        self._prime = self.redis_client.register_script(PRIME_SCRIPT)
+        self._restock = self.redis_client.register_script(RESTOCK_SCRIPT)
+        self._adjust = self.redis_client.register_script(ADJUST_SCRIPT)
+    
+    def prime(self, ticket_type_ids: List[uuid.UUID]) -> Dict[str, int]:
+        """Load available counts from the database for uncached ticket types."""
+        counts = {}
+        ticket_types = TicketType.objects.filter(id__in=ticket_type_ids).values_list(
+            'id', 'quantity', 'quantity_sold'
+        )
+        for ticket_type_id, quantity, quantity_sold in ticket_types:
+            counts[str(ticket_type_id)] = int(self._prime(
+                keys=[f"{INVENTORY_KEY_PREFIX}{ticket_type_id}", PENDING_SOLD_KEY, FLUSHING_SOLD_KEY],
+                args=[str(ticket_type_id), quantity, quantity_sold]
+            ))
+        return counts
+    
+    def reserve(self, items: List[Dict[str, Any]], ttl: int = DEFAULT_HOLD_TTL) -> Dict[str, Any]:
+        """Hold tickets across one or more ticket types in a single round trip."""
+        quantities: Dict[str, int] = {}
+        for item in items:
+            key = str(item['ticket_type_id'])
+            quantities[key] = quantities.get(key, 0) + int(item['quantity'])
+        
+        ticket_type_ids = list(quantities)
+        hold_id = str(uuid.uuid4())
+        deadline = time.time() + ttl
+        keys = [f"{HOLD_KEY_PREFIX}{hold_id}", HOLD_EXPIRY_KEY]
+        keys += [f"{INVENTORY_KEY_PREFIX}{ticket_type_id}" for ticket_type_id in ticket_type_ids]
+        args = [hold_id, deadline]
+        for ticket_type_id in ticket_type_ids:
+            args += [ticket_type_id, quantities[ticket_type_id]]
+        
+        result, index = self._reserve(keys=keys, args=args)
+        if result == -1:
+            self.prime(ticket_type_ids)
+            result, index = self._reserve(keys=keys, args=args)
+        if result != 1:
+            raise InsufficientInventoryError(ticket_type_ids[index - 1])
+        
+        return {
+            'hold_id': hold_id,
+            'items': quantities,
+            'expires_at': deadline,
+        }
+    
+    def claim(self, items: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Take tickets for a sale the caller writes to quantity_sold directly.
+        
+        Returns the quantities taken per ticket type, to pass to adjust() if
+        the sale is not recorded after all.
+        """
+        hold = self.reserve(items)
+        self._confirm(
+            keys=[f"{HOLD_KEY_PREFIX}{hold['hold_id']}", HOLD_EXPIRY_KEY, PENDING_SOLD_KEY],
+            args=[hold['hold_id'], time.time(), INVENTORY_KEY_PREFIX, '0']
+        )
+        return hold['items']
+    
+    def adjust(self, deltas: Dict[str, int]) -> None:
+        """Add to (or with negative deltas, take from) cached available counts.
+        
+        Uncached ticket types are skipped; they are primed from the database
+        when next reserved.
+        """
+        changes = [(ticket_type_id, int(delta)) for ticket_type_id, delta in deltas.items() if delta]
+        if not changes:
+            return
+        self._adjust(
+            keys=[f"{INVENTORY_KEY_PREFIX}{ticket_type_id}" for ticket_type_id, _ in changes],
+            args=[delta for _, delta in changes]
+        )
+    
+    def get_hold(self, hold_id: str) -> Dict[str, int]:
+        """Get the ticket quantities held by a hold, empty if it is gone."""
+        items = self.redis_client.hgetall(f"{HOLD_KEY_PREFIX}{hold_id}")
+        return {ticket_type_id: int(quantity) for ticket_type_id, quantity in items.items()}
+    
+    def confirm(self, hold_id: str) -> Optional[Dict[str, int]]:
+        """Turn a hold into sold tickets. Returns None if the hold is missing or expired."""
+        result = self._confirm(
+            keys=[f"{HOLD_KEY_PREFIX}{hold_id}", HOLD_EXPIRY_KEY, PENDING_SOLD_KEY],
+            args=[hold_id, time.time(), INVENTORY_KEY_PREFIX, '1']
+        )
+        if result[0] != 1:
+            return None
+        items = result[1]
+        return {items[i]: int(items[i + 1]) for i in range(0, len(items), 2)}
+    
+    def release(self, hold_id: str) -> bool:
+        """Return held tickets to inventory."""
+        return bool(self._release(
+            keys=[f"{HOLD_KEY_PREFIX}{hold_id}", HOLD_EXPIRY_KEY],
+            args=[hold_id, INVENTORY_KEY_PREFIX]
+        ))
+    
+    def restock(self, ticket_type_id: uuid.UUID, quantity: int) -> None:
+        """Return sold tickets to inventory, e.g. after a cancellation."""
+        self._restock(
+            keys=[f"{INVENTORY_KEY_PREFIX}{ticket_type_id}", PENDING_SOLD_KEY],
+            args=[str(ticket_type_id), quantity]
+        )
+    
+    def expire_holds(self, limit: int = 1000) -> int:
+        """Release holds whose TTL has passed. Returns the number released."""
+        return int(self._expire(
+            keys=[HOLD_EXPIRY_KEY],
+            args=[time.time(), limit, HOLD_KEY_PREFIX, INVENTORY_KEY_PREFIX]
+        ))
+
+
+class InventoryReconciler:
+    """Write-behind flush of confirmed sales into ticket_types.quantity_sold."""
+    
+    def __init__(self, inventory_cache: Optional[TicketInventoryCache] = None):
+        self.redis_client = (inventory_cache or TicketInventoryCache()).redis_client
+    
+    def flush(self, batch_size: int = 500) -> Dict[str, Any]:
+        """Apply pending sold deltas to the database in batched UPDATEs."""
+        # A leftover flushing hash means the previous run died; finish it first.
+        if not self.redis_client.exists(FLUSHING_SOLD_KEY):
+            try:
+                self.redis_client.rename(PENDING_SOLD_KEY, FLUSHING_SOLD_KEY)
+            except redis.ResponseError:
+                # Nothing has been sold since the last flush
+                return {'ticket_types': 0, 'tickets': 0}
+        
+        deltas = {
+            ticket_type_id: int(delta)
+            for ticket_type_id, delta in self.redis_client.hgetall(FLUSHING_SOLD_KEY).items()
+            if int(delta) != 0
+        }
+        ticket_type_ids = list(deltas)
+        
+        for start in range(0, len(ticket_type_ids), batch_size):
+            batch = ticket_type_ids[start:start + batch_size]
+            with transaction.atomic():
+                TicketType.objects.filter(id__in=batch).update(
+                    quantity_sold=F('quantity_sold') + Case(
+                        *[When(id=ticket_type_id, then=Value(deltas[ticket_type_id])) for ticket_type_id in batch],
+                        default=Value(0),
+                        output_field=IntegerField()
+                    ),
+                    updated_at=timezone.now()
+                )
+            self.redis_client.hdel(FLUSHING_SOLD_KEY, *batch)
+        
+        self.redis_client.delete(FLUSHING_SOLD_KEY)
+        return {
+            'ticket_types': len(deltas),
+            'tickets': sum(deltas.values()),
+        }
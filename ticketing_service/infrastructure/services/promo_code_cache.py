@@ -0,0 +1,139 @@
+import uuid
+import redis
+from decimal import Decimal
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from domain.promo_code import PromoCode
+
+
+CACHED_FIELDS = (
+    'id', 'code', 'event_id', 'discount_type', 'discount_value', 'max_uses', 'current_uses',
+    'single_use_count', 'valid_from', 'valid_until', 'min_purchase_amount', 'is_active',
+)
+
+# KEYS: cached promo hash
+INCREMENT_USES_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('HINCRBY', KEYS[1], 'current_uses', 1)
+end
+return -1
+"""
+
+
+class PromoCodeCache:
+    """Read-through Redis cache of promo codes keyed by code.
+    
+    Misses are cached briefly too, so guessing codes does not reach the
+    database. Saving or deleting a PromoCode drops its entry once the
+    transaction commits; usage counts in the cache are advisory,
+    PromoCode.apply() enforces max_uses.
+    """
+    
+    KEY_PREFIX = 'promo:code:'
+    TTL = 300
+    MISSING_TTL = 30
+    
+    def __init__(self):
+        self.redis_client = redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            decode_responses=True
+        )
+        self._increment_uses = self.redis_client.register_script(INCREMENT_USES_SCRIPT)
+    
+    def _key(self, code: str) -> str:
+        return f"{self.KEY_PREFIX}{code.upper()}"
+    
+    def get(self, code: str) -> Optional[PromoCode]:
+        """Get a promo code, loading it from the database on a miss."""
+        key = self._key(code)
+        try:
+            values = self.redis_client.hgetall(key)
+        except redis.RedisError:
+            return PromoCode.objects.filter(code=code.upper()).first()
+        
+        if values:
+            return None if values.get('missing') else self._decode(values)
+        
+        promo = PromoCode.objects.filter(code=code.upper()).first()
+        pipe = self.redis_client.pipeline()
+        if promo is None:
+            pipe.hset(key, 'missing', 1)
+            pipe.expire(key, self.MISSING_TTL)
+        else:
+            pipe.hset(key, mapping=self._encode(promo))
+            pipe.expire(key, self.TTL)
+        pipe.execute()
+        return promo
+    
+    def invalidate(self, code: str) -> None:
+        """Drop a cached code after it is created or updated."""
+        self.redis_client.delete(self._key(code))
+    
+    def invalidate_many(self, codes: Iterable[str]) -> None:
+        """Drop several cached codes in one round trip."""
+        keys = [self._key(code) for code in codes]
+        if keys:
+            self.redis_client.delete(*keys)
+    
+    def record_use(self, code: str) -> None:
+        """Bump the cached usage count after a successful apply."""
+        self._increment_uses(keys=[self._key(code)])
+    
+    @staticmethod
+    def _encode(promo: PromoCode) -> Dict[str, str]:
+        values = {}
+        for field in CACHED_FIELDS:
+            value = getattr(promo, field)
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            elif isinstance(value, bool):
+                value = int(value)
+            values[field] = '' if value is None else str(value)
+        return values
+    
+    @staticmethod
+    def _decode(values: Dict[str, str]) -> PromoCode:
+        return PromoCode.from_db('default', CACHED_FIELDS, [
+            uuid.UUID(values['id']),
+            values['code'],
+            uuid.UUID(values['event_id']) if values['event_id'] else None,
+            values['discount_type'],
+            Decimal(values['discount_value']),
+            int(values['max_uses']),
+            int(values['current_uses']),
+            int(values['single_use_count']),
+            datetime.fromisoformat(values['valid_from']),
+            datetime.fromisoformat(values['valid_until']),
+            Decimal(values['min_purchase_amount']),
+            values['is_active'] == '1',
+        ])
+
+
+@receiver(post_init, sender=PromoCode)
+def _remember_code(sender, instance, **kwargs):
+    # Read from __dict__ so a deferred code is not loaded
+    instance._cached_code = instance.__dict__.get('code')
+
+
+@receiver(post_save, sender=PromoCode)
+@receiver(post_delete, sender=PromoCode)
+def _promo_code_changed(sender, instance, **kwargs):
+    # A renamed code drops its old entry too
+    codes = {instance.code, getattr(instance, '_cached_code', None)} - {None}
+    instance._cached_code = instance.code
+    
+    def invalidate():
+        try:
+            PromoCodeCache().invalidate_many(codes)
+        except redis.RedisError:
+            # Stale entries still expire after TTL
+            pass
+    
+    transaction.on_commit(invalidate)
@@ -1,45 +1,261 @@
 import qrcode
+import qrcode.image.svg
 import io
 import base64
-from typing import Optional
+import hashlib
+import threading
+import redis
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+from django.conf import settings
+
+
+# Error correction per use: 'print' survives damaged paper tickets, 'screen'
+# gives smaller, faster codes for phones and monitors.
+QR_PROFILES = {
+    'print': qrcode.constants.ERROR_CORRECT_H,
+    'screen': qrcode.constants.ERROR_CORRECT_L,
+}
+
+IMAGE_FORMATS = ('png', 'svg')
+
+
+def render_qr(data: str, size: int = 10, profile: str = 'print', image_format: str = 'png') -> bytes:
+    """Render a QR code to PNG or SVG bytes."""
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=QR_PROFILES[profile],
+        box_size=size,
+        border=4,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+    
+    buffer = io.BytesIO()
+    if image_format == 'svg':
+        qr.make_image(image_factory=qrcode.image.svg.SvgPathImage).save(buffer)
+    else:
+        qr.make_image(fill_color="black", back_color="white").save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def _render_args(args) -> bytes:
+    """Process pool entry point for render_qr."""
+    return render_qr(*args)
+
+
+class QRRenderCache:
+    """Two-tier content-addressed cache of rendered QR codes.
+    
+    Ticket payloads never change after issue, so a render is keyed by a hash
+    of payload and render options. Hits are served from an in-process LRU,
+    then Redis; Redis errors degrade to rendering.
+    """
+    
+    KEY_PREFIX = 'ticket:qr:render:'
+    
+    def __init__(self, max_entries: int = 2048, ttl: int = 7 * 24 * 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._local: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.redis_client = redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB
+        )
+    
+    @staticmethod
+    def make_key(data: str, size: int, profile: str, image_format: str) -> str:
+        """Content address for a render."""
+        return hashlib.sha256(f"{image_format}|{profile}|{size}|{data}".encode()).hexdigest()
+    
+    def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        """Look up renders, promoting Redis hits into the local tier."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._local:
+                    self._local.move_to_end(key)
+                    found[key] = self._local[key]
+        
+        missing = [key for key in keys if key not in found]
+        if missing:
+            try:
+                values = self.redis_client.mget([self.KEY_PREFIX + key for key in missing])
+            except redis.RedisError:
+                values = [None] * len(missing)
+            remote = {key: value for key, value in zip(missing, values) if value is not None}
+            self._store_local(remote)
+            found.update(remote)
+        return found
+    
+    def set_many(self, renders: Dict[str, bytes]) -> None:
+        """Store renders in both tiers."""
+        self._store_local(renders)
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, value in renders.items():
+                pipe.setex(self.KEY_PREFIX + key, self.ttl, value)
+            pipe.execute()
+        except redis.RedisError:
+            pass
+    
+    def _store_local(self, renders: Dict[str, bytes]) -> None:
+        with self._lock:
+            for key, value in renders.items():
+                self._local[key] = value
+                self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+    
+    def clear_local(self) -> None:
+        """Drop the in-process tier."""
+        with self._lock:
+            self._local.clear()
+
+
+_render_cache: Optional[QRRenderCache] = None
+_render_pool: Optional[ProcessPoolExecutor] = None
+_render_pool_lock = threading.Lock()
+
+
+def get_render_cache() -> QRRenderCache:
+    """Process-wide render cache."""
+    global _render_cache
+    if _render_cache is None:
+        _render_cache = QRRenderCache()
+    return _render_cache
+
+
+def get_render_pool() -> ProcessPoolExecutor:
+    """Process-wide render pool, started on first use and reused afterwards."""
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            _render_pool = ProcessPoolExecutor(max_workers=settings.QR_RENDER_WORKERS or None)
+        return _render_pool
+
+
+def reset_render_pool() -> None:
+    """Shut down the render pool; the next batch starts a new one."""
+    global _render_pool
+    with _render_pool_lock:
+        pool, _render_pool = _render_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
 
 
 class QRCodeService:
-    """Service for generating QR codes."""
+    """Service for generating QR codes.
+    
+    Large batches of cache misses render in a shared process pool. Single
+    renders and small batches, which is what requests produce, stay in
+    process; bulk renders come from the render_qr_codes worker.
+    """
+    
+    # Below this many misses a pool costs more than it saves
+    POOL_THRESHOLD = 16
     
-    def generate_qr_code(self, data: str, size: int = 10) -> str:
+    def __init__(self, cache: Optional[QRRenderCache] = None):
+        self.cache = cache or get_render_cache()
+    
+    def generate_qr_code(self, data: str, size: int = 10, profile: str = 'print') -> str:
         """Generate QR code and return as base64 string."""
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_H,
-            box_size=size,
-            border=4,
-        )
-        qr.add_data(data)
-        qr.make(fit=True)
+        img_str = base64.b64encode(self.generate_qr_image(data, size, profile)).decode()
+        return f"data:image/png;base64,{img_str}"
+    
+    def generate_qr_image(self, data: str, size: int = 10, profile: str = 'print') -> bytes:
+        """Generate QR code and return as bytes."""
+        return self.render_batch([data], size, profile)[data]
+    
+    def generate_qr_svg(self, data: str, size: int = 10, profile: str = 'screen') -> bytes:
+        """Generate QR code as SVG, cheaper to produce and scale for screens."""
+        return self.render_batch([data], size, profile, image_format='svg')[data]
+    
+    def render_batch(
+        self,
+        payloads: List[str],
+        size: int = 10,
+        profile: str = 'print',
+        image_format: str = 'png'
+    ) -> Dict[str, bytes]:
+        """Render many QR codes, serving cached ones and rendering misses in a process pool."""
+        if profile not in QR_PROFILES:
+            raise ValueError(f"Unknown QR profile: {profile}")
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Unknown QR image format: {image_format}")
         
-        img = qr.make_image(fill_color="black", back_color="white")
+        keys = {payload: QRRenderCache.make_key(payload, size, profile, image_format) for payload in payloads}
+        cached = self.cache.get_many(list(set(keys.values())))
+        misses = list({payload for payload, key in keys.items() if key not in cached})
         
-        # Convert to base64
-        buffer = io.BytesIO()
-        img.save(buffer, format='PNG')
-        img_str = base64.b64encode(buffer.getvalue()).decode()
+        if misses:
+            args = [(payload, size, profile, image_format) for payload in misses]
+            if len(misses) < self.POOL_THRESHOLD:
+                rendered = [render_qr(*arg) for arg in args]
+            else:
+                try:
+                    rendered = list(get_render_pool().map(_render_args, args, chunksize=8))
+                except BrokenProcessPool:
+                    # A worker died; render this batch here and start over next time
+                    reset_render_pool()
+                    rendered = [render_qr(*arg) for arg in args]
+            fresh = {keys[payload]: image for payload, image in zip(misses, rendered)}
+            self.cache.set_many(fresh)
+            cached.update(fresh)
         
-        return f"data:image/png;base64,{img_str}"
+        return {payload: cached[key] for payload, key in keys.items()}
+
+
+class QRRenderQueue:
+    """Redis queue of QR payloads waiting to be rendered off the request path.
     
-    def generate_qr_image(self, data: str) -> bytes:
-        """Generate QR code and return as bytes."""
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_H,
-            box_size=10,
-            border=4,
+    Drained by the render_qr_codes management command. The queue is only a
+    cache warmer, so it is capped at MAX_PENDING and the oldest payloads are
+    dropped if no consumer keeps up; those render on first view instead.
+    """
+    
+    QUEUE_KEY = 'ticket:qr:render_queue'
+    MAX_PENDING = 100000
+    
+    def __init__(self, qr_service: Optional[QRCodeService] = None):
+        self.qr_service = qr_service or QRCodeService()
+        self.redis_client = redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            decode_responses=True
         )
-        qr.add_data(data)
-        qr.make(fit=True)
-        
-        img = qr.make_image(fill_color="black", back_color="white")
+    
+    def enqueue(self, payloads: List[str], chunk_size: int = 1000) -> int:
+        """Queue payloads for rendering. Best effort: tickets still render on demand."""
+        if not payloads:
+            return 0
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for start in range(0, len(payloads), chunk_size):
+                pipe.rpush(self.QUEUE_KEY, *payloads[start:start + chunk_size])
+            pipe.ltrim(self.QUEUE_KEY, -self.MAX_PENDING, -1)
+            pipe.execute()
+        except redis.RedisError:
+            return 0
+        return len(payloads)
+    
+    def process(self, batch_size: int = 100) -> int:
+        """Render the next batch of queued payloads. Returns the number rendered."""
+        pipe = self.redis_client.pipeline()
+        pipe.lrange(self.QUEUE_KEY, 0, batch_size - 1)
+        pipe.ltrim(self.QUEUE_KEY, batch_size, -1)
+        payloads, _ = pipe.execute()
         
-        buffer = io.BytesIO()
-        img.save(buffer, format='PNG')
-        return buffer.getvalue()
+        if payloads:
+            # Warms the render cache so ticket views and emails hit it
+            self.qr_service.render_batch(payloads)
+        return len(payloads)
+    
+    def pending(self) -> int:
+        """Number of payloads waiting to be rendered."""
+        return self.redis_client.llen(self.QUEUE_KEY)
@@ -0,0 +1,99 @@
+import hmac
+import base64
+import struct
+import hashlib
+import binascii
+import uuid
+import redis
+from typing import Iterator, Optional, Tuple
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from domain.promo_code import PromoCode, PromoCodeRedemption
+from infrastructure.services.promo_code_cache import PromoCodeCache
+
+
+class SingleUseCodeService:
+    """Pre-generated single-use codes derived from a parent promo code.
+    
+    A code is "<PARENT>-<token>" where the token packs a serial number and a
+    truncated HMAC, so millions of codes need no rows: the parent only stores
+    how many serials were issued. Redemptions are recorded in
+    PromoCodeRedemption (unique per serial) and mirrored in a Redis bitmap,
+    one bit per code, for database-free validation.
+    """
+    
+    SEPARATOR = '-'
+    MAC_SIZE = 6
+    TOKEN_LENGTH = 16
+    REDEEMED_KEY_PREFIX = 'promo:redeemed:'
+    
+    def __init__(self, cache: Optional[PromoCodeCache] = None, key: Optional[str] = None):
+        self.cache = cache or PromoCodeCache()
+        self.redis_client = self.cache.redis_client
+        self.key = (key or settings.SECRET_KEY).encode()
+    
+    def _mac(self, promo_id: uuid.UUID, serial: int) -> bytes:
+        message = promo_id.bytes + struct.pack('>I', serial)
+        return hmac.new(self.key, message, hashlib.sha256).digest()[:self.MAC_SIZE]
+    
+    def make_code(self, promo: PromoCode, serial: int) -> str:
+        """Build the code for one serial number."""
+        token = base64.b32encode(struct.pack('>I', serial) + self._mac(promo.id, serial)).decode('ascii')
+        return f"{promo.code}{self.SEPARATOR}{token}"
+    
+    def allocate(self, promo_code_id: uuid.UUID, count: int) -> Tuple[PromoCode, range]:
+        """Reserve the next count serials for a promo code."""
+        with transaction.atomic():
+            updated = PromoCode.objects.filter(id=promo_code_id).update(
+                single_use_count=F('single_use_count') + count
+            )
+            if not updated:
+                raise ValidationError("Promo code not found")
+            promo = PromoCode.objects.get(id=promo_code_id)
+        self.cache.invalidate(promo.code)
+        return promo, range(promo.single_use_count - count, promo.single_use_count)
+    
+    def iter_codes(self, promo: PromoCode, serials: range) -> Iterator[str]:
+        """Lazily generate codes for a serial range."""
+        for serial in serials:
+            yield self.make_code(promo, serial)
+    
+    def resolve(self, code: str) -> Optional[Tuple[PromoCode, int]]:
+        """Get the parent promo code and serial for a single-use code, if genuine."""
+        parent_code, _, token = code.upper().rpartition(self.SEPARATOR)
+        if not parent_code or len(token) != self.TOKEN_LENGTH:
+            return None
+        try:
+            raw = base64.b32decode(token)
+        except binascii.Error:
+            return None
+        
+        serial = struct.unpack('>I', raw[:4])[0]
+        promo = self.cache.get(parent_code)
+        if promo is None or serial >= promo.single_use_count:
+            return None
+        if not hmac.compare_digest(raw[4:], self._mac(promo.id, serial)):
+            return None
+        return promo, serial
+    
+    def is_redeemed(self, promo_code_id: uuid.UUID, serial: int) -> bool:
+        """Check the redemption bitmap."""
+        try:
+            return bool(self.redis_client.getbit(f"{self.REDEEMED_KEY_PREFIX}{promo_code_id}", serial))
+        except redis.RedisError:
+            return PromoCodeRedemption.objects.filter(promo_code_id=promo_code_id, serial=serial).exists()
+    
+    def redeem(self, promo_code_id: uuid.UUID, serial: int, order_id: Optional[uuid.UUID] = None) -> None:
+        """Record a redemption; raises ValidationError if the code was already used."""
+        try:
+            with transaction.atomic():
+                PromoCodeRedemption.objects.create(promo_code_id=promo_code_id, serial=serial, order_id=order_id)
+        except IntegrityError:
+            raise ValidationError("Promo code has already been used")
+        
+        transaction.on_commit(
+            lambda: self.redis_client.setbit(f"{self.REDEEMED_KEY_PREFIX}{promo_code_id}", serial, 1)
+        )
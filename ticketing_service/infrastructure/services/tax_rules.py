@@ -0,0 +1,114 @@
+import time
+import uuid
+import redis
+from decimal import Decimal
+from typing import Dict, NamedTuple, Optional, Tuple
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from domain.tax import TaxRule, NO_TAX_RULE_ID
+
+
+class CompiledTaxRule(NamedTuple):
+    """An active TaxRule reduced to what calculation needs."""
+    rule_id: uuid.UUID
+    tax_type: str
+    tax_rate: Decimal
+    
+    def calculate_tax(self, amount: Decimal) -> Decimal:
+        """Calculate tax amount (same arithmetic as TaxRule.calculate_tax)."""
+        if self.tax_type == 'percentage':
+            return (amount * self.tax_rate / 100).quantize(Decimal('0.01'))
+        return self.tax_rate
+
+
+NO_TAX = CompiledTaxRule(NO_TAX_RULE_ID, 'percentage', Decimal('0.00'))
+
+
+class TaxRuleTable:
+    """Process-wide (country, state) -> tax rule table.
+    
+    The table is loaded in one query and tagged with a version number kept in
+    Redis. Lookups are dict reads; at most every VERSION_CHECK_INTERVAL
+    seconds the Redis version is compared and the table reloaded if another
+    process published a change. Saving or deleting a TaxRule publishes once
+    the transaction commits. Changes that skip signals, such as queryset
+    updates, are picked up by a reload every RELOAD_INTERVAL seconds.
+    """
+    
+    VERSION_KEY = 'tax:rules:version'
+    VERSION_CHECK_INTERVAL = 5
+    RELOAD_INTERVAL = 300
+    
+    _rules: Optional[Dict[Tuple[str, str], CompiledTaxRule]] = None
+    _version: Optional[int] = None
+    _loaded_at: float = 0.0
+    _checked_at: float = 0.0
+    _redis_client: Optional[redis.Redis] = None
+    
+    @classmethod
+    def _redis(cls) -> redis.Redis:
+        if cls._redis_client is None:
+            cls._redis_client = redis.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.REDIS_DB,
+                decode_responses=True
+            )
+        return cls._redis_client
+    
+    @classmethod
+    def _current_version(cls) -> Optional[int]:
+        try:
+            return int(cls._redis().get(cls.VERSION_KEY) or 0)
+        except redis.RedisError:
+            return None
+    
+    @classmethod
+    def _load(cls, version: Optional[int]) -> None:
+        rules = TaxRule.objects.filter(is_active=True).order_by('created_at').values_list(
+            'id', 'country', 'state', 'tax_type', 'tax_rate'
+        )
+        # Later rules win when a jurisdiction has more than one
+        cls._rules = {
+            (country, state): CompiledTaxRule(rule_id, tax_type, tax_rate)
+            for rule_id, country, state, tax_type, tax_rate in rules
+        }
+        cls._version = version
+        cls._loaded_at = time.time()
+    
+    @classmethod
+    def rules(cls) -> Dict[Tuple[str, str], CompiledTaxRule]:
+        """Get the current table, reloading it if its version changed."""
+        now = time.time()
+        if cls._rules is not None and now - cls._checked_at < cls.VERSION_CHECK_INTERVAL:
+            return cls._rules
+        
+        cls._checked_at = now
+        version = cls._current_version()
+        stale = version != cls._version or now - cls._loaded_at > cls.RELOAD_INTERVAL
+        if cls._rules is None or stale:
+            cls._load(version)
+        return cls._rules
+    
+    @classmethod
+    def lookup(cls, country: str, state: str = '') -> CompiledTaxRule:
+        """Get the rule for a jurisdiction, or a zero-rate rule if none applies."""
+        return cls.rules().get((country, state), NO_TAX)
+    
+    @classmethod
+    def publish(cls) -> None:
+        """Announce that tax rules changed so every process reloads."""
+        try:
+            cls._redis().incr(cls.VERSION_KEY)
+        except redis.RedisError:
+            pass
+        cls._rules = None
+
+
+@receiver(post_save, sender=TaxRule)
+@receiver(post_delete, sender=TaxRule)
+def _tax_rule_changed(sender, instance, **kwargs):
+    transaction.on_commit(TaxRuleTable.publish)
@@ -0,0 +1,91 @@
+import uuid
+from typing import Dict, Any, List, Optional, Tuple
+from django.db import transaction
+
+from domain.ticket import Ticket
+from infrastructure.services.qr_code_service import QRRenderQueue
+from infrastructure.services.ticket_signing import TicketTokenSigner
+
+
+class BulkTicketIssuer:
+    """Issue tickets with chunked bulk_create instead of one INSERT per ticket.
+
+    Ids, QR payloads and security hashes are computed in memory before the
+    insert, and QR images are queued for background rendering.
+    """
+    
+    DEFAULT_CHUNK_SIZE = 1000
+    
+    def __init__(
+        self,
+        render_queue: Optional[QRRenderQueue] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        signer: Optional[TicketTokenSigner] = None
+    ):
+        self.render_queue = render_queue or QRRenderQueue()
+        self.chunk_size = chunk_size
+        self.signer = signer
+    
+    def build(
+        self,
+        ticket_type_id: uuid.UUID,
+        order_id: uuid.UUID,
+        attendee_name: str,
+        attendee_email: str,
+        quantity: int,
+        event_id: Optional[uuid.UUID] = None
+    ) -> List[Ticket]:
+        """Build unsaved tickets with QR data and security hash filled in.
+        
+        With an event id the QR data is a signed token scanners can verify offline.
+        """
+        signer = (self.signer or TicketTokenSigner()) if event_id else None
+        tickets = []
+        for _ in range(quantity):
+            ticket = Ticket(
+                ticket_type_id=ticket_type_id,
+                order_id=order_id,
+                attendee_name=attendee_name,
+                attendee_email=attendee_email
+            )
+            if signer:
+                ticket.qr_code_data = signer.sign_ticket(ticket, event_id)
+            ticket.prepare()
+            tickets.append(ticket)
+        return tickets
+    
+    def issue(self, tickets: List[Ticket]) -> List[Ticket]:
+        """Insert prepared tickets in chunks and queue their QR images."""
+        with transaction.atomic():
+            for start in range(0, len(tickets), self.chunk_size):
+                Ticket.objects.bulk_create(tickets[start:start + self.chunk_size])
+        
+        transaction.on_commit(
+            lambda: self.render_queue.enqueue([ticket.qr_code_data for ticket in tickets])
+        )
+        return tickets
+    
+    def issue_for_order(
+        self,
+        order_id: uuid.UUID,
+        items: List[Tuple[uuid.UUID, int]],
+        attendee_name: str = "Attendee",
+        attendee_email: str = "temp@example.com",
+        event_id: Optional[uuid.UUID] = None
+    ) -> List[Ticket]:
+        """Issue tickets for (ticket_type_id, quantity) pairs of an order."""
+        tickets = []
+        for ticket_type_id, quantity in items:
+            tickets += self.build(ticket_type_id, order_id, attendee_name, attendee_email, quantity, event_id)
+        return self.issue(tickets)
+    
+    def issue_batch(self, data: Dict[str, Any], quantity: int) -> List[Ticket]:
+        """Issue identical tickets, e.g. a comp batch."""
+        return self.issue(self.build(
+            data['ticket_type_id'],
+            data['order_id'],
+            data['attendee_name'],
+            data['attendee_email'],
+            quantity,
+            data.get('event_id')
+        ))
@@ -0,0 +1,256 @@
+import base64
+import struct
+import threading
+import time
+import uuid
+from datetime import datetime, timezone as dt_timezone
+from typing import Iterable, NamedTuple, Optional
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.utils import timezone
+
+from domain.ticket import Ticket
+from domain.ticket_type import TicketType
+
+
+TOKEN_PREFIX = 'ST1'
+TOKEN_VERSION = 1
+SIGNATURE_BYTES = 64
+KEY_BYTES = 32
+
+# version, key id, ticket id, event id, ticket type id, valid from, valid until
+_CLAIMS = struct.Struct('>BB16s16s16sII')
+
+
+class TicketClaims(NamedTuple):
+    """Verified contents of a signed ticket token."""
+    ticket_id: uuid.UUID
+    event_id: uuid.UUID
+    ticket_type_id: uuid.UUID
+    valid_from: Optional[datetime]
+    valid_until: Optional[datetime]
+
+
+def _to_epoch(value: Optional[datetime]) -> int:
+    return int(value.timestamp()) if value else 0
+
+
+def _from_epoch(value: int) -> Optional[datetime]:
+    return datetime.fromtimestamp(value, tz=dt_timezone.utc) if value else None
+
+
+def _decode_key(value: str) -> bytes:
+    try:
+        raw = base64.b64decode(value, validate=True)
+    except ValueError:
+        raw = b''
+    if len(raw) != KEY_BYTES:
+        raise ImproperlyConfigured("Ticket signing keys must be base64-encoded raw 32-byte Ed25519 keys")
+    return raw
+
+
+def generate_signing_key() -> str:
+    """New private key in the TICKET_SIGNING_PRIVATE_KEY format."""
+    raw = Ed25519PrivateKey.generate().private_bytes(
+        serialization.Encoding.Raw, serialization.PrivateFormat.Raw, serialization.NoEncryption()
+    )
+    return base64.b64encode(raw).decode()
+
+
+def public_key_for(private_key: str) -> str:
+    """Base64 public key matching a base64 private key."""
+    raw = Ed25519PrivateKey.from_private_bytes(_decode_key(private_key)).public_key().public_bytes(
+        serialization.Encoding.Raw, serialization.PublicFormat.Raw
+    )
+    return base64.b64encode(raw).decode()
+
+
+class TicketTokenVerifier:
+    """Verifies signed ticket tokens without the database.
+    
+    Only the Ed25519 public key is needed, so this is what door scanners
+    run; holding it does not let anyone mint tickets.
+    """
+    
+    def __init__(self, public_key: Optional[str] = None, key_id: Optional[int] = None):
+        if public_key is None:
+            public_key = public_key_for(settings.TICKET_SIGNING_PRIVATE_KEY)
+        self.public_key = public_key
+        self._public_key = Ed25519PublicKey.from_public_bytes(_decode_key(public_key))
+        self.key_id = key_id if key_id is not None else settings.TICKET_SIGNING_KEY_ID
+    
+    @staticmethod
+    def is_token(payload: str) -> bool:
+        """Check whether a QR payload is a signed token."""
+        return payload.startswith(TOKEN_PREFIX)
+    
+    def verify(self, token: str, now: Optional[datetime] = None) -> TicketClaims:
+        """Verify signature and validity window; raises ValidationError."""
+        if not self.is_token(token):
+            raise ValidationError("Not a signed ticket token")
+        
+        encoded = token[len(TOKEN_PREFIX):]
+        try:
+            raw = base64.b32decode(encoded + '=' * (-len(encoded) % 8))
+        except ValueError:
+            raise ValidationError("Malformed ticket token")
+        if len(raw) != _CLAIMS.size + SIGNATURE_BYTES:
+            raise ValidationError("Malformed ticket token")
+        
+        claims, signature = raw[:_CLAIMS.size], raw[_CLAIMS.size:]
+        version, key_id, ticket_id, event_id, ticket_type_id, valid_from, valid_until = _CLAIMS.unpack(claims)
+        if version != TOKEN_VERSION or key_id != self.key_id:
+            raise ValidationError("Unknown ticket token version or key")
+        try:
+            self._public_key.verify(signature, claims)
+        except InvalidSignature:
+            raise ValidationError("Invalid ticket signature")
+        
+        current = _to_epoch(now or timezone.now())
+        if valid_from and current < valid_from:
+            raise ValidationError("Ticket is not valid yet")
+        if valid_until and current > valid_until:
+            raise ValidationError("Ticket has expired")
+        
+        return TicketClaims(
+            uuid.UUID(bytes=ticket_id),
+            uuid.UUID(bytes=event_id),
+            uuid.UUID(bytes=ticket_type_id),
+            _from_epoch(valid_from),
+            _from_epoch(valid_until)
+        )
+
+
+class TicketTokenSigner(TicketTokenVerifier):
+    """Compact Ed25519-signed ticket tokens.
+    
+    The token packs the ticket, event and ticket type ids and the validity
+    window into 58 bytes, appends the signature and encodes it as unpadded
+    base32, which QR alphanumeric mode stores densely. The private key
+    never leaves this service.
+    """
+    
+    def __init__(self, private_key: Optional[str] = None, key_id: Optional[int] = None):
+        private_key = private_key or settings.TICKET_SIGNING_PRIVATE_KEY
+        self._private_key = Ed25519PrivateKey.from_private_bytes(_decode_key(private_key))
+        super().__init__(public_key_for(private_key), key_id)
+    
+    def sign(
+        self,
+        ticket_id: uuid.UUID,
+        event_id: uuid.UUID,
+        ticket_type_id: uuid.UUID,
+        valid_from: Optional[datetime] = None,
+        valid_until: Optional[datetime] = None
+    ) -> str:
+        """Create a signed token for a ticket."""
+        claims = _CLAIMS.pack(
+            TOKEN_VERSION,
+            self.key_id,
+            uuid.UUID(str(ticket_id)).bytes,
+            uuid.UUID(str(event_id)).bytes,
+            uuid.UUID(str(ticket_type_id)).bytes,
+            _to_epoch(valid_from),
+            _to_epoch(valid_until)
+        )
+        encoded = base64.b32encode(claims + self._private_key.sign(claims)).decode().rstrip('=')
+        return f"{TOKEN_PREFIX}{encoded}"
+    
+    def sign_ticket(
+        self,
+        ticket: Ticket,
+        event_id: uuid.UUID,
+        valid_from: Optional[datetime] = None,
+        valid_until: Optional[datetime] = None
+    ) -> str:
+        """Create a signed token for a ticket instance."""
+        return self.sign(ticket.id, event_id, ticket.ticket_type_id, valid_from, valid_until)
+
+
+class TicketRevocationSet:
+    """Small per-event set of ticket ids that must not be admitted.
+    
+    Holds cancelled and already used tickets so most rejections need no
+    database read. Admissions are recorded here as well as in the database.
+    """
+    
+    def __init__(self, event_id: uuid.UUID):
+        self.event_id = event_id
+        self.loaded_at = 0.0
+        self._revoked: dict = {}
+    
+    def __len__(self) -> int:
+        return len(self._revoked)
+    
+    def load(self) -> int:
+        """Load cancelled and used tickets for the event."""
+        ticket_type_ids = TicketType.objects.filter(event_id=self.event_id).values_list('id', flat=True)
+        rows = Ticket.objects.filter(
+            ticket_type_id__in=ticket_type_ids,
+            status__in=['used', 'cancelled']
+        ).values_list('id', 'status').iterator(chunk_size=5000)
+        self._revoked = {ticket_id: status for ticket_id, status in rows}
+        self.loaded_at = time.monotonic()
+        return len(self._revoked)
+    
+    def add(self, ticket_ids: Iterable[uuid.UUID], status: str = 'cancelled') -> None:
+        """Revoke tickets, e.g. from a cancellation feed."""
+        for ticket_id in ticket_ids:
+            self._revoked[uuid.UUID(str(ticket_id))] = status
+    
+    def status_of(self, ticket_id: uuid.UUID) -> Optional[str]:
+        """Get 'used' or 'cancelled' for a revoked ticket, None otherwise."""
+        return self._revoked.get(ticket_id)
+    
+    def mark_used(self, ticket_id: uuid.UUID) -> bool:
+        """Record an admission. Returns False if the ticket was already revoked or used."""
+        # setdefault is atomic under the GIL; the fresh marker tells us we won
+        marker = _UsedMarker()
+        return self._revoked.setdefault(ticket_id, marker) is marker
+
+
+class _UsedMarker(str):
+    """A distinct 'used' value per admission."""
+    
+    def __new__(cls):
+        return super().__new__(cls, 'used')
+
+
+class TicketRevocationRegistry:
+    """Process-wide revocation sets, one per event.
+    
+    A set is reloaded once it is REFRESH_INTERVAL seconds old, so tickets
+    cancelled or admitted through other processes are picked up.
+    """
+    
+    REFRESH_INTERVAL = 30.0
+    
+    _sets: dict = {}
+    _lock = threading.Lock()
+    
+    @classmethod
+    def get(cls, event_id: uuid.UUID) -> TicketRevocationSet:
+        """Get the event's revocation set, loading it when missing or stale."""
+        revocations = cls._sets.get(str(event_id))
+        if revocations is not None and not cls._stale(revocations):
+            return revocations
+        
+        with cls._lock:
+            revocations = cls._sets.get(str(event_id))
+            if revocations is None or cls._stale(revocations):
+                revocations = TicketRevocationSet(event_id)
+                revocations.load()
+                cls._sets[str(event_id)] = revocations
+        return revocations
+    
+    @classmethod
+    def _stale(cls, revocations: TicketRevocationSet) -> bool:
+        return time.monotonic() - revocations.loaded_at > cls.REFRESH_INTERVAL
+    
+    @classmethod
+    def unload(cls, event_id: uuid.UUID) -> None:
+        """Drop an event's revocation set."""
+        cls._sets.pop(str(event_id), None)
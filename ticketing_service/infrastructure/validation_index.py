@@ -0,0 +1,301 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional, Tuple
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Case, DateTimeField, Value, When
+from django.utils import timezone
+
+from domain.offline import OfflineTicket
+from domain.ticket import Ticket
+
+logger = logging.getLogger(__name__)
+
+
+class IndexEntry(NamedTuple):
+    """Compact attendee record held in the validation index."""
+    ticket_id: str
+    status: str
+    valid_until: float
+    attendee_name: str
+
+
+class UsedTicketRecord(NamedTuple):
+    """One line of the append-only used-ticket log."""
+    ticket_id: str
+    qr_code: str
+    used_at: float
+
+
+class ValidationIndex:
+    """Preloaded per-event QR lookup table for gate scanning.
+    
+    Lookups are plain dict reads with no locks or database access. Reloads
+    build a new dict and swap the reference, and check-ins go through
+    dict.setdefault, which is atomic under the GIL, so two scanners racing on
+    the same ticket in one process cannot both admit it.
+    
+    Check-ins never touch the database. They are appended to a used log (a
+    file when log_path is set, replayed on load) and reconcile() writes them
+    back in batches, marking OfflineTicket and Ticket used with conditional
+    updates. ValidationIndexRegistry runs it from a background flusher.
+    """
+    
+    def __init__(self, event_id: uuid.UUID, log_path: Optional[str] = None):
+        self.event_id = event_id
+        self.log_path = log_path
+        self._entries: Dict[str, IndexEntry] = {}
+        self._used: Dict[str, UsedTicketRecord] = {}
+        self._log: List[UsedTicketRecord] = []
+        self._log_lock = threading.Lock()
+        self._reconcile_lock = threading.Lock()
+        self.loaded_at: Optional[float] = None
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, qr_code: str) -> bool:
+        return qr_code in self._entries
+    
+    def load(self) -> int:
+        """Build the index from the event's offline tickets."""
+        rows = OfflineTicket.objects.filter(event_id=self.event_id).values_list(
+            'qr_code', 'ticket_id', 'status', 'valid_until', 'attendee_name'
+        ).iterator(chunk_size=5000)
+        entries = {
+            qr_code: IndexEntry(str(ticket_id), status, valid_until.timestamp(), attendee_name)
+            for qr_code, ticket_id, status, valid_until, attendee_name in rows
+        }
+        self._entries = entries
+        self.loaded_at = time.time()
+        return len(entries)
+    
+    def apply_changes(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Apply manifest delta rows (see OfflineManifestStore) without a reload."""
+        entries = dict(self._entries)
+        count = 0
+        for row in rows:
+            valid_until = row['valid_until']
+            if isinstance(valid_until, str):
+                valid_until = datetime.fromisoformat(valid_until)
+            entries[row['qr_code']] = IndexEntry(
+                str(row['ticket_id']), row['status'], valid_until.timestamp(), row['attendee_name']
+            )
+            count += 1
+        self._entries = entries
+        return count
+    
+    def lookup(self, qr_code: str) -> Optional[Tuple[IndexEntry, Optional[float]]]:
+        """Get the entry and check-in time (None if unused) for a QR code."""
+        entry = self._entries.get(qr_code)
+        if entry is None:
+            return None
+        record = self._used.get(qr_code)
+        return entry, record.used_at if record else None
+    
+    def validate(self, qr_code: str) -> Dict[str, Any]:
+        """Validate a QR code in the same shape as OfflineValidationEngine."""
+        found = self.lookup(qr_code)
+        if found is None:
+            return {'valid': False, 'reason': 'Ticket not found'}
+        
+        entry, used_at = found
+        if entry.status == 'used' or used_at is not None:
+            return {'valid': False, 'reason': 'Ticket already used'}
+        if entry.status != 'active' or entry.valid_until <= time.time():
+            return {'valid': False, 'reason': 'Ticket expired or invalid'}
+        
+        return {
+            'valid': True,
+            'ticket_id': entry.ticket_id,
+            'attendee_name': entry.attendee_name
+        }
+    
+    def check_in(self, qr_code: str) -> Dict[str, Any]:
+        """Validate and mark a ticket used. Only the first scanner wins."""
+        result = self.validate(qr_code)
+        if not result['valid']:
+            return result
+        
+        record = UsedTicketRecord(result['ticket_id'], qr_code, time.time())
+        if self._used.setdefault(qr_code, record) is not record:
+            return {'valid': False, 'reason': 'Ticket already used'}
+        
+        with self._log_lock:
+            self._log.append(record)
+            if self.log_path:
+                with open(self.log_path, 'a') as log_file:
+                    log_file.write(f"{record.ticket_id}\t{record.qr_code}\t{record.used_at}\n")
+        return result
+    
+    def pending_records(self) -> List[UsedTicketRecord]:
+        """Check-ins not yet written back to the database."""
+        return list(self._log)
+    
+    def reconcile(self, batch_size: int = 500) -> int:
+        """Write logged check-ins back to the database and compact the log file.
+        
+        Each batch leaves the log once its transaction commits, so a failure
+        keeps the rest for the next run.
+        """
+        with self._reconcile_lock:
+            records = list(self._log)
+            written = 0
+            try:
+                for start in range(0, len(records), batch_size):
+                    batch = records[start:start + batch_size]
+                    self._write_back(batch)
+                    # Check-ins are only appended, so the batch is still the head
+                    with self._log_lock:
+                        del self._log[:len(batch)]
+                    written += len(batch)
+            finally:
+                if written and self.log_path:
+                    with self._log_lock:
+                        self._rewrite_log(self._log)
+            return written
+    
+    def _write_back(self, batch: List[UsedTicketRecord]) -> None:
+        checked_in_at = Case(
+            *[
+                When(id=record.ticket_id, then=Value(datetime.fromtimestamp(record.used_at, tz=dt_timezone.utc)))
+                for record in batch
+            ],
+            output_field=DateTimeField()
+        )
+        with transaction.atomic():
+            claimed = OfflineTicket.objects.filter(
+                event_id=self.event_id,
+                qr_code__in=[record.qr_code for record in batch],
+                status='active'
+            ).update(status='used', change_token=OfflineTicket.PENDING_TOKEN, last_synced=timezone.now())
+            Ticket.objects.filter(id__in=[record.ticket_id for record in batch], status='active').update(
+                status='used',
+                checked_in_at=checked_in_at
+            )
+        if claimed < len(batch):
+            logger.warning(
+                "%d of %d check-ins for event %s were already marked used",
+                len(batch) - claimed, len(batch), self.event_id
+            )
+    
+    def _rewrite_log(self, records: List[UsedTicketRecord]) -> None:
+        """Replace the log file with the records still to be reconciled."""
+        tmp_path = f"{self.log_path}.tmp"
+        with open(tmp_path, 'w') as log_file:
+            for record in records:
+                log_file.write(f"{record.ticket_id}\t{record.qr_code}\t{record.used_at}\n")
+        os.replace(tmp_path, self.log_path)
+    
+    @classmethod
+    def replay_log(cls, event_id: uuid.UUID, log_path: str) -> 'ValidationIndex':
+        """Rebuild an index and its unreconciled check-ins after a restart."""
+        index = cls(event_id, log_path=log_path)
+        index.load()
+        try:
+            with open(log_path) as log_file:
+                for line in log_file:
+                    ticket_id, qr_code, used_at = line.rstrip('\n').split('\t')
+                    record = UsedTicketRecord(ticket_id, qr_code, float(used_at))
+                    index._used[qr_code] = record
+                    index._log.append(record)
+        except FileNotFoundError:
+            pass
+        return index
+
+
+class ValidationIndexRegistry:
+    """Process-wide registry of loaded validation indexes.
+    
+    Each index logs to OFFLINE_CHECKIN_LOG_DIR/<event_id>.log, so check-ins
+    not yet written to Ticket survive a restart and are picked up when the
+    event's index is next loaded. Loading an index starts a daemon thread
+    that reconciles every index each OFFLINE_CHECKIN_FLUSH_INTERVAL seconds.
+    """
+    
+    _indexes: Dict[str, ValidationIndex] = {}
+    _flusher: Optional[threading.Thread] = None
+    _flusher_lock = threading.Lock()
+    
+    @classmethod
+    def load(cls, event_id: uuid.UUID, log_path: Optional[str] = None) -> ValidationIndex:
+        """Load (or reload) the index for an event."""
+        index = cls._indexes.get(str(event_id))
+        if index is not None:
+            index.load()
+            return index
+        
+        log_path = log_path or cls.log_path(event_id)
+        index = ValidationIndex.replay_log(event_id, log_path) if log_path else ValidationIndex(event_id)
+        if not log_path:
+            index.load()
+        cls._indexes[str(event_id)] = index
+        cls.start_flusher()
+        return index
+    
+    @classmethod
+    def start_flusher(cls) -> None:
+        """Start the background flusher unless it runs or is disabled."""
+        interval = settings.OFFLINE_CHECKIN_FLUSH_INTERVAL
+        if interval <= 0:
+            return
+        with cls._flusher_lock:
+            if cls._flusher is None or not cls._flusher.is_alive():
+                cls._flusher = threading.Thread(
+                    target=cls._run_flusher, args=(interval,), name='offline-checkin-flusher', daemon=True
+                )
+                cls._flusher.start()
+    
+    @classmethod
+    def _run_flusher(cls, interval: float) -> None:
+        while True:
+            time.sleep(interval)
+            cls.flush()
+            close_old_connections()
+    
+    @staticmethod
+    def log_path(event_id: uuid.UUID) -> Optional[str]:
+        """Default used-log file for an event, None when logging is disabled."""
+        log_dir = settings.OFFLINE_CHECKIN_LOG_DIR
+        if not log_dir:
+            return None
+        os.makedirs(log_dir, exist_ok=True)
+        return os.path.join(log_dir, f"{event_id}.log")
+    
+    @classmethod
+    def get(cls, event_id: uuid.UUID) -> Optional[ValidationIndex]:
+        """Get the loaded index for an event."""
+        return cls._indexes.get(str(event_id))
+    
+    @classmethod
+    def find(cls, qr_code: str) -> Optional[ValidationIndex]:
+        """Find the loaded index that knows a QR code."""
+        for index in list(cls._indexes.values()):
+            if qr_code in index:
+                return index
+        return None
+    
+    @classmethod
+    def unload(cls, event_id: uuid.UUID) -> None:
+        """Drop an event's index."""
+        cls._indexes.pop(str(event_id), None)
+    
+    @classmethod
+    def reconcile_all(cls) -> int:
+        """Write back pending check-ins for every loaded index."""
+        return sum(index.reconcile() for index in list(cls._indexes.values()))
+    
+    @classmethod
+    def flush(cls) -> int:
+        """Reconcile every index, keeping what fails logged for the next run."""
+        written = 0
+        for index in list(cls._indexes.values()):
+            try:
+                written += index.reconcile()
+            except Exception:
+                logger.exception("Could not reconcile check-ins for event %s", index.event_id)
+        return written
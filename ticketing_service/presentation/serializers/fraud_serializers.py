@@ -17,3 +17,9 @@ class SecurityRuleSerializer(serializers.ModelSerializer):
     class Meta:
         model = SecurityRule
         fields = ['id', 'name', 'rule_type', 'threshold_value', 'time_window_minutes', 'is_active', 'created_at']
+
+
+class RiskAssessmentSerializer(serializers.Serializer):
+    """Serializer for risk assessment requests."""
+    ip_address = serializers.IPAddressField(required=False)
+    card_fingerprint = serializers.CharField(max_length=128, required=False)
@@ -17,4 +17,5 @@ class OfflineStatusSerializer(serializers.Serializer):
     event_id = serializers.UUIDField()
     ticket_count = serializers.IntegerField()
     last_synced = serializers.DateTimeField()
+    change_token = serializers.IntegerField()
     cache_status = serializers.CharField()
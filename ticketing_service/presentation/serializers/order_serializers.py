@@ -14,11 +14,29 @@ class CreateOrderSerializer(serializers.Serializer):
     event_id = serializers.UUIDField()
     items = OrderItemSerializer(many=True)
     currency = serializers.CharField(max_length=3, default='USD')
+    promo_code = serializers.CharField(max_length=50, required=False)
+    country = serializers.CharField(max_length=2, required=False)
+    state = serializers.CharField(max_length=50, required=False, default='')
+    # Forwarded by the storefront; the request's own address is the caller's
+    ip_address = serializers.IPAddressField(required=False)
+    card_fingerprint = serializers.CharField(max_length=128, required=False)
+
+
+class CreateOrderBatchSerializer(serializers.Serializer):
+    """Serializer for box-office batch order creation."""
+    orders = CreateOrderSerializer(many=True, allow_empty=False, max_length=500)
 
 
 class ProcessPurchaseSerializer(serializers.Serializer):
     """Serializer for processing purchases."""
     payment_id = serializers.UUIDField()
+    hold_id = serializers.CharField(required=False)
+
+
+class ReserveTicketsSerializer(serializers.Serializer):
+    """Serializer for holding tickets during checkout."""
+    items = OrderItemSerializer(many=True)
+    ttl = serializers.IntegerField(min_value=30, max_value=3600, required=False)
 
 
 class OrderItemResponseSerializer(serializers.ModelSerializer):
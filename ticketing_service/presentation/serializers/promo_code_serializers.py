@@ -26,6 +26,11 @@ class ApplyPromoCodeSerializer(serializers.Serializer):
     promo_code = serializers.CharField(max_length=50)
 
 
+class GenerateSingleUseCodesSerializer(serializers.Serializer):
+    """Serializer for bulk single-use code generation."""
+    count = serializers.IntegerField(min_value=1, max_value=5_000_000)
+
+
 class PromoCodeSerializer(serializers.ModelSerializer):
     """Serializer for promo code responses."""
     remaining_uses = serializers.SerializerMethodField()
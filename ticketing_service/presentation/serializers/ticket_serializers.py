@@ -21,6 +21,14 @@ class ValidateQRCodeSerializer(serializers.Serializer):
     qr_code_data = serializers.CharField()
 
 
+class VerifyTicketTokenSerializer(serializers.Serializer):
+    """Serializer for signed ticket token verification."""
+    
+    token = serializers.CharField()
+    event_id = serializers.UUIDField(required=False)
+    admit = serializers.BooleanField(default=False)
+
+
 class CheckInSerializer(serializers.Serializer):
     """Serializer for ticket check-in."""
     
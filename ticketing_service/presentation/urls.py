@@ -7,18 +7,24 @@ from presentation.views.ticket_type_views import (
 )
 from presentation.views.ticket_views import (
     validate_qr_code,
+    verify_ticket_token,
+    get_signing_key,
     check_in_ticket,
     get_ticket,
 )
 from presentation.views.order_views import (
     CreateOrderView,
+    CreateOrderBatchView,
     ProcessPurchaseView,
-    GetOrderView
+    GetOrderView,
+    ReserveTicketsView,
+    ReleaseReservationView
 )
 from presentation.views.promo_code_views import (
     CreatePromoCodeView,
     ValidatePromoCodeView,
-    ApplyPromoCodeView
+    ApplyPromoCodeView,
+    GenerateSingleUseCodesView
 )
 from presentation.views.refund_views import (
     RequestRefundView,
@@ -43,7 +49,10 @@ from presentation.views.fraud_views import (
 from presentation.views.offline_views import (
     validate_offline,
     sync_ticket_data,
-    offline_status
+    offline_status,
+    offline_manifest,
+    load_validation_index,
+    reconcile_validation_index
 )
 from presentation.views.group_booking_views import (
     create_group_booking,
@@ -62,17 +71,23 @@ urlpatterns = [
     path('events/<str:event_id>/ticket-types/list/', get_ticket_types, name='get_ticket_types'),
     path('ticket-types/<str:ticket_type_id>/', update_ticket_type, name='update_ticket_type'),
     path('tickets/validate/', validate_qr_code, name='validate_qr_code'),
+    path('tickets/verify/', verify_ticket_token, name='verify_ticket_token'),
+    path('tickets/signing-key/', get_signing_key, name='get_signing_key'),
     path('tickets/<str:ticket_id>/checkin/', check_in_ticket, name='check_in_ticket'),
     path('tickets/<str:ticket_id>/', get_ticket, name='get_ticket'),
     
     # Order endpoints
     path('orders/', CreateOrderView.as_view(), name='create-order'),
+    path('orders/batch/', CreateOrderBatchView.as_view(), name='create-order-batch'),
     path('orders/<str:order_id>/', GetOrderView.as_view(), name='get-order'),
     path('orders/<str:order_id>/purchase/', ProcessPurchaseView.as_view(), name='process-purchase'),
+    path('reservations/', ReserveTicketsView.as_view(), name='reserve-tickets'),
+    path('reservations/<str:hold_id>/', ReleaseReservationView.as_view(), name='release-reservation'),
     
     # Promo code endpoints
     path('events/<str:event_id>/promo-codes/', CreatePromoCodeView.as_view(), name='create-promo-code'),
     path('promo-codes/validate/', ValidatePromoCodeView.as_view(), name='validate-promo-code'),
+    path('promo-codes/<str:promo_code_id>/single-use-codes/', GenerateSingleUseCodesView.as_view(), name='generate-single-use-codes'),
     path('orders/<str:order_id>/apply-promo/', ApplyPromoCodeView.as_view(), name='apply-promo-code'),
     
     # Refund endpoints
@@ -99,6 +114,9 @@ urlpatterns = [
     path('validate-offline/', validate_offline, name='validate-offline'),
     path('sync/', sync_ticket_data, name='sync-ticket-data'),
     path('events/<uuid:event_id>/offline-status/', offline_status, name='offline-status'),
+    path('events/<uuid:event_id>/offline-manifest/', offline_manifest, name='offline-manifest'),
+    path('events/<uuid:event_id>/offline-index/', load_validation_index, name='load-validation-index'),
+    path('events/<uuid:event_id>/offline-index/reconcile/', reconcile_validation_index, name='reconcile-validation-index'),
     
     # Group booking endpoints
     path('events/<uuid:event_id>/group-booking/', create_group_booking, name='create-group-booking'),
@@ -6,7 +6,7 @@ import uuid
 from application.fraud_service import RiskAssessmentService
 from infrastructure.repositories.fraud_repository import FraudRepository
 from domain.order import Order
-from presentation.serializers.fraud_serializers import FraudAlertSerializer
+from presentation.serializers.fraud_serializers import FraudAlertSerializer, RiskAssessmentSerializer
 
 
 class FraudAlertView(APIView):
@@ -43,7 +43,17 @@ class RiskAssessmentView(APIView):
         except Order.DoesNotExist:
             return Response({'error': 'Order not found'}, status=status.HTTP_404_NOT_FOUND)
         
+        serializer = RiskAssessmentSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        # The customer's IP comes from the payload: REMOTE_ADDR is the
+        # calling service, shared by every order.
         service = RiskAssessmentService()
-        assessment = service.assess_order(order)
+        assessment = service.assess_order(
+            order,
+            ip_address=serializer.validated_data.get('ip_address'),
+            card_fingerprint=serializer.validated_data.get('card_fingerprint')
+        )
         
         return Response(assessment, status=status.HTTP_200_OK)
@@ -2,12 +2,14 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
 from django.core.exceptions import ValidationError
+from django.http import StreamingHttpResponse
 
 from application.offline_service import (
     OfflineValidationService,
     TicketSyncService,
     CacheManagementService
 )
+from infrastructure.offline_engine import OfflineManifestStore
 from presentation.serializers.offline_serializers import (
     ValidateOfflineSerializer,
     SyncTicketDataSerializer,
@@ -63,6 +65,7 @@ def offline_status(request, event_id):
             'event_id': str(cache.event_id),
             'ticket_count': cache.ticket_count,
             'last_synced': cache.last_synced,
+            'change_token': OfflineManifestStore().latest_token(event_id),
             'cache_status': 'active' if not cache.is_expired() else 'expired'
         }
         
@@ -71,3 +74,39 @@ def offline_status(request, event_id):
     
     except ValidationError as e:
         return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+
+
+@api_view(['GET'])
+def offline_manifest(request, event_id):
+    """Stream the offline ticket manifest delta since a change token."""
+    try:
+        since_token = int(request.query_params.get('since', 0))
+    except ValueError:
+        return Response({'error': 'Invalid change token'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        service = TicketSyncService()
+        chunks = service.get_manifest(event_id, since_token)
+    except ValidationError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    response = StreamingHttpResponse(chunks, content_type='application/x-ndjson')
+    response['Content-Encoding'] = 'gzip'
+    return response
+
+
+@api_view(['POST'])
+def load_validation_index(request, event_id):
+    """Preload the in-memory validation index for an event."""
+    service = OfflineValidationService()
+    return Response(service.load_index(event_id), status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+def reconcile_validation_index(request, event_id):
+    """Write index check-ins back to the database."""
+    try:
+        service = OfflineValidationService()
+        return Response(service.reconcile_index(event_id), status=status.HTTP_200_OK)
+    except ValidationError as e:
+        return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
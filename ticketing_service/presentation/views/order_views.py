@@ -9,9 +9,13 @@ from application.order_service import (
     ProcessTicketPurchaseService,
     OrderManagementService
 )
+from application.ticket_type_service import TicketReservationService
+from domain.order import Order
 from presentation.serializers.order_serializers import (
     CreateOrderSerializer,
+    CreateOrderBatchSerializer,
     ProcessPurchaseSerializer,
+    ReserveTicketsSerializer,
     OrderSerializer
 )
 
@@ -33,6 +37,27 @@ class CreateOrderView(APIView):
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+class CreateOrderBatchView(APIView):
+    """Create many orders at once (box office and bulk sales)."""
+    
+    def post(self, request):
+        serializer = CreateOrderBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            service = CreateOrderService()
+            orders = service.execute_batch(serializer.validated_data['orders'])
+        except ValidationError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        orders = Order.objects.filter(id__in=[order.id for order in orders]).prefetch_related('items')
+        return Response({
+            'orders': OrderSerializer(orders, many=True).data,
+            'count': len(orders)
+        }, status=status.HTTP_201_CREATED)
+
+
 class ProcessPurchaseView(APIView):
     """Process a ticket purchase."""
     
@@ -45,7 +70,8 @@ class ProcessPurchaseView(APIView):
             service = ProcessTicketPurchaseService()
             tickets = service.execute(
                 uuid.UUID(order_id),
-                serializer.validated_data['payment_id']
+                serializer.validated_data['payment_id'],
+                hold_id=serializer.validated_data.get('hold_id')
             )
             return Response({
                 'message': 'Purchase processed successfully',
@@ -66,3 +92,30 @@ class GetOrderView(APIView):
             return Response(serializer.data, status=status.HTTP_200_OK)
         except ValidationError as e:
             return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+
+
+class ReserveTicketsView(APIView):
+    """Hold tickets while the buyer completes checkout."""
+    
+    def post(self, request):
+        serializer = ReserveTicketsSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            service = TicketReservationService()
+            ttl = serializer.validated_data.get('ttl', service.engine.DEFAULT_HOLD_TTL)
+            hold = service.reserve(serializer.validated_data['items'], ttl=ttl)
+            return Response(hold, status=status.HTTP_201_CREATED)
+        except ValidationError as e:
+            return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+
+
+class ReleaseReservationView(APIView):
+    """Release a ticket hold."""
+    
+    def delete(self, request, hold_id):
+        service = TicketReservationService()
+        if not service.release(hold_id):
+            return Response({'error': 'Reservation not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(status=status.HTTP_204_NO_CONTENT)
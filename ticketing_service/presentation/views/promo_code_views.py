@@ -2,17 +2,20 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.core.exceptions import ValidationError
+from django.http import StreamingHttpResponse
 import uuid
 
 from application.promo_code_service import (
     CreatePromoCodeService,
     ValidatePromoCodeService,
-    ApplyDiscountService
+    ApplyDiscountService,
+    GenerateSingleUseCodesService
 )
 from presentation.serializers.promo_code_serializers import (
     CreatePromoCodeSerializer,
     ValidatePromoCodeSerializer,
     ApplyPromoCodeSerializer,
+    GenerateSingleUseCodesSerializer,
     PromoCodeSerializer
 )
 
@@ -86,3 +89,22 @@ class ApplyPromoCodeView(APIView):
             }, status=status.HTTP_200_OK)
         except ValidationError as e:
             return Response({'error': e.messages[0] if hasattr(e, 'messages') else str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class GenerateSingleUseCodesView(APIView):
+    """Pre-generate single-use codes and stream them as CSV."""
+    
+    def post(self, request, promo_code_id):
+        serializer = GenerateSingleUseCodesSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            service = GenerateSingleUseCodesService()
+            codes = service.execute(uuid.UUID(promo_code_id), serializer.validated_data['count'])
+        except ValidationError as e:
+            return Response({'error': e.messages[0] if hasattr(e, 'messages') else str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        response = StreamingHttpResponse((f"{code}\n" for code in codes), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="promo-codes-{promo_code_id}.csv"'
+        return response
@@ -6,12 +6,15 @@ from django.core.exceptions import ValidationError
 
 from application.ticket_service import (
     ValidateQRCodeService,
+    VerifyTicketTokenService,
     TicketCheckInService,
 )
 from domain.ticket import Ticket
+from infrastructure.services.ticket_signing import TicketTokenVerifier
 from presentation.serializers.ticket_serializers import (
     TicketSerializer,
     ValidateQRCodeSerializer,
+    VerifyTicketTokenSerializer,
     CheckInSerializer,
 )
 
@@ -31,6 +34,33 @@ def validate_qr_code(request):
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(['POST'])
+def verify_ticket_token(request):
+    """Verify a signed ticket token offline."""
+    serializer = VerifyTicketTokenSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    service = VerifyTicketTokenService()
+    result = service.execute(
+        serializer.validated_data['token'],
+        event_id=serializer.validated_data.get('event_id'),
+        admit=serializer.validated_data['admit']
+    )
+    return Response(result)
+
+
+@api_view(['GET'])
+def get_signing_key(request):
+    """Public key door scanners use to verify ticket tokens offline."""
+    verifier = TicketTokenVerifier()
+    return Response({
+        'algorithm': 'Ed25519',
+        'key_id': verifier.key_id,
+        'public_key': verifier.public_key
+    })
+
+
 @api_view(['POST'])
 def check_in_ticket(request, ticket_id):
     """Check in a ticket."""
@@ -11,12 +11,14 @@ from application.fraud_service import (
     SecurityValidationService,
     RiskAssessmentService
 )
+from infrastructure.services.fraud_velocity import SecurityRuleSet
 
 
 class FraudDetectionServiceTest(TestCase):
     """Tests for FraudDetectionService."""
     
     def setUp(self):
+        SecurityRuleSet.invalidate()
         self.service = FraudDetectionService()
         self.user_id = uuid.uuid4()
         self.event_id = uuid.uuid4()
@@ -47,6 +49,75 @@ class FraudDetectionServiceTest(TestCase):
         alert = self.service.check_order(order)
         
         self.assertIsNone(alert)
+    
+    def test_check_order_velocity(self):
+        """Test velocity detection from tracked orders."""
+        alerts = []
+        for _ in range(6):
+            order = Order.objects.create(
+                user_id=self.user_id,
+                event_id=self.event_id,
+                total_amount=Decimal('20.00'),
+                status='pending'
+            )
+            alerts.append(self.service.check_order(order))
+        
+        self.assertIsNone(alerts[0])
+        self.assertIn('High velocity detected', alerts[-1].description)
+        self.assertEqual(FraudAlert.objects.filter(user_id=self.user_id).count(), 1)
+    
+    def test_check_orders_batch(self):
+        """Test batch checking inserts all alerts at once."""
+        orders = [
+            Order.objects.create(
+                user_id=uuid.uuid4(),
+                event_id=self.event_id,
+                total_amount=Decimal('1500.00'),
+                status='pending'
+            )
+            for _ in range(3)
+        ]
+        
+        alerts = self.service.check_orders(orders)
+        
+        self.assertTrue(all(alerts))
+        self.assertEqual(FraudAlert.objects.filter(order_id__in=[o.id for o in orders]).count(), 3)
+    
+    def test_check_order_pattern_rule(self):
+        """Test configured pattern rule on a shared IP address."""
+        SecurityRule.objects.create(
+            name='Shared IP',
+            rule_type='pattern',
+            threshold_value=Decimal('2'),
+            time_window_minutes=60
+        )
+        SecurityRuleSet.invalidate()
+        
+        alert = None
+        for _ in range(3):
+            order = Order.objects.create(
+                user_id=uuid.uuid4(),
+                event_id=self.event_id,
+                total_amount=Decimal('20.00'),
+                status='pending'
+            )
+            alert = self.service.check_order(order, ip_address=f"10.0.0.{self.user_id.int % 250}")
+        
+        self.assertIsNotNone(alert)
+        self.assertIn('Shared IP', alert.description)
+    
+    def test_check_order_skips_order_counts_once_primed(self):
+        """Test repeated checks for a user do not count orders in the database."""
+        order = Order.objects.create(
+            user_id=self.user_id,
+            event_id=self.event_id,
+            total_amount=Decimal('50.00'),
+            status='pending'
+        )
+        self.service.check_order(order)
+        
+        with self.assertNumQueries(0):
+            self.service.check_order(order)
 
 
 class SecurityValidationServiceTest(TestCase):
@@ -1,12 +1,20 @@
 from decimal import Decimal
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.utils import timezone
 from datetime import timedelta
 import uuid
 
 from domain.ticket_type import TicketType
 from domain.order import Order, OrderItem
+from domain.promo_code import PromoCode
+from domain.tax import TaxRule, TaxCalculation
+from infrastructure.services.fraud_velocity import OrderSignals, VelocityTracker
+from infrastructure.services.inventory_reservation import TicketReservationEngine
+from infrastructure.services.promo_code_cache import PromoCodeCache
+from infrastructure.services.tax_rules import TaxRuleTable
 from application.order_service import (
     CreateOrderService,
     ProcessTicketPurchaseService,
@@ -43,6 +51,25 @@ class CreateOrderServiceTest(TestCase):
         self.assertEqual(order.items.count(), 1)
         self.assertEqual(order.total_amount, Decimal('100.00'))
     
+    def test_created_orders_feed_velocity(self):
+        """Test new orders are counted by customer IP before any assessment."""
+        ip_address = f"198.51.100.{uuid.uuid4().int % 250}"
+        tracker = VelocityTracker()
+        before = tracker.counts(OrderSignals('', '', 0, ip_address), [3600])[('ip', 3600)]
+        data = {
+            'user_id': uuid.uuid4(),
+            'event_id': self.event_id,
+            'items': [
+                {'ticket_type_id': self.ticket_type.id, 'quantity': 1}
+            ],
+            'ip_address': ip_address
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            self.service.execute_batch([data, {**data, 'user_id': uuid.uuid4()}])
+        
+        counts = tracker.counts(OrderSignals('', '', 0, ip_address), [3600])
+        self.assertEqual(counts[('ip', 3600)], before + 2)
+    
     def test_create_order_insufficient_tickets(self):
         """Test creating order with insufficient tickets."""
         data = {
@@ -54,6 +81,66 @@ class CreateOrderServiceTest(TestCase):
         }
         with self.assertRaises(ValidationError):
             self.service.execute(data)
+    
+    def test_create_order_with_promo_and_tax(self):
+        """Test discount and tax are priced when the order is created."""
+        now = timezone.now()
+        PromoCodeCache().invalidate('TEN')
+        PromoCode.objects.create(
+            code='TEN',
+            discount_type='percentage',
+            discount_value=Decimal('10.00'),
+            valid_from=now - timedelta(days=1),
+            valid_until=now + timedelta(days=1)
+        )
+        TaxRule.objects.create(name='CA Sales Tax', country='US', state='CA', tax_rate=Decimal('5.00'))
+        TaxRuleTable.publish()
+        
+        order = self.service.execute({
+            'user_id': uuid.uuid4(),
+            'event_id': self.event_id,
+            'items': [{'ticket_type_id': self.ticket_type.id, 'quantity': 2}],
+            'promo_code': 'TEN',
+            'country': 'US',
+            'state': 'CA'
+        })
+        
+        self.assertEqual(order.total_amount, Decimal('90.00'))
+        self.assertEqual(PromoCode.objects.get(code='TEN').current_uses, 1)
+        self.assertEqual(TaxCalculation.objects.get(order_id=order.id).tax_amount, Decimal('4.50'))
+    
+    def test_create_order_batch(self):
+        """Test batch creation uses a fixed number of queries."""
+        orders_data = [
+            {
+                'user_id': uuid.uuid4(),
+                'event_id': self.event_id,
+                'items': [{'ticket_type_id': self.ticket_type.id, 'quantity': 1}]
+            }
+            for _ in range(50)
+        ]
+        
+        with CaptureQueriesContext(connection) as queries:
+            orders = self.service.execute_batch(orders_data)
+        
+        self.assertEqual(len(orders), 50)
+        self.assertLess(len(queries), 10)
+        self.assertEqual(OrderItem.objects.filter(order__event_id=self.event_id).count(), 50)
+    
+    def test_create_order_batch_checks_combined_quantity(self):
+        """Test a batch cannot oversell across its orders."""
+        orders_data = [
+            {
+                'user_id': uuid.uuid4(),
+                'event_id': self.event_id,
+                'items': [{'ticket_type_id': self.ticket_type.id, 'quantity': 10}]
+            }
+            for _ in range(11)
+        ]
+        
+        with self.assertRaises(ValidationError):
+            self.service.execute_batch(orders_data)
+        self.assertFalse(Order.objects.filter(event_id=self.event_id).exists())
 
 
 class ProcessTicketPurchaseServiceTest(TestCase):
@@ -91,6 +178,24 @@ class ProcessTicketPurchaseServiceTest(TestCase):
         self.order.refresh_from_db()
         self.assertEqual(self.order.status, 'confirmed')
     
+    def test_process_purchase_takes_reservation_inventory(self):
+        """Test a purchase without a hold also draws down the reservation counter."""
+        engine = TicketReservationEngine()
+        self.service.execute(self.order.id, uuid.uuid4())
+        self.assertEqual(engine.inventory_cache.get_available_count(self.ticket_type.id), 98)
+        self.ticket_type.refresh_from_db()
+        self.assertEqual(self.ticket_type.quantity_sold, 2)
+        engine.inventory_cache.delete_cache(self.ticket_type.id)
+    
+    def test_process_purchase_sold_out_in_reservations(self):
+        """Test a purchase fails when holds have taken the remaining tickets."""
+        engine = TicketReservationEngine()
+        hold = engine.reserve([{'ticket_type_id': self.ticket_type.id, 'quantity': 99}])
+        with self.assertRaises(ValidationError):
+            self.service.execute(self.order.id, uuid.uuid4())
+        engine.release(hold['hold_id'])
+        engine.inventory_cache.delete_cache(self.ticket_type.id)
+    
     def test_process_invalid_order(self):
         """Test processing invalid order."""
         with self.assertRaises(ValidationError):
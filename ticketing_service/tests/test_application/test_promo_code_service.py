@@ -1,4 +1,6 @@
 from decimal import Decimal
+from django.apps import apps
+from django.db.models.signals import post_save
 from django.test import TestCase
 from django.core.exceptions import ValidationError
 from django.utils import timezone
@@ -11,8 +13,11 @@ from domain.ticket_type import TicketType
 from application.promo_code_service import (
     CreatePromoCodeService,
     ValidatePromoCodeService,
-    ApplyDiscountService
+    ApplyDiscountService,
+    GenerateSingleUseCodesService
 )
+from infrastructure.apps import InfrastructureConfig
+from infrastructure.services.promo_code_cache import PromoCodeCache
 
 
 class CreatePromoCodeServiceTest(TestCase):
@@ -45,6 +50,7 @@ class ValidatePromoCodeServiceTest(TestCase):
         self.service = ValidatePromoCodeService()
         self.event_id = uuid.uuid4()
         now = timezone.now()
+        PromoCodeCache().invalidate('SAVE20')
         
         self.promo = PromoCode.objects.create(
             code='SAVE20',
@@ -73,6 +79,65 @@ class ValidatePromoCodeServiceTest(TestCase):
         """Test promo code with amount below minimum."""
         with self.assertRaises(ValidationError):
             self.service.execute('SAVE20', Decimal('30.00'), self.event_id)
+    
+    def test_validate_reads_through_cache(self):
+        """Test repeated validation is served from the cache."""
+        self.service.execute('SAVE20', Decimal('100.00'), self.event_id)
+        
+        with self.assertNumQueries(0):
+            result = self.service.execute('save20', Decimal('100.00'), self.event_id)
+        
+        self.assertEqual(result['promo_code'].id, self.promo.id)
+    
+    def test_create_invalidates_cached_miss(self):
+        """Test a cached miss is dropped when the code is created."""
+        with self.assertRaises(ValidationError):
+            self.service.execute('LAUNCH', Decimal('100.00'))
+        
+        now = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            CreatePromoCodeService().execute({
+                'code': 'launch',
+                'discount_type': 'fixed',
+                'discount_value': Decimal('10.00'),
+                'valid_from': now - timedelta(days=1),
+                'valid_until': now + timedelta(days=1)
+            })
+        
+        result = self.service.execute('LAUNCH', Decimal('100.00'))
+        self.assertEqual(result['discount_amount'], Decimal('10.00'))
+    
+    def test_update_invalidates_cache(self):
+        """Test editing a code outside the services drops its cached entry."""
+        self.service.execute('SAVE20', Decimal('100.00'), self.event_id)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.promo.is_active = False
+            self.promo.save()
+        
+        with self.assertRaises(ValidationError):
+            self.service.execute('SAVE20', Decimal('100.00'), self.event_id)
+    
+    def test_rename_and_delete_invalidate_cache(self):
+        """Test the old code of a renamed promo and a deleted code stop validating."""
+        self.service.execute('SAVE20', Decimal('100.00'), self.event_id)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.promo.code = 'SAVE25'
+            self.promo.save()
+        with self.assertRaises(ValidationError):
+            self.service.execute('SAVE20', Decimal('100.00'), self.event_id)
+        self.assertEqual(self.service.execute('SAVE25', Decimal('100.00'), self.event_id)['promo_code'].id, self.promo.id)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.promo.delete()
+        with self.assertRaises(ValidationError):
+            self.service.execute('SAVE25', Decimal('100.00'), self.event_id)
+    
+    def test_receivers_connected_at_startup(self):
+        """Test the infrastructure app config connects the cache receivers."""
+        self.assertIsInstance(apps.get_app_config('infrastructure'), InfrastructureConfig)
+        self.assertTrue(post_save.has_listeners(PromoCode))
 
 
 class ApplyDiscountServiceTest(TestCase):
@@ -82,6 +147,7 @@ class ApplyDiscountServiceTest(TestCase):
         self.service = ApplyDiscountService()
         self.event_id = uuid.uuid4()
         now = timezone.now()
+        PromoCodeCache().invalidate('SAVE20')
         
         self.promo = PromoCode.objects.create(
             code='SAVE20',
@@ -130,3 +196,32 @@ class ApplyDiscountServiceTest(TestCase):
         
         with self.assertRaises(ValidationError):
             self.service.execute(self.order.id, 'SAVE20')
+    
+    def test_apply_respects_max_uses(self):
+        """Test usage cannot pass max_uses even from a stale instance."""
+        PromoCode.objects.filter(id=self.promo.id).update(max_uses=1)
+        stale = PromoCode.objects.get(id=self.promo.id)
+        self.promo.refresh_from_db()
+        self.promo.apply()
+        
+        with self.assertRaises(ValidationError):
+            stale.apply()
+        
+        self.promo.refresh_from_db()
+        self.assertEqual(self.promo.current_uses, 1)
+    
+    def test_single_use_code(self):
+        """Test a generated single-use code applies once."""
+        codes = list(GenerateSingleUseCodesService().execute(self.promo.id, 3))
+        self.assertEqual(len(set(codes)), 3)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            order = self.service.execute(self.order.id, codes[1])
+        self.assertEqual(order.total_amount, Decimal('80.00'))
+        
+        with self.assertRaises(ValidationError):
+            ValidatePromoCodeService().execute(codes[1], Decimal('100.00'), self.event_id)
+        
+        forged = codes[2][:-3] + ('AAA' if not codes[2].endswith('AAA') else 'BBB')
+        with self.assertRaises(ValidationError):
+            ValidatePromoCodeService().execute(forged, Decimal('100.00'), self.event_id)
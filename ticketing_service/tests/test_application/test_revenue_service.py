@@ -2,9 +2,10 @@ from decimal import Decimal
 from django.test import TestCase
 from django.utils import timezone
 from datetime import timedelta
+from unittest.mock import patch
 import uuid
 
-from domain.revenue import Revenue, RevenueReport
+from domain.revenue import Revenue, RevenueReport, RevenueRollup
 from domain.order import Order
 from domain.refund import Refund
 from domain.ticket import Ticket
@@ -54,7 +55,8 @@ class RevenueReportServiceTest(TestCase):
             status='confirmed'
         )
         
-        Revenue.objects.create(
+        self.order = order
+        self.revenue = Revenue.objects.create(
             event_id=self.event_id,
             order_id=order.id,
             gross_amount=Decimal('100.00'),
@@ -69,6 +71,33 @@ class RevenueReportServiceTest(TestCase):
         self.assertEqual(report.period, 'daily')
         self.assertEqual(report.total_gross, Decimal('100.00'))
         self.assertEqual(report.total_orders, 1)
+    
+    def test_custom_report_trims_partial_hours(self):
+        """Test revenue earlier in the window's first hour is left out."""
+        created_at = self.revenue.created_at
+        
+        with patch('application.revenue_service.timezone.now', return_value=created_at + timedelta(days=30, microseconds=1)):
+            report = self.service.generate_report(self.event_id, 'custom')
+        self.assertEqual(report.total_gross, Decimal('0.00'))
+        self.assertEqual(report.total_orders, 0)
+        
+        with patch('application.revenue_service.timezone.now', return_value=created_at + timedelta(days=30)):
+            report = self.service.generate_report(self.event_id, 'custom')
+        self.assertEqual(report.total_gross, Decimal('100.00'))
+        self.assertEqual(report.total_fees, Decimal('13.00'))
+        self.assertEqual(report.total_orders, 1)
+    
+    def test_total_orders_counts_revenue_records(self):
+        """Test total_orders sums rolled-up revenue records, not distinct order ids."""
+        Revenue.objects.create(
+            event_id=self.event_id,
+            order_id=self.order.id,
+            gross_amount=Decimal('20.00')
+        )
+        
+        report = self.service.generate_report(self.event_id, 'daily')
+        self.assertEqual(report.total_gross, Decimal('120.00'))
+        self.assertEqual(report.total_orders, 2)
 
 
 class PayoutManagementServiceTest(TestCase):
@@ -126,3 +155,49 @@ class PayoutManagementServiceTest(TestCase):
         self.assertEqual(payout['total_revenue'], Decimal('87.00'))  # 100 - 10 - 3
         self.assertEqual(payout['total_refunds'], Decimal('40.00'))
         self.assertEqual(payout['payout_amount'], Decimal('47.00'))  # 87 - 40
+    
+    def test_calculate_payout_reads_rollups(self):
+        """Test payout reads rollup buckets instead of scanning revenue."""
+        with self.assertNumQueries(1):
+            self.service.calculate_payout(self.event_id)
+    
+    def test_completed_refund_rolled_up_once(self):
+        """Test a refund counts toward payout only when it completes."""
+        ticket = Ticket.objects.filter(ticket_type_id=self.ticket_type.id).first()
+        refund = Refund.objects.create(
+            ticket_id=ticket.id,
+            order_id=ticket.order_id,
+            original_amount=Decimal('50.00'),
+            refund_amount=Decimal('7.00'),
+            reason='Test'
+        )
+        self.assertEqual(self.service.calculate_payout(self.event_id)['total_refunds'], Decimal('40.00'))
+        
+        refund.process()
+        refund.complete()
+        refund.save()
+        
+        self.assertEqual(self.service.calculate_payout(self.event_id)['total_refunds'], Decimal('47.00'))
+    
+    def test_refund_bucketed_on_completion(self):
+        """Test a refund lands in the hour it completed, not the hour it was requested."""
+        ticket = Ticket.objects.filter(ticket_type_id=self.ticket_type.id).first()
+        refund = Refund.objects.create(
+            ticket_id=ticket.id,
+            order_id=ticket.order_id,
+            original_amount=Decimal('50.00'),
+            refund_amount=Decimal('7.00'),
+            reason='Test'
+        )
+        Refund.objects.filter(id=refund.id).update(created_at=refund.created_at - timedelta(days=2))
+        refund = Refund.objects.get(id=refund.id)
+        
+        refund.process()
+        refund.complete()
+        
+        bucket = RevenueRollup.objects.get(event_id=self.event_id, bucket_start=RevenueRollup.bucket_for(refund.processed_at))
+        self.assertEqual(bucket.refund_amount, Decimal('47.00'))
+        self.assertFalse(RevenueRollup.objects.filter(
+            event_id=self.event_id,
+            bucket_start=RevenueRollup.bucket_for(refund.created_at)
+        ).exists())
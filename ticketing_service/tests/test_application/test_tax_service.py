@@ -1,5 +1,7 @@
 from decimal import Decimal
+from django.db.models.signals import post_delete, post_save
 from django.test import TestCase
+from unittest.mock import patch
 import uuid
 
 from domain.tax import TaxRule, TaxCalculation
@@ -7,8 +9,10 @@ from domain.order import Order
 from application.tax_service import (
     TaxCalculationService,
     TaxComplianceService,
-    TaxReportingService
+    TaxReportingService,
+    TaxRuleService
 )
+from infrastructure.services.tax_rules import TaxRuleTable
 
 
 class TaxCalculationServiceTest(TestCase):
@@ -23,6 +27,7 @@ class TaxCalculationServiceTest(TestCase):
             country='US',
             tax_rate=Decimal('10.00')
         )
+        TaxRuleTable.publish()
         
         self.order = Order.objects.create(
             user_id=uuid.uuid4(),
@@ -38,6 +43,75 @@ class TaxCalculationServiceTest(TestCase):
         self.assertEqual(calc.subtotal, Decimal('100.00'))
         self.assertEqual(calc.tax_amount, Decimal('10.00'))
         self.assertEqual(calc.total, Decimal('110.00'))
+    
+    def test_calculate_without_db_reads(self):
+        """Test checkout tax reads no tax rules once the table is loaded."""
+        self.service.calculate_for_order(self.order, 'US')
+        
+        with self.assertNumQueries(1):
+            calc = self.service.calculate_for_order(self.order, 'US')
+        self.assertEqual(calc.tax_amount, Decimal('10.00'))
+    
+    def test_no_rule_does_not_create_rule(self):
+        """Test a missing jurisdiction is taxed at zero without saving a rule."""
+        calc = self.service.calculate_for_order(self.order, 'NP')
+        
+        self.assertEqual(calc.tax_amount, Decimal('0.00'))
+        self.assertEqual(TaxRule.objects.count(), 1)
+    
+    def test_calculate_for_orders(self):
+        """Test batch calculation with a single insert."""
+        orders = [
+            Order.objects.create(
+                user_id=uuid.uuid4(),
+                event_id=self.event_id,
+                total_amount=Decimal('20.00'),
+                status='confirmed'
+            )
+            for _ in range(5)
+        ]
+        self.service.calculate_for_order(self.order, 'US')
+        
+        with self.assertNumQueries(1):
+            calcs = self.service.calculate_for_orders(orders, 'US')
+        self.assertEqual([calc.tax_amount for calc in calcs], [Decimal('2.00')] * 5)
+    
+    def test_rule_change_is_published(self):
+        """Test a new rule is picked up after publishing."""
+        self.service.calculate_for_order(self.order, 'US')
+        with self.captureOnCommitCallbacks(execute=True):
+            TaxRuleService().create_rule({'name': 'CA Tax', 'country': 'US', 'state': 'CA', 'tax_rate': Decimal('7.50')})
+        
+        calc = self.service.calculate_for_order(self.order, 'US', 'CA')
+        self.assertEqual(calc.tax_amount, Decimal('7.50'))
+    
+    def test_direct_edits_are_published(self):
+        """Test rules edited or deleted outside TaxRuleService are picked up."""
+        rule = TaxRule.objects.get(country='US', state='')
+        self.service.calculate_for_order(self.order, 'US')
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            rule.tax_rate = Decimal('20.00')
+            rule.save()
+        self.assertEqual(self.service.calculate_for_order(self.order, 'US').tax_amount, Decimal('20.00'))
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            rule.delete()
+        self.assertEqual(self.service.calculate_for_order(self.order, 'US').tax_amount, Decimal('0.00'))
+    
+    def test_receivers_connected_at_startup(self):
+        """Test rule receivers are connected by the infrastructure app config."""
+        self.assertTrue(post_save.has_listeners(TaxRule))
+        self.assertTrue(post_delete.has_listeners(TaxRule))
+    
+    def test_table_reloads_after_interval(self):
+        """Test queryset updates, which send no signal, are picked up on reload."""
+        self.service.calculate_for_order(self.order, 'US')
+        TaxRule.objects.filter(country='US', state='').update(tax_rate=Decimal('15.00'))
+        
+        with patch.object(TaxRuleTable, 'RELOAD_INTERVAL', -1), patch.object(TaxRuleTable, 'VERSION_CHECK_INTERVAL', -1):
+            calc = self.service.calculate_for_order(self.order, 'US')
+        self.assertEqual(calc.tax_amount, Decimal('15.00'))
 
 
 class TaxComplianceServiceTest(TestCase):
@@ -1,13 +1,21 @@
 from django.test import TestCase
 from django.core.exceptions import ValidationError
+from django.utils import timezone
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
 import uuid
 
 from domain.ticket import Ticket
+from domain.ticket_type import TicketType
 from application.ticket_service import (
     GenerateTicketService,
     ValidateQRCodeService,
+    VerifyTicketTokenService,
     TicketCheckInService
 )
+from infrastructure.services.ticket_issuance import BulkTicketIssuer
+from infrastructure.services.ticket_signing import TicketRevocationRegistry
 
 
 class GenerateTicketServiceTest(TestCase):
@@ -96,3 +104,83 @@ class TicketCheckInServiceTest(TestCase):
         """Test checking in non-existent ticket."""
         with self.assertRaises(ValidationError):
             self.service.execute(uuid.uuid4(), uuid.uuid4())
+
+
+class VerifyTicketTokenServiceTest(TestCase):
+    """Tests for VerifyTicketTokenService."""
+    
+    def setUp(self):
+        self.service = VerifyTicketTokenService()
+        self.event_id = uuid.uuid4()
+        now = timezone.now()
+        ticket_type = TicketType.objects.create(
+            event_id=self.event_id,
+            name='General',
+            price=Decimal('50.00'),
+            quantity=100,
+            sale_start=now,
+            sale_end=now + timedelta(days=30)
+        )
+        self.ticket = BulkTicketIssuer().issue_batch({
+            'ticket_type_id': ticket_type.id,
+            'order_id': uuid.uuid4(),
+            'attendee_name': 'John Doe',
+            'attendee_email': 'john@example.com',
+            'event_id': self.event_id
+        }, 1)[0]
+    
+    def tearDown(self):
+        TicketRevocationRegistry.unload(self.event_id)
+    
+    def test_verify_and_admit_once(self):
+        """Test a signed ticket is admitted once."""
+        result = self.service.execute(self.ticket.qr_code_data, event_id=self.event_id, admit=True)
+        self.assertTrue(result['valid'])
+        self.assertEqual(result['ticket_id'], str(self.ticket.id))
+        
+        again = self.service.execute(self.ticket.qr_code_data, admit=True)
+        self.assertFalse(again['valid'])
+    
+    def test_admission_is_persisted(self):
+        """Test an admission survives a fresh revocation set, e.g. another worker."""
+        self.assertTrue(self.service.execute(self.ticket.qr_code_data, admit=True)['valid'])
+        self.ticket.refresh_from_db()
+        self.assertEqual(self.ticket.status, 'used')
+        self.assertIsNotNone(self.ticket.checked_in_at)
+        
+        TicketRevocationRegistry.unload(self.event_id)
+        again = self.service.execute(self.ticket.qr_code_data, admit=True)
+        self.assertFalse(again['valid'])
+        self.assertEqual(again['reason'], 'Ticket used')
+    
+    def test_cancelled_ticket_rejected_on_admit(self):
+        """Test a ticket cancelled after the set was loaded is not admitted."""
+        TicketRevocationRegistry.get(self.event_id)
+        Ticket.objects.filter(id=self.ticket.id).update(status='cancelled')
+        
+        result = self.service.execute(self.ticket.qr_code_data, admit=True)
+        self.assertFalse(result['valid'])
+        self.assertEqual(result['reason'], 'Ticket cancelled')
+    
+    def test_revocations_refresh(self):
+        """Test a stale revocation set is reloaded."""
+        TicketRevocationRegistry.get(self.event_id)
+        Ticket.objects.filter(id=self.ticket.id).update(status='cancelled')
+        
+        with patch.object(TicketRevocationRegistry, 'REFRESH_INTERVAL', -1):
+            result = self.service.execute(self.ticket.qr_code_data)
+        self.assertFalse(result['valid'])
+        self.assertEqual(result['reason'], 'Ticket cancelled')
+    
+    def test_wrong_event(self):
+        """Test a ticket for another event is rejected."""
+        result = self.service.execute(self.ticket.qr_code_data, event_id=uuid.uuid4())
+        self.assertFalse(result['valid'])
+    
+    def test_forged_token(self):
+        """Test a forged token is rejected by ValidateQRCodeService too."""
+        token = self.ticket.qr_code_data
+        forged = token[:20] + ('A' if token[20] != 'A' else 'B') + token[21:]
+        self.assertFalse(self.service.execute(forged)['valid'])
+        with self.assertRaises(ValidationError):
+            ValidateQRCodeService().execute(forged)
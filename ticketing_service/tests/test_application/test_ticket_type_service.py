@@ -11,6 +11,7 @@ from application.ticket_type_service import (
     UpdateTicketTypeService,
     ManageTicketInventoryService
 )
+from infrastructure.services.inventory_reservation import TicketReservationEngine
 
 
 class CreateTicketTypeServiceTest(TestCase):
@@ -73,6 +74,15 @@ class UpdateTicketTypeServiceTest(TestCase):
         self.assertEqual(updated.name, 'General Admission')
         self.assertEqual(updated.price, Decimal('60.00'))
     
+    def test_update_quantity_shifts_cached_inventory(self):
+        """Test a capacity change moves the reservation counter by the same amount."""
+        engine = TicketReservationEngine()
+        engine.prime([self.ticket_type.id])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.service.execute(self.ticket_type.id, {'quantity': 80})
+        self.assertEqual(engine.inventory_cache.get_available_count(self.ticket_type.id), 80)
+        engine.inventory_cache.delete_cache(self.ticket_type.id)
+    
     def test_update_nonexistent_ticket_type(self):
         """Test updating non-existent ticket type."""
         with self.assertRaises(ValidationError):
@@ -3,9 +3,11 @@ from decimal import Decimal
 from datetime import timedelta
 from django.test import TestCase
 from django.utils import timezone
+from unittest.mock import patch
 from domain.analytics import TicketAnalytics, SalesMetrics
 from infrastructure.analytics_pipeline import AnalyticsPipeline
 from infrastructure.services.analytics_export import AnalyticsExportService
+from infrastructure.services.analytics_counters import TicketAnalyticsCounters
 
 
 class AnalyticsPipelineTest(TestCase):
@@ -37,6 +39,67 @@ class AnalyticsPipelineTest(TestCase):
         
         self.assertIsNotNone(data)
         self.assertEqual(data['sold_tickets'], 50)
+    
+    def test_sales_are_buffered_until_flush(self):
+        """Test pending sales are merged into reads and written by flush."""
+        TicketAnalytics.objects.create(
+            event_id=self.event_id,
+            total_tickets=100,
+            sold_tickets=50,
+            revenue=Decimal("5000.00")
+        )
+        
+        for _ in range(3):
+            self.pipeline.process_ticket_sale(self.event_id, ticket_price=Decimal("19.99"))
+        
+        self.assertEqual(TicketAnalytics.objects.get(event_id=self.event_id).sold_tickets, 50)
+        data = self.pipeline.aggregate_sales_data(self.event_id)
+        self.assertEqual(data['sold_tickets'], 53)
+        self.assertEqual(data['revenue'], Decimal("5059.97"))
+        
+        self.pipeline.flush()
+        
+        analytics = TicketAnalytics.objects.get(event_id=self.event_id)
+        self.assertEqual(analytics.sold_tickets, 53)
+        self.assertEqual(analytics.revenue, Decimal("5059.97"))
+        self.assertEqual(self.pipeline.aggregate_sales_data(self.event_id)['sold_tickets'], 53)
+    
+    def test_flush_creates_missing_analytics(self):
+        """Test flushing sales for an event without an analytics row."""
+        self.pipeline.process_ticket_sale(self.event_id, ticket_price=Decimal("25.00"), quantity=2)
+        
+        TicketAnalyticsCounters().flush()
+        
+        analytics = TicketAnalytics.objects.get(event_id=self.event_id)
+        self.assertEqual(analytics.sold_tickets, 2)
+        self.assertEqual(analytics.revenue, Decimal("50.00"))
+    
+    def test_pending_sales_without_row(self):
+        """Test reads include sales for an event that was never flushed."""
+        self.pipeline.process_ticket_sale(self.event_id, ticket_price=Decimal("25.00"), quantity=2)
+        
+        data = self.pipeline.aggregate_sales_data(self.event_id)
+        self.assertEqual(data['sold_tickets'], 2)
+        self.assertEqual(data['revenue'], Decimal("50.00"))
+        self.assertIsNone(self.pipeline.aggregate_sales_data(uuid.uuid4()))
+    
+    def test_failed_flush_keeps_every_event(self):
+        """Test a failing apply leaves all unflushed events for the next flush."""
+        other_event_id = uuid.uuid4()
+        self.pipeline.process_ticket_sale(self.event_id, ticket_price=Decimal("10.00"))
+        self.pipeline.process_ticket_sale(other_event_id, ticket_price=Decimal("20.00"))
+        counters = TicketAnalyticsCounters()
+        
+        with patch.object(TicketAnalyticsCounters, 'apply', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                counters.flush()
+        
+        dirty = counters.redis_client.smembers(TicketAnalyticsCounters.DIRTY_KEY)
+        self.assertTrue({str(self.event_id), str(other_event_id)} <= dirty)
+        
+        counters.flush()
+        self.assertEqual(TicketAnalytics.objects.get(event_id=self.event_id).sold_tickets, 1)
+        self.assertEqual(TicketAnalytics.objects.get(event_id=other_event_id).revenue, Decimal("20.00"))
 
 
 class AnalyticsExportServiceTest(TestCase):
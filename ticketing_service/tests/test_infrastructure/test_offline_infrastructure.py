@@ -1,15 +1,26 @@
+import gzip
+import json
+import os
+import tempfile
 from datetime import timedelta
+from unittest import mock
+from django.db import OperationalError
+from django.core.exceptions import ValidationError
 from django.test import TestCase
 from django.utils import timezone
 import uuid
 
 from domain.offline import OfflineTicket
+from domain.ticket import Ticket
+from application.offline_service import OfflineValidationService
 from infrastructure.offline_engine import (
     OfflineValidationEngine,
     TicketDataSync,
     OfflineAnalytics,
-    ConflictResolution
+    ConflictResolution,
+    OfflineManifestStore
 )
+from infrastructure.validation_index import ValidationIndex, ValidationIndexRegistry
 
 
 class OfflineValidationEngineTest(TestCase):
@@ -64,6 +75,216 @@ class TicketDataSyncTest(TestCase):
         self.assertEqual(len(result['synced_ids']), 1)
 
 
+class OfflineManifestStoreTest(TestCase):
+    """Tests for OfflineManifestStore."""
+    
+    def setUp(self):
+        self.store = OfflineManifestStore()
+        self.event_id = uuid.uuid4()
+        self.valid_until = timezone.now() + timedelta(days=1)
+        self.tickets = [
+            {
+                'ticket_id': uuid.uuid4(),
+                'qr_code': f'QR-MANIFEST-{i}',
+                'attendee_name': f'Attendee {i}',
+                'valid_until': self.valid_until
+            }
+            for i in range(5)
+        ]
+    
+    def _read_manifest(self, since_token=0):
+        body = b''.join(self.store.stream_manifest(self.event_id, since_token))
+        return [json.loads(line) for line in gzip.decompress(body).decode().splitlines()]
+    
+    def test_upsert_in_chunks_assigns_increasing_tokens(self):
+        """Test chunked upserts assign consecutive change tokens."""
+        self.store.upsert(self.event_id, self.tickets, chunk_size=2)
+        tokens = list(
+            OfflineTicket.objects.filter(event_id=self.event_id)
+            .order_by('change_token').values_list('change_token', flat=True)
+        )
+        self.assertEqual(tokens, [1, 2, 3, 4, 5])
+        self.assertEqual(self.store.latest_token(self.event_id), 5)
+    
+    def test_upsert_updates_existing_ticket(self):
+        """Test upserting an existing ticket updates it and bumps its token."""
+        self.store.upsert(self.event_id, self.tickets)
+        changed = dict(self.tickets[0], status='used')
+        self.store.upsert(self.event_id, [changed])
+        
+        ticket = OfflineTicket.objects.get(ticket_id=changed['ticket_id'])
+        self.assertEqual(ticket.status, 'used')
+        self.assertEqual(ticket.change_token, 6)
+        self.assertEqual(OfflineTicket.objects.filter(event_id=self.event_id).count(), 5)
+    
+    def test_stream_manifest_delta(self):
+        """Test the manifest only carries rows changed after the token."""
+        self.store.upsert(self.event_id, self.tickets)
+        full = self._read_manifest()
+        self.assertEqual(len(full), 6)
+        self.assertEqual(full[-1], {'next_token': 5, 'count': 5})
+        
+        self.store.upsert(self.event_id, [dict(self.tickets[2], status='used')])
+        delta = self._read_manifest(since_token=5)
+        self.assertEqual(len(delta), 2)
+        self.assertEqual(delta[0]['ticket_id'], str(self.tickets[2]['ticket_id']))
+        self.assertEqual(delta[0]['status'], 'used')
+        self.assertEqual(delta[-1], {'next_token': 6, 'count': 1})
+    
+    def test_single_row_writes_reach_delta(self):
+        """Test mark_used and conflict resolution bump the change token."""
+        self.store.upsert(self.event_id, self.tickets)
+        ticket = OfflineTicket.objects.get(ticket_id=self.tickets[0]['ticket_id'])
+        ticket.mark_used()
+        ConflictResolution().resolve(
+            OfflineTicket.objects.get(ticket_id=self.tickets[1]['ticket_id']), {'status': 'expired'}
+        )
+        
+        delta = self._read_manifest(since_token=5)
+        self.assertEqual([row['status'] for row in delta[:-1]], ['used', 'expired'])
+        self.assertEqual(delta[-1], {'next_token': 7, 'count': 2})
+    
+    def test_single_row_save_leaves_cursor_alone(self):
+        """Test a single-row save is one UPDATE and is stamped on the next read."""
+        self.store.upsert(self.event_id, self.tickets)
+        ticket = OfflineTicket.objects.get(ticket_id=self.tickets[0]['ticket_id'])
+        
+        with self.assertNumQueries(1):
+            ticket.mark_used()
+        
+        self.assertEqual(ticket.change_token, OfflineTicket.PENDING_TOKEN)
+        self.assertEqual(self.store.latest_token(self.event_id), 6)
+        self.assertEqual(OfflineTicket.objects.get(id=ticket.id).change_token, 6)
+
+
+class ValidationIndexTest(TestCase):
+    """Tests for ValidationIndex."""
+    
+    def setUp(self):
+        self.event_id = uuid.uuid4()
+        self.ticket = Ticket.objects.create(
+            ticket_type_id=uuid.uuid4(),
+            order_id=uuid.uuid4(),
+            attendee_name='John Doe',
+            attendee_email='john@example.com'
+        )
+        OfflineTicket.objects.create(
+            ticket_id=self.ticket.id,
+            qr_code=self.ticket.qr_code_data,
+            event_id=self.event_id,
+            attendee_name='John Doe',
+            valid_until=timezone.now() + timedelta(days=1)
+        )
+        OfflineTicket.objects.create(
+            ticket_id=uuid.uuid4(),
+            qr_code='QR-EXPIRED',
+            event_id=self.event_id,
+            attendee_name='Jane Doe',
+            valid_until=timezone.now() - timedelta(days=1)
+        )
+        log_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(log_dir.cleanup)
+        log_settings = self.settings(OFFLINE_CHECKIN_LOG_DIR=log_dir.name, OFFLINE_CHECKIN_FLUSH_INTERVAL=0)
+        log_settings.enable()
+        self.addCleanup(log_settings.disable)
+        self.index = ValidationIndexRegistry.load(self.event_id)
+    
+    def tearDown(self):
+        ValidationIndexRegistry.unload(self.event_id)
+    
+    def test_validate_without_database(self):
+        """Test lookups are served without queries."""
+        self.assertEqual(len(self.index), 2)
+        with self.assertNumQueries(0):
+            result = self.index.validate(self.ticket.qr_code_data)
+            expired = self.index.validate('QR-EXPIRED')
+            missing = self.index.validate('QR-MISSING')
+        self.assertTrue(result['valid'])
+        self.assertEqual(result['attendee_name'], 'John Doe')
+        self.assertEqual(expired['reason'], 'Ticket expired or invalid')
+        self.assertEqual(missing['reason'], 'Ticket not found')
+    
+    def test_check_in_only_once(self):
+        """Test a ticket is admitted once and logged for reconciliation."""
+        self.assertTrue(self.index.check_in(self.ticket.qr_code_data)['valid'])
+        second = self.index.check_in(self.ticket.qr_code_data)
+        self.assertFalse(second['valid'])
+        self.assertEqual(second['reason'], 'Ticket already used')
+        self.assertEqual(len(self.index.pending_records()), 1)
+    
+    def test_check_in_without_database(self):
+        """Test an admission is served from memory and written back later."""
+        with self.assertNumQueries(0):
+            self.assertTrue(self.index.check_in(self.ticket.qr_code_data)['valid'])
+        self.assertEqual(OfflineTicket.objects.get(ticket_id=self.ticket.id).status, 'active')
+        
+        self.index.reconcile()
+        offline = OfflineTicket.objects.get(ticket_id=self.ticket.id)
+        self.assertEqual(offline.status, 'used')
+        self.assertEqual(offline.change_token, OfflineTicket.PENDING_TOKEN)
+        
+        ValidationIndexRegistry.unload(self.event_id)
+        with self.assertRaises(ValidationError):
+            OfflineValidationService().validate_ticket(self.ticket.qr_code_data)
+    
+    def test_reconcile_writes_back(self):
+        """Test reconciling the used log updates OfflineTicket and Ticket."""
+        self.index.check_in(self.ticket.qr_code_data)
+        self.assertEqual(self.index.reconcile(), 1)
+        self.assertEqual(self.index.pending_records(), [])
+        
+        self.ticket.refresh_from_db()
+        self.assertEqual(self.ticket.status, 'used')
+        self.assertIsNotNone(self.ticket.checked_in_at)
+        self.assertEqual(OfflineTicket.objects.get(ticket_id=self.ticket.id).status, 'used')
+    
+    def test_replay_log(self):
+        """Test check-ins survive a restart through the log file."""
+        fd, log_path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            index = ValidationIndex(self.event_id, log_path=log_path)
+            index.load()
+            index.check_in(self.ticket.qr_code_data)
+            
+            replayed = ValidationIndex.replay_log(self.event_id, log_path)
+            self.assertFalse(replayed.validate(self.ticket.qr_code_data)['valid'])
+            self.assertEqual(len(replayed.pending_records()), 1)
+            
+            replayed.reconcile()
+            self.assertEqual(ValidationIndex.replay_log(self.event_id, log_path).pending_records(), [])
+        finally:
+            os.remove(log_path)
+    
+    def test_registry_replays_log_after_restart(self):
+        """Test the registry logs check-ins and picks them up on the next load."""
+        self.index.check_in(self.ticket.qr_code_data)
+        ValidationIndexRegistry.unload(self.event_id)
+        
+        reloaded = ValidationIndexRegistry.load(self.event_id)
+        self.assertIsNot(reloaded, self.index)
+        self.assertEqual(len(reloaded.pending_records()), 1)
+    
+    def test_flush_keeps_log_while_database_is_down(self):
+        """Test the background flush retries check-ins it could not write."""
+        self.index.check_in(self.ticket.qr_code_data)
+        
+        with mock.patch.object(ValidationIndex, '_write_back', side_effect=OperationalError):
+            self.assertEqual(ValidationIndexRegistry.flush(), 0)
+        self.assertEqual(len(self.index.pending_records()), 1)
+        
+        self.assertEqual(ValidationIndexRegistry.flush(), 1)
+        self.assertEqual(self.index.pending_records(), [])
+        self.ticket.refresh_from_db()
+        self.assertEqual(self.ticket.status, 'used')
+    
+    def test_engine_uses_index(self):
+        """Test OfflineValidationEngine answers from a loaded index."""
+        with self.assertNumQueries(0):
+            result = OfflineValidationEngine().validate(self.ticket.qr_code_data)
+        self.assertTrue(result['valid'])
+
+
 class OfflineAnalyticsTest(TestCase):
     """Tests for OfflineAnalytics."""
     
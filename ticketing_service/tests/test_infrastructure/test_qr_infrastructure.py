@@ -1,9 +1,21 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
 from django.test import TestCase
+from django.utils import timezone
+from unittest.mock import patch
 import uuid
 
 from domain.ticket import Ticket
-from infrastructure.services.qr_code_service import QRCodeService
+from infrastructure.services.qr_code_service import QRCodeService, QRRenderCache, QRRenderQueue, get_render_pool
 from infrastructure.repositories.ticket_repository import TicketRepository
+from infrastructure.services.ticket_signing import (
+    TicketRevocationSet,
+    TicketTokenSigner,
+    TicketTokenVerifier,
+    generate_signing_key,
+)
 
 
 class QRCodeServiceTest(TestCase):
@@ -24,6 +36,153 @@ class QRCodeServiceTest(TestCase):
         img_bytes = self.service.generate_qr_image(data)
         self.assertIsInstance(img_bytes, bytes)
         self.assertGreater(len(img_bytes), 0)
+    
+    def test_render_cache_hit(self):
+        """Test repeated renders are served from the cache."""
+        data = f"cached_{uuid.uuid4()}"
+        first = self.service.generate_qr_image(data)
+        with patch('infrastructure.services.qr_code_service.render_qr') as render:
+            second = self.service.generate_qr_image(data)
+        render.assert_not_called()
+        self.assertEqual(first, second)
+    
+    def test_render_cache_redis_tier(self):
+        """Test a fresh local tier is refilled from Redis."""
+        data = f"redis_{uuid.uuid4()}"
+        first = self.service.generate_qr_image(data)
+        cold = QRCodeService(cache=QRRenderCache())
+        with patch('infrastructure.services.qr_code_service.render_qr') as render:
+            self.assertEqual(cold.generate_qr_image(data), first)
+        render.assert_not_called()
+    
+    def test_render_batch(self):
+        """Test batch rendering in a process pool."""
+        payloads = [f"batch_{uuid.uuid4()}" for _ in range(QRCodeService.POOL_THRESHOLD + 4)]
+        images = self.service.render_batch(payloads)
+        self.assertEqual(set(images), set(payloads))
+        self.assertTrue(all(image.startswith(b'\x89PNG') for image in images.values()))
+    
+    def test_render_batch_reuses_pool(self):
+        """Test batches share one long-lived process pool."""
+        pool = get_render_pool()
+        payloads = [f"pooled_{uuid.uuid4()}" for _ in range(QRCodeService.POOL_THRESHOLD)]
+        self.service.render_batch(payloads)
+        self.assertIs(get_render_pool(), pool)
+    
+    def test_render_batch_rejects_unknown_format(self):
+        """Test an unsupported image format is refused."""
+        with self.assertRaises(ValueError):
+            self.service.render_batch(['data'], image_format='gif')
+    
+    def test_generate_qr_svg(self):
+        """Test SVG output with the screen profile."""
+        svg = self.service.generate_qr_svg("test_qr_data")
+        self.assertIn(b'<svg', svg)
+    
+    def test_screen_profile_is_smaller(self):
+        """Test the screen profile yields a smaller code than print."""
+        data = "x" * 100
+        screen = self.service.generate_qr_image(data, profile='screen')
+        printed = self.service.generate_qr_image(data, profile='print')
+        self.assertLess(len(screen), len(printed))
+
+
+class QRRenderQueueTest(TestCase):
+    """Tests for QRRenderQueue and the render_qr_codes command."""
+    
+    def setUp(self):
+        self.queue = QRRenderQueue()
+        self.queue.redis_client.delete(QRRenderQueue.QUEUE_KEY)
+    
+    def tearDown(self):
+        self.queue.redis_client.delete(QRRenderQueue.QUEUE_KEY)
+    
+    def test_command_drains_queue_into_render_cache(self):
+        """Test queued payloads are rendered and the queue emptied."""
+        payloads = [f"queued_{uuid.uuid4()}" for _ in range(5)]
+        self.queue.enqueue(payloads)
+        call_command('render_qr_codes', batch_size=2, stdout=StringIO())
+        self.assertEqual(self.queue.pending(), 0)
+        with patch('infrastructure.services.qr_code_service.render_qr') as render:
+            QRCodeService().render_batch(payloads)
+        render.assert_not_called()
+    
+    def test_queue_is_capped(self):
+        """Test the oldest payloads are dropped past MAX_PENDING."""
+        with patch.object(QRRenderQueue, 'MAX_PENDING', 3):
+            self.queue.enqueue(['a', 'b', 'c', 'd', 'e'])
+        self.assertEqual(self.queue.redis_client.lrange(QRRenderQueue.QUEUE_KEY, 0, -1), ['c', 'd', 'e'])
+
+
+class TicketTokenSignerTest(TestCase):
+    """Tests for TicketTokenSigner."""
+    
+    def setUp(self):
+        self.signer = TicketTokenSigner(generate_signing_key(), key_id=1)
+        self.ticket_id = uuid.uuid4()
+        self.event_id = uuid.uuid4()
+        self.ticket_type_id = uuid.uuid4()
+    
+    def test_sign_and_verify(self):
+        """Test a signed token round-trips its claims."""
+        valid_until = timezone.now() + timedelta(days=1)
+        token = self.signer.sign(self.ticket_id, self.event_id, self.ticket_type_id, valid_until=valid_until)
+        
+        claims = self.signer.verify(token)
+        self.assertEqual(claims.ticket_id, self.ticket_id)
+        self.assertEqual(claims.event_id, self.event_id)
+        self.assertEqual(claims.ticket_type_id, self.ticket_type_id)
+        self.assertEqual(int(claims.valid_until.timestamp()), int(valid_until.timestamp()))
+        self.assertIsNone(claims.valid_from)
+    
+    def test_token_is_qr_alphanumeric(self):
+        """Test tokens only use the QR alphanumeric character set."""
+        token = self.signer.sign(self.ticket_id, self.event_id, self.ticket_type_id)
+        self.assertTrue(set(token) <= set('0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'))
+        self.assertLess(len(token), 210)
+    
+    def test_verify_without_database(self):
+        """Test verification does not query the database."""
+        token = self.signer.sign(self.ticket_id, self.event_id, self.ticket_type_id)
+        with self.assertNumQueries(0):
+            self.signer.verify(token)
+    
+    def test_public_key_verifies(self):
+        """Test a verifier holding only the public key accepts signed tokens."""
+        token = self.signer.sign(self.ticket_id, self.event_id, self.ticket_type_id)
+        verifier = TicketTokenVerifier(self.signer.public_key, key_id=1)
+        self.assertEqual(verifier.verify(token).ticket_id, self.ticket_id)
+        self.assertFalse(hasattr(verifier, 'sign'))
+    
+    def test_tampered_token_rejected(self):
+        """Test a modified token fails verification."""
+        token = self.signer.sign(self.ticket_id, self.event_id, self.ticket_type_id)
+        tampered = token[:10] + ('A' if token[10] != 'A' else 'B') + token[11:]
+        with self.assertRaises(ValidationError):
+            self.signer.verify(tampered)
+    
+    def test_wrong_key_rejected(self):
+        """Test a token signed with another key fails verification."""
+        token = TicketTokenSigner(generate_signing_key(), key_id=1).sign(self.ticket_id, self.event_id, self.ticket_type_id)
+        with self.assertRaises(ValidationError):
+            self.signer.verify(token)
+    
+    def test_expired_token_rejected(self):
+        """Test a token past its validity window is rejected."""
+        token = self.signer.sign(
+            self.ticket_id, self.event_id, self.ticket_type_id,
+            valid_until=timezone.now() - timedelta(minutes=1)
+        )
+        with self.assertRaises(ValidationError):
+            self.signer.verify(token)
+    
+    def test_revocation_set_admits_once(self):
+        """Test the revocation set admits a ticket only once."""
+        revocations = TicketRevocationSet(self.event_id)
+        revocations.add([uuid.uuid4()])
+        self.assertTrue(revocations.mark_used(self.ticket_id))
+        self.assertFalse(revocations.mark_used(self.ticket_id))
+        self.assertEqual(revocations.status_of(self.ticket_id), 'used')
 
 
 class TicketRepositoryTest(TestCase):
@@ -3,11 +3,12 @@ from django.test import TestCase
 from django.utils import timezone
 import uuid
 
-from domain.revenue import Revenue, RevenueReport
+from domain.revenue import Revenue, RevenueReport, RevenueRollup
 from domain.order import Order
 from infrastructure.repositories.revenue_repository import (
     RevenueRepository,
-    RevenueTracker
+    RevenueTracker,
+    RevenueRollupBuilder
 )
 
 
@@ -45,6 +46,17 @@ class RevenueRepositoryTest(TestCase):
         self.assertEqual(analytics['total_gross'], Decimal('100.00'))
         self.assertEqual(analytics['total_net'], Decimal('87.00'))
         self.assertEqual(analytics['total_orders'], 1)
+    
+    def test_rebuild_rollups(self):
+        """Test rebuilding rollups reproduces the maintained buckets."""
+        expected = list(RevenueRollup.objects.filter(event_id=self.event_id).values_list('bucket_start', 'net_amount', 'order_count'))
+        RevenueRollup.objects.filter(event_id=self.event_id).delete()
+        
+        buckets = RevenueRollupBuilder().rebuild(self.event_id)
+        
+        self.assertEqual(buckets, 1)
+        rebuilt = list(RevenueRollup.objects.filter(event_id=self.event_id).values_list('bucket_start', 'net_amount', 'order_count'))
+        self.assertEqual(rebuilt, expected)
 
 
 class RevenueTrackerTest(TestCase):
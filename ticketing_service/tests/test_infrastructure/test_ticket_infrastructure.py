@@ -6,6 +6,13 @@ import uuid
 
 from domain.ticket_type import TicketType
 from infrastructure.services.inventory_cache import TicketInventoryCache
+from infrastructure.services.inventory_reservation import (
+    TicketReservationEngine,
+    InventoryReconciler,
+    InsufficientInventoryError,
+    PENDING_SOLD_KEY,
+    FLUSHING_SOLD_KEY,
+)
 from infrastructure.repositories.ticket_type_repository import TicketTypeRepository
 
 
@@ -38,6 +45,116 @@ class TicketInventoryCacheTest(TestCase):
         self.assertEqual(new_count, 110)
 
 
+class TicketReservationEngineTest(TestCase):
+    """Tests for TicketReservationEngine and InventoryReconciler."""
+    
+    def setUp(self):
+        self.engine = TicketReservationEngine()
+        self.reconciler = InventoryReconciler(self.engine.inventory_cache)
+        self.engine.redis_client.delete(PENDING_SOLD_KEY, FLUSHING_SOLD_KEY)
+        now = timezone.now()
+        self.vip = TicketType.objects.create(
+            event_id=uuid.uuid4(),
+            name='VIP',
+            price=Decimal('100.00'),
+            quantity=5,
+            sale_start=now - timedelta(hours=1),
+            sale_end=now + timedelta(days=30)
+        )
+        self.general = TicketType.objects.create(
+            event_id=self.vip.event_id,
+            name='General',
+            price=Decimal('50.00'),
+            quantity=10,
+            quantity_sold=2,
+            sale_start=now - timedelta(hours=1),
+            sale_end=now + timedelta(days=30)
+        )
+    
+    def tearDown(self):
+        for ticket_type in (self.vip, self.general):
+            self.engine.inventory_cache.delete_cache(ticket_type.id)
+        self.engine.redis_client.delete(PENDING_SOLD_KEY, FLUSHING_SOLD_KEY)
+    
+    def test_reserve_primes_and_decrements(self):
+        """Test reserving across ticket types primes counters from the database."""
+        hold = self.engine.reserve([
+            {'ticket_type_id': self.vip.id, 'quantity': 2},
+            {'ticket_type_id': self.general.id, 'quantity': 3},
+        ])
+        self.assertEqual(self.engine.inventory_cache.get_available_count(self.vip.id), 3)
+        self.assertEqual(self.engine.inventory_cache.get_available_count(self.general.id), 5)
+        self.assertEqual(self.engine.get_hold(hold['hold_id']), {str(self.vip.id): 2, str(self.general.id): 3})
+        self.engine.release(hold['hold_id'])
+    
+    def test_reserve_is_all_or_nothing(self):
+        """Test a failing ticket type leaves the others untouched."""
+        with self.assertRaises(InsufficientInventoryError):
+            self.engine.reserve([
+                {'ticket_type_id': self.general.id, 'quantity': 3},
+                {'ticket_type_id': self.vip.id, 'quantity': 6},
+            ])
+        self.assertEqual(self.engine.inventory_cache.get_available_count(self.general.id), 8)
+        self.assertEqual(self.engine.inventory_cache.get_available_count(self.vip.id), 5)
+    
+    def test_release_returns_inventory(self):
+        """Test releasing a hold restores available count."""
+        hold = self.engine.reserve([{'ticket_type_id': self.vip.id, 'quantity': 5}])
+        self.assertTrue(self.engine.release(hold['hold_id']))
+        self.assertFalse(self.engine.release(hold['hold_id']))
+        self.assertEqual(self.engine.inventory_cache.get_available_count(self.vip.id), 5)
+    
+    def test_expired_hold_is_released(self):
+        """Test expired holds cannot be confirmed and return inventory."""
+        hold = self.engine.reserve([{'ticket_type_id': self.vip.id, 'quantity': 4}], ttl=-1)
+        self.assertEqual(self.engine.expire_holds(), 1)
+        self.assertIsNone(self.engine.confirm(hold['hold_id']))
+        self.assertEqual(self.engine.inventory_cache.get_available_count(self.vip.id), 5)
+    
+    def test_confirm_and_flush(self):
+        """Test confirmed holds are written back to ticket_types in a batch."""
+        hold = self.engine.reserve([
+            {'ticket_type_id': self.vip.id, 'quantity': 2},
+            {'ticket_type_id': self.general.id, 'quantity': 1},
+        ])
+        self.assertEqual(
+            self.engine.confirm(hold['hold_id']),
+            {str(self.vip.id): 2, str(self.general.id): 1}
+        )
+        
+        result = self.reconciler.flush()
+        self.assertEqual(result, {'ticket_types': 2, 'tickets': 3})
+        self.vip.refresh_from_db()
+        self.general.refresh_from_db()
+        self.assertEqual(self.vip.quantity_sold, 2)
+        self.assertEqual(self.general.quantity_sold, 3)
+        self.assertEqual(self.reconciler.flush()['tickets'], 0)
+    
+    def test_restock_after_confirm(self):
+        """Test restocking cancels out a pending sale."""
+        hold = self.engine.reserve([{'ticket_type_id': self.vip.id, 'quantity': 2}])
+        self.engine.confirm(hold['hold_id'])
+        self.engine.restock(self.vip.id, 2)
+        self.assertEqual(self.engine.inventory_cache.get_available_count(self.vip.id), 5)
+        self.assertEqual(self.reconciler.flush()['ticket_types'], 0)
+    
+    def test_claim_takes_inventory_without_pending_sale(self):
+        """Test claimed tickets leave the counter but are not flushed again."""
+        claimed = self.engine.claim([{'ticket_type_id': self.vip.id, 'quantity': 3}])
+        self.assertEqual(claimed, {str(self.vip.id): 3})
+        self.assertEqual(self.engine.inventory_cache.get_available_count(self.vip.id), 2)
+        self.assertEqual(self.reconciler.flush()['ticket_types'], 0)
+        with self.assertRaises(InsufficientInventoryError):
+            self.engine.claim([{'ticket_type_id': self.vip.id, 'quantity': 3}])
+    
+    def test_adjust_shifts_cached_counts_only(self):
+        """Test adjust changes primed counters and skips uncached ones."""
+        self.engine.prime([self.vip.id])
+        self.engine.adjust({self.vip.id: -2, self.general.id: 4})
+        self.assertEqual(self.engine.inventory_cache.get_available_count(self.vip.id), 3)
+        self.assertIsNone(self.engine.inventory_cache.get_available_count(self.general.id))
+
+
 class TicketTypeRepositoryTest(TestCase):
     """Tests for TicketTypeRepository."""
     
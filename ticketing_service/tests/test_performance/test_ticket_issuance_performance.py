@@ -0,0 +1,51 @@
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+import uuid
+
+from domain.ticket import Ticket
+from infrastructure.services.ticket_issuance import BulkTicketIssuer
+
+
+class TicketIssuanceBenchmarkTest(TestCase):
+    """Tests for batched ticket issuance at volume."""
+    
+    QUANTITY = 2000
+    
+    def setUp(self):
+        self.data = {
+            'ticket_type_id': uuid.uuid4(),
+            'order_id': uuid.uuid4(),
+            'attendee_name': 'Comp Guest',
+            'attendee_email': 'comp@example.com'
+        }
+    
+    def test_bulk_issue_large_batch(self):
+        """Test bulk issuance stores a large comp batch."""
+        tickets = BulkTicketIssuer().issue_batch(self.data, self.QUANTITY)
+        self.assertEqual(len(tickets), self.QUANTITY)
+        self.assertEqual(Ticket.objects.filter(order_id=self.data['order_id']).count(), self.QUANTITY)
+    
+    def test_bulk_issue_query_count(self):
+        """Test bulk issuance issues a handful of INSERTs, not one per ticket."""
+        with CaptureQueriesContext(connection) as context:
+            BulkTicketIssuer(chunk_size=500).issue_batch(self.data, 2000)
+        self.assertLess(len(context.captured_queries), 2000 // 10)
+    
+    def test_bulk_issued_tickets_are_prepared(self):
+        """Test bulk issued tickets carry QR data and security hash."""
+        tickets = BulkTicketIssuer().issue_batch(self.data, 3)
+        stored = Ticket.objects.get(id=tickets[0].id)
+        self.assertEqual(stored.qr_code_data, stored.generate_qr_data())
+        self.assertEqual(stored.security_hash, stored.generate_security_hash())
+        self.assertEqual(len({ticket.qr_code_data for ticket in tickets}), 3)
+    
+    def test_benchmark_command_reports_timings(self):
+        """Test the loop-vs-bulk benchmark reports both timings and keeps no tickets."""
+        out = StringIO()
+        call_command('benchmark_ticket_issuance', quantity=20, stdout=out)
+        
+        self.assertRegex(out.getvalue(), r'quantity=20 loop=[\d.]+s bulk=[\d.]+s speedup=[\d.]+x')
+        self.assertFalse(Ticket.objects.exists())
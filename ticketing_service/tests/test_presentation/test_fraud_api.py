@@ -1,6 +1,7 @@
 from decimal import Decimal
 from django.test import TestCase
 from rest_framework.test import APIClient
+from unittest.mock import patch
 import uuid
 
 from domain.fraud import FraudAlert, SecurityRule
@@ -57,3 +58,39 @@ class FraudAPITest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn('risk_score', response.data)
         self.assertIn('recommendation', response.data)
+    
+    def test_risk_assessment_uses_customer_ip(self):
+        """Test the customer IP comes from the payload, not the caller."""
+        order = Order.objects.create(
+            user_id=uuid.uuid4(),
+            event_id=uuid.uuid4(),
+            total_amount=Decimal('10.00'),
+            status='pending'
+        )
+        
+        with patch('presentation.views.fraud_views.RiskAssessmentService.assess_order', return_value={}) as assess:
+            response = self.client.post(
+                f'/api/tickets/orders/{order.id}/risk-assessment/',
+                {'ip_address': '203.0.113.7'},
+                format='json'
+            )
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(assess.call_args.kwargs['ip_address'], '203.0.113.7')
+    
+    def test_risk_assessment_rejects_bad_ip(self):
+        """Test a malformed customer IP is rejected."""
+        order = Order.objects.create(
+            user_id=uuid.uuid4(),
+            event_id=uuid.uuid4(),
+            total_amount=Decimal('10.00'),
+            status='pending'
+        )
+        
+        response = self.client.post(
+            f'/api/tickets/orders/{order.id}/risk-assessment/',
+            {'ip_address': 'not-an-ip'},
+            format='json'
+        )
+        
+        self.assertEqual(response.status_code, 400)
@@ -1,3 +1,6 @@
+import gzip
+import json
+import tempfile
 from datetime import timedelta
 from django.test import TestCase
 from rest_framework.test import APIClient
@@ -5,6 +8,7 @@ from django.utils import timezone
 import uuid
 
 from domain.offline import OfflineTicket, ValidationCache
+from infrastructure.validation_index import ValidationIndexRegistry
 
 
 class ValidateOfflineAPITest(TestCase):
@@ -77,3 +81,73 @@ class OfflineStatusAPITest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data['ticket_count'], 2)
         self.assertEqual(response.data['cache_status'], 'active')
+
+
+class OfflineManifestAPITest(TestCase):
+    """Tests for offline manifest API."""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.event_id = uuid.uuid4()
+        self.client.post('/api/tickets/sync/', {
+            'event_id': str(self.event_id),
+            'tickets': [
+                {
+                    'ticket_id': str(uuid.uuid4()),
+                    'qr_code': 'QR-API-MANIFEST',
+                    'attendee_name': 'Alice',
+                    'valid_until': (timezone.now() + timedelta(days=1)).isoformat()
+                }
+            ]
+        }, format='json')
+    
+    def test_get_manifest(self):
+        """Test streaming the manifest."""
+        response = self.client.get(f'/api/tickets/events/{self.event_id}/offline-manifest/?since=0')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        lines = gzip.decompress(b''.join(response.streaming_content)).decode().splitlines()
+        self.assertEqual(json.loads(lines[0])['qr_code'], 'QR-API-MANIFEST')
+        self.assertEqual(json.loads(lines[-1])['next_token'], 1)
+    
+    def test_get_manifest_invalid_token(self):
+        """Test an invalid change token is rejected."""
+        response = self.client.get(f'/api/tickets/events/{self.event_id}/offline-manifest/?since=abc')
+        self.assertEqual(response.status_code, 400)
+
+
+class ValidationIndexAPITest(TestCase):
+    """Tests for validation index API."""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.event_id = uuid.uuid4()
+        OfflineTicket.objects.create(
+            ticket_id=uuid.uuid4(),
+            qr_code='QR-INDEX-API',
+            event_id=self.event_id,
+            attendee_name='Alice',
+            valid_until=timezone.now() + timedelta(days=1)
+        )
+        log_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(log_dir.cleanup)
+        log_settings = self.settings(OFFLINE_CHECKIN_LOG_DIR=log_dir.name, OFFLINE_CHECKIN_FLUSH_INTERVAL=0)
+        log_settings.enable()
+        self.addCleanup(log_settings.disable)
+    
+    def tearDown(self):
+        ValidationIndexRegistry.unload(self.event_id)
+    
+    def test_load_and_reconcile_index(self):
+        """Test loading the index, validating from it and reconciling."""
+        response = self.client.post(f'/api/tickets/events/{self.event_id}/offline-index/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['ticket_count'], 1)
+        
+        response = self.client.post('/api/tickets/validate-offline/', {'qr_code': 'QR-INDEX-API'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        
+        response = self.client.post(f'/api/tickets/events/{self.event_id}/offline-index/reconcile/')
+        self.assertEqual(response.data['reconciled'], 1)
+        self.assertEqual(OfflineTicket.objects.get(qr_code='QR-INDEX-API').status, 'used')
@@ -8,6 +8,7 @@ import json
 
 from domain.ticket_type import TicketType
 from domain.order import Order
+from infrastructure.services.inventory_reservation import TicketReservationEngine
 
 
 class OrderAPITest(TestCase):
@@ -41,6 +42,23 @@ class OrderAPITest(TestCase):
         self.assertEqual(response.status_code, 201)
         self.assertEqual(response.data['total_amount'], '100.00')
     
+    def test_create_order_batch(self):
+        """Test creating box-office orders in one call."""
+        data = {
+            'orders': [
+                {
+                    'user_id': str(uuid.uuid4()),
+                    'event_id': str(self.event_id),
+                    'items': [{'ticket_type_id': str(self.ticket_type.id), 'quantity': 1}]
+                }
+                for _ in range(20)
+            ]
+        }
+        response = self.client.post('/api/tickets/orders/batch/', data, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['count'], 20)
+        self.assertEqual(response.data['orders'][0]['total_amount'], '50.00')
+    
     def test_get_order(self):
         """Test getting an order."""
         order = Order.objects.create(
@@ -74,3 +92,40 @@ class OrderAPITest(TestCase):
         )
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data['tickets_generated'], 2)
+    
+    def test_process_purchase_with_reservation(self):
+        """Test purchasing against a reservation hold."""
+        items = [{'ticket_type_id': str(self.ticket_type.id), 'quantity': 2}]
+        hold_response = self.client.post('/api/tickets/reservations/', {'items': items}, format='json')
+        self.assertEqual(hold_response.status_code, 201)
+        
+        create_response = self.client.post('/api/tickets/orders/', {
+            'user_id': str(self.user_id),
+            'event_id': str(self.event_id),
+            'items': items
+        }, format='json')
+        
+        response = self.client.post(
+            f"/api/tickets/orders/{create_response.data['id']}/purchase/",
+            {'payment_id': str(uuid.uuid4()), 'hold_id': hold_response.data['hold_id']},
+            format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['tickets_generated'], 2)
+        
+        # Sold count is written back by the reconciler, not the request
+        self.ticket_type.refresh_from_db()
+        self.assertEqual(self.ticket_type.quantity_sold, 0)
+        
+        engine = TicketReservationEngine()
+        engine.restock(self.ticket_type.id, 2)
+        engine.inventory_cache.delete_cache(self.ticket_type.id)
+    
+    def test_release_reservation(self):
+        """Test releasing a reservation hold."""
+        hold_response = self.client.post('/api/tickets/reservations/', {
+            'items': [{'ticket_type_id': str(self.ticket_type.id), 'quantity': 1}]
+        }, format='json')
+        response = self.client.delete(f"/api/tickets/reservations/{hold_response.data['hold_id']}/")
+        self.assertEqual(response.status_code, 204)
+        TicketReservationEngine().inventory_cache.delete_cache(self.ticket_type.id)
@@ -8,6 +8,7 @@ import uuid
 from domain.promo_code import PromoCode
 from domain.order import Order, OrderItem
 from domain.ticket_type import TicketType
+from infrastructure.services.promo_code_cache import PromoCodeCache
 
 
 class PromoCodeAPITest(TestCase):
@@ -17,6 +18,7 @@ class PromoCodeAPITest(TestCase):
         self.client = APIClient()
         self.event_id = uuid.uuid4()
         self.now = timezone.now()
+        PromoCodeCache().invalidate('SAVE20')
     
     def test_create_promo_code(self):
         """Test creating a promo code."""
@@ -107,3 +109,24 @@ class PromoCodeAPITest(TestCase):
         
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data['new_total'], '80.00')
+    
+    def test_generate_single_use_codes(self):
+        """Test streaming pre-generated single-use codes."""
+        promo = PromoCode.objects.create(
+            code='SAVE20',
+            discount_type='percentage',
+            discount_value=Decimal('20.00'),
+            valid_from=self.now - timedelta(days=1),
+            valid_until=self.now + timedelta(days=30)
+        )
+        
+        response = self.client.post(
+            f'/api/tickets/promo-codes/{promo.id}/single-use-codes/',
+            {'count': 5},
+            format='json'
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        codes = b''.join(response.streaming_content).decode().split()
+        self.assertEqual(len(codes), 5)
+        self.assertTrue(all(code.startswith('SAVE20-') for code in codes))
@@ -5,6 +5,7 @@ import uuid
 
 from domain.tax import TaxRule, TaxCalculation
 from domain.order import Order
+from infrastructure.services.tax_rules import TaxRuleTable
 
 
 class TaxAPITest(TestCase):
@@ -19,6 +20,7 @@ class TaxAPITest(TestCase):
             country='US',
             tax_rate=Decimal('10.00')
         )
+        TaxRuleTable.publish()
         
         self.order = Order.objects.create(
             user_id=uuid.uuid4(),
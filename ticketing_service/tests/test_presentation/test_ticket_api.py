@@ -58,3 +58,10 @@ class TicketAPITest(TestCase):
         """Test getting non-existent ticket."""
         response = self.client.get(f'/api/tickets/tickets/{uuid.uuid4()}/')
         self.assertEqual(response.status_code, 404)
+    
+    def test_get_signing_key(self):
+        """Test scanners can fetch the public key but not the private key."""
+        response = self.client.get('/api/tickets/tickets/signing-key/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()), {'algorithm', 'key_id', 'public_key'})
+        self.assertEqual(response.json()['algorithm'], 'Ed25519')
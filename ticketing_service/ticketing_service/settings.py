@@ -143,6 +143,21 @@ RABBITMQ_USER = config('RABBITMQ_USER')
 RABBITMQ_PASSWORD = config('RABBITMQ_PASSWORD')
 RABBITMQ_VHOST = config('RABBITMQ_VHOST', default='/')
 
+# Signed ticket QR payloads. Base64 of a raw 32-byte Ed25519 private key that
+# stays in this service; door scanners only get the public key from
+# tickets/signing-key/.
+TICKET_SIGNING_PRIVATE_KEY = config('TICKET_SIGNING_PRIVATE_KEY')
+TICKET_SIGNING_KEY_ID = config('TICKET_SIGNING_KEY_ID', cast=int, default=1)
+
+# Worker processes for batch QR rendering; 0 uses one per CPU
+QR_RENDER_WORKERS = config('QR_RENDER_WORKERS', cast=int, default=0)
+
+# Offline check-in used logs, replayed when an event's validation index loads
+OFFLINE_CHECKIN_LOG_DIR = config('OFFLINE_CHECKIN_LOG_DIR', default=str(BASE_DIR / 'checkin_logs'))
+
+# Seconds between background write-backs of offline check-ins; 0 disables
+OFFLINE_CHECKIN_FLUSH_INTERVAL = config('OFFLINE_CHECKIN_FLUSH_INTERVAL', cast=float, default=5.0)
+
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [